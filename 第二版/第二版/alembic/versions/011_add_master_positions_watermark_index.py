@@ -0,0 +1,34 @@
+"""add master_positions watermark index
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """升級資料庫"""
+    
+    # 跟單引擎依 (last_updated, id) 水位線查詢變動的倉位
+    op.create_index(
+        'ix_master_positions_last_updated_id',
+        'master_positions',
+        ['last_updated', 'id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """降級資料庫"""
+    
+    op.drop_index('ix_master_positions_last_updated_id', table_name='master_positions')
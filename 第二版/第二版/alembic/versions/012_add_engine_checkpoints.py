@@ -0,0 +1,41 @@
+"""add engine_checkpoints table
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """升級資料庫"""
+    
+    # 創建 engine_checkpoints 表（跟單引擎重啟後恢復倉位變動偵測狀態）
+    op.create_table(
+        'engine_checkpoints',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('engine_name', sa.String(length=50), nullable=False, comment='引擎名稱'),
+        sa.Column('state', sa.Text(), nullable=False, comment='狀態（JSON）'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新時間'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    
+    op.create_index('ix_engine_checkpoints_id', 'engine_checkpoints', ['id'])
+    op.create_index('ix_engine_checkpoints_engine_name', 'engine_checkpoints', ['engine_name'], unique=True)
+
+
+def downgrade() -> None:
+    """降級資料庫"""
+    
+    op.drop_index('ix_engine_checkpoints_engine_name', table_name='engine_checkpoints')
+    op.drop_index('ix_engine_checkpoints_id', table_name='engine_checkpoints')
+    op.drop_table('engine_checkpoints')
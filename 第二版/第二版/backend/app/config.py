@@ -3,7 +3,7 @@ Application Configuration
 """
 import logging
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +37,61 @@ class Settings(BaseSettings):
     TELEGRAM_BOT_TOKEN: Optional[str] = None
     TELEGRAM_CHAT_ID: Optional[str] = None
     TELEGRAM_ENABLED: bool = False
-    
+
+    # 跟單引擎
+    ENGINE_MAX_CONCURRENT_MASTERS: int = 8  # 單輪同時處理的 Master 上限
+    ENGINE_MASTER_TIMEOUT_SECONDS: float = 10.0  # 單一 Master 的處理時限
+    ENGINE_WARM_CREDENTIAL_CACHE: bool = True  # 啟動時預載跟隨者的解密憑證
+    ENGINE_COALESCE_WINDOW_SECONDS: float = 0.0  # 同一倉位變動的下單合併窗口，0 表示不合併
+    ENGINE_ORDER_RETRY_ATTEMPTS: int = 3  # 暫時性下單失敗的最大重試次數
+    ENGINE_ORDER_RETRY_BASE_DELAY_SECONDS: float = 0.5  # 第一次重試的退避上限
+    ENGINE_ORDER_RETRY_QUEUE_SIZE: int = 1000  # 重試佇列容量
+
+    # 同步交易所客戶端使用的執行緒池大小
+    EXCHANGE_THREAD_POOL_SIZE: int = 16
+
+    # 交易所熔斷器（交易所與 API Key 各自計算）
+    EXCHANGE_CIRCUIT_FAILURE_THRESHOLD: int = 5  # 連續暫時性失敗幾次後開啟
+    EXCHANGE_CIRCUIT_RECOVERY_SECONDS: float = 30.0  # 開啟後多久放行探測請求
+
+    # CCXT 交易所 API 位址覆寫：交易所名稱 -> 基礎網址（如本地模擬交易所 http://127.0.0.1:8765），
+    # 環境變數以 JSON 設定，例如 EXCHANGE_BASE_URLS='{"binance": "http://127.0.0.1:8765"}'
+    EXCHANGE_BASE_URLS: Dict[str, str] = {}
+
+    # 交易所市場規格（下單精度與最小值）的重新載入間隔
+    EXCHANGE_MARKETS_REFRESH_SECONDS: float = 3600.0
+
+    # 市場行情輪詢（每個交易所的交易對一個輪詢任務）
+    MARKET_DATA_POLL_SECONDS: float = 2.0  # 輪詢間隔
+    MARKET_DATA_IDLE_SECONDS: float = 300.0  # 多久沒有讀取後停止輪詢
+
+    # Mock 交易所模擬（壓力測試用；關閉時 MockExchange 返回固定回應）
+    MOCK_EXCHANGE_SIMULATE: bool = False
+    MOCK_EXCHANGE_SEED: Optional[int] = None  # 隨機種子，設定後可重現同一情境
+    MOCK_EXCHANGE_LATENCY_MS: float = 0.0  # 請求延遲中位數
+    MOCK_EXCHANGE_LATENCY_SIGMA: float = 0.0  # 延遲的對數常態分佈參數
+    MOCK_EXCHANGE_ERROR_RATE: float = 0.0  # 交易所暫時不可用的機率
+    MOCK_EXCHANGE_TIMEOUT_RATE: float = 0.0  # 下單逾時的機率
+    MOCK_EXCHANGE_PARTIAL_FILL_RATE: float = 0.0  # 市價單部分成交的機率
+    MOCK_EXCHANGE_RATE_LIMIT_PER_SECOND: float = 0.0  # 每個 API Key 每秒請求數上限，0 表示不限
+
+    # EA 配置（/ea/config、/ea/heartbeat 輪詢與 /ea/ws 推送）
+    EA_CONFIG_CACHE_TTL_SECONDS: float = 10.0  # 配置快取存活時間（其他程序的變更最遲多久生效）
+    EA_HEARTBEAT_FLUSH_SECONDS: float = 5.0  # last_seen 批量寫入間隔
+    EA_WS_AUTH_TIMEOUT_SECONDS: float = 10.0  # WebSocket 連線後等待認證訊息的時間
+    EA_WS_HEARTBEAT_SECONDS: float = 15.0  # WebSocket 連線期間記錄心跳的間隔
+
+    # 儀表板（摘要快取在引擎寫入該用戶的交易或倉位時立即失效，事件串流推送同一批寫入）
+    DASHBOARD_CACHE_TTL_SECONDS: float = 2.0  # 摘要快取存活時間（行情與其他程序的寫入最遲多久反映）
+    DASHBOARD_SSE_HEARTBEAT_SECONDS: float = 15.0  # /dashboard/events 沒有事件時送出心跳的間隔
+
+    # 全域設定快取（緊急全停等）
+    GLOBAL_SETTINGS_REFRESH_SECONDS: float = 5.0  # 重新載入間隔（其他程序的寫入最遲多久生效）
+
+    # 解密憑證快取
+    CREDENTIAL_CACHE_MAX_SIZE: int = 1024
+    CREDENTIAL_CACHE_TTL_SECONDS: float = 60.0
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -16,14 +16,18 @@ from backend.app.config import settings
 # 創建 Base 類別用於模型定義
 Base = declarative_base()
 
+# 連接池設定（跟單引擎依此限制同時持有的 session 數量）
+DB_POOL_SIZE = 10  # 連接池大小
+DB_MAX_OVERFLOW = 20  # 最大溢出連接數
+
 # 創建非同步引擎
 # 使用 asyncpg 驅動（postgresql+asyncpg://）
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,  # 在開發模式下顯示 SQL 語句
     future=True,
-    pool_size=10,  # 連接池大小
-    max_overflow=20,  # 最大溢出連接數
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
     pool_pre_ping=True,  # 在使用連接前檢查連接是否有效
     pool_recycle=3600,  # 連接回收時間（秒）
     poolclass=QueuePool,  # 使用隊列池
@@ -4,6 +4,7 @@ EA Trading Backend - Main Application Entry Point
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from backend.app.services.heartbeat_buffer import get_heartbeat_buffer
 from backend.app.routes import credential_routes, exchange_routes, test_routes, follower_routes, auth_routes, user_routes, follow_config_routes, trade_routes, dashboard_routes, trader_routes, ea_routes
 
 app = FastAPI(
@@ -45,6 +46,12 @@ app.include_router(follower_routes.router)  # 跟單引擎路由
 app.include_router(test_routes.router)  # 測試路由（開發用）
 
 
+@app.on_event("shutdown")
+async def flush_heartbeats():
+    """關閉前寫入緩衝中的 EA 心跳"""
+    await get_heartbeat_buffer().stop()
+
+
 @app.get("/")
 async def root():
     """健康檢查端點"""
@@ -12,6 +12,7 @@ from backend.app.models.follower_position import FollowerPosition
 from backend.app.models.trade_error import TradeError
 from backend.app.models.follow_settings import FollowSettings
 from backend.app.models.global_setting import GlobalSetting
+from backend.app.models.engine_checkpoint import EngineCheckpoint
 # PositionSnapshot 在最後導入，避免循環依賴
 from backend.app.models.position_snapshot import PositionSnapshot
 
@@ -29,5 +30,6 @@ __all__ = [
     "TradeError",
     "FollowSettings",
     "GlobalSetting",
+    "EngineCheckpoint",
     "PositionSnapshot"
 ]
@@ -0,0 +1,22 @@
+"""
+Engine Checkpoint Model
+引擎檢查點模型 - 保存跟單引擎的倉位變動偵測狀態，重啟後恢復
+"""
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime
+
+from backend.app.database import Base
+
+
+class EngineCheckpoint(Base):
+    """引擎檢查點表"""
+    __tablename__ = "engine_checkpoints"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    engine_name = Column(String(50), nullable=False, unique=True, index=True)  # 引擎名稱，例如: "follower_engine_v2"
+    
+    # 狀態（JSON 格式）
+    state = Column(Text, nullable=False)
+    
+    # 時間戳
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -2,7 +2,7 @@
 Master Position Model
 Master 倉位模型 - 記錄 Master 當前的倉位狀態
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -12,6 +12,10 @@ from backend.app.database import Base
 class MasterPosition(Base):
     """Master 倉位表"""
     __tablename__ = "master_positions"
+    __table_args__ = (
+        # 跟單引擎依 (last_updated, id) 水位線查詢變動的倉位
+        Index("ix_master_positions_last_updated_id", "last_updated", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
@@ -96,6 +96,26 @@ class CredentialRepository:
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
     
+    async def get_credentials_by_ids(
+        self,
+        credential_ids: list[int]
+    ) -> list[ApiCredential]:
+        """
+        批量獲取憑證
+        
+        Args:
+            credential_ids: 憑證 ID 列表
+            
+        Returns:
+            憑證列表（不存在的 ID 會被略過）
+        """
+        if not credential_ids:
+            return []
+        
+        stmt = select(ApiCredential).where(ApiCredential.id.in_(set(credential_ids)))
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+    
     async def get_user_credentials(
         self,
         user_id: int,
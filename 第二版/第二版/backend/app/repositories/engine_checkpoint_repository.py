@@ -0,0 +1,35 @@
+"""
+Engine Checkpoint Repository
+引擎檢查點資料存取層
+"""
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.models.engine_checkpoint import EngineCheckpoint
+
+
+class EngineCheckpointRepository:
+    """引擎檢查點資料存取層"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get(self, engine_name: str) -> Optional[EngineCheckpoint]:
+        """獲取引擎的檢查點"""
+        stmt = select(EngineCheckpoint).where(EngineCheckpoint.engine_name == engine_name)
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+    
+    async def save(self, engine_name: str, state: str) -> EngineCheckpoint:
+        """更新或創建檢查點"""
+        checkpoint = await self.get(engine_name)
+        
+        if checkpoint:
+            checkpoint.state = state
+        else:
+            checkpoint = EngineCheckpoint(engine_name=engine_name, state=state)
+            self.db.add(checkpoint)
+        
+        await self.db.flush()
+        return checkpoint
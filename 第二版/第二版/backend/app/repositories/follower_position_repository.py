@@ -2,8 +2,9 @@
 Follower Position Repository
 跟隨者倉位資料存取層
 """
-from typing import Optional, List
-from sqlalchemy import select, and_
+from datetime import datetime
+from typing import Optional, List, Dict, Tuple, Iterable, Any
+from sqlalchemy import select, and_, insert, update, values, column, func, Integer, Float
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.app.models.follower_position import FollowerPosition
@@ -38,6 +39,95 @@ class FollowerPositionRepository:
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
     
+    async def get_positions_by_symbol(
+        self,
+        keys: Iterable[Tuple[int, int]],
+        symbol: str
+    ) -> Dict[Tuple[int, int], FollowerPosition]:
+        """
+        批量獲取多個跟隨者在同一交易對的倉位
+        
+        Args:
+            keys: (user_id, credential_id) 列表
+            symbol: 交易對
+            
+        Returns:
+            (user_id, credential_id) → 倉位
+        """
+        keys = set(keys)
+        if not keys:
+            return {}
+        stmt = select(FollowerPosition).where(
+            and_(
+                FollowerPosition.symbol == symbol,
+                FollowerPosition.user_id.in_({user_id for user_id, _ in keys})
+            )
+        )
+        result = await self.db.execute(stmt)
+        positions = {}
+        for position in result.scalars().all():
+            key = (position.user_id, position.credential_id)
+            if key in keys:
+                positions[key] = position
+        return positions
+    
+    async def bulk_insert_positions(self, rows: List[Dict[str, Any]]) -> None:
+        """以多列 INSERT 批量創建倉位"""
+        if not rows:
+            return
+        now = datetime.utcnow()
+        await self.db.execute(
+            insert(FollowerPosition),
+            [{"last_updated": now, **row} for row in rows]
+        )
+    
+    async def bulk_update_positions(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        批量更新倉位大小與開倉價格
+        
+        PostgreSQL 使用單一 UPDATE ... FROM (VALUES ...)；
+        其他資料庫退回依主鍵的 executemany
+        
+        Args:
+            rows: 每列包含 id、position_size、entry_price（None 表示不變）
+        """
+        if not rows:
+            return
+        now = datetime.utcnow()
+        
+        if self.db.bind.dialect.name == "postgresql":
+            data = values(
+                column("id", Integer),
+                column("position_size", Float),
+                column("entry_price", Float),
+                name="v"
+            ).data([(row["id"], row["position_size"], row["entry_price"]) for row in rows])
+            stmt = (
+                update(FollowerPosition)
+                .where(FollowerPosition.id == data.c.id)
+                .values(
+                    position_size=data.c.position_size,
+                    entry_price=func.coalesce(data.c.entry_price, FollowerPosition.entry_price),
+                    last_updated=now
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await self.db.execute(stmt)
+            return
+        
+        await self.db.execute(
+            update(FollowerPosition),
+            [
+                {
+                    "id": row["id"],
+                    "position_size": row["position_size"],
+                    "last_updated": now,
+                    **({"entry_price": row["entry_price"]} if row["entry_price"] is not None else {})
+                }
+                for row in rows
+            ]
+        )
+    
     async def update_position(
         self,
         user_id: int,
@@ -2,9 +2,9 @@
 Trade Error Repository
 交易錯誤資料存取層
 """
-from typing import Optional, List
+from typing import Optional, List, Set, Iterable, Dict, Any
 from datetime import datetime
-from sqlalchemy import select
+from sqlalchemy import select, insert, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.app.models.trade_error import TradeError
@@ -52,11 +52,42 @@ class TradeErrorRepository:
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
     
+    async def count_unresolved_by_user(self, user_id: int) -> int:
+        """計算用戶未解決的錯誤數量（不載入錯誤內容）"""
+        stmt = select(func.count()).select_from(TradeError).where(
+            TradeError.user_id == user_id,
+            TradeError.is_resolved == False
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one()
+    
     async def has_unresolved_errors(self, user_id: int) -> bool:
         """檢查用戶是否有未解決的錯誤"""
         errors = await self.get_unresolved_by_user(user_id)
         return len(errors) > 0
     
+    async def get_users_with_unresolved_errors(self, user_ids: Iterable[int]) -> Set[int]:
+        """批量檢查：返回有未解決錯誤的用戶 ID"""
+        user_ids = set(user_ids)
+        if not user_ids:
+            return set()
+        stmt = select(TradeError.user_id).where(
+            TradeError.user_id.in_(user_ids),
+            TradeError.is_resolved == False
+        ).distinct()
+        result = await self.db.execute(stmt)
+        return set(result.scalars().all())
+    
+    async def bulk_create(self, rows: List[Dict[str, Any]]) -> None:
+        """以多列 INSERT 批量創建錯誤記錄（不回讀）"""
+        if not rows:
+            return
+        now = datetime.utcnow()
+        await self.db.execute(
+            insert(TradeError),
+            [{"created_at": now, "is_resolved": False, **row} for row in rows]
+        )
+    
     async def resolve(
         self,
         error_id: int,
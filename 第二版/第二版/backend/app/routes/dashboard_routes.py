@@ -3,26 +3,17 @@ Dashboard Routes
 儀表板聚合 API 路由 - 專供前端使用
 """
 import logging
-from typing import Optional
+from typing import Any, Dict, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, desc
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from backend.app.database import get_db
 from backend.app.config import settings
 from backend.app.services.auth_service import get_current_active_user
 from backend.app.models.user import User
-from backend.app.models.follow_settings import FollowSettings
-from backend.app.models.master_position import MasterPosition
-from backend.app.models.follower_position import FollowerPosition
-from backend.app.models.trade_log import TradeLog
-from backend.app.models.trade_error import TradeError
-from backend.app.repositories.follow_settings_repository import FollowSettingsRepository
-from backend.app.repositories.trade_error_repository import TradeErrorRepository
-from backend.app.repositories.follower_position_repository import FollowerPositionRepository
-from backend.app.services.follower_engine_v2 import _follower_engine_v2_instance
-from backend.app.services.pnl_service import get_pnl_service
+from backend.app.services import follower_engine_v2
+from backend.app.services.dashboard_service import get_dashboard_service
+from backend.app.services.dashboard_stream import DashboardStream
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +26,7 @@ class PositionSummary(BaseModel):
     symbol: str
     position_size: float
     entry_price: Optional[float]
-    current_value: float  # 假設價值（實際應從交易所獲取）
+    current_value: float  # 倉位大小 × 當前市價（沒有行情時使用開倉價格）
 
 
 class MasterActivity(BaseModel):
@@ -52,6 +43,9 @@ class EngineStatus(BaseModel):
     is_running: bool
     status: str  # "Running" or "Stopped"
     poll_interval: int
+    last_tick: Optional[Dict[str, Any]] = None  # 上一輪 Master 處理統計
+    coalescing: Optional[Dict[str, Any]] = None  # 下單合併統計
+    order_retries: Optional[Dict[str, Any]] = None  # 下單重試佇列統計
 
 
 class RecentTrade(BaseModel):
@@ -106,8 +100,7 @@ class DashboardSummary(BaseModel):
 
 @router.get("/summary", response_model=DashboardSummary)
 async def get_dashboard_summary(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_active_user)
 ):
     """
     獲取儀表板摘要
@@ -117,161 +110,12 @@ async def get_dashboard_summary(
     - Master 目前的最新動作與持倉
     - 跟單引擎的運行狀態
     - 最近 5 筆跟單成功的記錄
+    
+    資料庫查詢並行執行，組裝結果短暫快取，引擎寫入該用戶的交易或倉位時立即失效；
+    引擎狀態每次請求即時讀取
     """
     try:
-        # 1. 獲取跟單設定
-        settings_repo = FollowSettingsRepository(db)
-        settings = await settings_repo.get_by_user_id(current_user.id)
-        
-        is_active = settings.is_active if settings else False
-        follow_ratio = settings.follow_ratio if settings else 0.0
-        master_user_id = settings.master_user_id if settings else None
-        master_credential_id = settings.master_credential_id if settings else None
-        
-        # 2. 獲取跟隨者倉位
-        position_repo = FollowerPositionRepository(db)
-        follower_positions = await position_repo.get_all_positions(current_user.id)
-        
-        # 計算總持倉價值（簡化版：使用開倉價格 × 倉位大小）
-        total_position_value = sum(
-            abs(pos.position_size) * (pos.entry_price or 0)
-            for pos in follower_positions
-        )
-        
-        my_positions = [
-            PositionSummary(
-                symbol=pos.symbol,
-                position_size=pos.position_size,
-                entry_price=pos.entry_price,
-                current_value=abs(pos.position_size) * (pos.entry_price or 0)
-            )
-            for pos in follower_positions
-        ]
-        
-        # 3. 獲取 Master 倉位和最新動作
-        master_positions_list = []
-        master_latest_activity = None
-        
-        if master_user_id and master_credential_id:
-            # 獲取 Master 倉位
-            master_result = await db.execute(
-                select(MasterPosition).where(
-                    and_(
-                        MasterPosition.master_user_id == master_user_id,
-                        MasterPosition.master_credential_id == master_credential_id
-                    )
-                ).order_by(desc(MasterPosition.last_updated))
-            )
-            master_positions = master_result.scalars().all()
-            
-            master_positions_list = [
-                PositionSummary(
-                    symbol=pos.symbol,
-                    position_size=pos.position_size,
-                    entry_price=pos.entry_price,
-                    current_value=abs(pos.position_size) * (pos.entry_price or 0)
-                )
-                for pos in master_positions
-            ]
-            
-            # 獲取 Master 最新動作（最近更新的倉位）
-            if master_positions:
-                latest_pos = master_positions[0]
-                master_latest_activity = MasterActivity(
-                    symbol=latest_pos.symbol,
-                    action=f"持倉 {latest_pos.position_size}",
-                    position_size=latest_pos.position_size,
-                    entry_price=latest_pos.entry_price,
-                    timestamp=latest_pos.last_updated.isoformat()
-                )
-        
-        # 4. 獲取引擎狀態
-        engine_is_running = False
-        poll_interval = 3
-        
-        if _follower_engine_v2_instance:
-            engine_is_running = _follower_engine_v2_instance.is_running
-            poll_interval = _follower_engine_v2_instance.poll_interval
-        
-        engine_status = EngineStatus(
-            is_running=engine_is_running,
-            status="Running" if engine_is_running else "Stopped",
-            poll_interval=poll_interval
-        )
-        
-        # 5. 獲取最近 5 筆成功的交易
-        trades_result = await db.execute(
-            select(TradeLog).where(
-                and_(
-                    TradeLog.follower_user_id == current_user.id,
-                    TradeLog.is_success == True
-                )
-            ).order_by(desc(TradeLog.timestamp)).limit(5)
-        )
-        successful_trades = trades_result.scalars().all()
-        
-        recent_successful_trades = [
-            RecentTrade(
-                id=trade.id,
-                timestamp=trade.timestamp.isoformat(),
-                symbol=trade.master_symbol,
-                action=trade.follower_action,
-                side=trade.side,
-                amount=trade.follower_amount,
-                status=trade.status,
-                execution_time_ms=trade.execution_time_ms
-            )
-            for trade in successful_trades
-        ]
-        
-        # 6. 檢查未解決的錯誤
-        error_repo = TradeErrorRepository(db)
-        unresolved_errors = await error_repo.get_unresolved_by_user(current_user.id)
-        
-        # 7. 計算 PnL（新增）
-        pnl_service = get_pnl_service(db)
-        follower_credential_id = settings.follower_credential_id if settings else None
-        
-        pnl_summary = {
-            "unrealized_pnl": 0.0,
-            "unrealized_pnl_percent": 0.0,
-            "realized_pnl": 0.0,
-            "realized_pnl_percent": 0.0,
-            "total_pnl": 0.0,
-            "total_pnl_percent": 0.0
-        }
-        
-        if follower_credential_id:
-            try:
-                pnl_summary = await pnl_service.get_pnl_summary(
-                    user_id=current_user.id,
-                    credential_id=follower_credential_id
-                )
-            except Exception as e:
-                logger.error(f"計算 PnL 失敗: {str(e)}")
-        
-        # 構建響應
-        return DashboardSummary(
-            user_id=current_user.id,
-            username=current_user.username,
-            is_active=is_active,
-            follow_ratio=follow_ratio,
-            master_user_id=master_user_id,
-            total_position_value=total_position_value,
-            my_positions=my_positions,
-            master_latest_activity=master_latest_activity,
-            master_positions=master_positions_list,
-            engine_status=engine_status,
-            recent_successful_trades=recent_successful_trades,
-            has_unresolved_errors=len(unresolved_errors) > 0,
-            unresolved_error_count=len(unresolved_errors),
-            unrealized_pnl=pnl_summary["unrealized_pnl"],
-            unrealized_pnl_percent=pnl_summary["unrealized_pnl_percent"],
-            realized_pnl=pnl_summary["realized_pnl"],
-            realized_pnl_percent=pnl_summary["realized_pnl_percent"],
-            total_pnl=pnl_summary["total_pnl"],
-            total_pnl_percent=pnl_summary["total_pnl_percent"]
-        )
+        return await _build_summary(current_user)
         
     except Exception as e:
         logger.error(f"獲取儀表板摘要失敗: {str(e)}", exc_info=True)
@@ -279,3 +123,69 @@ async def get_dashboard_summary(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="獲取儀表板摘要失敗"
         )
+
+
+@router.get("/events")
+async def stream_dashboard_events(
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    儀表板事件串流（Server-Sent Events）
+    
+    連線後先送出一則 summary 事件（與 /summary 相同的內容），
+    之後由跟單引擎在寫入時直接推送增量事件：
+    - trade: 新的跟單記錄
+    - position: 我的倉位變更
+    - error: 新的跟單錯誤或錯誤已解決
+    - master_position: 跟隨的 Master 倉位變更
+    - settings: 跟單設定變更（包含失敗後自動停止跟單）
+    - engine_status: 引擎啟動、停止或緊急全停變更
+    
+    連線期間不需要輪詢 /summary 或 /follow-config/status
+    """
+    async def snapshot() -> Dict[str, Any]:
+        return (await _build_summary(current_user)).model_dump()
+    
+    stream = DashboardStream(current_user.id, snapshot)
+    return StreamingResponse(
+        stream.events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # 關閉 nginx 緩衝，事件立即送達
+        }
+    )
+
+
+async def _build_summary(current_user: User) -> DashboardSummary:
+    """組裝儀表板摘要（資料庫部分來自快取，引擎狀態即時讀取）"""
+    summary = await get_dashboard_service().get_summary(current_user.id, current_user.username)
+    return DashboardSummary(**summary, engine_status=_engine_status())
+
+
+def _engine_status() -> EngineStatus:
+    """讀取跟單引擎狀態"""
+    engine_is_running = False
+    poll_interval = 3
+    last_tick = None
+    coalescing = None
+    order_retries = None
+    
+    # 於請求時讀取單例，引擎可能在模組載入後才啟動
+    engine_v2 = follower_engine_v2._follower_engine_v2_instance
+    if engine_v2:
+        engine_is_running = engine_v2.is_running
+        poll_interval = engine_v2.poll_interval
+        if engine_v2.last_tick_stats:
+            last_tick = engine_v2.last_tick_stats.to_dict()
+        coalescing = engine_v2.coalescer.get_stats()
+        order_retries = engine_v2.retry_queue.get_stats()
+    
+    return EngineStatus(
+        is_running=engine_is_running,
+        status="Running" if engine_is_running else "Stopped",
+        poll_interval=poll_interval,
+        last_tick=last_tick,
+        coalescing=coalescing,
+        order_retries=order_retries
+    )
@@ -3,17 +3,16 @@ EA Routes
 EA 專用 API 路由 - 供 MT4/MT5 EA 調用
 """
 import logging
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, WebSocket
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from pydantic import BaseModel
 
 from backend.app.database import get_db
 from backend.app.config import settings
-from backend.app.models.user import User
-from backend.app.models.follower_relation import FollowerRelation
-from backend.app.models.global_setting import GlobalSetting
+from backend.app.services.ea_config_cache import get_ea_config_cache, resolve_ea_config
+from backend.app.services.ea_push import EAPushSession
+from backend.app.services.global_settings import get_global_settings
+from backend.app.services.heartbeat_buffer import get_heartbeat_buffer
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +43,9 @@ async def get_ea_config(
     
     重要：每次調用會自動更新該用戶的 last_seen 時間
     
+    配置從 EA 配置快取讀取（用戶、跟單關係或緊急全停變更時清除），
+    last_seen 記錄在心跳緩衝中定期批量寫入，命中快取時不存取資料庫
+    
     Args:
         user_id: 用戶 ID
         
@@ -51,66 +53,35 @@ async def get_ea_config(
         用戶的跟單配置（copy_ratio, is_active, emergency_stop）
     """
     try:
-        logger.info(f"📡 EA 請求配置: user_id={user_id}")
+        logger.debug(f"📡 EA 請求配置: user_id={user_id}")
         
-        # 1. 查詢用戶
-        stmt = select(User).where(User.id == user_id)
-        result = await db.execute(stmt)
-        user = result.scalar_one_or_none()
+        # 1. 查詢用戶與跟單關係（快取）
+        cache = get_ea_config_cache()
+        config = await cache.get_user_config(db, user_id)
         
-        if not user:
+        if not config:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"找不到用戶 ID: {user_id}"
             )
         
-        # 2. 更新 last_seen（心跳）
-        user.last_seen = datetime.utcnow()
-        await db.commit()
-        logger.info(f"💓 更新心跳: user={user.username}, last_seen={user.last_seen}")
-        
-        # 3. 查詢跟單關係（如果是 follower）
-        copy_ratio = 1.0
-        relation_active = True
-        
-        if user.role == "follower":
-            stmt = select(FollowerRelation).where(
-                FollowerRelation.follower_id == user_id
-            )
-            result = await db.execute(stmt)
-            relation = result.scalar_one_or_none()
-            
-            if relation:
-                copy_ratio = relation.copy_ratio
-                relation_active = (relation.status == "active")
-                logger.info(f"📊 跟單關係: copy_ratio={copy_ratio}, status={relation.status}")
-        
-        # 4. 查詢全局緊急停止設定
-        stmt = select(GlobalSetting).where(
-            GlobalSetting.key == "emergency_stop_all"
-        )
-        result = await db.execute(stmt)
-        emergency_setting = result.scalar_one_or_none()
-        
-        emergency_stop = False
-        if emergency_setting:
-            emergency_stop = emergency_setting.value_bool or False
-            logger.info(f"🚨 緊急全停狀態: {emergency_stop}")
+        # 2. 更新 last_seen（心跳，批量寫入）
+        last_seen = get_heartbeat_buffer().touch(user_id)
         
-        # 5. 計算最終狀態
-        final_active = user.is_active and relation_active and not emergency_stop
+        # 3. 查詢全局緊急停止設定（快取）
+        global_settings = get_global_settings()
+        await global_settings.ensure_fresh(db)
+        emergency_stop = global_settings.emergency_stop
         
+        # 4. 計算最終狀態
         response = EAConfigResponse(
-            user_id=user.id,
-            username=user.username,
-            is_active=final_active,
-            copy_ratio=copy_ratio,
-            emergency_stop=emergency_stop,
-            last_seen=user.last_seen.isoformat() if user.last_seen else None,
-            message="配置獲取成功" if final_active else "跟單已停用"
+            **resolve_ea_config(config, emergency_stop),
+            last_seen=last_seen.isoformat()
         )
         
-        logger.info(f"✅ EA 配置回應: user={user.username}, active={final_active}, ratio={copy_ratio}")
+        logger.debug(
+            f"✅ EA 配置回應: user={config.username}, active={response.is_active}, ratio={config.copy_ratio}"
+        )
         return response
         
     except HTTPException:
@@ -131,7 +102,7 @@ async def ea_heartbeat(
     """
     EA 心跳端點
     
-    簡單的心跳檢查，只更新 last_seen
+    簡單的心跳檢查，只更新 last_seen（記錄在心跳緩衝中定期批量寫入）
     
     Args:
         user_id: 用戶 ID
@@ -140,26 +111,23 @@ async def ea_heartbeat(
         心跳確認
     """
     try:
-        # 查詢用戶
-        stmt = select(User).where(User.id == user_id)
-        result = await db.execute(stmt)
-        user = result.scalar_one_or_none()
+        # 查詢用戶（快取）
+        config = await get_ea_config_cache().get_user_config(db, user_id)
         
-        if not user:
+        if not config:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"找不到用戶 ID: {user_id}"
             )
         
         # 更新 last_seen
-        user.last_seen = datetime.utcnow()
-        await db.commit()
+        last_seen = get_heartbeat_buffer().touch(user_id)
         
         return {
             "status": "ok",
-            "user_id": user.id,
-            "username": user.username,
-            "last_seen": user.last_seen.isoformat()
+            "user_id": config.user_id,
+            "username": config.username,
+            "last_seen": last_seen.isoformat()
         }
         
     except HTTPException:
@@ -170,3 +138,15 @@ async def ea_heartbeat(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"心跳失敗: {str(e)}"
         )
+
+
+@router.websocket("/ws")
+async def ea_websocket(websocket: WebSocket):
+    """
+    EA 推送通道
+    
+    連線後第一則訊息為 {"type": "auth", "token": "<JWT>"}，
+    認證成功後收到完整配置，之後推送配置變更與緊急全停，無需再輪詢 /ea/config；
+    連線期間自動記錄心跳（EA 也可以送 {"type": "ping"}）
+    """
+    await EAPushSession(websocket).run()
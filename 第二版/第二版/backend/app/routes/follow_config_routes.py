@@ -20,6 +20,10 @@ from backend.app.models.trade_error import TradeError
 from backend.app.repositories.follow_settings_repository import FollowSettingsRepository
 from backend.app.repositories.trade_error_repository import TradeErrorRepository
 from backend.app.repositories.follower_position_repository import FollowerPositionRepository
+from backend.app.services.dashboard_cache import get_dashboard_cache
+from backend.app.services.dashboard_stream import ERROR_EVENT, SETTINGS_EVENT
+from backend.app.services.signal_bus import get_signal_bus
+from backend.app.services.subscription_index import get_subscription_index
 
 logger = logging.getLogger(__name__)
 
@@ -79,6 +83,16 @@ class TradeErrorResponse(BaseModel):
     created_at: str
 
 
+def _publish_settings_event(settings: FollowSettings):
+    """推送跟單設定變更給該用戶已連線的儀表板"""
+    get_signal_bus().publish_dashboard_event(SETTINGS_EVENT, {
+        "master_user_id": settings.master_user_id,
+        "master_credential_id": settings.master_credential_id,
+        "follow_ratio": settings.follow_ratio,
+        "is_active": settings.is_active
+    }, user_id=settings.user_id)
+
+
 @router.post("/settings", response_model=FollowSettingsResponse, status_code=status.HTTP_201_CREATED)
 async def create_follow_settings(
     data: FollowSettingsCreate,
@@ -112,6 +126,9 @@ async def create_follow_settings(
         )
         
         await db.commit()
+        get_subscription_index().upsert(settings)
+        get_dashboard_cache().bump_user(current_user.id)
+        _publish_settings_event(settings)
         
         logger.info(f"用戶 {current_user.id} 創建跟單設定成功")
         
@@ -207,6 +224,9 @@ async def update_my_follow_settings(
             )
         
         await db.commit()
+        get_subscription_index().upsert(settings)
+        get_dashboard_cache().bump_user(current_user.id)
+        _publish_settings_event(settings)
         
         logger.info(f"用戶 {current_user.id} 更新跟單設定成功")
         
@@ -379,15 +399,24 @@ async def resolve_error(
         remaining_errors = await error_repo.get_unresolved_by_user(current_user.id)
         
         # 如果沒有其他錯誤，自動恢復跟單
+        resumed_settings = None
         if len(remaining_errors) == 0:
             settings_repo = FollowSettingsRepository(db)
-            await settings_repo.update(
+            resumed_settings = await settings_repo.update(
                 user_id=current_user.id,
                 is_active=True
             )
             logger.info(f"用戶 {current_user.id} 的跟單已自動恢復")
         
         await db.commit()
+        if resumed_settings:
+            get_subscription_index().upsert(resumed_settings)
+        get_dashboard_cache().bump_user(current_user.id)
+        get_signal_bus().publish_dashboard_event(
+            ERROR_EVENT, {"error_id": error_id, "is_resolved": True}, user_id=current_user.id
+        )
+        if resumed_settings:
+            _publish_settings_event(resumed_settings)
         
         return {
             "message": "錯誤已解決",
@@ -15,6 +15,10 @@ from backend.app.services.credential_service import CredentialService
 from backend.app.services.crypto_service import get_crypto_service
 from backend.app.services.exchange_service import get_exchange_service
 from backend.app.services.cache_service import get_cache_service
+from backend.app.services.exchanges.rate_limiter import get_rate_limiter
+from backend.app.services.exchanges.circuit_breaker import get_circuit_breaker_registry
+from backend.app.services.exchanges.market_cache import get_market_metadata_cache
+from backend.app.services.market_data_service import get_market_data_service
 from backend.app.repositories.credential_repository import CredentialRepository
 from backend.app.models.follow_relationship import FollowRelationship
 from backend.app.models.trade_history import TradeHistory
@@ -295,7 +299,12 @@ async def get_engine_status(engine: FollowerEngine = Depends(get_engine)):
     """獲取引擎狀態"""
     return {
         "is_running": engine.is_running,
-        "poll_interval": engine.poll_interval
+        "poll_interval": engine.poll_interval,
+        "last_tick": engine.last_tick_stats.to_dict() if engine.last_tick_stats else None,
+        "rate_limits": get_rate_limiter().get_stats(),
+        "circuit_breakers": get_circuit_breaker_registry().get_stats(),
+        "markets": get_market_metadata_cache().get_stats(),
+        "market_data": get_market_data_service().get_stats()
     }
 
 
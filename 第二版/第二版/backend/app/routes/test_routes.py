@@ -11,9 +11,13 @@ from backend.app.database import get_db
 from backend.app.config import settings
 from backend.app.services.credential_service import CredentialService
 from backend.app.services.crypto_service import get_crypto_service
-from backend.app.services.exchange_service import get_exchange_service, MockExchange
+from backend.app.services.exchange_service import get_exchange_service
+from backend.app.services.exchanges.client_registry import get_exchange_client_registry
 from backend.app.services.cache_service import get_cache_service
+from backend.app.services.dashboard_cache import get_dashboard_cache
+from backend.app.services.dashboard_stream import MASTER_POSITION_EVENT, master_position_event
 from backend.app.repositories.credential_repository import CredentialRepository
+from backend.app.services.signal_bus import get_signal_bus
 
 logger = logging.getLogger(__name__)
 
@@ -90,15 +94,17 @@ async def get_mock_balance(
         
         logger.info(f"  - 解密成功！Secret 長度: {len(decrypted_cred['api_secret'])}")
         
-        # 步驟 3: 創建 MockExchange 實例（使用解密後的憑證）
-        mock_exchange = MockExchange(
-            api_key=decrypted_cred['api_key'],
-            api_secret=decrypted_cred['api_secret'],
-            passphrase=decrypted_cred.get('passphrase')
+        # 步驟 3: 獲取 MockExchange 實例（使用解密後的憑證）
+        mock_exchange = get_exchange_client_registry().get_client(
+            'mock',
+            decrypted_cred['api_key'],
+            decrypted_cred['api_secret'],
+            decrypted_cred.get('passphrase'),
+            credential_id=credential_id
         )
         
         # 步驟 4: 調用 MockExchange 獲取餘額
-        balance = mock_exchange.fetch_balance()
+        balance = await mock_exchange.fetch_balance()
         
         logger.info(f"  - Mock Balance 獲取成功")
         
@@ -182,14 +188,16 @@ async def create_mock_order(
             user_id=user_id
         )
         
-        # 創建 MockExchange 並下單
-        mock_exchange = MockExchange(
-            api_key=decrypted_cred['api_key'],
-            api_secret=decrypted_cred['api_secret'],
-            passphrase=decrypted_cred.get('passphrase')
+        # 獲取 MockExchange 並下單
+        mock_exchange = get_exchange_client_registry().get_client(
+            'mock',
+            decrypted_cred['api_key'],
+            decrypted_cred['api_secret'],
+            decrypted_cred.get('passphrase'),
+            credential_id=credential_id
         )
         
-        order = mock_exchange.create_order(
+        order = await mock_exchange.create_order(
             symbol=symbol,
             order_type=order_type,
             side=side,
@@ -382,6 +390,16 @@ async def trigger_master_order(
         
         await db.commit()
         await db.refresh(position)
+        get_dashboard_cache().bump_master(master_user_id, master_credential_id)
+        get_signal_bus().publish_dashboard_event(
+            MASTER_POSITION_EVENT, master_position_event(position),
+            master_key=(master_user_id, master_credential_id)
+        )
+        
+        # 發佈倉位變動信號（供訂閱信號匯流排的 Follower Engine V2；應用程式執行的跟單引擎以輪詢偵測）
+        get_signal_bus().publish_master_position(
+            master_user_id, master_credential_id, symbol, position_size
+        )
         
         # 查詢有多少跟隨者（舊版 FollowRelationship）
         result = await db.execute(
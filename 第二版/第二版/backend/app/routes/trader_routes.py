@@ -15,6 +15,10 @@ from backend.app.services.auth_service import get_current_active_user
 from backend.app.models.user import User
 from backend.app.models.follower_relation import FollowerRelation, RelationStatus
 from backend.app.models.global_setting import GlobalSetting
+from backend.app.services.subscription_index import get_subscription_index
+from backend.app.services.ea_config_cache import get_ea_config_cache
+from backend.app.services.global_settings import get_global_settings, EMERGENCY_STOP_KEY
+from backend.app.services.heartbeat_buffer import get_heartbeat_buffer
 
 logger = logging.getLogger(__name__)
 
@@ -78,9 +82,11 @@ async def get_clients(
         
         # 構建客戶資訊列表
         clients = []
+        heartbeats = get_heartbeat_buffer()
         for relation in relations:
-            # 獲取跟隨者資訊
+            # 獲取跟隨者資訊（尚未寫入資料庫的心跳優先）
             follower = relation.follower
+            last_seen = heartbeats.pending_last_seen(follower.id) or follower.last_seen
             
             # 構建客戶資訊（包含 Mock 數據）
             client_info = ClientInfo(
@@ -91,7 +97,7 @@ async def get_clients(
                 copy_ratio=relation.copy_ratio,
                 status=relation.status,
                 created_at=relation.created_at.isoformat(),
-                last_seen=follower.last_seen.isoformat() if follower.last_seen else None,
+                last_seen=last_seen.isoformat() if last_seen else None,
                 # Mock 數據
                 net_value=10000.0 + (relation.id * 1000),
                 pnl=200.0 * relation.id,
@@ -138,22 +144,33 @@ async def manage_client(
                 detail="找不到該客戶關係"
             )
         
+        # 客戶狀態變更後，同步跟單索引與 EA 配置快取中該客戶的設定
+        follower_id = relation.follower_id
+        index = get_subscription_index()
+        ea_cache = get_ea_config_cache()
+        
         # 執行動作
         if request.action == "approve":
             relation.status = RelationStatus.ACTIVE.value
             await db.commit()
+            await index.refresh_user(db, follower_id)
+            ea_cache.invalidate_user(follower_id)
             logger.info(f"✅ 已核准客戶: relation_id={request.relation_id}")
             return {"message": "客戶已核准", "status": relation.status}
             
         elif request.action == "block":
             relation.status = RelationStatus.BLOCKED.value
             await db.commit()
+            await index.refresh_user(db, follower_id)
+            ea_cache.invalidate_user(follower_id)
             logger.info(f"⛔ 已封鎖客戶: relation_id={request.relation_id}")
             return {"message": "客戶已封鎖", "status": relation.status}
             
         elif request.action == "delete":
             await db.delete(relation)
             await db.commit()
+            await index.refresh_user(db, follower_id)
+            ea_cache.invalidate_user(follower_id)
             logger.info(f"🗑️ 已刪除客戶: relation_id={request.relation_id}")
             return {"message": "客戶已刪除"}
             
@@ -225,6 +242,8 @@ async def update_client(
         
         await db.commit()
         await db.refresh(relation)
+        await get_subscription_index().refresh_user(db, relation.follower_id)
+        get_ea_config_cache().invalidate_user(relation.follower_id)
         
         return {
             "message": "客戶設定已更新",
@@ -264,29 +283,8 @@ async def emergency_stop(
     try:
         logger.info(f"🚨 緊急全停請求: trader={current_user.username}, stop_all={request.stop_all}")
         
-        # 查詢或創建全局設定
-        stmt = select(GlobalSetting).where(
-            GlobalSetting.key == "emergency_stop_all"
-        )
-        result = await db.execute(stmt)
-        setting = result.scalar_one_or_none()
-        
-        if not setting:
-            # 如果不存在，創建新設定
-            setting = GlobalSetting(
-                key="emergency_stop_all",
-                value_bool=request.stop_all,
-                description="緊急全停開關 - 停止所有跟單"
-            )
-            db.add(setting)
-            logger.info(f"📝 創建緊急全停設定: stop_all={request.stop_all}")
-        else:
-            # 更新現有設定
-            setting.value_bool = request.stop_all
-            logger.info(f"🔄 更新緊急全停設定: stop_all={request.stop_all}")
-        
-        await db.commit()
-        await db.refresh(setting)
+        # 寫入全局設定（提交後立即通知跟單引擎與已連線的 EA）
+        setting = await get_global_settings().set_bool(db, EMERGENCY_STOP_KEY, request.stop_all)
         
         status_text = "已啟動" if request.stop_all else "已解除"
         logger.info(f"✅ 緊急全停 {status_text}")
@@ -319,7 +317,7 @@ async def get_emergency_stop_status(
     """
     try:
         stmt = select(GlobalSetting).where(
-            GlobalSetting.key == "emergency_stop_all"
+            GlobalSetting.key == EMERGENCY_STOP_KEY
         )
         result = await db.execute(stmt)
         setting = result.scalar_one_or_none()
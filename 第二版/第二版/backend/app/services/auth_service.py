@@ -147,6 +147,23 @@ class AuthService:
         return user
 
 
+def decode_access_token(token: str) -> Optional[str]:
+    """
+    驗證 JWT Token 並取出用戶名稱
+    
+    Args:
+        token: JWT Token
+        
+    Returns:
+        用戶名稱，Token 無效時返回 None
+    """
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    return payload.get("sub")
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
@@ -170,12 +187,8 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-    except JWTError:
+    username = decode_access_token(token)
+    if username is None:
         raise credentials_exception
     
     user_repo = UserRepository(db)
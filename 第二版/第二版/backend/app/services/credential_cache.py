@@ -0,0 +1,145 @@
+"""
+Credential Cache
+解密後憑證的程序內快取 - 下單路徑不必每次查詢資料庫與解密
+"""
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from backend.app.config import settings as app_settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _CacheEntry:
+    """快取項目"""
+    user_id: int
+    credential: Dict[str, Optional[str]]
+    expires_at: float
+
+
+class DecryptedCredentialCache:
+    """
+    解密憑證快取
+
+    以憑證 ID 為鍵，採用 LRU 淘汰與短 TTL；
+    憑證更新或刪除時必須呼叫 invalidate。
+    每個憑證維護一個版本號，讀取期間若被清除，舊的讀取結果不會寫回快取
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0):
+        """
+        初始化快取
+
+        Args:
+            max_size: 最多保留的憑證數量
+            ttl: 快取存活時間（秒）
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, _CacheEntry]" = OrderedDict()
+        self._versions: Dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def version(self, credential_id: int) -> int:
+        """獲取憑證目前的版本號（讀取資料庫前取得，寫回時比對）"""
+        return self._versions.get(credential_id, 0)
+
+    def get(self, credential_id: int, user_id: int) -> Optional[Dict[str, Optional[str]]]:
+        """
+        獲取快取的解密憑證
+
+        Args:
+            credential_id: 憑證 ID
+            user_id: 用戶 ID（必須與憑證擁有者相同）
+
+        Returns:
+            憑證字典的副本，未命中則返回 None
+        """
+        entry = self._entries.get(credential_id)
+        if entry is None or entry.user_id != user_id:
+            self.misses += 1
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            del self._entries[credential_id]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(credential_id)
+        self.hits += 1
+        return dict(entry.credential)
+
+    def put(
+        self,
+        credential_id: int,
+        user_id: int,
+        credential: Dict[str, Optional[str]],
+        version: Optional[int] = None
+    ) -> bool:
+        """
+        寫入解密憑證
+
+        Args:
+            credential_id: 憑證 ID
+            user_id: 憑證擁有者
+            credential: 解密後的憑證
+            version: 讀取前取得的版本號，與目前不符時放棄寫入
+
+        Returns:
+            是否已寫入
+        """
+        if version is not None and version != self.version(credential_id):
+            return False
+
+        self._entries[credential_id] = _CacheEntry(
+            user_id=user_id,
+            credential=dict(credential),
+            expires_at=time.monotonic() + self.ttl
+        )
+        self._entries.move_to_end(credential_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return True
+
+    def invalidate(self, credential_id: int):
+        """清除單一憑證"""
+        self._entries.pop(credential_id, None)
+        self._versions[credential_id] = self.version(credential_id) + 1
+        logger.debug(f"解密憑證快取已清除 - 憑證: {credential_id}")
+
+    def clear(self):
+        """清除所有憑證"""
+        for credential_id in list(self._entries):
+            self.invalidate(credential_id)
+
+    def get_stats(self) -> Dict[str, int]:
+        """快取統計"""
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+# 全域快取實例
+_credential_cache_instance: Optional[DecryptedCredentialCache] = None
+
+
+def get_credential_cache() -> DecryptedCredentialCache:
+    """獲取 Credential Cache 單例"""
+    global _credential_cache_instance
+    if _credential_cache_instance is None:
+        _credential_cache_instance = DecryptedCredentialCache(
+            max_size=app_settings.CREDENTIAL_CACHE_MAX_SIZE,
+            ttl=app_settings.CREDENTIAL_CACHE_TTL_SECONDS
+        )
+    return _credential_cache_instance
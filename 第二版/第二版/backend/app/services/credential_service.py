@@ -3,13 +3,15 @@ Credential Service
 API 憑證業務邏輯層
 """
 import logging
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterable, Tuple
 from datetime import datetime
 
 from backend.app.repositories.credential_repository import CredentialRepository
 from backend.app.services.crypto_service import CryptoService
 from backend.app.services.exchange_service import ExchangeService
 from backend.app.services.cache_service import CacheService
+from backend.app.services.credential_cache import DecryptedCredentialCache, get_credential_cache
+from backend.app.services.exchanges.client_registry import get_exchange_client_registry
 from backend.app.models.api_credential import ApiCredential
 
 logger = logging.getLogger(__name__)
@@ -26,7 +28,8 @@ class CredentialService:
         credential_repo: CredentialRepository,
         crypto_service: CryptoService,
         exchange_service: ExchangeService,
-        cache_service: CacheService
+        cache_service: CacheService,
+        credential_cache: Optional[DecryptedCredentialCache] = None
     ):
         """
         初始化 Credential Service
@@ -36,11 +39,13 @@ class CredentialService:
             crypto_service: 加密服務
             exchange_service: 交易所服務
             cache_service: 快取服務
+            credential_cache: 解密憑證快取（預設使用全域單例）
         """
         self.credential_repo = credential_repo
         self.crypto_service = crypto_service
         self.exchange_service = exchange_service
         self.cache_service = cache_service
+        self.credential_cache = credential_cache if credential_cache is not None else get_credential_cache()
     
     async def create_credential(
         self,
@@ -177,7 +182,7 @@ class CredentialService:
         verify: bool = True
     ) -> Optional[ApiCredential]:
         """
-        更新現有憑證（重新驗證）
+        更新現有憑證（重新驗證，提交後清除快取）
         
         Args:
             credential_id: 憑證 ID
@@ -240,7 +245,11 @@ class CredentialService:
             credential_id, user_id, **update_data
         )
         
-        # 清除快取
+        # 提交後才清除快取，並讓共用的交易所客戶端以新憑證重建
+        # （提交前失效會讓並行的讀取把舊的 Secret 重新快取）
+        await self.credential_repo.db.commit()
+        self.credential_cache.invalidate(credential_id)
+        get_exchange_client_registry().invalidate(credential_id)
         await self.cache_service.invalidate_user_credentials_cache(user_id)
         await self.cache_service.invalidate_credential_cache(credential_id)
         
@@ -254,7 +263,7 @@ class CredentialService:
         user_id: int
     ) -> bool:
         """
-        刪除憑證（清除快取）
+        刪除憑證（提交後清除快取）
         
         Args:
             credential_id: 憑證 ID
@@ -268,7 +277,10 @@ class CredentialService:
         )
         
         if result:
-            # 清除快取
+            # 提交後才清除快取
+            await self.credential_repo.db.commit()
+            self.credential_cache.invalidate(credential_id)
+            get_exchange_client_registry().invalidate(credential_id)
             await self.cache_service.invalidate_user_credentials_cache(user_id)
             await self.cache_service.invalidate_credential_cache(credential_id)
             
@@ -291,12 +303,57 @@ class CredentialService:
         Returns:
             包含 api_key, api_secret, passphrase 的字典
         """
+        cached = self.credential_cache.get(credential_id, user_id)
+        if cached is not None:
+            return cached
+        
+        version = self.credential_cache.version(credential_id)
         credential = await self.credential_repo.get_credential_by_id(
             credential_id, user_id
         )
         if not credential:
             return None
         
+        decrypted = self._decrypt_credential(credential)
+        self.credential_cache.put(credential_id, user_id, decrypted, version=version)
+        return dict(decrypted)
+    
+    async def warm_credential_cache(
+        self,
+        credentials: Iterable[Tuple[int, int]]
+    ) -> int:
+        """
+        預載解密憑證到快取（單次查詢）
+        
+        Args:
+            credentials: (credential_id, user_id) 列表
+            
+        Returns:
+            已載入的憑證數量
+        """
+        owners = dict(credentials)
+        versions = {cid: self.credential_cache.version(cid) for cid in owners}
+        rows = await self.credential_repo.get_credentials_by_ids(list(owners))
+        
+        loaded = 0
+        for credential in rows:
+            if owners.get(credential.id) != credential.user_id:
+                continue
+            try:
+                decrypted = self._decrypt_credential(credential)
+            except Exception as e:
+                logger.warning(f"預載憑證 {credential.id} 失敗: {e}")
+                continue
+            if self.credential_cache.put(
+                credential.id, credential.user_id, decrypted, version=versions[credential.id]
+            ):
+                loaded += 1
+        
+        logger.info(f"已預載 {loaded}/{len(owners)} 個解密憑證")
+        return loaded
+    
+    def _decrypt_credential(self, credential: ApiCredential) -> Dict[str, Optional[str]]:
+        """解密憑證的 Secret 與 Passphrase"""
         # 解密 Secret
         api_secret = self.crypto_service.decrypt(credential.encrypted_api_secret)
         
@@ -0,0 +1,185 @@
+"""
+Dashboard Cache
+儀表板摘要的程序內快取 - 每位用戶保留最近一次組裝的摘要
+
+跟單引擎寫入跟隨者的交易記錄、倉位或錯誤時呼叫 bump_user，寫入 Master 倉位時呼叫 bump_master；
+摘要記錄組裝前讀取的版本號，讀取時版本不符即視為失效，不必逐筆清除。
+TTL 是保底機制（行情價格與其他程序的寫入最遲 TTL 秒後反映）
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from backend.app.config import settings as app_settings
+
+logger = logging.getLogger(__name__)
+
+# Master 鍵 (master_user_id, master_credential_id)
+MasterKey = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class DashboardVersion:
+    """組裝摘要時讀取的版本號"""
+    user: int
+    master_key: Optional[MasterKey] = None
+    master: int = 0
+
+
+@dataclass
+class CachedDashboard:
+    """快取的摘要"""
+    summary: Dict[str, Any]
+    version: DashboardVersion
+    expires_at: float
+
+
+class DashboardCache:
+    """
+    儀表板摘要快取
+
+    以用戶 ID 為鍵，採用 LRU 淘汰與 TTL。
+    同一用戶並行的未命中只組裝一次，其他請求等待同一個結果
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_size: int = 10000):
+        """
+        Args:
+            ttl: 快取存活時間（秒，可選，預設使用設定值）
+            max_size: 最多保留的用戶數量
+        """
+        self.ttl = ttl if ttl is not None else app_settings.DASHBOARD_CACHE_TTL_SECONDS
+        self.max_size = max_size
+        self._entries: "OrderedDict[int, CachedDashboard]" = OrderedDict()
+        self._user_versions: Dict[int, int] = {}
+        self._master_versions: Dict[MasterKey, int] = {}
+        self._inflight: Dict[int, asyncio.Task] = {}
+
+        # 統計
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def user_version(self, user_id: int) -> int:
+        return self._user_versions.get(user_id, 0)
+
+    def master_version(self, master_user_id: int, master_credential_id: int) -> int:
+        return self._master_versions.get((master_user_id, master_credential_id), 0)
+
+    def bump_user(self, user_id: int):
+        """用戶的交易記錄、倉位、錯誤或跟單設定已變更（提交之後呼叫）"""
+        self._user_versions[user_id] = self.user_version(user_id) + 1
+
+    def bump_users(self, user_ids: Iterable[int]):
+        for user_id in set(user_ids):
+            self.bump_user(user_id)
+
+    def bump_master(self, master_user_id: int, master_credential_id: int):
+        """Master 的倉位已變更，所有跟隨者的摘要失效（提交之後呼叫）"""
+        key = (master_user_id, master_credential_id)
+        self._master_versions[key] = self._master_versions.get(key, 0) + 1
+
+    def _is_current(self, user_id: int, version: DashboardVersion) -> bool:
+        if version.user != self.user_version(user_id):
+            return False
+        return version.master_key is None or version.master == self.master_version(*version.master_key)
+
+    def get(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """返回仍有效的摘要，過期或版本不符時返回 None"""
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic() or not self._is_current(user_id, entry.version):
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return entry.summary
+
+    def put(self, user_id: int, summary: Dict[str, Any], version: DashboardVersion):
+        """
+        寫入摘要；version 必須在組裝的第一個查詢之前讀取，
+        組裝期間的寫入會讓此摘要在下次讀取時失效
+        """
+        self._entries[user_id] = CachedDashboard(
+            summary=summary, version=version, expires_at=time.monotonic() + self.ttl
+        )
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get_or_build(
+        self,
+        user_id: int,
+        build: Callable[[], Awaitable[Tuple[Dict[str, Any], DashboardVersion]]]
+    ) -> Dict[str, Any]:
+        """
+        返回快取的摘要，未命中時呼叫 build 組裝並寫入快取
+
+        Args:
+            user_id: 用戶 ID
+            build: 組裝摘要，返回 (摘要, 組裝前讀取的版本號)
+
+        Returns:
+            摘要
+        """
+        summary = self.get(user_id)
+        if summary is not None:
+            self.hits += 1
+            return summary
+
+        # 組裝在獨立的任務中執行，第一個請求中斷不會影響等待同一結果的其他請求
+        task = self._inflight.get(user_id)
+        if task is None:
+            self.misses += 1
+            task = asyncio.create_task(self._build(user_id, build))
+            self._inflight[user_id] = task
+            task.add_done_callback(lambda done: self._build_done(user_id, done))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    async def _build(
+        self,
+        user_id: int,
+        build: Callable[[], Awaitable[Tuple[Dict[str, Any], DashboardVersion]]]
+    ) -> Dict[str, Any]:
+        summary, version = await build()
+        self.put(user_id, summary, version)
+        return summary
+
+    def _build_done(self, user_id: int, task: asyncio.Task):
+        if self._inflight.get(user_id) is task:
+            del self._inflight[user_id]
+        if not task.cancelled() and task.exception() is not None:
+            # 等待者已各自收到例外，這裡只記錄
+            logger.debug(f"組裝儀表板摘要失敗: user_id={user_id}, {task.exception()!r}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """快取統計"""
+        total = self.hits + self.misses + self.shared
+        return {
+            "users": len(self._entries),
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared": self.shared,
+            "hit_rate": round((self.hits + self.shared) / total, 3) if total else None
+        }
+
+
+# 全域儀表板快取實例
+_dashboard_cache_instance: Optional[DashboardCache] = None
+
+
+def get_dashboard_cache() -> DashboardCache:
+    """獲取 Dashboard Cache 單例"""
+    global _dashboard_cache_instance
+    if _dashboard_cache_instance is None:
+        _dashboard_cache_instance = DashboardCache()
+    return _dashboard_cache_instance
@@ -0,0 +1,241 @@
+"""
+Dashboard Service
+儀表板摘要組裝 - 彼此獨立的查詢各自使用一個 session 並行執行，組裝結果由 DashboardCache 快取
+
+查詢分為兩條路徑同時進行：
+    跟單設定 → (Master 倉位, PnL)   依賴設定中的 Master 與憑證
+    跟隨者倉位 / 最近交易 / 未解決錯誤數   只依賴用戶 ID
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, desc, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from backend.app.database import AsyncSessionLocal
+from backend.app.models.follow_settings import FollowSettings
+from backend.app.models.follower_position import FollowerPosition
+from backend.app.models.master_position import MasterPosition
+from backend.app.models.trade_log import TradeLog
+from backend.app.repositories.follow_settings_repository import FollowSettingsRepository
+from backend.app.repositories.follower_position_repository import FollowerPositionRepository
+from backend.app.repositories.trade_error_repository import TradeErrorRepository
+from backend.app.services.dashboard_cache import DashboardCache, DashboardVersion, get_dashboard_cache
+from backend.app.services.market_data_service import MarketDataService, get_market_data_service
+from backend.app.services.pnl_service import PnLService
+
+logger = logging.getLogger(__name__)
+
+EMPTY_PNL = {
+    "unrealized_pnl": 0.0,
+    "unrealized_pnl_percent": 0.0,
+    "realized_pnl": 0.0,
+    "realized_pnl_percent": 0.0,
+    "total_pnl": 0.0,
+    "total_pnl_percent": 0.0
+}
+
+
+class DashboardService:
+    """
+    儀表板摘要服務
+
+    返回 /dashboard/summary 除引擎狀態外的所有欄位（引擎狀態是記憶體讀取，每次請求即時取得）
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[async_sessionmaker] = None,
+        cache: Optional[DashboardCache] = None,
+        market_data: Optional[MarketDataService] = None,
+        recent_trades: int = 5
+    ):
+        """
+        Args:
+            session_factory: 會話工廠（可選，預設使用應用程式的資料庫）
+            cache: 摘要快取（可選，預設使用全域實例）
+            market_data: 市場行情服務（可選，預設使用全域實例）
+            recent_trades: 返回的最近成功交易筆數
+        """
+        self.session_factory = session_factory or AsyncSessionLocal
+        self.cache = cache if cache is not None else get_dashboard_cache()
+        self.market_data = market_data if market_data is not None else get_market_data_service()
+        self.recent_trades = recent_trades
+
+    async def get_summary(self, user_id: int, username: str) -> Dict[str, Any]:
+        """
+        獲取用戶的儀表板摘要（命中快取時不查詢資料庫）
+
+        Args:
+            user_id: 用戶 ID
+            username: 用戶名稱
+
+        Returns:
+            摘要欄位（不含 engine_status）
+        """
+        return await self.cache.get_or_build(user_id, lambda: self._build(user_id, username))
+
+    async def _build(self, user_id: int, username: str) -> Tuple[Dict[str, Any], DashboardVersion]:
+        """並行查詢並組裝摘要，返回 (摘要, 查詢前讀取的版本號)"""
+        user_version = self.cache.user_version(user_id)
+
+        (settings, master_version, master_positions, pnl), follower_positions, trades, error_count = (
+            await asyncio.gather(
+                self._load_settings_and_master(user_id),
+                self._load_follower_positions(user_id),
+                self._load_recent_trades(user_id),
+                self._count_unresolved_errors(user_id)
+            )
+        )
+
+        # 當前市價從共用的行情快取讀取（不直接請求交易所）
+        prices = await self.market_data.get_prices(
+            'mock',
+            {pos.symbol for pos in [*follower_positions, *master_positions] if pos.position_size}
+        )
+
+        def position_summary(pos) -> Dict[str, Any]:
+            return {
+                "symbol": pos.symbol,
+                "position_size": pos.position_size,
+                "entry_price": pos.entry_price,
+                # 倉位大小 × 當前市價（沒有行情時使用開倉價格）
+                "current_value": abs(pos.position_size) * prices.get(pos.symbol, pos.entry_price or 0)
+            }
+
+        my_positions = [position_summary(pos) for pos in follower_positions]
+
+        # Master 最新動作（最近更新的倉位）
+        master_latest_activity = None
+        if master_positions:
+            latest = master_positions[0]
+            master_latest_activity = {
+                "symbol": latest.symbol,
+                "action": f"持倉 {latest.position_size}",
+                "position_size": latest.position_size,
+                "entry_price": latest.entry_price,
+                "timestamp": latest.last_updated.isoformat()
+            }
+
+        summary = {
+            "user_id": user_id,
+            "username": username,
+            "is_active": settings.is_active if settings else False,
+            "follow_ratio": settings.follow_ratio if settings else 0.0,
+            "master_user_id": settings.master_user_id if settings else None,
+            "total_position_value": sum(pos["current_value"] for pos in my_positions),
+            "my_positions": my_positions,
+            "master_latest_activity": master_latest_activity,
+            "master_positions": [position_summary(pos) for pos in master_positions],
+            "recent_successful_trades": [
+                {
+                    "id": trade.id,
+                    "timestamp": trade.timestamp.isoformat(),
+                    "symbol": trade.master_symbol,
+                    "action": trade.follower_action,
+                    "side": trade.side,
+                    "amount": trade.follower_amount,
+                    "status": trade.status,
+                    "execution_time_ms": trade.execution_time_ms
+                }
+                for trade in trades
+            ],
+            "has_unresolved_errors": error_count > 0,
+            "unresolved_error_count": error_count,
+            **{key: pnl[key] for key in EMPTY_PNL}
+        }
+
+        master_key = (
+            (settings.master_user_id, settings.master_credential_id)
+            if settings and settings.master_user_id and settings.master_credential_id
+            else None
+        )
+        return summary, DashboardVersion(user=user_version, master_key=master_key, master=master_version)
+
+    async def _load_settings_and_master(
+        self,
+        user_id: int
+    ) -> Tuple[Optional[FollowSettings], int, List[MasterPosition], Dict[str, Any]]:
+        """讀取跟單設定，再並行讀取 Master 倉位與計算 PnL；返回 (設定, Master 版本號, Master 倉位, PnL)"""
+        async with self.session_factory() as db:
+            settings = await FollowSettingsRepository(db).get_by_user_id(user_id)
+        if settings is None:
+            return None, 0, [], EMPTY_PNL
+
+        master_version = 0
+        master_task = None
+        if settings.master_user_id and settings.master_credential_id:
+            # 在查詢 Master 倉位前讀取版本號，查詢期間的變動會讓這份摘要失效
+            master_version = self.cache.master_version(settings.master_user_id, settings.master_credential_id)
+            master_task = self._load_master_positions(settings.master_user_id, settings.master_credential_id)
+
+        pnl_task = self._load_pnl(user_id, settings.follower_credential_id)
+        if master_task is None:
+            return settings, master_version, [], await pnl_task
+        master_positions, pnl = await asyncio.gather(master_task, pnl_task)
+        return settings, master_version, master_positions, pnl
+
+    async def _load_master_positions(
+        self,
+        master_user_id: int,
+        master_credential_id: int
+    ) -> List[MasterPosition]:
+        """Master 倉位（最近更新的在前）"""
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(MasterPosition).where(
+                    and_(
+                        MasterPosition.master_user_id == master_user_id,
+                        MasterPosition.master_credential_id == master_credential_id
+                    )
+                ).order_by(desc(MasterPosition.last_updated))
+            )
+            return list(result.scalars().all())
+
+    async def _load_pnl(self, user_id: int, credential_id: Optional[int]) -> Dict[str, Any]:
+        """計算 PnL，沒有跟隨者憑證或計算失敗時返回 0"""
+        if not credential_id:
+            return EMPTY_PNL
+        try:
+            async with self.session_factory() as db:
+                return await PnLService(db, self.market_data).get_pnl_summary(
+                    user_id=user_id,
+                    credential_id=credential_id
+                )
+        except Exception as e:
+            logger.error(f"計算 PnL 失敗: {str(e)}")
+            return EMPTY_PNL
+
+    async def _load_follower_positions(self, user_id: int) -> List[FollowerPosition]:
+        async with self.session_factory() as db:
+            return await FollowerPositionRepository(db).get_all_positions(user_id)
+
+    async def _load_recent_trades(self, user_id: int) -> List[TradeLog]:
+        """最近的成功交易"""
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(TradeLog).where(
+                    and_(
+                        TradeLog.follower_user_id == user_id,
+                        TradeLog.is_success == True
+                    )
+                ).order_by(desc(TradeLog.timestamp)).limit(self.recent_trades)
+            )
+            return list(result.scalars().all())
+
+    async def _count_unresolved_errors(self, user_id: int) -> int:
+        async with self.session_factory() as db:
+            return await TradeErrorRepository(db).count_unresolved_by_user(user_id)
+
+
+# 全域儀表板服務實例
+_dashboard_service_instance: Optional[DashboardService] = None
+
+
+def get_dashboard_service() -> DashboardService:
+    """獲取 Dashboard Service 單例"""
+    global _dashboard_service_instance
+    if _dashboard_service_instance is None:
+        _dashboard_service_instance = DashboardService()
+    return _dashboard_service_instance
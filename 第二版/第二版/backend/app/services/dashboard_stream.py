@@ -0,0 +1,154 @@
+"""
+Dashboard Stream
+儀表板的 Server-Sent Events 串流 - 連線時送出完整摘要，之後只推送引擎寫入的增量事件
+
+事件（event 欄位，data 為 JSON）：
+    summary          完整摘要（連線時，以及事件佇列溢出後重新同步）
+    trade            新的跟單記錄（TradeLog）
+    position         跟隨者倉位變更
+    error            新的跟單錯誤或錯誤已解決
+    master_position  跟隨的 Master 倉位變更
+    settings         跟單設定變更
+    engine_status    引擎啟動、停止或緊急全停變更
+沒有事件時每 heartbeat_interval 秒送出註解行，避免代理伺服器關閉閒置連線
+"""
+import json
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from backend.app.config import settings as app_settings
+from backend.app.database import AsyncSessionLocal
+from backend.app.models.master_position import MasterPosition
+from backend.app.repositories.follow_settings_repository import FollowSettingsRepository
+from backend.app.services.signal_bus import DASHBOARD_TOPIC, DashboardEvent, SignalBus, get_signal_bus
+
+logger = logging.getLogger(__name__)
+
+# 事件名稱
+SUMMARY_EVENT = "summary"
+TRADE_EVENT = "trade"
+POSITION_EVENT = "position"
+ERROR_EVENT = "error"
+MASTER_POSITION_EVENT = "master_position"
+SETTINGS_EVENT = "settings"
+ENGINE_STATUS_EVENT = "engine_status"
+
+
+def format_sse(event: str, data: Dict[str, Any], event_id: Optional[int] = None) -> str:
+    """格式化一則 SSE 訊息"""
+    lines = [] if event_id is None else [f"id: {event_id}"]
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def master_position_event(position: MasterPosition) -> Dict[str, Any]:
+    """
+    Master 倉位變更事件的內容（以 master_key 發佈）
+
+    不含 last_updated：新建的倉位由資料庫產生時間戳，提交後尚未載入
+    """
+    return {
+        "symbol": position.symbol,
+        "position_size": position.position_size,
+        "entry_price": position.entry_price
+    }
+
+
+class DashboardStream:
+    """
+    單一儀表板的 SSE 串流
+
+    訂閱信號匯流排的 DASHBOARD_TOPIC，只轉送發給自己、自己跟隨的 Master 或廣播的事件；
+    佇列溢出（客戶端讀取太慢）時捨棄積壓的事件，改送一次完整摘要
+    """
+
+    def __init__(
+        self,
+        user_id: int,
+        snapshot: Callable[[], Awaitable[Dict[str, Any]]],
+        session_factory: Optional[async_sessionmaker] = None,
+        signal_bus: Optional[SignalBus] = None,
+        heartbeat_interval: Optional[float] = None,
+        queue_size: int = 1000
+    ):
+        """
+        Args:
+            user_id: 用戶 ID
+            snapshot: 產生完整摘要的函式
+            session_factory: 會話工廠（可選，預設使用應用程式的資料庫）
+            signal_bus: 信號匯流排（可選，預設使用全域實例）
+            heartbeat_interval: 沒有事件時送出心跳的間隔（秒，可選，預設使用設定值）
+            queue_size: 事件佇列上限，超過時改送完整摘要
+        """
+        self.user_id = user_id
+        self.snapshot = snapshot
+        self.session_factory = session_factory or AsyncSessionLocal
+        self.signal_bus = signal_bus or get_signal_bus()
+        self.heartbeat_interval = (
+            heartbeat_interval if heartbeat_interval is not None
+            else app_settings.DASHBOARD_SSE_HEARTBEAT_SECONDS
+        )
+        self.queue_size = queue_size
+        self.master_key: Optional[Tuple[int, int]] = None
+        self._event_id = 0
+
+    async def events(self) -> AsyncIterator[str]:
+        """產生 SSE 訊息直到客戶端中斷"""
+        # 先訂閱再讀取摘要，讀取期間的事件不會遺漏（可能與摘要重複：交易以 TradeLog id 去重，倉位直接覆寫）
+        subscription = self.signal_bus.subscribe(DASHBOARD_TOPIC, maxsize=self.queue_size)
+        logger.info(f"📡 儀表板已連線事件串流: user_id={self.user_id}")
+        try:
+            await self._load_master_key()
+            yield await self._summary()
+
+            while True:
+                batch = await subscription.get_batch(timeout=self.heartbeat_interval)
+                if subscription.consume_overflow():
+                    yield await self._summary()
+                    continue
+                if not batch:
+                    yield ": ping\n\n"
+                    continue
+                for event in batch:
+                    if self._is_relevant(event):
+                        if event.event == SETTINGS_EVENT:
+                            self._apply_settings(event.data)
+                        yield self._format(event.event, event.data)
+        finally:
+            subscription.close()
+            logger.info(f"🔌 儀表板已中斷事件串流: user_id={self.user_id}")
+
+    async def _load_master_key(self):
+        """讀取用戶跟隨的 Master"""
+        async with self.session_factory() as db:
+            settings = await FollowSettingsRepository(db).get_by_user_id(self.user_id)
+        if settings is not None:
+            self._apply_settings({
+                "master_user_id": settings.master_user_id,
+                "master_credential_id": settings.master_credential_id
+            })
+
+    def _apply_settings(self, data: Dict[str, Any]):
+        master_user_id = data.get("master_user_id")
+        master_credential_id = data.get("master_credential_id")
+        self.master_key = (
+            (master_user_id, master_credential_id)
+            if master_user_id and master_credential_id else None
+        )
+
+    def _is_relevant(self, event: DashboardEvent) -> bool:
+        if event.user_id is not None:
+            return event.user_id == self.user_id
+        if event.master_key is not None:
+            return event.master_key == self.master_key
+        return True
+
+    async def _summary(self) -> str:
+        return self._format(SUMMARY_EVENT, await self.snapshot())
+
+    def _format(self, event: str, data: Dict[str, Any]) -> str:
+        self._event_id += 1
+        return format_sse(event, data, self._event_id)
@@ -0,0 +1,180 @@
+"""
+EA Config Cache
+EA 配置的程序內快取 - /ea/config 與 /ea/heartbeat 命中快取時不查詢資料庫
+
+用戶或跟單關係變更時，由呼叫端（路由或服務）在提交後呼叫 invalidate_user，
+提交前失效會讓並行的讀取把舊資料重新快取；失效時同時在信號匯流排發佈 UserConfigSignal，
+推送給已連線的 EA；TTL 是保底機制（其他程序或直接修改資料庫的變更最遲 TTL 秒後生效）。
+緊急全停屬於全域設定，由 GlobalSettingsCache 快取
+"""
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.config import settings as app_settings
+from backend.app.models.follower_relation import FollowerRelation
+from backend.app.models.user import User
+from backend.app.services.signal_bus import SignalBus, get_signal_bus
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class EAUserConfig:
+    """單一用戶解析後的 EA 配置（不含全域的緊急全停）"""
+    user_id: int
+    username: str
+    user_active: bool
+    copy_ratio: float
+    relation_active: bool
+
+
+def resolve_ea_config(config: EAUserConfig, emergency_stop: bool) -> Dict[str, Any]:
+    """
+    組合 EA 看到的最終配置（/ea/config 回應與 WebSocket 推送共用）
+
+    Args:
+        config: 用戶的 EA 配置
+        emergency_stop: 是否已啟動緊急全停
+
+    Returns:
+        user_id, username, is_active, copy_ratio, emergency_stop, message
+    """
+    is_active = config.user_active and config.relation_active and not emergency_stop
+    return {
+        "user_id": config.user_id,
+        "username": config.username,
+        "is_active": is_active,
+        "copy_ratio": config.copy_ratio,
+        "emergency_stop": emergency_stop,
+        "message": "配置獲取成功" if is_active else "跟單已停用"
+    }
+
+
+class EAConfigCache:
+    """
+    EA 配置快取
+
+    以用戶 ID 為鍵，採用 LRU 淘汰與 TTL。
+    每個用戶維護一個版本號，讀取資料庫期間若被清除，舊的讀取結果不會寫回快取
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        max_size: int = 10000,
+        signal_bus: Optional[SignalBus] = None
+    ):
+        """
+        Args:
+            ttl: 快取存活時間（秒，可選，預設使用設定值）
+            max_size: 最多保留的用戶數量
+            signal_bus: 發佈變更的信號匯流排（可選，預設使用全域實例）
+        """
+        self.ttl = ttl if ttl is not None else app_settings.EA_CONFIG_CACHE_TTL_SECONDS
+        self.max_size = max_size
+        self.signal_bus = signal_bus or get_signal_bus()
+        self._entries: "OrderedDict[int, Tuple[EAUserConfig, float]]" = OrderedDict()
+        self._versions: Dict[int, int] = {}
+
+        # 統計
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_user_config(self, db: AsyncSession, user_id: int) -> Optional[EAUserConfig]:
+        """
+        獲取用戶的 EA 配置，未命中時查詢資料庫
+
+        Args:
+            db: 資料庫會話
+            user_id: 用戶 ID
+
+        Returns:
+            EAUserConfig；用戶不存在時返回 None（不快取，註冊後立即可用）
+        """
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[1] > time.monotonic():
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        version = self._versions.get(user_id, 0)
+        config = await self._load_user_config(db, user_id)
+        if config is not None and self._versions.get(user_id, 0) == version:
+            self._entries[user_id] = (config, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return config
+
+    async def _load_user_config(self, db: AsyncSession, user_id: int) -> Optional[EAUserConfig]:
+        """從資料庫解析用戶與跟單關係"""
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one_or_none()
+        if user is None:
+            return None
+
+        copy_ratio = 1.0
+        relation_active = True
+        if user.role == "follower":
+            result = await db.execute(
+                select(FollowerRelation).where(FollowerRelation.follower_id == user_id)
+            )
+            relation = result.scalar_one_or_none()
+            if relation:
+                copy_ratio = relation.copy_ratio
+                relation_active = (relation.status == "active")
+
+        return EAUserConfig(
+            user_id=user.id,
+            username=user.username,
+            user_active=user.is_active,
+            copy_ratio=copy_ratio,
+            relation_active=relation_active
+        )
+
+    def invalidate_user(self, user_id: int):
+        """清除用戶的配置並通知已連線的 EA（用戶或跟單關係變更後、提交之後呼叫）"""
+        self._drop(user_id)
+        self.signal_bus.publish_user_config(user_id)
+
+    def _drop(self, user_id: int):
+        """清除用戶的配置（遞增版本號，進行中的讀取不會寫回）"""
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+        self._entries.pop(user_id, None)
+
+    def clear(self):
+        """清除所有快取"""
+        for user_id in list(self._entries):
+            self._drop(user_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """快取統計"""
+        total = self.hits + self.misses
+        return {
+            "users": len(self._entries),
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else None
+        }
+
+
+# 全域 EA 配置快取實例
+_ea_config_cache_instance: Optional[EAConfigCache] = None
+
+
+def get_ea_config_cache() -> EAConfigCache:
+    """獲取 EA Config Cache 單例"""
+    global _ea_config_cache_instance
+    if _ea_config_cache_instance is None:
+        _ea_config_cache_instance = EAConfigCache()
+    return _ea_config_cache_instance
@@ -0,0 +1,228 @@
+"""
+EA Push Channel
+EA 的 WebSocket 推送通道 - 認證一次後推送配置變更與緊急全停，連線本身即為心跳
+
+協議（JSON 文字訊息）：
+    EA → 伺服器  {"type": "auth", "token": "<JWT>"}            連線後的第一則訊息
+    伺服器 → EA  {"type": "config", ...}                        認證成功，完整配置
+    伺服器 → EA  {"type": "config_update", "changes": {...}}    用戶或跟單關係變更（只含變動欄位）
+    伺服器 → EA  {"type": "emergency_stop", "changes": {...}}   緊急全停變更
+    EA → 伺服器  {"type": "ping"}  →  {"type": "pong"}
+    伺服器 → EA  {"type": "error", "message": "..."}            之後關閉連線
+"""
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Optional
+
+from fastapi import WebSocket, WebSocketDisconnect, status
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from backend.app.config import settings as app_settings
+from backend.app.database import AsyncSessionLocal
+from backend.app.repositories.user_repository import UserRepository
+from backend.app.services.auth_service import decode_access_token
+from backend.app.services.ea_config_cache import EAConfigCache, get_ea_config_cache, resolve_ea_config
+from backend.app.services.global_settings import (
+    EMERGENCY_STOP_KEY,
+    GlobalSettingsCache,
+    get_global_settings,
+)
+from backend.app.services.heartbeat_buffer import HeartbeatBuffer, get_heartbeat_buffer
+from backend.app.services.signal_bus import (
+    CONFIG_TOPIC,
+    GlobalSettingSignal,
+    SignalBus,
+    UserConfigSignal,
+    get_signal_bus,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class EAPushSession:
+    """
+    單一 EA 的 WebSocket 連線
+
+    訂閱信號匯流排的 CONFIG_TOPIC，與自己有關的變更重新解析配置後只推送變動的欄位；
+    連線期間每 heartbeat_interval 秒及每次收到訊息時記錄心跳
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        session_factory: Optional[async_sessionmaker] = None,
+        config_cache: Optional[EAConfigCache] = None,
+        global_settings: Optional[GlobalSettingsCache] = None,
+        signal_bus: Optional[SignalBus] = None,
+        heartbeat_buffer: Optional[HeartbeatBuffer] = None,
+        auth_timeout: Optional[float] = None,
+        heartbeat_interval: Optional[float] = None
+    ):
+        """
+        Args:
+            websocket: WebSocket 連線
+            session_factory: 會話工廠（可選，預設使用應用程式的資料庫）
+            config_cache: EA 配置快取（可選，預設使用全域實例）
+            global_settings: 全域設定快取（可選，預設使用全域實例）
+            signal_bus: 信號匯流排（可選，預設使用全域實例）
+            heartbeat_buffer: 心跳緩衝（可選，預設使用全域實例）
+            auth_timeout: 等待認證訊息的時間（秒，可選，預設使用設定值）
+            heartbeat_interval: 記錄心跳的間隔（秒，可選，預設使用設定值）
+        """
+        self.websocket = websocket
+        self.session_factory = session_factory or AsyncSessionLocal
+        self.config_cache = config_cache if config_cache is not None else get_ea_config_cache()
+        self.global_settings = global_settings or get_global_settings()
+        self.signal_bus = signal_bus or get_signal_bus()
+        self.heartbeat_buffer = heartbeat_buffer or get_heartbeat_buffer()
+        self.auth_timeout = (
+            auth_timeout if auth_timeout is not None
+            else app_settings.EA_WS_AUTH_TIMEOUT_SECONDS
+        )
+        self.heartbeat_interval = (
+            heartbeat_interval if heartbeat_interval is not None
+            else app_settings.EA_WS_HEARTBEAT_SECONDS
+        )
+        self.user_id: Optional[int] = None
+        self._sent: Dict[str, Any] = {}
+        self._send_lock = asyncio.Lock()
+
+    async def run(self):
+        """處理連線直到任一方關閉"""
+        await self.websocket.accept()
+        try:
+            self.user_id = await self._authenticate()
+        except WebSocketDisconnect:
+            return
+        if self.user_id is None:
+            return
+
+        # 先訂閱再讀取配置，讀取期間的變更不會遺漏
+        subscription = self.signal_bus.subscribe(CONFIG_TOPIC)
+        tasks = []
+        try:
+            fields = await self._resolve()
+            if fields is None:
+                await self._close("找不到用戶")
+                return
+            self._sent = fields
+            self.heartbeat_buffer.touch(self.user_id)
+            await self._send({"type": "config", **fields})
+            logger.info(f"📡 EA 已連線推送通道: user_id={self.user_id}")
+
+            tasks = [
+                asyncio.create_task(self._receive_loop()),
+                asyncio.create_task(self._push_loop(subscription)),
+            ]
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if not task.cancelled() and task.exception() is not None:
+                    logger.debug(f"EA 推送通道結束: user_id={self.user_id}, {task.exception()!r}")
+        except WebSocketDisconnect:
+            pass
+        finally:
+            subscription.close()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            logger.info(f"🔌 EA 已中斷推送通道: user_id={self.user_id}")
+
+    async def _authenticate(self) -> Optional[int]:
+        """等待認證訊息，返回用戶 ID；失敗時送出錯誤並關閉連線，返回 None"""
+        try:
+            text = await asyncio.wait_for(self.websocket.receive_text(), self.auth_timeout)
+        except asyncio.TimeoutError:
+            await self._close("認證逾時")
+            return None
+
+        message = self._parse(text)
+        token = message.get("token")
+        if message.get("type") != "auth" or not isinstance(token, str):
+            await self._close("第一則訊息必須是認證訊息")
+            return None
+
+        username = decode_access_token(token)
+        if username is None:
+            await self._close("無法驗證憑證")
+            return None
+
+        async with self.session_factory() as db:
+            user = await UserRepository(db).get_user_by_username(username)
+        if user is None:
+            await self._close("無法驗證憑證")
+            return None
+        if not user.is_active:
+            await self._close("用戶已被停用")
+            return None
+        return user.id
+
+    async def _resolve(self) -> Optional[Dict[str, Any]]:
+        """解析目前的配置，用戶不存在時返回 None"""
+        async with self.session_factory() as db:
+            config = await self.config_cache.get_user_config(db, self.user_id)
+            if config is None:
+                return None
+            await self.global_settings.ensure_fresh(db)
+        return resolve_ea_config(config, self.global_settings.emergency_stop)
+
+    async def _receive_loop(self):
+        """接收 EA 訊息（每則訊息都是心跳），EA 中斷時返回"""
+        while True:
+            try:
+                text = await self.websocket.receive_text()
+            except WebSocketDisconnect:
+                return
+            self.heartbeat_buffer.touch(self.user_id)
+            if self._parse(text).get("type") == "ping":
+                await self._send({"type": "pong"})
+
+    async def _push_loop(self, subscription):
+        """推送與自己有關的配置變更，用戶被刪除時關閉連線並返回"""
+        while True:
+            batch = await subscription.get_batch(timeout=self.heartbeat_interval)
+            self.heartbeat_buffer.touch(self.user_id)
+
+            changed = subscription.consume_overflow() or any(
+                (isinstance(s, UserConfigSignal) and s.user_id == self.user_id)
+                or (isinstance(s, GlobalSettingSignal) and s.key == EMERGENCY_STOP_KEY)
+                for s in batch
+            )
+            if not changed:
+                continue
+
+            fields = await self._resolve()
+            if fields is None:
+                await self._close("用戶已刪除")
+                return
+
+            changes = {key: value for key, value in fields.items() if self._sent.get(key) != value}
+            if not changes:
+                continue
+            self._sent = fields
+            await self._send({
+                "type": "emergency_stop" if "emergency_stop" in changes else "config_update",
+                "changes": changes
+            })
+            logger.debug(f"📤 推送 EA 配置變更: user_id={self.user_id}, changes={changes}")
+
+    async def _send(self, message: Dict[str, Any]):
+        async with self._send_lock:
+            await self.websocket.send_json(message)
+
+    async def _close(self, message: str):
+        """送出錯誤訊息並關閉連線"""
+        try:
+            await self._send({"type": "error", "message": message})
+            await self.websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        except Exception as e:
+            logger.debug(f"關閉 EA 推送通道失敗: {e}")
+
+    @staticmethod
+    def _parse(text: str) -> Dict[str, Any]:
+        """解析 JSON 訊息，格式不符時返回空字典"""
+        try:
+            message = json.loads(text)
+        except ValueError:
+            return {}
+        return message if isinstance(message, dict) else {}
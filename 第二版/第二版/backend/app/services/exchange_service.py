@@ -3,19 +3,15 @@ Exchange Service
 交易所整合服務（使用 CCXT）
 """
 import logging
-from typing import Optional, Dict, Any, List
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Dict, Any, List
 from datetime import datetime
-import ccxt
-from ccxt.base.errors import (
-    AuthenticationError,
-    NetworkError,
-    ExchangeError,
-    InvalidOrder,
-    InsufficientFunds,
-    BadRequest
-)
 
-from backend.app.services.exchanges.mock_exchange import MockExchange
+from backend.app.services.exchanges.async_adapters import as_async_exchange
+from backend.app.services.exchanges.async_base_exchange import AsyncBaseExchange
+from backend.app.services.exchanges.client_registry import get_exchange_client_registry
+from backend.app.services.exchanges.errors import is_authentication_error, is_ccxt_error
+from backend.app.services.exchanges.factory import ExchangeFactory
 
 logger = logging.getLogger(__name__)
 
@@ -48,19 +44,24 @@ class ExchangeService:
         exchange_name: str,
         api_key: str,
         api_secret: str,
-        passphrase: Optional[str] = None
+        passphrase: Optional[str] = None,
+        credential_id: Optional[int] = None
     ):
         """
-        創建交易所實例（支援 Mock Exchange）
+        獲取交易所實例（支援 Mock Exchange）
+        
+        有憑證 ID 時從客戶端註冊表共用；沒有憑證 ID（驗證尚未保存的憑證）時創建一次性實例，
+        不進入註冊表，也不建立該 API Key 的令牌桶與熔斷器，由呼叫端使用後關閉
         
         Args:
             exchange_name: 交易所名稱
             api_key: API Key
             api_secret: API Secret
             passphrase: Passphrase（某些交易所需要）
+            credential_id: 憑證 ID（可選）
             
         Returns:
-            交易所實例（CCXT 或 MockExchange）
+            AsyncBaseExchange 實例（CCXT async_support 或 MockExchange）
             
         Raises:
             ValueError: 如果交易所不支援
@@ -70,27 +71,35 @@ class ExchangeService:
         if exchange_name_lower not in self.SUPPORTED_EXCHANGES:
             raise ValueError(f"不支援的交易所: {exchange_name}")
         
-        # 如果是 Mock Exchange，返回 MockExchange 實例
-        if exchange_name_lower == 'mock':
-            logger.info("創建 MockExchange 實例（開發模式）")
-            return MockExchange(api_key, api_secret, passphrase)
-        
-        # 獲取真實交易所類別
-        exchange_class = getattr(ccxt, exchange_name_lower)
-        
-        # 配置參數
-        config = {
-            'apiKey': api_key,
-            'secret': api_secret,
-            'enableRateLimit': True,
-            'timeout': 30000,  # 30 秒超時
-        }
-        
-        # 某些交易所需要 passphrase（如 OKX）
-        if passphrase:
-            config['password'] = passphrase
+        if credential_id is None:
+            return ExchangeFactory.create_async_client(
+                exchange_name_lower, api_key, api_secret, passphrase
+            )
         
-        return exchange_class(config)
+        return get_exchange_client_registry().get_client(
+            exchange_name_lower, api_key, api_secret, passphrase,
+            credential_id=credential_id
+        )
+    
+    @asynccontextmanager
+    async def _temporary_exchange(
+        self,
+        exchange_name: str,
+        api_key: str,
+        api_secret: str,
+        passphrase: Optional[str] = None
+    ) -> AsyncIterator[AsyncBaseExchange]:
+        """一次性交易所實例（不進入客戶端註冊表），離開時關閉連接"""
+        exchange = as_async_exchange(self._create_exchange_instance(
+            exchange_name, api_key, api_secret, passphrase
+        ))
+        try:
+            yield exchange
+        finally:
+            try:
+                await exchange.close()
+            except Exception as e:
+                logger.debug(f"關閉交易所連接失敗: {e}")
     
     async def verify_credentials(
         self,
@@ -116,16 +125,15 @@ class ExchangeService:
             - error_message: str - 錯誤訊息（如有）
         """
         try:
-            # 創建交易所實例
-            exchange = self._create_exchange_instance(
+            # 創建一次性交易所實例（憑證未必會保存，不佔用註冊表與限流狀態）
+            async with self._temporary_exchange(
                 exchange_name, api_key, api_secret, passphrase
-            )
-            
-            # 嘗試獲取帳戶餘額（驗證憑證有效性）
-            balance = await self._fetch_balance_async(exchange)
-            
-            # 檢查交易權限（嘗試獲取 API 權限資訊）
-            has_trading_permission = await self._check_trading_permission(exchange)
+            ) as exchange:
+                # 嘗試獲取帳戶餘額（驗證憑證有效性）
+                balance = await self._fetch_balance_async(exchange)
+                
+                # 檢查交易權限（嘗試獲取 API 權限資訊）
+                has_trading_permission = await self._check_trading_permission(exchange)
             
             # 提取帳戶基本資訊
             account_info = {
@@ -141,34 +149,35 @@ class ExchangeService:
                 'error_message': None
             }
             
-        except AuthenticationError as e:
-            logger.warning(f"憑證驗證失敗 ({exchange_name}): {str(e)}")
-            return {
-                'is_valid': False,
-                'has_trading_permission': False,
-                'account_info': None,
-                'error_message': f"認證失敗：API Key 或 Secret 無效"
-            }
-        
-        except NetworkError as e:
-            logger.error(f"網路錯誤 ({exchange_name}): {str(e)}")
-            return {
-                'is_valid': False,
-                'has_trading_permission': False,
-                'account_info': None,
-                'error_message': f"網路連接錯誤，請稍後重試"
-            }
-        
-        except ValueError as e:
-            logger.error(f"交易所不支援: {str(e)}")
-            return {
-                'is_valid': False,
-                'has_trading_permission': False,
-                'account_info': None,
-                'error_message': str(e)
-            }
-        
         except Exception as e:
+            # ccxt 錯誤以名稱分類，不需要在模組層級匯入 ccxt
+            if is_authentication_error(e):
+                logger.warning(f"憑證驗證失敗 ({exchange_name}): {str(e)}")
+                return {
+                    'is_valid': False,
+                    'has_trading_permission': False,
+                    'account_info': None,
+                    'error_message': f"認證失敗：API Key 或 Secret 無效"
+                }
+            
+            if is_ccxt_error(e, 'NetworkError'):
+                logger.error(f"網路錯誤 ({exchange_name}): {str(e)}")
+                return {
+                    'is_valid': False,
+                    'has_trading_permission': False,
+                    'account_info': None,
+                    'error_message': f"網路連接錯誤，請稍後重試"
+                }
+            
+            if isinstance(e, ValueError):
+                logger.error(f"交易所不支援: {str(e)}")
+                return {
+                    'is_valid': False,
+                    'has_trading_permission': False,
+                    'account_info': None,
+                    'error_message': str(e)
+                }
+            
             logger.error(f"驗證憑證時發生未預期錯誤 ({exchange_name}): {str(e)}")
             return {
                 'is_valid': False,
@@ -177,56 +186,43 @@ class ExchangeService:
                 'error_message': f"驗證失敗：{str(e)}"
             }
     
-    async def _fetch_balance_async(self, exchange) -> Dict:
+    async def _fetch_balance_async(self, exchange: AsyncBaseExchange) -> Dict:
         """
         異步獲取帳戶餘額（支援 Mock Exchange）
         
         Args:
-            exchange: 交易所實例（CCXT 或 MockExchange）
+            exchange: 非同步交易所實例
             
         Returns:
             餘額資訊
         """
         try:
-            # MockExchange 和 CCXT 都有 fetch_balance 方法
-            if hasattr(exchange, 'fetch_balance'):
-                balance = exchange.fetch_balance()
-                return balance
-            else:
-                raise Exception("交易所不支援獲取餘額")
+            return await exchange.fetch_balance()
         except Exception as e:
             logger.error(f"獲取餘額失敗: {str(e)}")
             raise
     
-    async def _check_trading_permission(self, exchange) -> bool:
+    async def _check_trading_permission(self, exchange: AsyncBaseExchange) -> bool:
         """
         檢查是否具備交易權限（支援 Mock Exchange）
         
         Args:
-            exchange: 交易所實例（CCXT 或 MockExchange）
+            exchange: 非同步交易所實例
             
         Returns:
             是否具備交易權限
         """
         try:
             # MockExchange 始終返回 True
-            if isinstance(exchange, MockExchange):
+            if exchange.get_exchange_id() == 'mock':
                 return True
             
-            # 嘗試獲取開放訂單（需要交易權限）
-            if hasattr(exchange, 'fetch_open_orders'):
-                # 只是測試權限，不需要實際結果
-                exchange.fetch_open_orders(limit=1)
-                return True
-            else:
-                # 如果交易所不支援此 API，假設有權限
-                return True
-        except AuthenticationError:
-            # 認證錯誤表示沒有交易權限
-            return False
-        except Exception:
-            # 其他錯誤（如網路錯誤）不影響權限判斷
+            # 嘗試獲取開放訂單（需要交易權限），只是測試權限，不需要實際結果
+            await exchange.fetch_open_orders(limit=1)
             return True
+        except Exception as e:
+            # 認證錯誤表示沒有交易權限，其他錯誤（如網路錯誤）不影響權限判斷
+            return not is_authentication_error(e)
     
     def _calculate_total_balance_usd(self, balance: Dict) -> float:
         """
@@ -272,11 +268,10 @@ class ExchangeService:
             NetworkError: 網路錯誤
         """
         try:
-            exchange = self._create_exchange_instance(
+            async with self._temporary_exchange(
                 exchange_name, api_key, api_secret, passphrase
-            )
-            
-            balance = await self._fetch_balance_async(exchange)
+            ) as exchange:
+                balance = await self._fetch_balance_async(exchange)
             
             # 提取非零餘額
             total_balance = balance.get('total', {})
@@ -0,0 +1,236 @@
+"""
+Async Exchange Adapters
+將交易所客戶端轉為 AsyncBaseExchange：
+同步客戶端在有界執行緒池中執行，CCXT 使用 async_support 原生協程
+"""
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Union
+
+from backend.app.config import settings as app_settings
+from backend.app.services.exchanges.async_base_exchange import AsyncBaseExchange
+from backend.app.services.exchanges.errors import is_ccxt_error
+
+logger = logging.getLogger(__name__)
+
+# ccxt 的 precisionMode 常數（與 ccxt.base.decimal_to_precision 相同，避免匯入 ccxt）
+CCXT_DECIMAL_PLACES = 2
+CCXT_SIGNIFICANT_DIGITS = 3
+CCXT_TICK_SIZE = 4
+
+
+def _ccxt_precision_to_step(value: Any, mode: int) -> Optional[float]:
+    """將 CCXT 精度換算為最小變動單位"""
+    if value is None or mode == CCXT_SIGNIFICANT_DIGITS:
+        return None
+    if mode == CCXT_DECIMAL_PLACES:
+        return 10.0 ** -int(value)
+    return float(value)
+
+
+# 全域執行緒池實例
+_exchange_executor_instance: Optional[ThreadPoolExecutor] = None
+
+
+def get_exchange_executor() -> ThreadPoolExecutor:
+    """獲取同步交易所呼叫使用的有界執行緒池"""
+    global _exchange_executor_instance
+    if _exchange_executor_instance is None:
+        _exchange_executor_instance = ThreadPoolExecutor(
+            max_workers=app_settings.EXCHANGE_THREAD_POOL_SIZE,
+            thread_name_prefix="exchange"
+        )
+    return _exchange_executor_instance
+
+
+class ThreadedExchangeAdapter(AsyncBaseExchange):
+    """
+    同步交易所的非同步轉接器
+
+    包裝 BaseExchange 或 CCXT 同步客戶端，每次呼叫都在執行緒池中執行
+    """
+
+    def __init__(self, exchange: Any, executor: Optional[ThreadPoolExecutor] = None):
+        """
+        Args:
+            exchange: 同步交易所實例
+            executor: 執行緒池（可選，預設使用全域實例）
+        """
+        self.exchange = exchange
+        self.executor = executor
+        self.id = getattr(exchange, 'id', 'base')
+        self.supports_batch_orders = getattr(exchange, 'supports_batch_orders', False) is True
+
+    async def _run(self, method: str, *args, **kwargs):
+        """在執行緒池中呼叫同步方法"""
+        loop = asyncio.get_running_loop()
+        call = functools.partial(getattr(self.exchange, method), *args, **kwargs)
+        return await loop.run_in_executor(self.executor or get_exchange_executor(), call)
+
+    async def fetch_balance(self) -> Dict[str, Any]:
+        return await self._run('fetch_balance')
+
+    async def fetch_ticker(self, symbol: str) -> Dict[str, Any]:
+        return await self._run('fetch_ticker', symbol)
+
+    async def fetch_open_orders(
+        self,
+        symbol: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        return await self._run('fetch_open_orders', symbol=symbol, limit=limit)
+
+    async def create_order(
+        self,
+        symbol: str,
+        order_type: str,
+        side: str,
+        amount: float,
+        price: Optional[float] = None,
+        params: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        return await self._run('create_order', symbol, order_type, side, amount, price, params)
+
+    async def create_orders(
+        self,
+        orders: List[Dict[str, Any]]
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        if self.supports_batch_orders:
+            return await self._run('create_orders', orders)
+        return await super().create_orders(orders)
+
+    async def fetch_positions(self, symbols: Optional[List[str]] = None) -> List[Dict]:
+        return await self._run('fetch_positions', symbols)
+
+    async def cancel_order(self, order_id: str, symbol: str) -> Dict[str, Any]:
+        return await self._run('cancel_order', order_id, symbol)
+
+    async def fetch_order_by_client_id(self, client_order_id: str, symbol: str) -> Dict[str, Any]:
+        """BaseExchange 直接查詢；CCXT 同步客戶端以 fetch_order 的 clientOrderId 參數查詢"""
+        if hasattr(self.exchange, 'fetch_order_by_client_id'):
+            return await self._run('fetch_order_by_client_id', client_order_id, symbol)
+        return await self._run('fetch_order', None, symbol, {'clientOrderId': client_order_id})
+
+    async def load_markets(self) -> Dict[str, Dict[str, Any]]:
+        if not hasattr(self.exchange, 'load_markets'):
+            return {}
+        return await self._run('load_markets')
+
+    async def close(self):
+        """關閉同步客戶端持有的 HTTP 連接"""
+        session = getattr(self.exchange, 'session', None)
+        if session is not None and hasattr(session, 'close'):
+            session.close()
+
+
+class CcxtAsyncExchange(AsyncBaseExchange):
+    """CCXT async_support 客戶端轉接器"""
+
+    def __init__(self, client: Any):
+        """
+        Args:
+            client: ccxt.async_support 交易所實例
+        """
+        self.client = client
+        self.id = getattr(client, 'id', 'base')
+        has = getattr(client, 'has', None)
+        self.supports_batch_orders = isinstance(has, dict) and bool(has.get('createOrders'))
+
+    async def fetch_balance(self) -> Dict[str, Any]:
+        return await self.client.fetch_balance()
+
+    async def fetch_ticker(self, symbol: str) -> Dict[str, Any]:
+        return await self.client.fetch_ticker(symbol)
+
+    async def fetch_open_orders(
+        self,
+        symbol: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        return await self.client.fetch_open_orders(symbol, None, limit)
+
+    async def create_order(
+        self,
+        symbol: str,
+        order_type: str,
+        side: str,
+        amount: float,
+        price: Optional[float] = None,
+        params: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        return await self.client.create_order(symbol, order_type, side, amount, price, params or {})
+
+    async def create_orders(
+        self,
+        orders: List[Dict[str, Any]]
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        使用交易所原生批量下單端點；整批失敗時每筆訂單都回報同一個例外
+
+        交易所的批量端點不支援該市場類型時（如幣安現貨）改為逐筆下單
+        """
+        if not self.supports_batch_orders:
+            return await super().create_orders(orders)
+        try:
+            return await self.client.create_orders([
+                {
+                    'symbol': order['symbol'],
+                    'type': order['type'],
+                    'side': order['side'],
+                    'amount': order['amount'],
+                    'price': order.get('price'),
+                    'params': order.get('params') or {}
+                }
+                for order in orders
+            ])
+        except Exception as e:
+            if is_ccxt_error(e, 'NotSupported'):
+                return await super().create_orders(orders)
+            return [e] * len(orders)
+
+    async def fetch_positions(self, symbols: Optional[List[str]] = None) -> List[Dict]:
+        return await self.client.fetch_positions(symbols)
+
+    async def cancel_order(self, order_id: str, symbol: str) -> Dict[str, Any]:
+        return await self.client.cancel_order(order_id, symbol)
+
+    async def fetch_order_by_client_id(self, client_order_id: str, symbol: str) -> Dict[str, Any]:
+        """CCXT 的 fetch_order 以 clientOrderId 參數查詢（Binance、OKX 等皆支援）"""
+        return await self.client.fetch_order(None, symbol, {'clientOrderId': client_order_id})
+
+    async def load_markets(self) -> Dict[str, Dict[str, Any]]:
+        """
+        載入 CCXT 市場資料，精度統一換算為最小變動單位
+
+        CCXT 依交易所以小數位數或最小變動單位表示精度（precisionMode）；
+        有效位數模式無法換算為固定單位，該精度視為未知
+        """
+        markets = await self.client.load_markets()
+        mode = getattr(self.client, 'precisionMode', CCXT_TICK_SIZE)
+        return {
+            symbol: {
+                **market,
+                'precision': {
+                    key: _ccxt_precision_to_step(value, mode)
+                    for key, value in (market.get('precision') or {}).items()
+                }
+            }
+            for symbol, market in markets.items()
+        }
+
+    async def close(self):
+        """關閉 aiohttp 連接"""
+        await self.client.close()
+
+
+def as_async_exchange(exchange: Any) -> AsyncBaseExchange:
+    """
+    將交易所實例轉為 AsyncBaseExchange
+
+    已是非同步實例則原樣返回，同步實例包裝為 ThreadedExchangeAdapter
+    """
+    if isinstance(exchange, AsyncBaseExchange):
+        return exchange
+    return ThreadedExchangeAdapter(exchange)
@@ -0,0 +1,105 @@
+"""
+Async Base Exchange
+非同步交易所抽象基類 - 與 BaseExchange 介面相同，所有方法皆為協程
+"""
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Any, Union
+
+
+class AsyncBaseExchange(ABC):
+    """
+    非同步交易所抽象基類
+
+    方法與回傳格式與 BaseExchange 一致（詳見 BaseExchange），
+    差別在於呼叫不會阻塞事件循環
+    """
+
+    id = 'base'
+
+    # 是否支援單次請求送出多筆訂單
+    supports_batch_orders = False
+
+    @abstractmethod
+    async def fetch_balance(self) -> Dict[str, Any]:
+        """獲取帳戶餘額"""
+        pass
+
+    @abstractmethod
+    async def fetch_ticker(self, symbol: str) -> Dict[str, Any]:
+        """獲取市場行情（當前價格）"""
+        pass
+
+    @abstractmethod
+    async def fetch_open_orders(
+        self,
+        symbol: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """獲取開放訂單"""
+        pass
+
+    @abstractmethod
+    async def create_order(
+        self,
+        symbol: str,
+        order_type: str,
+        side: str,
+        amount: float,
+        price: Optional[float] = None,
+        params: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        """創建訂單"""
+        pass
+
+    async def create_orders(
+        self,
+        orders: List[Dict[str, Any]]
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        批量創建訂單（格式見 BaseExchange.create_orders）
+
+        預設並行呼叫 create_order；支援批量下單的實作應覆寫
+        """
+        return await asyncio.gather(*[
+            self.create_order(
+                symbol=order['symbol'],
+                order_type=order['type'],
+                side=order['side'],
+                amount=order['amount'],
+                price=order.get('price'),
+                params=order.get('params')
+            )
+            for order in orders
+        ], return_exceptions=True)
+
+    @abstractmethod
+    async def fetch_positions(self, symbols: Optional[List[str]] = None) -> List[Dict]:
+        """獲取持倉"""
+        pass
+
+    @abstractmethod
+    async def cancel_order(self, order_id: str, symbol: str) -> Dict[str, Any]:
+        """取消訂單"""
+        pass
+
+    async def fetch_order_by_client_id(self, client_order_id: str, symbol: str) -> Dict[str, Any]:
+        """以客戶端訂單 ID 查詢訂單（格式見 BaseExchange.fetch_order_by_client_id），預設不支援"""
+        raise NotImplementedError(f"{self.get_exchange_id()} 不支援以客戶端訂單 ID 查詢訂單")
+
+    async def load_markets(self) -> Dict[str, Dict[str, Any]]:
+        """獲取市場規格（格式見 BaseExchange.load_markets），預設不提供"""
+        return {}
+
+    async def close(self):
+        """釋放連接（預設無需處理）"""
+        pass
+
+    def get_exchange_id(self) -> str:
+        """
+        獲取交易所 ID
+
+        Returns:
+            交易所 ID（如 'mock', 'binance', 'okx'）
+        """
+        return self.id
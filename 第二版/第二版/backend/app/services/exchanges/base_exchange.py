@@ -3,7 +3,7 @@ Base Exchange
 交易所抽象基類 - 定義統一介面
 """
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 
 
 class BaseExchange(ABC):
@@ -14,6 +14,9 @@ class BaseExchange(ABC):
     確保切換交易所時核心邏輯不需改動
     """
     
+    # 是否支援單次請求送出多筆訂單
+    supports_batch_orders = False
+    
     def __init__(self, api_key: str, api_secret: str, passphrase: Optional[str] = None):
         """
         初始化交易所
@@ -134,6 +137,36 @@ class BaseExchange(ABC):
         """
         pass
     
+    def create_orders(self, orders: List[Dict[str, Any]]) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        批量創建訂單
+        
+        預設逐筆呼叫 create_order；支援批量下單的交易所應覆寫並設定 supports_batch_orders
+        
+        Args:
+            orders: 訂單列表，每筆為
+                {'symbol': 'BTC/USDT', 'type': 'market', 'side': 'buy',
+                 'amount': 0.1, 'price': None, 'params': {...}}
+            
+        Returns:
+            與 orders 順序對應的結果；成功為訂單回執（格式同 create_order），
+            失敗為該筆訂單的例外
+        """
+        results = []
+        for order in orders:
+            try:
+                results.append(self.create_order(
+                    symbol=order['symbol'],
+                    order_type=order['type'],
+                    side=order['side'],
+                    amount=order['amount'],
+                    price=order.get('price'),
+                    params=order.get('params')
+                ))
+            except Exception as e:
+                results.append(e)
+        return results
+    
     @abstractmethod
     def fetch_positions(self, symbols: Optional[List[str]] = None) -> List[Dict]:
         """
@@ -181,6 +214,42 @@ class BaseExchange(ABC):
         """
         pass
     
+    def fetch_order_by_client_id(self, client_order_id: str, symbol: str) -> Dict[str, Any]:
+        """
+        以客戶端訂單 ID 查詢訂單（確認重複 ID 的訂單確實是同一筆下單）
+        
+        預設不支援；支援客戶端訂單 ID 的交易所應覆寫
+        
+        Args:
+            client_order_id: 下單時傳入的 params['clientOrderId']
+            symbol: 交易對
+            
+        Returns:
+            訂單回執（格式同 create_order，filled 為實際成交數量）
+        """
+        raise NotImplementedError(f"{self.id} 不支援以客戶端訂單 ID 查詢訂單")
+    
+    def load_markets(self) -> Dict[str, Dict[str, Any]]:
+        """
+        獲取市場規格（下單前的精度與最小值檢查）
+        
+        預設不提供規格；有規格的交易所應覆寫
+        
+        Returns:
+            {
+                'BTC/USDT': {
+                    'symbol': 'BTC/USDT',
+                    'precision': {'amount': 0.00001, 'price': 0.01},  # 最小變動單位
+                    'limits': {
+                        'amount': {'min': 0.00001},  # 最小下單數量
+                        'cost': {'min': 5.0}  # 最小名目價值
+                    }
+                },
+                ...
+            }
+        """
+        return {}
+    
     def get_exchange_id(self) -> str:
         """
         獲取交易所 ID
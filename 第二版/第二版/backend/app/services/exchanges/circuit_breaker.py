@@ -0,0 +1,321 @@
+"""
+Circuit Breaker
+交易所熔斷器 - 交易所或 API Key 連續失敗後暫停送出請求，冷卻後以單一探測請求恢復
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple, Union
+
+from backend.app.config import settings as app_settings
+from backend.app.services.exchanges.async_base_exchange import AsyncBaseExchange
+from backend.app.services.exchanges.errors import is_transient_error
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """熔斷器開啟中，請求未送出"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} 熔斷中，{retry_after:.1f} 秒後再試")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    熔斷器
+
+    closed：正常放行，連續 failure_threshold 次暫時性失敗
+        （且來自至少 min_sources 個不同來源）後開啟；
+    open：直接拒絕，recovery_timeout 秒後進入 half_open；
+    half_open：只放行一個探測請求，成功則關閉，失敗則重新開啟
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        min_sources: int = 1
+    ):
+        """
+        Args:
+            name: 名稱（用於日誌與統計）
+            failure_threshold: 開啟熔斷的連續失敗次數
+            recovery_timeout: 開啟後的冷卻秒數
+            min_sources: 連續失敗至少來自幾個不同來源（如 API Key）才開啟
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.min_sources = min_sources
+        self._state = CLOSED
+        self._failures = 0
+        self._failing_sources: Set[Hashable] = set()
+        self._opened_at = 0.0
+        self._probing = False
+
+        # 統計
+        self.opened = 0  # 開啟次數
+        self.rejected = 0  # 被拒絕的請求數
+
+    @property
+    def state(self) -> str:
+        """當前狀態（open 冷卻結束後視為 half_open）"""
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = HALF_OPEN
+            logger.info(f"熔斷器 {self.name} 進入半開狀態，放行探測請求")
+        return self._state
+
+    def retry_after(self) -> float:
+        """距離下一次可以嘗試的秒數"""
+        if self.state == OPEN:
+            return max(0.0, self._opened_at + self.recovery_timeout - time.monotonic())
+        # 半開狀態等待探測結果
+        return min(self.recovery_timeout, 1.0)
+
+    def try_acquire(self) -> bool:
+        """
+        請求是否可以送出
+
+        半開狀態下取得探測資格的呼叫端必須以 release() 回報結果
+        """
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        self.rejected += 1
+        return False
+
+    def abort(self):
+        """歸還探測資格（請求未送出），不影響狀態"""
+        self._probing = False
+
+    def release(self, error: Optional[BaseException] = None, source: Hashable = None):
+        """
+        回報請求結果
+
+        Args:
+            error: 請求拋出的例外；None 表示成功。
+                只有暫時性錯誤計為失敗，其餘錯誤表示交易所可正常回應；
+                被取消的請求不影響狀態
+            source: 請求來源（如 API Key）
+        """
+        probing, self._probing = self._probing, False
+        if isinstance(error, asyncio.CancelledError):
+            return
+
+        if error is None or not is_transient_error(error):
+            if self._state != CLOSED:
+                logger.info(f"熔斷器 {self.name} 已恢復")
+            self._state = CLOSED
+            self._failures = 0
+            self._failing_sources.clear()
+            return
+
+        self._failures += 1
+        self._failing_sources.add(source)
+        if probing or (
+            self._state == CLOSED
+            and self._failures >= self.failure_threshold
+            and len(self._failing_sources) >= self.min_sources
+        ):
+            self._state = OPEN
+            self._opened_at = time.monotonic()
+            self.opened += 1
+            logger.warning(
+                f"熔斷器 {self.name} 開啟 - 連續失敗 {self._failures} 次，"
+                f"{self.recovery_timeout} 秒內暫停送出請求: {error}"
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """熔斷統計"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "opened": self.opened,
+            "rejected": self.rejected
+        }
+
+
+class CircuitBreakerRegistry:
+    """
+    熔斷器註冊表
+
+    每個交易所一個熔斷器（交易所整體故障），每個 API Key 再一個熔斷器（單一帳戶故障）；
+    交易所熔斷器需要至少兩個 API Key 連續失敗才開啟，單一帳戶的問題不會影響其他跟隨者
+    """
+
+    def __init__(
+        self,
+        failure_threshold: Optional[int] = None,
+        recovery_timeout: Optional[float] = None
+    ):
+        """
+        Args:
+            failure_threshold: 開啟熔斷的連續失敗次數（可選，預設使用設定值）
+            recovery_timeout: 開啟後的冷卻秒數（可選，預設使用設定值）
+        """
+        self.failure_threshold = failure_threshold or app_settings.EXCHANGE_CIRCUIT_FAILURE_THRESHOLD
+        self.recovery_timeout = recovery_timeout or app_settings.EXCHANGE_CIRCUIT_RECOVERY_SECONDS
+        self._exchange_breakers: Dict[str, CircuitBreaker] = {}
+        self._key_breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+
+    def _create(self, name: str, min_sources: int = 1) -> CircuitBreaker:
+        return CircuitBreaker(name, self.failure_threshold, self.recovery_timeout, min_sources)
+
+    def breakers_for(self, exchange_name: str, api_key: str) -> List[CircuitBreaker]:
+        """
+        獲取（必要時創建）某個 API Key 需要經過的熔斷器
+
+        Returns:
+            [交易所熔斷器, API Key 熔斷器]
+        """
+        exchange_breaker = self._exchange_breakers.get(exchange_name)
+        if exchange_breaker is None:
+            exchange_breaker = self._create(exchange_name, min_sources=2)
+            self._exchange_breakers[exchange_name] = exchange_breaker
+
+        key_breaker = self._key_breakers.get((exchange_name, api_key))
+        if key_breaker is None:
+            masked = f"{api_key[:4]}...{api_key[-4:]}" if len(api_key) > 8 else "****"
+            key_breaker = self._create(f"{exchange_name}:{masked}")
+            self._key_breakers[(exchange_name, api_key)] = key_breaker
+
+        return [exchange_breaker, key_breaker]
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """所有熔斷器的狀態"""
+        return {
+            "exchanges": {b.name: b.get_stats() for b in self._exchange_breakers.values()},
+            "api_keys": {b.name: b.get_stats() for b in self._key_breakers.values()}
+        }
+
+
+class CircuitBreakerExchange(AsyncBaseExchange):
+    """請求前檢查熔斷器、請求後回報結果的交易所包裝"""
+
+    def __init__(
+        self,
+        client: AsyncBaseExchange,
+        breakers: List[CircuitBreaker],
+        source: Hashable = None
+    ):
+        """
+        Args:
+            client: 非同步交易所實例
+            breakers: 請求需要經過的熔斷器
+            source: 回報給熔斷器的請求來源（如 API Key）
+        """
+        self.client = client
+        self.breakers = breakers
+        self.source = source
+        self.id = client.get_exchange_id()
+        self.supports_batch_orders = client.supports_batch_orders
+
+    def _acquire(self):
+        """所有熔斷器都放行才送出請求，否則歸還已取得的探測資格並拋出 CircuitOpenError"""
+        acquired = []
+        for breaker in self.breakers:
+            if not breaker.try_acquire():
+                for granted in acquired:
+                    granted.abort()
+                raise CircuitOpenError(breaker.name, breaker.retry_after())
+            acquired.append(breaker)
+
+    def _release(self, error: Optional[BaseException] = None):
+        for breaker in self.breakers:
+            breaker.release(error, self.source)
+
+    async def _call(self, method: str, *args, **kwargs):
+        self._acquire()
+        try:
+            result = await getattr(self.client, method)(*args, **kwargs)
+        except BaseException as e:
+            self._release(e)
+            raise
+        self._release()
+        return result
+
+    async def fetch_balance(self) -> Dict[str, Any]:
+        return await self._call('fetch_balance')
+
+    async def fetch_ticker(self, symbol: str) -> Dict[str, Any]:
+        return await self._call('fetch_ticker', symbol)
+
+    async def fetch_open_orders(
+        self,
+        symbol: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        return await self._call('fetch_open_orders', symbol=symbol, limit=limit)
+
+    async def create_order(
+        self,
+        symbol: str,
+        order_type: str,
+        side: str,
+        amount: float,
+        price: Optional[float] = None,
+        params: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        return await self._call('create_order', symbol, order_type, side, amount, price, params)
+
+    async def create_orders(
+        self,
+        orders: List[Dict[str, Any]]
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        批量下單視為一次請求：熔斷時每筆訂單都回報 CircuitOpenError，
+        所有訂單都因暫時性錯誤失敗才計為一次失敗
+        """
+        try:
+            self._acquire()
+        except CircuitOpenError as e:
+            return [e] * len(orders)
+        try:
+            results = await self.client.create_orders(orders)
+        except BaseException as e:
+            self._release(e)
+            raise
+        errors = [r for r in results if isinstance(r, BaseException)]
+        all_transient = bool(results) and len(errors) == len(results) and all(
+            is_transient_error(e) for e in errors
+        )
+        self._release(errors[0] if all_transient else None)
+        return results
+
+    async def fetch_positions(self, symbols: Optional[List[str]] = None) -> List[Dict]:
+        return await self._call('fetch_positions', symbols)
+
+    async def cancel_order(self, order_id: str, symbol: str) -> Dict[str, Any]:
+        return await self._call('cancel_order', order_id, symbol)
+
+    async def fetch_order_by_client_id(self, client_order_id: str, symbol: str) -> Dict[str, Any]:
+        return await self._call('fetch_order_by_client_id', client_order_id, symbol)
+
+    async def load_markets(self) -> Dict[str, Dict[str, Any]]:
+        return await self._call('load_markets')
+
+    async def close(self):
+        await self.client.close()
+
+
+# 全域熔斷器註冊表實例
+_circuit_breaker_registry_instance: Optional[CircuitBreakerRegistry] = None
+
+
+def get_circuit_breaker_registry() -> CircuitBreakerRegistry:
+    """獲取 Circuit Breaker Registry 單例"""
+    global _circuit_breaker_registry_instance
+    if _circuit_breaker_registry_instance is None:
+        _circuit_breaker_registry_instance = CircuitBreakerRegistry()
+    return _circuit_breaker_registry_instance
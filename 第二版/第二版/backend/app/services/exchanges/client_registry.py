@@ -0,0 +1,223 @@
+"""
+Exchange Client Registry
+交易所客戶端註冊表 - 依 (交易所, 憑證) 共用非同步客戶端實例，保持連接與市場資料常駐
+"""
+import asyncio
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Set, Tuple, Union
+
+from backend.app.services.exchanges.async_base_exchange import AsyncBaseExchange
+from backend.app.services.exchanges.circuit_breaker import (
+    CircuitBreakerExchange,
+    get_circuit_breaker_registry,
+)
+from backend.app.services.exchanges.factory import ExchangeFactory
+from backend.app.services.exchanges.rate_limiter import RateLimitedExchange, get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# (交易所名稱, 憑證 ID)；沒有憑證 ID 的呼叫以憑證指紋代替
+ClientKey = Tuple[str, Union[int, str]]
+
+
+def build_exchange_client(
+    exchange_name: str,
+    api_key: str,
+    api_secret: str,
+    passphrase: Optional[str] = None
+) -> AsyncBaseExchange:
+    """
+    創建非同步交易所客戶端（Mock 或 CCXT async_support）
+
+    Args:
+        exchange_name: 交易所名稱（小寫）
+        api_key: API Key
+        api_secret: API Secret
+        passphrase: Passphrase（某些交易所需要）
+
+    Returns:
+        AsyncBaseExchange 實例；MockExchange 為同步實作，在執行緒池中執行，
+        CCXT 在第一次創建真實交易所客戶端時才載入。
+        所有請求都先經過該交易所與該 API Key 的熔斷器（熔斷時不佔用令牌），
+        再經過對應的令牌桶
+    """
+    buckets = get_rate_limiter().buckets_for(
+        exchange_name, api_key, *ExchangeFactory.get_rate_limits(exchange_name)
+    )
+    breakers = get_circuit_breaker_registry().breakers_for(exchange_name, api_key)
+
+    return CircuitBreakerExchange(
+        RateLimitedExchange(
+            ExchangeFactory.create_async_client(exchange_name, api_key, api_secret, passphrase),
+            buckets
+        ),
+        breakers,
+        source=api_key
+    )
+
+
+def credential_fingerprint(
+    api_key: str,
+    api_secret: str,
+    passphrase: Optional[str] = None
+) -> str:
+    """憑證指紋（不保存明文，用於偵測憑證變更）"""
+    raw = "\0".join([api_key or "", api_secret or "", passphrase or ""])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+@dataclass
+class _ClientEntry:
+    """註冊表項目"""
+    client: Any
+    fingerprint: str
+    last_used: float
+
+
+class ExchangeClientRegistry:
+    """
+    交易所客戶端註冊表
+
+    - 首次使用時才創建客戶端
+    - 閒置超過 idle_ttl 的客戶端會被移除並關閉
+    - 憑證內容變更（指紋不同）或呼叫 invalidate 時重建
+    """
+
+    def __init__(
+        self,
+        idle_ttl: float = 600.0,
+        builder: Callable[..., Any] = build_exchange_client
+    ):
+        """
+        初始化註冊表
+
+        Args:
+            idle_ttl: 客戶端閒置多久後移除（秒）
+            builder: 客戶端建構函式 (exchange_name, api_key, api_secret, passphrase)
+        """
+        self.idle_ttl = idle_ttl
+        self.builder = builder
+        self._entries: Dict[ClientKey, _ClientEntry] = {}
+        self._last_sweep = time.monotonic()
+        self._closing: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_client(
+        self,
+        exchange_name: str,
+        api_key: str,
+        api_secret: str,
+        passphrase: Optional[str] = None,
+        credential_id: Optional[int] = None
+    ):
+        """
+        獲取（必要時創建）交易所客戶端
+
+        Args:
+            exchange_name: 交易所名稱
+            api_key: API Key
+            api_secret: API Secret
+            passphrase: Passphrase（可選）
+            credential_id: 憑證 ID（可選，未提供時以憑證指紋區分）
+
+        Returns:
+            交易所實例
+        """
+        now = time.monotonic()
+        self._maybe_sweep(now)
+
+        exchange_name = exchange_name.lower()
+        fingerprint = credential_fingerprint(api_key, api_secret, passphrase)
+        key: ClientKey = (
+            exchange_name,
+            credential_id if credential_id is not None else f"anon:{fingerprint}"
+        )
+
+        entry = self._entries.get(key)
+        if entry is not None and entry.fingerprint == fingerprint:
+            entry.last_used = now
+            return entry.client
+
+        if entry is not None:
+            logger.info(f"憑證已變更，重建交易所客戶端 - {exchange_name}, 憑證: {credential_id}")
+            self._close(entry.client)
+
+        client = self.builder(exchange_name, api_key, api_secret, passphrase)
+        self._entries[key] = _ClientEntry(client=client, fingerprint=fingerprint, last_used=now)
+        return client
+
+    def invalidate(self, credential_id: int):
+        """移除某個憑證的所有客戶端（憑證更新或刪除時呼叫）"""
+        for key in [k for k in self._entries if k[1] == credential_id]:
+            self._close(self._entries.pop(key).client)
+            logger.debug(f"交易所客戶端已移除 - {key[0]}, 憑證: {credential_id}")
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """
+        移除閒置過久的客戶端
+
+        Returns:
+            移除的數量
+        """
+        now = time.monotonic() if now is None else now
+        expired = [k for k, e in self._entries.items() if now - e.last_used > self.idle_ttl]
+        for key in expired:
+            self._close(self._entries.pop(key).client)
+        if expired:
+            logger.info(f"移除 {len(expired)} 個閒置的交易所客戶端")
+        return len(expired)
+
+    def clear(self):
+        """關閉並移除所有客戶端"""
+        for entry in self._entries.values():
+            self._close(entry.client)
+        self._entries.clear()
+
+    def _maybe_sweep(self, now: float):
+        """定期清理閒置客戶端（不需要背景任務）"""
+        if now - self._last_sweep >= min(60.0, self.idle_ttl):
+            self._last_sweep = now
+            self.evict_idle(now)
+
+    def _close(self, client: Any):
+        """釋放客戶端持有的 HTTP 連接"""
+        if isinstance(client, AsyncBaseExchange):
+            try:
+                task = asyncio.get_running_loop().create_task(self._aclose(client))
+            except RuntimeError:
+                return
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+            return
+
+        session = getattr(client, 'session', None)
+        if session is not None and hasattr(session, 'close'):
+            try:
+                session.close()
+            except Exception as e:
+                logger.debug(f"關閉交易所連接失敗: {e}")
+
+    @staticmethod
+    async def _aclose(client: AsyncBaseExchange):
+        """關閉非同步客戶端"""
+        try:
+            await client.close()
+        except Exception as e:
+            logger.debug(f"關閉交易所連接失敗: {e}")
+
+
+# 全域註冊表實例
+_client_registry_instance: Optional[ExchangeClientRegistry] = None
+
+
+def get_exchange_client_registry() -> ExchangeClientRegistry:
+    """獲取 Exchange Client Registry 單例"""
+    global _client_registry_instance
+    if _client_registry_instance is None:
+        _client_registry_instance = ExchangeClientRegistry()
+    return _client_registry_instance
@@ -0,0 +1,70 @@
+"""
+Exchange Errors
+交易所錯誤分類 - 區分可重試的暫時性錯誤與需要人工處理的錯誤
+
+不在模組層級匯入 ccxt：ccxt 尚未載入時不可能出現 ccxt 錯誤，
+分類時只查詢已載入的 ccxt.base.errors，避免啟動時為此匯入整個 ccxt
+"""
+import asyncio
+import sys
+from typing import Optional
+
+# 不依賴 ccxt 的暫時性錯誤
+TRANSIENT_ERRORS = (
+    asyncio.TimeoutError,
+    TimeoutError,
+    ConnectionError,
+)
+
+
+def _ccxt_error_class(name: str) -> Optional[type]:
+    """已載入的 ccxt 錯誤類別；ccxt 尚未載入時返回 None"""
+    module = sys.modules.get('ccxt.base.errors')
+    return getattr(module, name, None) if module is not None else None
+
+
+def is_ccxt_error(error: BaseException, name: str) -> bool:
+    """
+    是否為 ccxt.<name>（含子類別）
+
+    Args:
+        error: 例外
+        name: ccxt 錯誤類別名稱（如 'AuthenticationError'）
+    """
+    error_class = _ccxt_error_class(name)
+    return error_class is not None and isinstance(error, error_class)
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    是否為可重試的暫時性錯誤
+
+    網路逾時、交易所維護、限流等（ccxt.NetworkError 含 RequestTimeout、
+    ExchangeNotAvailable、RateLimitExceeded），稍後重試通常會成功；
+    餘額不足、認證失敗、參數錯誤等重試也不會成功，不在此列
+    """
+    return isinstance(error, TRANSIENT_ERRORS) or is_ccxt_error(error, 'NetworkError')
+
+
+def is_authentication_error(error: BaseException) -> bool:
+    """是否為認證失敗（API Key 或 Secret 無效、權限不足）"""
+    return is_ccxt_error(error, 'AuthenticationError')
+
+
+# 交易所以一般錯誤回報重複訂單時的訊息（ccxt 未對應為 DuplicateOrderId）
+DUPLICATE_ORDER_MESSAGES = (
+    'Duplicate order sent',  # 幣安 -2010
+)
+
+
+def is_duplicate_order_error(error: BaseException) -> bool:
+    """
+    是否為重複的客戶端訂單 ID
+
+    重試時出現表示先前逾時的請求其實已被交易所接受
+    """
+    if is_ccxt_error(error, 'DuplicateOrderId'):
+        return True
+    return is_ccxt_error(error, 'ExchangeError') and any(
+        message in str(error) for message in DUPLICATE_ORDER_MESSAGES
+    )
@@ -1,16 +1,51 @@
 """
 Exchange Factory
 交易所工廠類 - 統一創建交易所實例
+
+交易所適配器以模組路徑登記，首次使用時才匯入：
+只用 Mock 的環境不會載入 ccxt，真實交易所在第一次創建客戶端時才載入 ccxt.async_support
 """
+import importlib
 import logging
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
 
+from backend.app.config import settings as app_settings
+from backend.app.services.exchanges.async_adapters import CcxtAsyncExchange, ThreadedExchangeAdapter
+from backend.app.services.exchanges.async_base_exchange import AsyncBaseExchange
 from backend.app.services.exchanges.base_exchange import BaseExchange
-from backend.app.services.exchanges.mock_exchange import MockExchange
+from backend.app.services.exchanges.rate_limiter import RateLimit
 
 logger = logging.getLogger(__name__)
 
 
+def rebase_urls(urls: Any, base_url: str) -> Any:
+    """
+    把 CCXT 的 API 網址改指向 base_url，保留原本的路徑
+    
+    例如 https://fapi.binance.com/fapi/v1 -> http://127.0.0.1:8765/fapi/v1；
+    WebSocket 網址（ws/wss）改用對應的 ws 協定
+    
+    Args:
+        urls: client.urls['api']（字串或巢狀字典）
+        base_url: 新的基礎網址（http 或 https）
+        
+    Returns:
+        結構相同的新網址
+    """
+    if isinstance(urls, dict):
+        return {key: rebase_urls(value, base_url) for key, value in urls.items()}
+    if not isinstance(urls, str):
+        return urls
+    
+    original = urlsplit(urls)
+    base = urlsplit(base_url)
+    scheme = base.scheme
+    if original.scheme in ('ws', 'wss'):
+        scheme = 'wss' if base.scheme == 'https' else 'ws'
+    return f"{scheme}://{base.netloc}{base.path.rstrip('/')}{original.path}"
+
+
 class ExchangeFactory:
     """
     交易所工廠類
@@ -32,18 +67,119 @@ class ExchangeFactory:
         'mexc'  # MEXC
     ]
     
-    @staticmethod
+    # 本地實作的同步適配器：交易所名稱 -> (模組路徑, 類別名稱)
+    ADAPTERS: Dict[str, Tuple[str, str]] = {
+        'mock': ('backend.app.services.exchanges.mock_exchange', 'MockExchange'),
+    }
+    
+    # CCXT 支援的交易所：交易所名稱 -> ccxt.async_support 類別名稱
+    CCXT_EXCHANGES: Dict[str, str] = {
+        'binance': 'binance',
+        'binance_testnet': 'binance',
+        'okx': 'okx',
+        'bybit': 'bybit',
+        'huobi': 'huobi',
+        'kucoin': 'kucoin',
+        'gate': 'gate',
+        'bitget': 'bitget',
+        'mexc': 'mexc'
+    }
+    
+    # 使用測試網（CCXT sandbox 模式）的交易所
+    SANDBOX_EXCHANGES = {'binance_testnet'}
+    
+    # 交易所整體限額（本服務所有 API Key 共用，對應交易所的 IP 限額）
+    EXCHANGE_RATE_LIMITS = {
+        'mock': RateLimit(rate=1000, burst=1000),
+        'binance': RateLimit(rate=20, burst=40),
+        'binance_testnet': RateLimit(rate=10, burst=20),
+        'okx': RateLimit(rate=20, burst=40),
+        'bybit': RateLimit(rate=50, burst=100),
+        'huobi': RateLimit(rate=10, burst=20),
+        'kucoin': RateLimit(rate=10, burst=20),
+        'gate': RateLimit(rate=10, burst=20),
+        'bitget': RateLimit(rate=10, burst=20),
+        'mexc': RateLimit(rate=10, burst=20)
+    }
+    
+    # 單一 API Key 的下單限額（對應交易所的帳戶限額）
+    API_KEY_RATE_LIMITS = {
+        'mock': RateLimit(rate=100, burst=100),
+        'binance': RateLimit(rate=5, burst=10),
+        'binance_testnet': RateLimit(rate=5, burst=10),
+        'okx': RateLimit(rate=20, burst=30),
+        'bybit': RateLimit(rate=10, burst=10),
+        'huobi': RateLimit(rate=5, burst=10),
+        'kucoin': RateLimit(rate=5, burst=10),
+        'gate': RateLimit(rate=5, burst=10),
+        'bitget': RateLimit(rate=5, burst=10),
+        'mexc': RateLimit(rate=5, burst=10)
+    }
+    
+    # 未列出的交易所使用保守的預設值
+    DEFAULT_EXCHANGE_RATE_LIMIT = RateLimit(rate=5, burst=10)
+    DEFAULT_API_KEY_RATE_LIMIT = RateLimit(rate=2, burst=5)
+    
+    @classmethod
+    def register_adapter(cls, exchange_name: str, module_path: str, class_name: str):
+        """
+        登記同步適配器（首次使用時才匯入 module_path）
+        
+        Args:
+            exchange_name: 交易所名稱
+            module_path: 適配器所在模組
+            class_name: 適配器類別名稱（BaseExchange 子類別）
+        """
+        exchange_name_lower = exchange_name.lower()
+        cls.ADAPTERS[exchange_name_lower] = (module_path, class_name)
+        if exchange_name_lower not in cls.SUPPORTED_EXCHANGES:
+            cls.SUPPORTED_EXCHANGES.append(exchange_name_lower)
+    
+    @classmethod
+    def load_adapter(cls, exchange_name: str) -> type:
+        """
+        載入交易所的適配器類別
+        
+        模組在第一次呼叫時匯入，之後直接取用 sys.modules；
+        每次都從模組取得類別，測試可以 patch('ccxt.async_support.<交易所>')
+        
+        Args:
+            exchange_name: 交易所名稱
+            
+        Returns:
+            BaseExchange 子類別，或 ccxt.async_support 交易所類別
+            
+        Raises:
+            ValueError: 如果交易所不支援
+        """
+        exchange_name_lower = exchange_name.lower()
+        
+        if exchange_name_lower in cls.ADAPTERS:
+            module_path, class_name = cls.ADAPTERS[exchange_name_lower]
+            return getattr(importlib.import_module(module_path), class_name)
+        
+        if exchange_name_lower in cls.CCXT_EXCHANGES:
+            ccxt_async = importlib.import_module('ccxt.async_support')
+            return getattr(ccxt_async, cls.CCXT_EXCHANGES[exchange_name_lower])
+        
+        raise ValueError(
+            f"不支援的交易所: {exchange_name}。"
+            f"支援的交易所: {', '.join(cls.SUPPORTED_EXCHANGES)}"
+        )
+    
+    @classmethod
     def create_exchange(
+        cls,
         exchange_name: str,
         api_key: str,
         api_secret: str,
         passphrase: Optional[str] = None
     ) -> BaseExchange:
         """
-        創建交易所實例
+        創建同步交易所實例
         
         Args:
-            exchange_name: 交易所名稱（如 'mock', 'binance', 'binance_testnet', 'okx'）
+            exchange_name: 交易所名稱（如 'mock'）
             api_key: API Key
             api_secret: API Secret
             passphrase: Passphrase（某些交易所需要，如 OKX）
@@ -53,41 +189,95 @@ class ExchangeFactory:
             
         Raises:
             ValueError: 如果交易所不支援
+            NotImplementedError: 交易所只有 CCXT 非同步實作（請使用 create_async_client）
         """
         exchange_name_lower = exchange_name.lower()
         
-        if exchange_name_lower not in ExchangeFactory.SUPPORTED_EXCHANGES:
-            raise ValueError(
-                f"不支援的交易所: {exchange_name}。"
-                f"支援的交易所: {', '.join(ExchangeFactory.SUPPORTED_EXCHANGES)}"
+        if exchange_name_lower not in cls.ADAPTERS and exchange_name_lower in cls.CCXT_EXCHANGES:
+            raise NotImplementedError(f"{exchange_name} 只支援非同步客戶端")
+        
+        exchange_class = cls.load_adapter(exchange_name_lower)
+        logger.info(f"創建 {exchange_class.__name__} 實例")
+        return exchange_class(api_key, api_secret, passphrase)
+    
+    @classmethod
+    def create_async_client(
+        cls,
+        exchange_name: str,
+        api_key: str,
+        api_secret: str,
+        passphrase: Optional[str] = None,
+        base_url: Optional[str] = None
+    ) -> AsyncBaseExchange:
+        """
+        創建非同步交易所客戶端（不含限流與熔斷）
+        
+        Args:
+            exchange_name: 交易所名稱
+            api_key: API Key
+            api_secret: API Secret
+            passphrase: Passphrase（某些交易所需要，如 OKX）
+            base_url: API 基礎網址（可選，預設使用 EXCHANGE_BASE_URLS 設定；
+                      用於指向本地模擬交易所，只適用 CCXT 交易所）
+            
+        Returns:
+            AsyncBaseExchange 實例；同步適配器在執行緒池中執行，
+            CCXT 交易所使用 async_support 原生協程
+            
+        Raises:
+            ValueError: 如果交易所不支援
+        """
+        exchange_name_lower = exchange_name.lower()
+        
+        if exchange_name_lower in cls.ADAPTERS:
+            return ThreadedExchangeAdapter(
+                cls.create_exchange(exchange_name_lower, api_key, api_secret, passphrase)
             )
         
-        # Mock Exchange
-        if exchange_name_lower == 'mock':
-            logger.info("創建 MockExchange 實例（開發模式）")
-            return MockExchange(api_key, api_secret, passphrase)
-        
-        # Binance Testnet
-        elif exchange_name_lower == 'binance_testnet':
-            logger.info("創建 BinanceTestnetExchange 實例")
-            # TODO: 實作 BinanceTestnetExchange
-            raise NotImplementedError("BinanceTestnetExchange 尚未實作")
-        
-        # Binance
-        elif exchange_name_lower == 'binance':
-            logger.info("創建 BinanceExchange 實例")
-            # TODO: 實作 BinanceExchange
-            raise NotImplementedError("BinanceExchange 尚未實作")
-        
-        # OKX
-        elif exchange_name_lower == 'okx':
-            logger.info("創建 OKXExchange 實例")
-            # TODO: 實作 OKXExchange
-            raise NotImplementedError("OKXExchange 尚未實作")
-        
-        # 其他交易所
-        else:
-            raise NotImplementedError(f"{exchange_name} 尚未實作")
+        exchange_class = cls.load_adapter(exchange_name_lower)
+        
+        config: Dict[str, Any] = {
+            'apiKey': api_key,
+            'secret': api_secret,
+            'enableRateLimit': True,
+            'timeout': 30000,  # 30 秒超時
+        }
+        
+        # 某些交易所需要 passphrase（如 OKX）
+        if passphrase:
+            config['password'] = passphrase
+        
+        client = exchange_class(config)
+        if exchange_name_lower in cls.SANDBOX_EXCHANGES:
+            client.set_sandbox_mode(True)
+        
+        base_url = base_url or app_settings.EXCHANGE_BASE_URLS.get(exchange_name_lower)
+        if base_url:
+            client.urls['api'] = rebase_urls(client.urls['api'], base_url)
+            logger.info(f"{exchange_name} API 位址覆寫為 {base_url}")
+        
+        return CcxtAsyncExchange(client)
+    
+    @staticmethod
+    def get_rate_limits(exchange_name: str) -> Tuple[RateLimit, RateLimit]:
+        """
+        獲取交易所的限流設定
+        
+        Args:
+            exchange_name: 交易所名稱
+            
+        Returns:
+            (交易所整體限額, 單一 API Key 限額)
+        """
+        exchange_name_lower = exchange_name.lower()
+        return (
+            ExchangeFactory.EXCHANGE_RATE_LIMITS.get(
+                exchange_name_lower, ExchangeFactory.DEFAULT_EXCHANGE_RATE_LIMIT
+            ),
+            ExchangeFactory.API_KEY_RATE_LIMITS.get(
+                exchange_name_lower, ExchangeFactory.DEFAULT_API_KEY_RATE_LIMIT
+            )
+        )
     
     @staticmethod
     def is_supported(exchange_name: str) -> bool:
@@ -0,0 +1,244 @@
+"""
+Market Metadata Cache
+交易所市場規格快取 - 依交易所快取下單精度、最小數量與最小名目價值，
+下單前在本地取整並丟棄低於最小值的訂單，不必等交易所拒絕
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from decimal import Decimal, ROUND_FLOOR, ROUND_HALF_UP
+from typing import Any, Dict, Optional
+
+from backend.app.config import settings as app_settings
+from backend.app.services.exchanges.async_base_exchange import AsyncBaseExchange
+
+logger = logging.getLogger(__name__)
+
+# 沒有市場規格時的最小下單數量（交易所未提供規格或交易對不在規格中）
+DEFAULT_MIN_AMOUNT = 0.0001
+
+# 取整前容許的浮點誤差（以最小變動單位計），避免 0.29999999 被捨去為 0.29
+_STEP_TOLERANCE = Decimal("1e-9")
+
+
+def _floor_to_step(value: float, step: float) -> float:
+    """向下取整到 step 的整數倍"""
+    units = (Decimal(repr(value)) / Decimal(repr(step))).quantize(_STEP_TOLERANCE)
+    return float(units.to_integral_value(rounding=ROUND_FLOOR) * Decimal(repr(step)))
+
+
+@dataclass(frozen=True)
+class MarketInfo:
+    """單一交易對的下單規格（None 表示交易所未提供）"""
+    symbol: str
+    amount_step: Optional[float] = None  # 數量最小變動單位
+    price_tick: Optional[float] = None  # 價格最小變動單位
+    min_amount: Optional[float] = None  # 最小下單數量
+    min_notional: Optional[float] = None  # 最小名目價值（數量 × 價格）
+
+    @classmethod
+    def from_market(cls, market: Dict[str, Any]) -> "MarketInfo":
+        """由 load_markets 的市場資料建立（格式見 BaseExchange.load_markets）"""
+        precision = market.get('precision') or {}
+        limits = market.get('limits') or {}
+
+        def positive(value: Any) -> Optional[float]:
+            return float(value) if value else None
+
+        return cls(
+            symbol=market['symbol'],
+            amount_step=positive(precision.get('amount')),
+            price_tick=positive(precision.get('price')),
+            min_amount=positive((limits.get('amount') or {}).get('min')),
+            min_notional=positive((limits.get('cost') or {}).get('min'))
+        )
+
+    def round_amount(self, amount: float) -> float:
+        """
+        數量向下取整到最小變動單位
+
+        向下取整確保不會超過目標倉位（減倉時不會超賣）
+        """
+        if self.amount_step is None:
+            return amount
+        return _floor_to_step(amount, self.amount_step)
+
+    def round_price(self, price: float) -> float:
+        """價格四捨五入到最小變動單位"""
+        if self.price_tick is None:
+            return price
+        tick = Decimal(repr(self.price_tick))
+        units = (Decimal(repr(price)) / tick).to_integral_value(rounding=ROUND_HALF_UP)
+        return float(units * tick)
+
+    def is_dust(self, amount: float, price: Optional[float] = None) -> bool:
+        """
+        數量是否低於交易所的最小下單量或最小名目價值
+
+        Args:
+            amount: 已取整的數量
+            price: 參考價格（可選，未提供時不檢查名目價值）
+        """
+        if amount <= 0:
+            return True
+        min_amount = self.min_amount if self.min_amount is not None else (
+            DEFAULT_MIN_AMOUNT if self.amount_step is None else 0.0
+        )
+        if amount < min_amount:
+            return True
+        if self.min_notional is not None and price:
+            return amount * price < self.min_notional
+        return False
+
+
+class MarketMetadataCache:
+    """
+    市場規格快取
+
+    每個交易所第一次下單前載入一次（市場規格與 API Key 無關，同一交易所共用），
+    超過 refresh_interval 後在背景重新載入，期間繼續使用舊的規格；
+    載入失敗時使用保守的預設值，retry_interval 秒後再試
+    """
+
+    def __init__(
+        self,
+        refresh_interval: Optional[float] = None,
+        retry_interval: float = 30.0
+    ):
+        """
+        Args:
+            refresh_interval: 重新載入間隔（秒，可選，預設使用設定值）
+            retry_interval: 載入失敗後多久再試（秒）
+        """
+        self.refresh_interval = (
+            refresh_interval if refresh_interval is not None
+            else app_settings.EXCHANGE_MARKETS_REFRESH_SECONDS
+        )
+        self.retry_interval = retry_interval
+        self._markets: Dict[str, Dict[str, MarketInfo]] = {}
+        self._loaded_at: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+        # 統計
+        self.loads = 0
+        self.load_failures = 0
+        self.amounts_rounded = 0  # 數量被取整的訂單數
+        self.orders_dropped = 0  # 低於最小值、未送出的訂單數
+
+    async def ensure_loaded(self, exchange_name: str, client: AsyncBaseExchange):
+        """
+        確保交易所的市場規格已載入
+
+        第一次呼叫時等待載入完成；規格過期時在背景重新載入，不阻塞下單
+
+        Args:
+            exchange_name: 交易所名稱
+            client: 用來載入規格的交易所客戶端
+        """
+        loaded_at = self._loaded_at.get(exchange_name)
+        if loaded_at is None:
+            lock = self._locks.setdefault(exchange_name, asyncio.Lock())
+            async with lock:
+                # 等待期間其他呼叫端可能已經載入
+                if exchange_name not in self._loaded_at:
+                    await self._load(exchange_name, client)
+            return
+
+        if time.monotonic() - loaded_at < self.refresh_interval:
+            return
+        task = self._refreshing.get(exchange_name)
+        if task is None or task.done():
+            self._refreshing[exchange_name] = asyncio.create_task(self._load(exchange_name, client))
+
+    async def _load(self, exchange_name: str, client: AsyncBaseExchange):
+        """載入市場規格，失敗時保留舊的規格"""
+        try:
+            markets = await client.load_markets()
+        except Exception as e:
+            self.load_failures += 1
+            # retry_interval 秒後視為過期，由下一次 ensure_loaded 在背景重試
+            self._loaded_at[exchange_name] = (
+                time.monotonic() - self.refresh_interval + self.retry_interval
+            )
+            self._markets.setdefault(exchange_name, {})
+            logger.warning(
+                f"載入 {exchange_name} 市場規格失敗，{self.retry_interval} 秒後重試: {e}"
+            )
+            return
+
+        self._markets[exchange_name] = {
+            symbol: MarketInfo.from_market({'symbol': symbol, **market})
+            for symbol, market in (markets or {}).items()
+        }
+        self._loaded_at[exchange_name] = time.monotonic()
+        self.loads += 1
+        logger.info(f"已載入 {exchange_name} 的 {len(self._markets[exchange_name])} 個市場規格")
+
+    def get(self, exchange_name: str, symbol: str) -> MarketInfo:
+        """
+        獲取交易對的下單規格
+
+        Returns:
+            MarketInfo；沒有規格時只套用預設的最小下單數量
+        """
+        market = self._markets.get(exchange_name, {}).get(symbol)
+        return market if market is not None else MarketInfo(symbol=symbol)
+
+    def normalize_amount(
+        self,
+        exchange_name: str,
+        symbol: str,
+        amount: float,
+        price: Optional[float] = None
+    ) -> float:
+        """
+        下單前取整數量並檢查最小值
+
+        Args:
+            exchange_name: 交易所名稱
+            symbol: 交易對
+            amount: 原始數量
+            price: 參考價格（可選，用於檢查最小名目價值）
+
+        Returns:
+            取整後的數量；0 表示低於最小值，不應送出
+        """
+        market = self.get(exchange_name, symbol)
+        rounded = market.round_amount(amount)
+        if market.is_dust(rounded, price):
+            self.orders_dropped += 1
+            return 0.0
+        if rounded != amount:
+            self.amounts_rounded += 1
+        return rounded
+
+    def get_stats(self) -> Dict[str, Any]:
+        """快取統計"""
+        now = time.monotonic()
+        return {
+            "exchanges": {
+                name: {
+                    "markets": len(self._markets.get(name, {})),
+                    "age_seconds": round(now - loaded_at, 1)
+                }
+                for name, loaded_at in self._loaded_at.items()
+            },
+            "loads": self.loads,
+            "load_failures": self.load_failures,
+            "amounts_rounded": self.amounts_rounded,
+            "orders_dropped": self.orders_dropped
+        }
+
+
+# 全域市場規格快取實例
+_market_cache_instance: Optional[MarketMetadataCache] = None
+
+
+def get_market_metadata_cache() -> MarketMetadataCache:
+    """獲取 Market Metadata Cache 單例"""
+    global _market_cache_instance
+    if _market_cache_instance is None:
+        _market_cache_instance = MarketMetadataCache()
+    return _market_cache_instance
@@ -4,10 +4,11 @@ Mock Exchange
 """
 import logging
 import uuid
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Union
 from datetime import datetime
 
 from backend.app.services.exchanges.base_exchange import BaseExchange
+from backend.app.services.exchanges.mock_simulator import MockExchangeSimulator, get_mock_simulator
 
 logger = logging.getLogger(__name__)
 
@@ -17,9 +18,20 @@ class MockExchange(BaseExchange):
     模擬交易所類別
     用於開發和測試，不發起真實網路請求
     繼承 BaseExchange 確保介面一致
+    
+    未啟用模擬器時立即回應固定資料；啟用模擬器（見 mock_simulator）時
+    依 API Key 追蹤倉位與餘額，並注入延遲、錯誤、逾時、部分成交與限流拒絕
     """
     
-    def __init__(self, api_key: str, api_secret: str, passphrase: Optional[str] = None):
+    supports_batch_orders = True
+    
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        passphrase: Optional[str] = None,
+        simulator: Optional[MockExchangeSimulator] = None
+    ):
         """
         初始化 Mock Exchange
         
@@ -27,9 +39,12 @@ class MockExchange(BaseExchange):
             api_key: API Key（用於驗證加密流程）
             api_secret: API Secret（用於驗證加密流程）
             passphrase: Passphrase（可選）
+            simulator: 模擬器（可選，預設使用全域設定；未啟用時為 None）
         """
         super().__init__(api_key, api_secret, passphrase)
         self.id = 'mock'
+        self.simulator = simulator if simulator is not None else get_mock_simulator()
+        self._account = self.simulator.account(api_key) if self.simulator is not None else None
         
         # 模擬市價數據
         self._mock_prices = {
@@ -39,8 +54,24 @@ class MockExchange(BaseExchange):
             'SOL/USDT': 100.0
         }
         
+        # 模擬市場規格：(數量最小變動單位, 價格最小變動單位, 最小名目價值)
+        self._mock_markets = {
+            'BTC/USDT': (0.00001, 0.01, 5.0),
+            'ETH/USDT': (0.0001, 0.01, 5.0),
+            'BNB/USDT': (0.001, 0.1, 5.0),
+            'SOL/USDT': (0.01, 0.01, 5.0)
+        }
+        
+        # 已接受的訂單（以客戶端訂單 ID 索引；與真實交易所相同，拒絕重複的 ID）
+        self._orders_by_client_id: Dict[str, Dict[str, Any]] = {}
+        
         logger.info(f"MockExchange 初始化 - API Key: {api_key[:8]}...")
     
+    def _simulate_request(self, method: str):
+        """啟用模擬器時注入延遲、限流與暫時性錯誤"""
+        if self.simulator is not None:
+            self.simulator.before_request(self._account, method)
+    
     def fetch_balance(self) -> Dict[str, Any]:
         """
         模擬獲取帳戶餘額
@@ -49,6 +80,17 @@ class MockExchange(BaseExchange):
             模擬的餘額資訊
         """
         logger.info("MockExchange: 執行 fetch_balance()")
+        self._simulate_request('fetch_balance')
+        
+        if self._account is not None:
+            with self._account.lock:
+                balances = dict(self._account.balances)
+            return {
+                'total': balances,
+                'free': dict(balances),
+                'used': {currency: 0.0 for currency in balances},
+                'info': {'mock': True, 'simulated': True}
+            }
         
         return {
             'total': {
@@ -86,6 +128,7 @@ class MockExchange(BaseExchange):
             模擬的行情資訊
         """
         logger.info(f"MockExchange: 執行 fetch_ticker(symbol={symbol})")
+        self._simulate_request('fetch_ticker')
         
         # 獲取模擬價格
         last_price = self._mock_prices.get(symbol, 50000.0)
@@ -115,6 +158,11 @@ class MockExchange(BaseExchange):
             模擬的訂單列表
         """
         logger.info(f"MockExchange: 執行 fetch_open_orders(symbol={symbol}, limit={limit})")
+        self._simulate_request('fetch_open_orders')
+        
+        if self._account is not None:
+            # 模擬的市價單立即成交或取消，沒有掛單
+            return []
         
         return [
             {
@@ -149,11 +197,31 @@ class MockExchange(BaseExchange):
             side: 買賣方向（'buy' 或 'sell'）
             amount: 數量
             price: 價格（限價單需要）
-            params: 額外參數
+            params: 額外參數（clientOrderId 重複時拋出 DuplicateOrderId）
             
         Returns:
-            模擬的訂單回執
+            模擬的訂單回執（啟用模擬器時可能部分成交，filled < amount）
         """
+        self._simulate_request('create_order')
+        return self._place_order(symbol, order_type, side, amount, price, params)
+    
+    def _place_order(
+        self,
+        symbol: str,
+        order_type: str,
+        side: str,
+        amount: float,
+        price: Optional[float] = None,
+        params: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        """產生訂單回執（啟用模擬器時由模擬器成交並更新帳戶）"""
+        client_order_id = (params or {}).get('clientOrderId')
+        if client_order_id is not None and self._account is None:
+            if client_order_id in self._orders_by_client_id:
+                # 與真實交易所相同的錯誤類型；只在重複時才載入 ccxt
+                import ccxt
+                raise ccxt.DuplicateOrderId(f"mock 重複的客戶端訂單 ID: {client_order_id}")
+        
         order_id = str(uuid.uuid4())
         timestamp = datetime.utcnow().timestamp() * 1000
         
@@ -168,7 +236,7 @@ class MockExchange(BaseExchange):
         
         order = {
             'id': order_id,
-            'clientOrderId': f"mock_{order_id[:8]}",
+            'clientOrderId': client_order_id or f"mock_{order_id[:8]}",
             'timestamp': timestamp,
             'datetime': datetime.utcnow().isoformat(),
             'symbol': symbol,
@@ -192,8 +260,47 @@ class MockExchange(BaseExchange):
             }
         }
         
+        if self._account is not None:
+            return self.simulator.execute_order(self._account, order, client_order_id)
+        if client_order_id is not None:
+            self._orders_by_client_id[client_order_id] = order
         return order
     
+    def create_orders(self, orders: List[Dict[str, Any]]) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        模擬批量創建訂單（單次請求）
+        
+        Args:
+            orders: 訂單列表（格式見 BaseExchange.create_orders）
+            
+        Returns:
+            與 orders 順序對應的訂單回執或例外
+        """
+        logger.info(f"MockExchange: 執行 create_orders(共 {len(orders)} 筆)")
+        if self.simulator is None:
+            return super().create_orders(orders)
+        
+        # 批量下單是一次請求：整批失敗時每筆訂單都回報同一個例外
+        try:
+            self._simulate_request('create_orders')
+        except Exception as e:
+            return [e] * len(orders)
+        
+        results = []
+        for order in orders:
+            try:
+                results.append(self._place_order(
+                    symbol=order['symbol'],
+                    order_type=order['type'],
+                    side=order['side'],
+                    amount=order['amount'],
+                    price=order.get('price'),
+                    params=order.get('params')
+                ))
+            except Exception as e:
+                results.append(e)
+        return results
+    
     def fetch_positions(self, symbols: Optional[List[str]] = None) -> List[Dict]:
         """
         模擬獲取持倉
@@ -205,24 +312,50 @@ class MockExchange(BaseExchange):
             模擬的持倉列表
         """
         logger.info(f"MockExchange: 執行 fetch_positions(symbols={symbols})")
+        self._simulate_request('fetch_positions')
         
-        positions = [
-            {
-                'symbol': 'BTC/USDT',
-                'side': 'long',
-                'contracts': 0.5,
-                'contractSize': 1,
-                'entryPrice': 48000.0,
-                'markPrice': 50000.0,
-                'notional': 25000.0,
-                'leverage': 10,
-                'unrealizedPnl': 1000.0,
-                'percentage': 4.17,
-                'timestamp': datetime.utcnow().timestamp() * 1000,
-                'datetime': datetime.utcnow().isoformat(),
-                'info': {'mock': True}
-            }
-        ]
+        if self._account is not None:
+            with self._account.lock:
+                held = [
+                    (symbol, size, self._account.entry_prices.get(symbol, 0.0))
+                    for symbol, size in self._account.positions.items()
+                    if size != 0
+                ]
+            positions = []
+            for symbol, size, entry_price in held:
+                mark_price = self._mock_prices.get(symbol, 50000.0)
+                positions.append({
+                    'symbol': symbol,
+                    'side': 'long' if size > 0 else 'short',
+                    'contracts': abs(size),
+                    'contractSize': 1,
+                    'entryPrice': entry_price,
+                    'markPrice': mark_price,
+                    'notional': abs(size) * mark_price,
+                    'leverage': 1,
+                    'unrealizedPnl': (mark_price - entry_price) * size,
+                    'timestamp': datetime.utcnow().timestamp() * 1000,
+                    'datetime': datetime.utcnow().isoformat(),
+                    'info': {'mock': True, 'simulated': True}
+                })
+        else:
+            positions = [
+                {
+                    'symbol': 'BTC/USDT',
+                    'side': 'long',
+                    'contracts': 0.5,
+                    'contractSize': 1,
+                    'entryPrice': 48000.0,
+                    'markPrice': 50000.0,
+                    'notional': 25000.0,
+                    'leverage': 10,
+                    'unrealizedPnl': 1000.0,
+                    'percentage': 4.17,
+                    'timestamp': datetime.utcnow().timestamp() * 1000,
+                    'datetime': datetime.utcnow().isoformat(),
+                    'info': {'mock': True}
+                }
+            ]
         
         if symbols:
             positions = [p for p in positions if p['symbol'] in symbols]
@@ -241,6 +374,7 @@ class MockExchange(BaseExchange):
             模擬的取消結果
         """
         logger.info(f"MockExchange: 執行 cancel_order(order_id={order_id}, symbol={symbol})")
+        self._simulate_request('cancel_order')
         
         return {
             'id': order_id,
@@ -251,6 +385,47 @@ class MockExchange(BaseExchange):
             'info': {'mock': True}
         }
     
+    def fetch_order_by_client_id(self, client_order_id: str, symbol: str) -> Dict[str, Any]:
+        """
+        以客戶端訂單 ID 查詢已接受的訂單
+        
+        Args:
+            client_order_id: 客戶端訂單 ID
+            symbol: 交易對
+            
+        Returns:
+            訂單回執（格式同 create_order）
+        """
+        self._simulate_request('fetch_order')
+        if self._account is not None:
+            order = self.simulator.find_order(self._account, client_order_id)
+        else:
+            order = self._orders_by_client_id.get(client_order_id)
+        if order is None or order['symbol'] != symbol:
+            import ccxt
+            raise ccxt.OrderNotFound(f"mock 找不到客戶端訂單 ID: {client_order_id}")
+        return dict(order)
+    
+    def load_markets(self) -> Dict[str, Dict[str, Any]]:
+        """
+        模擬市場規格
+        
+        Returns:
+            市場規格（格式見 BaseExchange.load_markets）
+        """
+        self._simulate_request('load_markets')
+        return {
+            symbol: {
+                'symbol': symbol,
+                'precision': {'amount': amount_step, 'price': price_tick},
+                'limits': {
+                    'amount': {'min': amount_step},
+                    'cost': {'min': min_notional}
+                }
+            }
+            for symbol, (amount_step, price_tick, min_notional) in self._mock_markets.items()
+        }
+    
     def set_mock_price(self, symbol: str, price: float):
         """
         設定模擬價格（測試用）
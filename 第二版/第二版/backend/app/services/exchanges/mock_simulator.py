@@ -0,0 +1,286 @@
+"""
+Mock Exchange Simulator
+模擬交易所的行為模型 - 依 API Key 追蹤倉位與餘額，並注入延遲、錯誤、逾時、
+部分成交與限流拒絕，讓壓力測試與引擎基準測試可以離線重現真實交易所的情境
+"""
+import logging
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from backend.app.config import settings as app_settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SimulationProfile:
+    """模擬參數（機率皆為 0~1）"""
+    seed: Optional[int] = None  # 隨機種子，相同種子與 API Key 產生相同的序列
+    latency_ms: float = 0.0  # 請求延遲中位數
+    latency_sigma: float = 0.0  # 延遲的對數常態分佈參數，越大尾端越長
+    error_rate: float = 0.0  # 交易所暫時不可用（ExchangeNotAvailable）
+    timeout_rate: float = 0.0  # 請求逾時（RequestTimeout）
+    timeout_fill_rate: float = 0.5  # 逾時的下單請求實際已被交易所接受的機率
+    partial_fill_rate: float = 0.0  # 市價單部分成交的機率
+    partial_fill_min: float = 0.5  # 部分成交時的最低成交比例
+    rate_limit_per_second: float = 0.0  # 單一 API Key 每秒請求數上限，0 表示不限
+    rate_limit_burst: int = 10  # 限流的突發容量
+    initial_balances: Dict[str, float] = field(default_factory=lambda: {'USDT': 100000.0})
+    fee_rate: float = 0.001  # 手續費率
+
+    @classmethod
+    def from_settings(cls) -> "SimulationProfile":
+        """由 MOCK_EXCHANGE_* 設定建立"""
+        return cls(
+            seed=app_settings.MOCK_EXCHANGE_SEED,
+            latency_ms=app_settings.MOCK_EXCHANGE_LATENCY_MS,
+            latency_sigma=app_settings.MOCK_EXCHANGE_LATENCY_SIGMA,
+            error_rate=app_settings.MOCK_EXCHANGE_ERROR_RATE,
+            timeout_rate=app_settings.MOCK_EXCHANGE_TIMEOUT_RATE,
+            partial_fill_rate=app_settings.MOCK_EXCHANGE_PARTIAL_FILL_RATE,
+            rate_limit_per_second=app_settings.MOCK_EXCHANGE_RATE_LIMIT_PER_SECOND
+        )
+
+
+def _ccxt_error(name: str, message: str) -> Exception:
+    """建立與真實交易所相同類型的 ccxt 錯誤（只在注入錯誤時才載入 ccxt）"""
+    import ccxt
+    return getattr(ccxt, name)(message)
+
+
+class SimulatedAccount:
+    """單一 API Key 的帳戶狀態"""
+
+    def __init__(self, api_key: str, profile: SimulationProfile):
+        self.api_key = api_key
+        self.balances: Dict[str, float] = dict(profile.initial_balances)
+        self.positions: Dict[str, float] = {}  # 交易對 -> 淨倉位（買入為正）
+        self.entry_prices: Dict[str, float] = {}
+        self.orders: Dict[str, Dict[str, Any]] = {}  # 客戶端訂單 ID -> 已接受的訂單回執
+        self.lock = threading.Lock()
+        # 每個帳戶獨立的隨機序列，不受其他帳戶請求交錯的影響
+        self.rng = random.Random(f"{profile.seed}:{api_key}") if profile.seed is not None else random.Random()
+        self._tokens = float(profile.rate_limit_burst)
+        self._refilled_at = time.monotonic()
+
+    def take_token(self, rate: float, burst: int) -> bool:
+        """消耗一個限流令牌；沒有令牌時返回 False"""
+        now = time.monotonic()
+        self._tokens = min(float(burst), self._tokens + (now - self._refilled_at) * rate)
+        self._refilled_at = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def apply_fill(self, symbol: str, side: str, filled: float, price: float, fee_rate: float):
+        """成交後更新倉位、均價與餘額"""
+        base, _, quote = symbol.partition('/')
+        quote = quote or 'USDT'
+        signed = filled if side == 'buy' else -filled
+        cost = filled * price
+
+        previous = self.positions.get(symbol, 0.0)
+        position = previous + signed
+        if abs(position) < 1e-12:
+            position = 0.0
+            self.entry_prices.pop(symbol, None)
+        elif previous == 0 or (previous > 0) != (position > 0):
+            # 開倉或反手：以成交價為均價
+            self.entry_prices[symbol] = price
+        elif abs(position) > abs(previous):
+            # 加倉：加權平均；減倉不改變均價
+            self.entry_prices[symbol] = (
+                self.entry_prices.get(symbol, price) * abs(previous) + cost
+            ) / abs(position)
+        self.positions[symbol] = position
+
+        self.balances[base] = self.balances.get(base, 0.0) + signed
+        self.balances[quote] = (
+            self.balances.get(quote, 0.0) + (-cost if side == 'buy' else cost) - cost * fee_rate
+        )
+
+
+class MockExchangeSimulator:
+    """
+    模擬交易所的共用狀態
+
+    帳戶狀態依 API Key 保存在模擬器中（不在 MockExchange 實例上），
+    客戶端被註冊表重建後倉位與已接受的客戶端訂單 ID 仍然保留。
+    MockExchange 在執行緒池中執行，延遲以 time.sleep 模擬
+    """
+
+    def __init__(self, profile: Optional[SimulationProfile] = None):
+        """
+        Args:
+            profile: 模擬參數（可選，預設不注入延遲與錯誤）
+        """
+        self.profile = profile or SimulationProfile()
+        self._accounts: Dict[str, SimulatedAccount] = {}
+        self._lock = threading.Lock()
+
+        # 統計
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.rate_limited = 0
+        self.partial_fills = 0
+        self.duplicates = 0
+
+    def _count(self, name: str):
+        """累計統計（多個執行緒同時下單）"""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def account(self, api_key: str) -> SimulatedAccount:
+        """獲取（必要時創建）API Key 的帳戶"""
+        with self._lock:
+            account = self._accounts.get(api_key)
+            if account is None:
+                account = SimulatedAccount(api_key, self.profile)
+                self._accounts[api_key] = account
+            return account
+
+    def before_request(self, account: SimulatedAccount, method: str):
+        """
+        模擬一次請求：延遲、限流與暫時性錯誤
+
+        Raises:
+            ccxt.RateLimitExceeded / ccxt.ExchangeNotAvailable
+        """
+        profile = self.profile
+        with account.lock:
+            self._count('requests')
+            delay = self._latency(account.rng)
+            limited = profile.rate_limit_per_second > 0 and not account.take_token(
+                profile.rate_limit_per_second, profile.rate_limit_burst
+            )
+            failed = not limited and account.rng.random() < profile.error_rate
+
+        if delay > 0:
+            time.sleep(delay)
+        if limited:
+            self._count('rate_limited')
+            raise _ccxt_error('RateLimitExceeded', f"mock {method}: 請求過於頻繁")
+        if failed:
+            self._count('errors')
+            raise _ccxt_error('ExchangeNotAvailable', f"mock {method}: 503 Service Unavailable")
+
+    def _latency(self, rng: random.Random) -> float:
+        """依對數常態分佈抽樣的延遲（秒）"""
+        if self.profile.latency_ms <= 0:
+            return 0.0
+        return self.profile.latency_ms * math.exp(rng.gauss(0, self.profile.latency_sigma)) / 1000
+
+    def execute_order(
+        self,
+        account: SimulatedAccount,
+        order: Dict[str, Any],
+        client_order_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        成交訂單並更新帳戶
+
+        Args:
+            account: 下單帳戶
+            order: MockExchange 產生的訂單回執（成交價與數量）
+            client_order_id: 客戶端訂單 ID（重複時拋出 DuplicateOrderId）
+
+        Returns:
+            依部分成交調整後的訂單回執
+
+        Raises:
+            ccxt.DuplicateOrderId / ccxt.RequestTimeout
+        """
+        profile = self.profile
+        with account.lock:
+            if client_order_id is not None:
+                if client_order_id in account.orders:
+                    self._count('duplicates')
+                    raise _ccxt_error('DuplicateOrderId', f"mock 重複的客戶端訂單 ID: {client_order_id}")
+
+            timed_out = account.rng.random() < profile.timeout_rate
+            accepted = not timed_out or account.rng.random() < profile.timeout_fill_rate
+            partial = order['type'] == 'market' and account.rng.random() < profile.partial_fill_rate
+            fraction = account.rng.uniform(profile.partial_fill_min, 1.0) if partial else 1.0
+
+            if accepted:
+                if client_order_id is not None:
+                    account.orders[client_order_id] = order
+                filled = order['amount'] * fraction
+                account.apply_fill(order['symbol'], order['side'], filled, order['price'], profile.fee_rate)
+
+        if timed_out:
+            self._count('timeouts')
+            raise _ccxt_error('RequestTimeout', f"mock create_order: 請求逾時（已被接受: {accepted}）")
+
+        if partial:
+            # 市價單未成交的部分由交易所取消（IOC）
+            self._count('partial_fills')
+            order['filled'] = filled
+            order['remaining'] = order['amount'] - filled
+            order['cost'] = filled * order['price']
+            order['fee']['cost'] = order['cost'] * profile.fee_rate
+            order['status'] = 'canceled'
+        return order
+
+    def find_order(self, account: SimulatedAccount, client_order_id: str) -> Optional[Dict[str, Any]]:
+        """以客戶端訂單 ID 查詢帳戶已接受的訂單（逾時但已被接受的訂單也查得到）"""
+        with account.lock:
+            return account.orders.get(client_order_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """模擬統計"""
+        return {
+            "accounts": len(self._accounts),
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "rate_limited": self.rate_limited,
+            "partial_fills": self.partial_fills,
+            "duplicates": self.duplicates
+        }
+
+
+# 全域模擬器實例（未啟用模擬時為 None）
+_mock_simulator_instance: Optional[MockExchangeSimulator] = None
+_mock_simulator_loaded = False
+
+
+def get_mock_simulator() -> Optional[MockExchangeSimulator]:
+    """
+    獲取 Mock Exchange Simulator 單例
+
+    Returns:
+        MOCK_EXCHANGE_SIMULATE 為 True 或已呼叫 configure_mock_simulator 時返回模擬器，
+        否則返回 None（MockExchange 維持固定回應）
+    """
+    global _mock_simulator_instance, _mock_simulator_loaded
+    if not _mock_simulator_loaded:
+        _mock_simulator_loaded = True
+        if app_settings.MOCK_EXCHANGE_SIMULATE:
+            _mock_simulator_instance = MockExchangeSimulator(SimulationProfile.from_settings())
+    return _mock_simulator_instance
+
+
+def configure_mock_simulator(
+    simulator: Optional[MockExchangeSimulator]
+) -> Optional[MockExchangeSimulator]:
+    """
+    設定之後創建的 MockExchange 使用的模擬器（壓力測試與基準測試用）
+
+    Args:
+        simulator: 模擬器；None 表示停用模擬
+
+    Returns:
+        先前的模擬器
+    """
+    global _mock_simulator_instance, _mock_simulator_loaded
+    previous = get_mock_simulator()
+    _mock_simulator_instance = simulator
+    _mock_simulator_loaded = True
+    return previous
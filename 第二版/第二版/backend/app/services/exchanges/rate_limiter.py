@@ -0,0 +1,230 @@
+"""
+Rate Limiter
+交易所請求的令牌桶限流 - 超出限額的請求排隊等待而不是直接失敗
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from backend.app.services.exchanges.async_base_exchange import AsyncBaseExchange
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """令牌桶限額"""
+    rate: float  # 每秒補充的請求數
+    burst: int  # 桶容量（可瞬間送出的請求數）
+
+
+class TokenBucket:
+    """
+    令牌桶
+
+    令牌不足時預支並依序等待：每個請求在進入時就決定等待時間，
+    因此天然先進先出，也不需要跨事件循環的鎖
+    """
+
+    def __init__(self, name: str, limit: RateLimit):
+        self.name = name
+        self.limit = limit
+        self._tokens = float(limit.burst)
+        self._updated = time.monotonic()
+
+        # 統計
+        self.queued = 0
+        self.max_queued = 0
+        self.acquired = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _reserve(self) -> float:
+        """取走一個令牌，返回需要等待的秒數"""
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.limit.burst),
+            self._tokens + (now - self._updated) * self.limit.rate
+        )
+        self._updated = now
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.limit.rate
+
+    async def acquire(self) -> float:
+        """
+        等待直到可以送出一個請求
+
+        Returns:
+            實際等待的秒數
+        """
+        wait = self._reserve()
+        if wait > 0:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self._tokens += 1  # 歸還未使用的令牌
+                raise
+            finally:
+                self.queued -= 1
+
+        self.acquired += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        return wait
+
+    def get_stats(self) -> Dict[str, Any]:
+        """限流統計"""
+        return {
+            "rate": self.limit.rate,
+            "burst": self.limit.burst,
+            "queue_depth": self.queued,
+            "max_queue_depth": self.max_queued,
+            "acquired": self.acquired,
+            "avg_wait_ms": int(self.total_wait / self.acquired * 1000) if self.acquired else 0,
+            "max_wait_ms": int(self.max_wait * 1000)
+        }
+
+
+class ExchangeRateLimiter:
+    """
+    交易所限流器
+
+    每個交易所一個共用的令牌桶（對應交易所對本服務 IP 的限額），
+    每個 API Key 再一個令牌桶（對應交易所對帳戶的限額）
+    """
+
+    def __init__(self):
+        self._exchange_buckets: Dict[str, TokenBucket] = {}
+        self._key_buckets: Dict[Tuple[str, str], TokenBucket] = {}
+
+    def buckets_for(
+        self,
+        exchange_name: str,
+        api_key: str,
+        exchange_limit: RateLimit,
+        api_key_limit: RateLimit
+    ) -> List[TokenBucket]:
+        """
+        獲取（必要時創建）某個 API Key 需要經過的令牌桶
+
+        Args:
+            exchange_name: 交易所名稱
+            api_key: API Key
+            exchange_limit: 交易所整體限額
+            api_key_limit: 單一 API Key 限額
+
+        Returns:
+            [交易所令牌桶, API Key 令牌桶]
+        """
+        exchange_bucket = self._exchange_buckets.get(exchange_name)
+        if exchange_bucket is None:
+            exchange_bucket = TokenBucket(exchange_name, exchange_limit)
+            self._exchange_buckets[exchange_name] = exchange_bucket
+
+        key_bucket = self._key_buckets.get((exchange_name, api_key))
+        if key_bucket is None:
+            masked = f"{api_key[:4]}...{api_key[-4:]}" if len(api_key) > 8 else "****"
+            key_bucket = TokenBucket(f"{exchange_name}:{masked}", api_key_limit)
+            self._key_buckets[(exchange_name, api_key)] = key_bucket
+
+        return [exchange_bucket, key_bucket]
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """所有令牌桶的統計（佇列深度與等待時間）"""
+        return {
+            "exchanges": {b.name: b.get_stats() for b in self._exchange_buckets.values()},
+            "api_keys": {b.name: b.get_stats() for b in self._key_buckets.values()}
+        }
+
+
+class RateLimitedExchange(AsyncBaseExchange):
+    """每次請求前依序通過令牌桶的交易所包裝"""
+
+    def __init__(self, client: AsyncBaseExchange, buckets: List[TokenBucket]):
+        """
+        Args:
+            client: 非同步交易所實例
+            buckets: 請求需要經過的令牌桶
+        """
+        self.client = client
+        self.buckets = buckets
+        self.id = client.get_exchange_id()
+        self.supports_batch_orders = client.supports_batch_orders
+
+    async def _throttle(self):
+        """等待所有令牌桶放行"""
+        for bucket in self.buckets:
+            await bucket.acquire()
+
+    async def fetch_balance(self) -> Dict[str, Any]:
+        await self._throttle()
+        return await self.client.fetch_balance()
+
+    async def fetch_ticker(self, symbol: str) -> Dict[str, Any]:
+        await self._throttle()
+        return await self.client.fetch_ticker(symbol)
+
+    async def fetch_open_orders(
+        self,
+        symbol: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        await self._throttle()
+        return await self.client.fetch_open_orders(symbol=symbol, limit=limit)
+
+    async def create_order(
+        self,
+        symbol: str,
+        order_type: str,
+        side: str,
+        amount: float,
+        price: Optional[float] = None,
+        params: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        await self._throttle()
+        return await self.client.create_order(symbol, order_type, side, amount, price, params)
+
+    async def create_orders(
+        self,
+        orders: List[Dict[str, Any]]
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """原生批量下單只計一次請求，否則每筆訂單各自經過令牌桶"""
+        if not self.supports_batch_orders:
+            return await super().create_orders(orders)
+        await self._throttle()
+        return await self.client.create_orders(orders)
+
+    async def fetch_positions(self, symbols: Optional[List[str]] = None) -> List[Dict]:
+        await self._throttle()
+        return await self.client.fetch_positions(symbols)
+
+    async def cancel_order(self, order_id: str, symbol: str) -> Dict[str, Any]:
+        await self._throttle()
+        return await self.client.cancel_order(order_id, symbol)
+
+    async def fetch_order_by_client_id(self, client_order_id: str, symbol: str) -> Dict[str, Any]:
+        await self._throttle()
+        return await self.client.fetch_order_by_client_id(client_order_id, symbol)
+
+    async def load_markets(self) -> Dict[str, Dict[str, Any]]:
+        await self._throttle()
+        return await self.client.load_markets()
+
+    async def close(self):
+        await self.client.close()
+
+
+# 全域限流器實例
+_rate_limiter_instance: Optional[ExchangeRateLimiter] = None
+
+
+def get_rate_limiter() -> ExchangeRateLimiter:
+    """獲取 Exchange Rate Limiter 單例"""
+    global _rate_limiter_instance
+    if _rate_limiter_instance is None:
+        _rate_limiter_instance = ExchangeRateLimiter()
+    return _rate_limiter_instance
@@ -4,17 +4,23 @@ Follower Engine Service (Signal Dispatcher)
 """
 import asyncio
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy import select, and_, or_
 
+from backend.app.config import settings as app_settings
+from backend.app.database import DB_POOL_SIZE
 from backend.app.models.follow_relationship import FollowRelationship
 from backend.app.models.master_position import MasterPosition
 from backend.app.models.trade_history import TradeHistory
 from backend.app.models.trade_log import TradeLog
 from backend.app.services.credential_service import CredentialService
-from backend.app.services.exchange_service import MockExchange
+from backend.app.services.exchanges.client_registry import get_exchange_client_registry
+from backend.app.services.dashboard_cache import get_dashboard_cache
+from backend.app.services.dashboard_stream import MASTER_POSITION_EVENT, master_position_event
+from backend.app.services.master_scheduler import TickStats, run_masters_concurrently
+from backend.app.services.signal_bus import get_signal_bus
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +32,11 @@ class FollowerEngine:
         self,
         db: AsyncSession,
         credential_service: CredentialService,
-        poll_interval: int = 3  # 改為 3 秒輪詢
+        poll_interval: int = 3,  # 改為 3 秒輪詢
+        max_concurrent_masters: int = 8,
+        master_timeout: float = 10.0,
+        session_factory: Optional[async_sessionmaker] = None,
+        max_db_sessions: int = DB_POOL_SIZE
     ):
         """
         初始化跟單引擎
@@ -35,16 +45,35 @@ class FollowerEngine:
             db: 資料庫 session
             credential_service: 憑證服務
             poll_interval: 輪詢間隔（秒），預設 3 秒
+            max_concurrent_masters: 單輪同時處理的 Master 上限
+            master_timeout: 單一 Master 的處理時限（秒），本輪總耗時不超過 poll_interval
+            session_factory: 會話工廠（可選，預設與 db 使用同一個資料庫引擎）
+            max_db_sessions: 跟隨者交易同時持有的 session 上限，預設為連接池大小
         """
         self.db = db
         self.credential_service = credential_service
         self.poll_interval = poll_interval
+        self.max_concurrent_masters = max_concurrent_masters
+        self.master_timeout = master_timeout
+        self.session_factory = session_factory or async_sessionmaker(
+            db.bind, class_=AsyncSession, expire_on_commit=False
+        )
+        self.last_tick_stats: Optional[TickStats] = None
+        self._session_semaphore = asyncio.Semaphore(max_db_sessions)
         self.is_running = False
         self._task: Optional[asyncio.Task] = None
         
         # 追蹤上次檢查的倉位狀態（用於檢測變動）
         self._last_positions: Dict[Tuple[int, int, str], float] = {}
         
+        # 分發中途超時的倉位：(倉位大小, 跟隨關係 ID -> 下單任務)，下一輪沿用而不重新下單
+        self._partial_dispatches: Dict[
+            Tuple[int, int, str], Tuple[float, Dict[int, asyncio.Task]]
+        ] = {}
+        
+        # 進行中的跟隨者下單任務（不隨 Master 超時取消），停止時等待完成
+        self._trade_tasks: Set[asyncio.Task] = set()
+        
         logger.info(f"Follower Engine 初始化完成，輪詢間隔: {poll_interval} 秒")
     
     async def start(self):
@@ -69,6 +98,8 @@ class FollowerEngine:
                 await self._task
             except asyncio.CancelledError:
                 pass
+        if self._trade_tasks:
+            await asyncio.gather(*self._trade_tasks, return_exceptions=True)
         logger.info("Follower Engine 已停止")
     
     async def _monitoring_loop(self):
@@ -96,10 +127,15 @@ class FollowerEngine:
             # 等待下一輪
             await asyncio.sleep(self.poll_interval)
     
-    async def _check_and_follow_positions(self):
+    async def _check_and_follow_positions(self) -> TickStats:
         """
         檢查並執行跟單
         核心跟單邏輯 (Copy Logic)
+        
+        各 Master 以有限並行度同時處理，本輪總耗時不超過 poll_interval
+        
+        Returns:
+            本輪的 TickStats
         """
         # 獲取所有啟用的跟隨關係
         result = await self.db.execute(
@@ -109,7 +145,8 @@ class FollowerEngine:
         
         if not relationships:
             logger.debug("沒有啟用的跟隨關係")
-            return
+            self.last_tick_stats = TickStats()
+            return self.last_tick_stats
         
         logger.info(f"檢查 {len(relationships)} 個跟隨關係")
         
@@ -121,19 +158,36 @@ class FollowerEngine:
                 master_groups[key] = []
             master_groups[key].append(rel)
         
-        # 處理每個 Master 的倉位
-        for (master_user_id, master_credential_id), followers in master_groups.items():
-            try:
-                await self._process_master_positions(
-                    master_user_id,
-                    master_credential_id,
-                    followers
-                )
-            except Exception as e:
-                logger.error(
-                    f"處理 Master {master_user_id} 的倉位時發生錯誤: {str(e)}",
-                    exc_info=True
-                )
+        # 並行處理每個 Master 的倉位
+        stats = await run_masters_concurrently(
+            master_groups,
+            self._process_master_group,
+            max_concurrency=self.max_concurrent_masters,
+            master_timeout=self.master_timeout,
+            tick_budget=self.poll_interval
+        )
+        self.last_tick_stats = stats
+        
+        logger.info(
+            f"本輪處理 {stats.masters_total} 個 Master - "
+            f"完成: {stats.processed}, 跳過: {stats.skipped}, "
+            f"超時: {stats.timed_out}, 失敗: {stats.failed}, "
+            f"耗時: {stats.duration_ms}ms"
+        )
+        return stats
+    
+    async def _process_master_group(
+        self,
+        master_key: Tuple[int, int],
+        followers: List[FollowRelationship]
+    ):
+        """處理單個 Master（供並行排程呼叫）"""
+        master_user_id, master_credential_id = master_key
+        await self._process_master_positions(
+            master_user_id,
+            master_credential_id,
+            followers
+        )
     
     async def _process_master_positions(
         self,
@@ -149,16 +203,17 @@ class FollowerEngine:
             master_credential_id: Master 憑證 ID
             followers: 該 Master 的所有跟隨者
         """
-        # 獲取 Master 的所有倉位
-        result = await self.db.execute(
-            select(MasterPosition).where(
-                and_(
-                    MasterPosition.master_user_id == master_user_id,
-                    MasterPosition.master_credential_id == master_credential_id
+        # 獲取 Master 的所有倉位（讀取完即歸還連接，分發期間不佔用）
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(MasterPosition).where(
+                    and_(
+                        MasterPosition.master_user_id == master_user_id,
+                        MasterPosition.master_credential_id == master_credential_id
+                    )
                 )
             )
-        )
-        master_positions = result.scalars().all()
+            master_positions = result.scalars().all()
         
         if not master_positions:
             logger.debug(f"Master {master_user_id} 沒有倉位")
@@ -166,7 +221,7 @@ class FollowerEngine:
         
         logger.info(f"Master {master_user_id} 有 {len(master_positions)} 個倉位")
         
-        # 檢查每個倉位是否有變動
+        # 檢查每個倉位是否有變動（分發完成後才記錄倉位，超時被取消時下一輪重新分發）
         for position in master_positions:
             position_key = (master_user_id, master_credential_id, position.symbol)
             last_size = self._last_positions.get(position_key, None)
@@ -179,11 +234,11 @@ class FollowerEngine:
                     f"首次檢測到 Master {master_user_id} 的倉位: "
                     f"{position.symbol} = {current_size}"
                 )
-                self._last_positions[position_key] = current_size
                 
                 # 如果倉位不為 0，執行跟單
                 if current_size != 0:
                     await self._dispatch_signal_to_followers(position, followers)
+                self._last_positions[position_key] = current_size
                     
             elif last_size != current_size:
                 # 倉位發生變動
@@ -191,10 +246,10 @@ class FollowerEngine:
                     f"檢測到 Master {master_user_id} 倉位變動: "
                     f"{position.symbol} {last_size} -> {current_size}"
                 )
-                self._last_positions[position_key] = current_size
                 
                 # 執行跟單
                 await self._dispatch_signal_to_followers(position, followers)
+                self._last_positions[position_key] = current_size
             else:
                 # 倉位無變動
                 logger.debug(
@@ -210,6 +265,9 @@ class FollowerEngine:
         """
         分發信號給所有跟隨者 (Signal Dispatcher)
         
+        每個跟隨者的下單在獨立任務中執行，Master 超時只取消等待、不取消已送出的下單，
+        任務完成時照常寫入實際結果；下一輪同一倉位沿用這些任務（已完成或仍在進行），不重複下單
+        
         Args:
             master_position: Master 的倉位
             followers: 所有跟隨者
@@ -220,14 +278,30 @@ class FollowerEngine:
             f"Master 倉位: {master_position.position_size}"
         )
         
-        # 並行處理所有跟隨者
-        tasks = []
+        position_key = (
+            master_position.master_user_id,
+            master_position.master_credential_id,
+            master_position.symbol
+        )
+        dispatched_size, trade_tasks = self._partial_dispatches.get(position_key, (None, {}))
+        if dispatched_size != master_position.position_size:
+            trade_tasks = {}
+        self._partial_dispatches[position_key] = (master_position.position_size, trade_tasks)
+        
+        # 並行處理所有跟隨者（每個跟隨者使用獨立 session）
         for follower in followers:
-            task = self._execute_follower_trade(follower, master_position)
-            tasks.append(task)
+            if follower.id not in trade_tasks:
+                task = asyncio.create_task(self._execute_follower_trade(follower, master_position))
+                self._trade_tasks.add(task)
+                task.add_done_callback(self._trade_tasks.discard)
+                trade_tasks[follower.id] = task
         
-        # 等待所有跟單完成
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # 等待所有跟單完成（超時被取消時下單任務繼續執行）
+        results = await asyncio.gather(
+            *(asyncio.shield(trade_tasks[follower.id]) for follower in followers),
+            return_exceptions=True
+        )
+        del self._partial_dispatches[position_key]
         
         # 統計結果
         success_count = sum(1 for r in results if r is True)
@@ -243,10 +317,27 @@ class FollowerEngine:
         master_position: MasterPosition
     ) -> bool:
         """
-        執行跟隨者交易 (同步下單)
+        執行跟隨者交易
+        使用獨立的 session，並以信號量限制同時持有的 session 數量
+        """
+        async with self._session_semaphore:
+            async with self.session_factory() as session:
+                return await self._execute_follower_trade_in_session(
+                    session, relationship, master_position
+                )
+    
+    async def _execute_follower_trade_in_session(
+        self,
+        session: AsyncSession,
+        relationship: FollowRelationship,
+        master_position: MasterPosition
+    ) -> bool:
+        """
+        在指定 session 中執行跟隨者交易 (同步下單)
         包含完整的 try-except 保護和滑價預估
         
         Args:
+            session: 資料庫 session
             relationship: 跟隨關係
             master_position: Master 倉位
             
@@ -301,9 +392,9 @@ class FollowerEngine:
             master_position_size=master_position.position_size,
             status="pending"
         )
-        self.db.add(trade)
-        await self.db.commit()
-        await self.db.refresh(trade)
+        session.add(trade)
+        await session.commit()
+        await session.refresh(trade)
         
         # 初始化 trade_log
         trade_log = TradeLog(
@@ -324,9 +415,9 @@ class FollowerEngine:
             status="pending",
             is_success=False
         )
-        self.db.add(trade_log)
-        await self.db.commit()
-        await self.db.refresh(trade_log)
+        session.add(trade_log)
+        await session.commit()
+        await session.refresh(trade_log)
         
         try:
             # 獲取跟隨者的解密憑證
@@ -341,17 +432,19 @@ class FollowerEngine:
             
             logger.debug(f"[跟隨者 {relationship.follower_user_id}] 憑證解密成功")
             
-            # 創建 MockExchange 實例
-            logger.debug(f"[跟隨者 {relationship.follower_user_id}] 創建 MockExchange 實例...")
-            exchange = MockExchange(
-                api_key=decrypted_cred['api_key'],
-                api_secret=decrypted_cred['api_secret'],
-                passphrase=decrypted_cred.get('passphrase')
+            # 獲取共用的 MockExchange 實例
+            logger.debug(f"[跟隨者 {relationship.follower_user_id}] 獲取 MockExchange 實例...")
+            exchange = get_exchange_client_registry().get_client(
+                'mock',
+                decrypted_cred['api_key'],
+                decrypted_cred['api_secret'],
+                decrypted_cred.get('passphrase'),
+                credential_id=relationship.follower_credential_id
             )
             
             # 執行下單（同步下單）
             logger.info(f"[跟隨者 {relationship.follower_user_id}] 執行下單...")
-            order = exchange.create_order(
+            order = await exchange.create_order(
                 symbol=master_position.symbol,
                 order_type="market",
                 side=side,
@@ -384,7 +477,8 @@ class FollowerEngine:
             trade_log.is_success = True
             trade_log.execution_time_ms = execution_time_ms
             
-            await self.db.commit()
+            await session.commit()
+            get_dashboard_cache().bump_user(relationship.follower_user_id)
             
             logger.info(
                 f"[跟隨者 {relationship.follower_user_id}] 跟單成功 - "
@@ -414,7 +508,8 @@ class FollowerEngine:
             trade_log.error_message = str(e)
             trade_log.execution_time_ms = execution_time_ms
             
-            await self.db.commit()
+            await session.commit()
+            get_dashboard_cache().bump_user(relationship.follower_user_id)
             
             logger.error(
                 f"[跟隨者 {relationship.follower_user_id}] 跟單失敗 - "
@@ -473,10 +568,20 @@ class FollowerEngine:
             self.db.add(position)
         
         await self.db.commit()
+        get_dashboard_cache().bump_master(master_user_id, master_credential_id)
+        get_signal_bus().publish_dashboard_event(
+            MASTER_POSITION_EVENT, master_position_event(position),
+            master_key=(master_user_id, master_credential_id)
+        )
         logger.info(
             f"Master 倉位已更新 - 用戶: {master_user_id}, "
             f"交易對: {symbol}, 倉位: {position_size}"
         )
+        
+        # 發佈倉位變動信號，喚醒訂閱中的跟單引擎
+        get_signal_bus().publish_master_position(
+            master_user_id, master_credential_id, symbol, position_size
+        )
 
 
 # 全域引擎實例
@@ -493,6 +598,8 @@ def get_follower_engine(
         _follower_engine_instance = FollowerEngine(
             db=db,
             credential_service=credential_service,
-            poll_interval=3  # 3 秒輪詢
+            poll_interval=3,  # 3 秒輪詢
+            max_concurrent_masters=app_settings.ENGINE_MAX_CONCURRENT_MASTERS,
+            master_timeout=app_settings.ENGINE_MASTER_TIMEOUT_SECONDS
         )
     return _follower_engine_instance
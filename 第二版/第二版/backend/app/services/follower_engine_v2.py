@@ -4,28 +4,75 @@ Follower Engine Service V2 (使用 FollowSettings)
 支援用戶級別的跟單配置和錯誤處理
 """
 import asyncio
-import logging
 import json
-from typing import Dict, List, Optional, Tuple, Any
-from datetime import datetime
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+import logging
+import time
+from dataclasses import astuple
+from typing import Dict, List, Mapping, Optional, Sequence, Set, Tuple, Any
+from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import select, and_, or_
 
-from backend.app.models.follow_settings import FollowSettings
+from backend.app.config import settings as app_settings
+from backend.app.database import DB_POOL_SIZE
 from backend.app.models.master_position import MasterPosition
 from backend.app.models.follower_position import FollowerPosition
 from backend.app.models.trade_history import TradeHistory
-from backend.app.models.trade_log import TradeLog
 from backend.app.models.trade_error import TradeError
 from backend.app.models.user import User
 from backend.app.services.credential_service import CredentialService
-from backend.app.services.exchanges.mock_exchange import MockExchange
+from backend.app.services.exchanges.client_registry import (
+    ExchangeClientRegistry,
+    get_exchange_client_registry,
+)
+from backend.app.services.exchanges.circuit_breaker import CircuitOpenError
+from backend.app.services.exchanges.errors import is_duplicate_order_error, is_transient_error
+from backend.app.services.exchanges.market_cache import (
+    MarketMetadataCache,
+    get_market_metadata_cache,
+)
 from backend.app.repositories.trade_error_repository import TradeErrorRepository
 from backend.app.repositories.follower_position_repository import FollowerPositionRepository
+from backend.app.repositories.engine_checkpoint_repository import EngineCheckpointRepository
 from backend.app.services.notifier import get_notifier_service
+from backend.app.services.master_scheduler import TickStats, run_masters_concurrently
+from backend.app.services.order_coalescer import OrderCoalescer
+from backend.app.services.order_retry import OrderRetryQueue, client_order_id, signal_id
+from backend.app.services.trade_persistence import FollowerTradeOutcome, TradePersistence
+from backend.app.services.subscription_index import (
+    FollowerEntry,
+    SubscriptionIndex,
+    get_subscription_index,
+)
+from backend.app.services.dashboard_cache import DashboardCache, get_dashboard_cache
+from backend.app.services.dashboard_stream import (
+    ENGINE_STATUS_EVENT,
+    ERROR_EVENT,
+    MASTER_POSITION_EVENT,
+    POSITION_EVENT,
+    SETTINGS_EVENT,
+    TRADE_EVENT,
+    master_position_event,
+)
+from backend.app.services.global_settings import (
+    EMERGENCY_STOP_KEY,
+    GlobalSettingsCache,
+    get_global_settings,
+)
+from backend.app.services.signal_bus import (
+    SignalBus,
+    Subscription,
+    CONFIG_TOPIC,
+    GlobalSettingSignal,
+    MASTER_POSITION_TOPIC,
+    get_signal_bus,
+)
 
 logger = logging.getLogger(__name__)
 
+# 對帳時視為已同步的倉位差異（浮點誤差）；實際的最小下單量由交易所市場規格決定
+SIZE_EPSILON = 1e-9
+
 
 class FollowerEngineV2:
     """跟單核心引擎 V2 (使用 FollowSettings)"""
@@ -34,9 +81,28 @@ class FollowerEngineV2:
         self,
         db: AsyncSession,
         credential_service: CredentialService,
-        poll_interval: int = 3,
+        poll_interval: int = 30,
         telegram_bot_token: Optional[str] = None,
-        telegram_chat_id: Optional[str] = None
+        telegram_chat_id: Optional[str] = None,
+        signal_bus: Optional[SignalBus] = None,
+        event_driven: bool = True,
+        max_concurrent_masters: int = 8,
+        master_timeout: float = 10.0,
+        session_factory: Optional[async_sessionmaker] = None,
+        max_db_sessions: int = DB_POOL_SIZE,
+        subscription_index: Optional[SubscriptionIndex] = None,
+        watermark_lookback: float = 2.0,
+        checkpoint_name: str = "follower_engine_v2",
+        checkpoint_interval: float = 5.0,
+        warm_credential_cache: bool = False,
+        client_registry: Optional[ExchangeClientRegistry] = None,
+        coalesce_window: float = 0.0,
+        order_retry_attempts: int = 3,
+        order_retry_base_delay: float = 0.5,
+        order_retry_queue_size: int = 1000,
+        market_cache: Optional[MarketMetadataCache] = None,
+        global_settings: Optional[GlobalSettingsCache] = None,
+        dashboard_cache: Optional[DashboardCache] = None
     ):
         """
         初始化跟單引擎
@@ -44,15 +110,73 @@ class FollowerEngineV2:
         Args:
             db: 資料庫 session
             credential_service: 憑證服務
-            poll_interval: 輪詢間隔（秒），預設 3 秒
+            poll_interval: 安全掃描間隔（秒），預設 30 秒；
+                事件驅動模式下引擎由信號匯流排即時喚醒，輪詢僅作為兜底
             telegram_bot_token: Telegram Bot Token（可選）
             telegram_chat_id: Telegram Chat ID（可選）
+            signal_bus: 信號匯流排（可選，預設使用全域實例）
+            event_driven: 是否訂閱 Master 倉位信號；False 時退回純輪詢
+            max_concurrent_masters: 單輪同時處理的 Master 上限
+            master_timeout: 單一 Master 的處理時限（秒），本輪總耗時不超過 poll_interval
+            session_factory: 會話工廠（可選，預設與 db 使用同一個資料庫引擎），
+                每個 Master 讀取倉位及每次分發的讀寫都使用獨立的 session
+            max_db_sessions: 分發讀寫同時持有的 session 上限，預設為連接池大小，
+                溢出連接留給 API 請求與 Master 讀取
+            subscription_index: Master → 跟隨者索引（可選，預設使用全域實例）
+            watermark_lookback: 變動查詢的回看窗口（秒），容許提交順序與時間戳不一致；
+                0 表示嚴格依 (last_updated, id) 水位線查詢
+            checkpoint_name: 檢查點名稱，同一資料庫中的多個引擎需使用不同名稱
+            checkpoint_interval: 保存檢查點的最小間隔（秒），停止時一定會保存
+            warm_credential_cache: 啟動時是否預載所有跟隨者的解密憑證
+            client_registry: 交易所客戶端註冊表（可選，預設使用全域實例）
+            coalesce_window: 下單合併窗口（秒），同一 (Master, 交易對) 在窗口內的
+                多次變動合併為一次對帳；0 表示每次變動立即分發
+            order_retry_attempts: 暫時性下單失敗的最大重試次數，用盡後才停止該跟隨者
+            order_retry_base_delay: 第一次重試的退避上限（秒），之後每次加倍並隨機抖動
+            order_retry_queue_size: 重試佇列容量
+            market_cache: 交易所市場規格快取（可選，預設使用全域實例），
+                下單前依規格取整數量並丟棄低於最小值的訂單
+            global_settings: 全域設定快取（可選，預設使用全域實例），
+                緊急全停期間不分發、不重試，啟動時立即取消佇列中的下單
+            dashboard_cache: 儀表板摘要快取（可選，預設使用全域實例），
+                寫入跟隨者交易或 Master 倉位後遞增對應的版本號
         """
         self.db = db
         self.credential_service = credential_service
         self.poll_interval = poll_interval
+        self.event_driven = event_driven
+        self.signal_bus = signal_bus or get_signal_bus()
+        self.max_concurrent_masters = max_concurrent_masters
+        self.master_timeout = master_timeout
+        self.session_factory = session_factory or async_sessionmaker(
+            db.bind, class_=AsyncSession, expire_on_commit=False
+        )
+        self.last_tick_stats: Optional[TickStats] = None
+        self._session_semaphore = asyncio.Semaphore(max_db_sessions)
+        self.subscription_index = subscription_index or get_subscription_index()
+        self.watermark_lookback = watermark_lookback
+        self.checkpoint_name = checkpoint_name
+        self.checkpoint_interval = checkpoint_interval
+        self.warm_credential_cache = warm_credential_cache
+        self.client_registry = (
+            client_registry if client_registry is not None else get_exchange_client_registry()
+        )
+        self.market_cache = (
+            market_cache if market_cache is not None else get_market_metadata_cache()
+        )
+        self.global_settings = global_settings or get_global_settings()
+        self.dashboard_cache = dashboard_cache if dashboard_cache is not None else get_dashboard_cache()
+        self.coalescer = OrderCoalescer(coalesce_window)
+        self.retry_queue = OrderRetryQueue(
+            max_size=order_retry_queue_size,
+            max_attempts=order_retry_attempts,
+            base_delay=order_retry_base_delay
+        )
         self.is_running = False
         self._task: Optional[asyncio.Task] = None
+        self._subscription: Optional[Subscription] = None
+        self._settings_subscription: Optional[Subscription] = None
+        self._settings_task: Optional[asyncio.Task] = None
         
         # 初始化通知服務
         self.notifier = get_notifier_service(telegram_bot_token, telegram_chat_id)
@@ -60,7 +184,28 @@ class FollowerEngineV2:
         # 追蹤上次檢查的倉位狀態
         self._last_positions: Dict[Tuple[int, int, str], float] = {}
         
-        logger.info(f"Follower Engine V2 初始化完成，輪詢間隔: {poll_interval} 秒")
+        # 倉位變動水位線 (last_updated, id)，以及上一輪未完成的 Master
+        self._watermark: Optional[Tuple[datetime, int]] = None
+        self._retry_masters: Set[Tuple[int, int]] = set()
+        
+        # 緊急全停時被取消的下單，解除後即使倉位未變也重新對帳
+        self._resync_positions: Set[Tuple[int, int, str]] = set()
+        
+        # 已對帳的跟單設定；之後才出現（新訂閱或設定變更）的跟隨者，所屬 Master 會完整重讀並補上對帳
+        # （None 表示沒有檢查點：以首次看到的索引為準，由首輪的倉位狀態負責）
+        self._synced_followers: Optional[Set[FollowerEntry]] = None
+        
+        # 檢查點狀態：上述狀態變動後標記為待保存
+        self._checkpoint_dirty = False
+        self._last_checkpoint_at: float = 0.0
+        
+        # 進行中的通知任務，停止時等待完成
+        self._notification_tasks: Set[asyncio.Task] = set()
+        
+        logger.info(
+            f"Follower Engine V2 初始化完成，安全掃描間隔: {poll_interval} 秒，"
+            f"事件驅動: {event_driven}，Master 並行上限: {max_concurrent_masters}"
+        )
         if telegram_bot_token and telegram_chat_id:
             logger.info("Telegram 通知已啟用")
         else:
@@ -73,7 +218,17 @@ class FollowerEngineV2:
             return
         
         self.is_running = True
+        await self.restore_checkpoint()
+        await self._load_subscription_index()
+        await self._refresh_global_settings()
+        if self.warm_credential_cache:
+            await self._warm_credential_cache()
+        if self.event_driven:
+            self._subscription = self.signal_bus.subscribe(MASTER_POSITION_TOPIC)
+        self._settings_subscription = self.signal_bus.subscribe(CONFIG_TOPIC)
+        self._settings_task = asyncio.create_task(self._watch_global_settings())
         self._task = asyncio.create_task(self._monitoring_loop())
+        self._publish_engine_status()
         logger.info(f"Follower Engine V2 已啟動")
     
     async def stop(self):
@@ -88,18 +243,186 @@ class FollowerEngineV2:
                 await self._task
             except asyncio.CancelledError:
                 pass
+        if self._settings_task:
+            self._settings_task.cancel()
+            await asyncio.gather(self._settings_task, return_exceptions=True)
+            self._settings_task = None
+        if self._subscription:
+            self._subscription.close()
+            self._subscription = None
+        if self._settings_subscription:
+            self._settings_subscription.close()
+            self._settings_subscription = None
+        await self.drain_notifications()
+        if self._checkpoint_dirty:
+            await self.save_checkpoint()
+        self._publish_engine_status()
         logger.info("Follower Engine V2 已停止")
     
+    async def drain_notifications(self):
+        """等待進行中的通知任務完成"""
+        if self._notification_tasks:
+            await asyncio.gather(*self._notification_tasks, return_exceptions=True)
+    
+    def _spawn_notification(self, coro):
+        """在背景發送通知（不阻塞主流程）"""
+        task = asyncio.create_task(coro)
+        self._notification_tasks.add(task)
+        task.add_done_callback(self._notification_tasks.discard)
+    
+    async def restore_checkpoint(self) -> bool:
+        """
+        從檢查點恢復倉位變動偵測狀態
+        
+        引擎已有狀態時（同一實例重新啟動）不覆蓋
+        
+        Returns:
+            是否已恢復
+        """
+        if self._last_positions or self._watermark is not None:
+            return False
+        
+        try:
+            async with self.session_factory() as session:
+                checkpoint = await EngineCheckpointRepository(session).get(self.checkpoint_name)
+        except Exception as e:
+            logger.error(f"讀取引擎檢查點失敗，將從頭偵測倉位變動: {str(e)}")
+            return False
+        
+        if checkpoint is None:
+            logger.info("沒有引擎檢查點，將從頭偵測倉位變動")
+            return False
+        
+        state = json.loads(checkpoint.state)
+        self._last_positions = {
+            (master_user_id, master_credential_id, symbol): size
+            for master_user_id, master_credential_id, symbol, size in state["last_positions"]
+        }
+        if state.get("watermark"):
+            watermark_ts, watermark_id = state["watermark"]
+            self._watermark = (datetime.fromisoformat(watermark_ts), watermark_id)
+        self._retry_masters = {tuple(key) for key in state.get("retry_masters", [])}
+        if state.get("synced_followers") is not None:
+            self._synced_followers = {FollowerEntry(*fields) for fields in state["synced_followers"]}
+        self._last_checkpoint_at = time.monotonic()
+        
+        logger.info(
+            f"已從檢查點恢復 {len(self._last_positions)} 個倉位狀態，"
+            f"水位線: {self._watermark}"
+        )
+        return True
+    
+    async def save_checkpoint(self):
+        """保存倉位變動偵測狀態到檢查點"""
+        state = {
+            "last_positions": [
+                [master_user_id, master_credential_id, symbol, size]
+                for (master_user_id, master_credential_id, symbol), size in self._last_positions.items()
+            ],
+            "watermark": (
+                [self._watermark[0].isoformat(), self._watermark[1]]
+                if self._watermark is not None else None
+            ),
+            "retry_masters": [list(key) for key in self._retry_masters],
+            "synced_followers": (
+                sorted(astuple(entry) for entry in self._synced_followers)
+                if self._synced_followers is not None else None
+            ),
+        }
+        
+        try:
+            async with self.session_factory() as session:
+                await EngineCheckpointRepository(session).save(self.checkpoint_name, json.dumps(state))
+                await session.commit()
+        except Exception as e:
+            logger.error(f"保存引擎檢查點失敗: {str(e)}")
+            return
+        
+        self._checkpoint_dirty = False
+        self._last_checkpoint_at = time.monotonic()
+        logger.debug(f"引擎檢查點已保存，{len(self._last_positions)} 個倉位狀態")
+    
+    async def _maybe_save_checkpoint(self):
+        """狀態有變動且距上次保存超過間隔時保存檢查點"""
+        if not self._checkpoint_dirty:
+            return
+        if time.monotonic() - self._last_checkpoint_at < self.checkpoint_interval:
+            return
+        await self.save_checkpoint()
+    
+    async def _load_subscription_index(self):
+        """從資料庫建立 Master → 跟隨者索引"""
+        async with self.session_factory() as session:
+            await self.subscription_index.load(session)
+    
+    async def _refresh_global_settings(self):
+        """載入全域設定（超過重新載入間隔時才查詢資料庫）"""
+        async with self.session_factory() as session:
+            await self.global_settings.ensure_fresh(session)
+    
+    async def _watch_global_settings(self):
+        """緊急全停啟動時立即取消佇列中的下單（不等待監控循環醒來）"""
+        while True:
+            signals = await self._settings_subscription.get_batch()
+            overflowed = self._settings_subscription.consume_overflow()
+            if not overflowed and not any(
+                isinstance(s, GlobalSettingSignal) and s.key == EMERGENCY_STOP_KEY for s in signals
+            ):
+                continue
+            if self.global_settings.emergency_stop:
+                self._cancel_queued_orders()
+            else:
+                logger.info("緊急全停已解除，恢復跟單")
+            self._publish_engine_status()
+    
+    def _cancel_queued_orders(self):
+        """取消重試佇列中的下單，緊急全停解除後重新對帳這些倉位"""
+        cancelled = self.retry_queue.cancel_all()
+        self._defer_until_resume(item.master_position for item in cancelled)
+        logger.warning(f"🚨 緊急全停：已取消 {len(cancelled)} 筆等待中的下單")
+    
+    def _defer_until_resume(self, master_positions):
+        """標記倉位在緊急全停解除後重新對帳（所屬 Master 下一輪完整重讀）"""
+        for position in master_positions:
+            position_key = (position.master_user_id, position.master_credential_id, position.symbol)
+            self._resync_positions.add(position_key)
+            self._retry_masters.add(position_key[:2])
+            self._checkpoint_dirty = True
+    
+    async def _warm_credential_cache(self):
+        """預載索引中所有跟隨者的解密憑證，失敗時只記錄警告"""
+        credentials = {
+            (entry.follower_credential_id, entry.user_id)
+            for entries in self.subscription_index.snapshot().values()
+            for entry in entries
+        }
+        try:
+            await self.credential_service.warm_credential_cache(credentials)
+        except Exception as e:
+            logger.warning(f"預載跟隨者憑證失敗: {e}")
+    
     async def _monitoring_loop(self):
-        """監控循環"""
+        """
+        監控循環
+        
+        啟動時先讀取全部倉位建立水位線，之後等待 Master 倉位信號；
+        每輪只查詢水位線之後變動的倉位；等待逾時或信號溢出時執行安全掃描，
+        不受水位線限制重讀全部倉位，補上提交時間晚於回看窗口而被變動查詢跳過的更新
+        """
         logger.info("監控循環已啟動")
+        master_keys: Optional[Set[Tuple[int, int]]] = None
         
         while self.is_running:
             try:
                 loop_start = datetime.utcnow()
-                logger.debug(f"[{loop_start.strftime('%H:%M:%S')}] 開始新一輪監控檢查")
+                logger.debug(
+                    f"[{loop_start.strftime('%H:%M:%S')}] 開始新一輪監控檢查 - "
+                    f"{'安全掃描' if master_keys is None else f'信號喚醒 {len(master_keys)} 個 Master'}"
+                )
                 
-                await self._check_and_follow_positions()
+                await self._check_and_follow_positions(full_scan=master_keys is None)
+                await self._process_due_retries()
+                await self._maybe_save_checkpoint()
                 
                 loop_end = datetime.utcnow()
                 duration = (loop_end - loop_start).total_seconds()
@@ -108,69 +431,253 @@ class FollowerEngineV2:
             except Exception as e:
                 logger.error(f"監控循環發生錯誤: {str(e)}", exc_info=True)
             
-            await asyncio.sleep(self.poll_interval)
+            master_keys = await self._wait_for_signals()
     
-    async def _check_and_follow_positions(self):
-        """檢查並執行跟單"""
-        # 獲取所有啟用的跟單設定
-        result = await self.db.execute(
-            select(FollowSettings).where(FollowSettings.is_active == True)
-        )
-        settings_list = result.scalars().all()
+    async def _wait_for_signals(self) -> Optional[Set[Tuple[int, int]]]:
+        """
+        等待下一輪觸發
+        
+        Returns:
+            發出信號的 (master_user_id, master_credential_id) 集合；
+            None 表示等待逾時或信號溢出（安全掃描）
+        """
+        # 有進行中的合併窗口或待重試的下單時，最遲在到期時醒來處理
+        # （緊急全停期間不處理，解除後由下一個信號或安全掃描恢復）
+        timeout = self.poll_interval
+        if not self.global_settings.emergency_stop:
+            for due_in in (self.coalescer.seconds_until_due(), self.retry_queue.seconds_until_due()):
+                if due_in is not None:
+                    timeout = min(timeout, due_in)
+        
+        if self._subscription is None:
+            await asyncio.sleep(timeout)
+            return None
+        
+        signals = await self._subscription.get_batch(timeout=timeout)
+        if not signals or self._subscription.consume_overflow():
+            return None
+        
+        return {(s.master_user_id, s.master_credential_id) for s in signals}
+    
+    async def _check_and_follow_positions(self, full_scan: bool = False) -> TickStats:
+        """
+        檢查並執行跟單
+        
+        以單一查詢取得水位線之後變動的倉位，只處理有變動的 Master；
+        各 Master 以有限並行度同時處理，每個 Master 有獨立時限，
+        本輪總耗時不超過 poll_interval
+        
+        Args:
+            full_scan: 安全掃描，忽略水位線讀取全部倉位（大小未變的倉位會被略過）
+            
+        Returns:
+            本輪的 TickStats
+        """
+        if not self.subscription_index.is_loaded:
+            await self._load_subscription_index()
+        
+        # 緊急全停期間不查詢倉位也不推進水位線，解除後的第一輪涵蓋期間的所有變動
+        await self._refresh_global_settings()
+        if self.global_settings.emergency_stop:
+            logger.debug("緊急全停中，跳過本輪跟單")
+            self.last_tick_stats = TickStats()
+            return self.last_tick_stats
+        
+        # 從索引快照取得按 Master 分組的跟單設定（快照不會被修改，無需加鎖）
+        snapshot = self.subscription_index.snapshot()
+        joined = self._collect_unsynced_followers(snapshot)
         
-        if not settings_list:
+        if not snapshot:
             logger.debug("沒有啟用的跟單設定")
-            return
+            self.last_tick_stats = TickStats()
+            return self.last_tick_stats
         
-        logger.info(f"檢查 {len(settings_list)} 個跟單設定")
+        # 查詢變動的倉位並按 Master 分組
+        async with self.session_factory() as session:
+            changed = await self._fetch_changed_positions(session, full_scan=full_scan)
         
-        # 按 Master 分組處理
-        master_groups: Dict[Tuple[int, int], List[FollowSettings]] = {}
-        for settings in settings_list:
-            key = (settings.master_user_id, settings.master_credential_id)
-            if key not in master_groups:
-                master_groups[key] = []
-            master_groups[key].append(settings)
+        changed_by_master: Dict[Tuple[int, int], List[MasterPosition]] = {}
+        for position in changed:
+            key = (position.master_user_id, position.master_credential_id)
+            changed_by_master.setdefault(key, []).append(position)
         
-        # 處理每個 Master 的倉位
-        for (master_user_id, master_credential_id), followers in master_groups.items():
-            try:
-                await self._process_master_positions(
-                    master_user_id,
-                    master_credential_id,
-                    followers
+        # 有變動的 Master，加上上一輪未完成或有新跟隨者、需要完整重讀的 Master
+        unfinished = self._retry_masters
+        master_groups: Dict[Tuple[int, int], List[FollowerEntry]] = {
+            key: list(snapshot[key])
+            for key in set(changed_by_master) | unfinished | set(joined)
+            if key in snapshot
+        }
+        # 先全部標記為未完成，處理完成的 Master 會被移出
+        self._retry_masters = set(master_groups)
+        
+        logger.info(
+            f"{'安全掃描讀取' if full_scan else '變動查詢取得'} {len(changed)} 個倉位，"
+            f"檢查 {len(master_groups)} 個 Master 的 "
+            f"{sum(len(f) for f in master_groups.values())} 個跟單設定"
+        )
+        
+        async def process(master_key: Tuple[int, int], followers: List[FollowerEntry]):
+            full_read = master_key in unfinished or master_key in joined
+            positions = None if full_read else changed_by_master.get(master_key)
+            await self._process_master_group(master_key, followers, positions, joined.get(master_key, []))
+        
+        # 並行處理每個 Master 的倉位
+        stats = await run_masters_concurrently(
+            master_groups,
+            process,
+            max_concurrency=self.max_concurrent_masters,
+            master_timeout=self.master_timeout,
+            tick_budget=self.poll_interval
+        )
+        self.last_tick_stats = stats
+        if unfinished != self._retry_masters:
+            self._checkpoint_dirty = True
+        
+        logger.info(
+            f"本輪處理 {stats.masters_total} 個 Master - "
+            f"完成: {stats.processed}, 跳過: {stats.skipped}, "
+            f"超時: {stats.timed_out}, 失敗: {stats.failed}, "
+            f"耗時: {stats.duration_ms}ms"
+        )
+        return stats
+    
+    def _collect_unsynced_followers(
+        self,
+        snapshot: Mapping[Tuple[int, int], Tuple[FollowerEntry, ...]]
+    ) -> Dict[Tuple[int, int], List[FollowerEntry]]:
+        """
+        找出尚未對帳的跟單設定，按 Master 分組
+        
+        新跟隨者所跟隨 Master 的倉位可能早已在水位線之前，只查詢變動不會涵蓋；
+        已對帳的設定保存在檢查點，停機期間新增或變更的設定重啟後同樣視為尚未對帳。
+        沒有檢查點時引擎第一次看到的索引視為已對帳（首輪把所有倉位視為首次出現並分發）
+        """
+        current = {entry for entries in snapshot.values() for entry in entries}
+        if self._synced_followers is None:
+            self._synced_followers = current
+            self._checkpoint_dirty = True
+        elif not self._synced_followers <= current:
+            self._synced_followers &= current
+            self._checkpoint_dirty = True
+        
+        joined: Dict[Tuple[int, int], List[FollowerEntry]] = {}
+        for entry in current - self._synced_followers:
+            joined.setdefault(entry.master_key, []).append(entry)
+        return joined
+    
+    async def _fetch_changed_positions(
+        self,
+        session: AsyncSession,
+        full_scan: bool = False
+    ) -> List[MasterPosition]:
+        """
+        查詢水位線之後變動的 Master 倉位（所有 Master 共用一次查詢）
+        
+        水位線為 (last_updated, id)；設定回看窗口時改為重讀窗口內的倉位，
+        避免較晚提交但時間戳較早的更新被跳過，重讀的倉位會因大小未變而略過。
+        提交延遲超過回看窗口的更新只能由 full_scan（讀取全部倉位）補上
+        """
+        stmt = select(MasterPosition).order_by(MasterPosition.last_updated, MasterPosition.id)
+        
+        if self._watermark is not None and not full_scan:
+            watermark_ts, watermark_id = self._watermark
+            if self.watermark_lookback > 0:
+                stmt = stmt.where(
+                    MasterPosition.last_updated >= watermark_ts - timedelta(seconds=self.watermark_lookback)
                 )
-            except Exception as e:
-                logger.error(
-                    f"處理 Master {master_user_id} 的倉位時發生錯誤: {str(e)}",
-                    exc_info=True
+            else:
+                stmt = stmt.where(
+                    or_(
+                        MasterPosition.last_updated > watermark_ts,
+                        and_(
+                            MasterPosition.last_updated == watermark_ts,
+                            MasterPosition.id > watermark_id
+                        )
+                    )
                 )
+        
+        result = await session.execute(stmt)
+        positions = list(result.scalars().all())
+        
+        if positions:
+            latest = positions[-1]
+            latest_key = (latest.last_updated, latest.id)
+            if self._watermark is None or latest_key > self._watermark:
+                self._watermark = latest_key
+                self._checkpoint_dirty = True
+        
+        return positions
+    
+    async def _process_master_group(
+        self,
+        master_key: Tuple[int, int],
+        followers: List[FollowerEntry],
+        positions: Optional[List[MasterPosition]] = None,
+        joined: Sequence[FollowerEntry] = ()
+    ):
+        """
+        處理單個 Master（供並行排程呼叫），完成後移出重試集合、新跟隨者標記為已對帳
+        
+        仍有合併窗口未結束或因緊急全停中止分發的 Master 保留在重試集合，下一輪完整重讀後分發
+        """
+        master_user_id, master_credential_id = master_key
+        completed = await self._process_master_positions(
+            master_user_id,
+            master_credential_id,
+            followers,
+            positions,
+            joined
+        )
+        if completed and joined:
+            self._synced_followers.update(joined)
+            self._checkpoint_dirty = True
+        if completed and not self.coalescer.has_pending(master_key):
+            self._retry_masters.discard(master_key)
     
     async def _process_master_positions(
         self,
         master_user_id: int,
         master_credential_id: int,
-        followers: List[FollowSettings]
-    ):
-        """處理單個 Master 的所有倉位"""
-        # 獲取 Master 的所有倉位
-        result = await self.db.execute(
-            select(MasterPosition).where(
-                and_(
-                    MasterPosition.master_user_id == master_user_id,
-                    MasterPosition.master_credential_id == master_credential_id
+        followers: List[FollowerEntry],
+        positions: Optional[List[MasterPosition]] = None,
+        joined: Sequence[FollowerEntry] = ()
+    ) -> bool:
+        """
+        處理單個 Master 的倉位
+        
+        Args:
+            positions: 本輪變動的倉位；None 表示讀取該 Master 的全部倉位
+            joined: 尚未對帳的新跟隨者，倉位未變動時也對這些跟隨者分發
+            
+        Returns:
+            False 表示因緊急全停中止分發（不記錄倉位，下一輪重新對帳）
+        """
+        master_positions = positions
+        if master_positions is None:
+            # 獲取 Master 的所有倉位（讀取完即歸還連接，分發期間不佔用）
+            async with self.session_factory() as session:
+                result = await session.execute(
+                    select(MasterPosition).where(
+                        and_(
+                            MasterPosition.master_user_id == master_user_id,
+                            MasterPosition.master_credential_id == master_credential_id
+                        )
+                    )
                 )
-            )
-        )
-        master_positions = result.scalars().all()
+                master_positions = result.scalars().all()
         
         if not master_positions:
             logger.debug(f"Master {master_user_id} 沒有倉位")
-            return
+            return True
         
-        logger.info(f"Master {master_user_id} 有 {len(master_positions)} 個倉位")
+        logger.info(f"Master {master_user_id} 有 {len(master_positions)} 個倉位需要檢查")
         
-        # 檢查每個倉位是否有變動
+        # 檢查每個倉位是否有變動，變動的倉位合併為一次分發
+        changed: List[MasterPosition] = []
+        unchanged: List[MasterPosition] = []
+        observed: Dict[Tuple[int, int, str], float] = {}
+        now = time.monotonic()
         for position in master_positions:
             position_key = (master_user_id, master_credential_id, position.symbol)
             last_size = self._last_positions.get(position_key, None)
@@ -182,134 +689,410 @@ class FollowerEngineV2:
                     f"首次檢測到 Master {master_user_id} 的倉位: "
                     f"{position.symbol} = {current_size}"
                 )
-                self._last_positions[position_key] = current_size
-                
-                if current_size != 0:
-                    await self._dispatch_signal_to_followers(position, followers)
+                if current_size == 0:
+                    observed[position_key] = current_size
+                    continue
                     
             elif last_size != current_size:
                 logger.info(
                     f"檢測到 Master {master_user_id} 倉位變動: "
                     f"{position.symbol} {last_size} -> {current_size}"
                 )
-                self._last_positions[position_key] = current_size
-                await self._dispatch_signal_to_followers(position, followers)
+            
+            elif position_key in self._resync_positions:
+                logger.info(
+                    f"緊急全停解除，重新對帳 Master {master_user_id} 的倉位: "
+                    f"{position.symbol} = {current_size}"
+                )
+            
+            else:
+                # 窗口內倉位回到原大小，淨變動為零
+                self.coalescer.discard(position_key, len(followers))
+                unchanged.append(position)
+                continue
+            
+            # 合併窗口尚未結束，延後到窗口結束時以最新倉位分發
+            if self.coalescer.hold(position_key, current_size, now):
+                continue
+            changed.append(position)
+            observed[position_key] = current_size
+        
+        if changed and not await self._dispatch_signals_to_followers(changed, followers):
+            return False
+        
+        # 新跟隨者補上未變動倉位的對帳（已同步的倉位不會下單）
+        if joined and unchanged and not await self._dispatch_signals_to_followers(unchanged, list(joined)):
+            return False
+        
+        # 分發完成後才記錄倉位、關閉合併窗口，超時被取消時下一輪會重新對帳
+        if observed:
+            for position_key in observed:
+                self.coalescer.release(position_key, len(followers))
+            self._last_positions.update(observed)
+            self._resync_positions.difference_update(observed)
+            self._checkpoint_dirty = True
+        return True
     
-    async def _dispatch_signal_to_followers(
+    async def _dispatch_signals_to_followers(
         self,
-        master_position: MasterPosition,
-        followers: List[FollowSettings]
-    ):
-        """分發信號給所有跟隨者"""
+        master_positions: List[MasterPosition],
+        followers: List[FollowerEntry]
+    ) -> bool:
+        """
+        分發單個 Master 本輪所有變動倉位的信號給跟隨者
+        
+        批量讀取跟隨者狀態 → 每個跟隨者憑證一次批量下單 → 同時完成的跟隨者每個倉位單一交易批量寫入，
+        交易所往返次數與變動的交易對數量無關；等待限流的跟隨者不會延後已完成跟隨者的寫入
+        
+        Returns:
+            False 表示分發前或分發期間啟動了緊急全停（已送出的下單照常寫入）
+        """
+        if self.global_settings.emergency_stop:
+            return False
+        
         logger.info(
             f"分發信號給 {len(followers)} 個跟隨者 - "
-            f"交易對: {master_position.symbol}, "
-            f"Master 倉位: {master_position.position_size}"
+            f"交易對: {', '.join(p.symbol for p in master_positions)}"
         )
         
-        # 並行處理所有跟隨者
-        tasks = []
-        for follower_settings in followers:
-            task = self._execute_follower_trade(follower_settings, master_position)
-            tasks.append(task)
+        # 批量讀取並規劃對帳
+        async with self._session_semaphore:
+            async with self.session_factory() as session:
+                planned = [
+                    (position, await self._plan_follower_trades(session, position, followers))
+                    for position in master_positions
+                ]
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # 新的對帳涵蓋了這些交易對，取消等待中的重試
+        for position in master_positions:
+            for settings in followers:
+                self.retry_queue.supersede(settings.id, position.symbol)
         
-        success_count = sum(1 for r in results if r is True)
-        failed_count = sum(1 for r in results if isinstance(r, Exception) or r is False)
+        # 依跟隨者合併各交易對的待下單腿
+        legs_by_follower: Dict[int, List[Tuple[MasterPosition, FollowerTradeOutcome]]] = {}
+        for position, plans in planned:
+            for plan in plans:
+                legs_by_follower.setdefault(plan.follow_settings_id, []).append((position, plan))
         
-        logger.info(f"跟單完成 - 成功: {success_count}, 失敗: {failed_count}")
+        if not legs_by_follower:
+            logger.info("所有跟隨者倉位已同步或暫停跟單，無需下單")
+            return True
+        
+        # 並行下單（不佔用資料庫連接），每個跟隨者一次批量請求；
+        # 完成的跟隨者隨即寫入，Master 超時被取消時已成交的下單不會遺失或在下一輪重送
+        settings_by_id = {settings.id: settings for settings in followers}
+        pending = {
+            asyncio.ensure_future(self._execute_follower_trades(settings_by_id[settings_id], legs)): legs
+            for settings_id, legs in legs_by_follower.items()
+        }
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                completed: Dict[int, Tuple[MasterPosition, List[FollowerTradeOutcome]]] = {}
+                for task in done:
+                    legs = pending.pop(task)
+                    task.result()
+                    for position, outcome in legs:
+                        completed.setdefault(id(position), (position, []))[1].append(outcome)
+                # 寫入不隨 Master 超時中斷（下單已送出）
+                await asyncio.shield(self._record_outcomes(list(completed.values()), settings_by_id))
+        finally:
+            for task in pending:
+                task.cancel()
+        return not self.global_settings.emergency_stop
     
-    async def _execute_follower_trade(
+    async def _record_outcomes(
         self,
-        settings: FollowSettings,
-        master_position: MasterPosition
-    ) -> bool:
+        planned: List[Tuple[MasterPosition, List[FollowerTradeOutcome]]],
+        settings_by_id: Dict[int, FollowerEntry]
+    ):
         """
-        執行跟隨者交易
-        包含錯誤處理和自動停止機制
+        處理一批已完成跟隨者的下單結果：暫時性失敗排入重試佇列，其餘每個倉位單一交易批量寫入並發送通知
+        
+        重試次數用盡或佇列已滿的暫時性失敗按一般失敗處理（停止跟單）；
+        因熔斷未送出的下單腿暫緩到熔斷器預計恢復時，不寫入錯誤、不停止跟單、不發送通知；
+        低於最小下單量而未送出的下單腿不寫入任何紀錄
         """
-        start_time = datetime.utcnow()
-        error_repo = TradeErrorRepository(self.db)
-        position_repo = FollowerPositionRepository(self.db)
+        final: List[Tuple[MasterPosition, List[FollowerTradeOutcome]]] = []
+        for master_position, outcomes in planned:
+            settled = []
+            for outcome in outcomes:
+                if outcome.skipped:
+                    continue
+                if outcome.held_for is not None:
+                    settings = settings_by_id[outcome.follow_settings_id]
+                    self.retry_queue.hold(master_position, settings, outcome, outcome.held_for)
+                    continue
+                if outcome.transient:
+                    settings = settings_by_id[outcome.follow_settings_id]
+                    if self.retry_queue.schedule(master_position, settings, outcome):
+                        continue
+                    outcome.error_message = (
+                        f"{outcome.error_message}（重試 {outcome.attempts} 次後仍失敗）"
+                        if outcome.attempts >= self.retry_queue.max_attempts
+                        else f"{outcome.error_message}（重試佇列已滿）"
+                    )
+                settled.append(outcome)
+            if settled:
+                final.append((master_position, settled))
         
-        # 檢查是否有未解決的錯誤
-        has_errors = await error_repo.has_unresolved_errors(settings.user_id)
-        if has_errors:
-            logger.warning(
-                f"[跟隨者 {settings.user_id}] 有未解決的錯誤，跳過本次跟單"
+        if not final:
+            return
+        
+        # 每個倉位單一交易批量寫入
+        persisted = []
+        try:
+            async with self._session_semaphore:
+                async with self.session_factory() as session:
+                    persistence = TradePersistence(session)
+                    for position, outcomes in final:
+                        trade_log_ids = await persistence.persist(position, outcomes)
+                        persisted.append((position, outcomes, trade_log_ids))
+        finally:
+            # 部分寫入失敗時，已提交的倉位仍需讓儀表板失效並推送
+            self.dashboard_cache.bump_users(
+                outcome.user_id for _, outcomes in final for outcome in outcomes
             )
-            return False
+            self._publish_dashboard_events(persisted, settings_by_id)
         
-        # 獲取當前跟隨者倉位
-        current_position = await position_repo.get_position(
-            user_id=settings.user_id,
-            credential_id=settings.follower_credential_id,
-            symbol=master_position.symbol
-        )
-        current_size = current_position.position_size if current_position else 0.0
+        success_count = failed_count = 0
+        for master_position, outcomes in final:
+            for outcome in outcomes:
+                settings = settings_by_id[outcome.follow_settings_id]
+                if outcome.is_success:
+                    success_count += 1
+                    # 發送成功通知（異步，不阻塞主流程）
+                    self._spawn_notification(
+                        self._send_trade_success_notification(
+                            settings=settings,
+                            symbol=master_position.symbol,
+                            side=outcome.side,
+                            amount=outcome.amount,
+                            price=master_position.entry_price or 0.0,
+                            order_id=outcome.order_id
+                        )
+                    )
+                else:
+                    failed_count += 1
+                    # 已在批量寫入中自動停止該用戶的跟單，同步移出索引
+                    self.subscription_index.remove_user(outcome.user_id)
+                    self._spawn_notification(
+                        self._send_error_notification(
+                            settings=settings,
+                            error_type="exchange_error",
+                            error_message=outcome.error_message,
+                            context={
+                                "symbol": master_position.symbol,
+                                "side": outcome.side,
+                                "amount": outcome.amount,
+                                "current_position": outcome.current_size,
+                                "target_position": outcome.target_size
+                            }
+                        )
+                    )
         
-        # 計算目標倉位大小（根據 Master 倉位和跟單比例）
-        target_size = master_position.position_size * settings.follow_ratio
+        logger.info(f"跟單完成 - 成功: {success_count}, 失敗: {failed_count}")
+    
+    def _publish_dashboard_events(
+        self,
+        persisted: List[Tuple[MasterPosition, List[FollowerTradeOutcome], List[int]]],
+        settings_by_id: Dict[int, FollowerEntry]
+    ):
+        """將已提交的跟單結果推送給已連線的儀表板（交易、倉位、錯誤與自動停止跟單）"""
+        for master_position, outcomes, trade_log_ids in persisted:
+            for outcome, trade_log_id in zip(outcomes, trade_log_ids):
+                self.signal_bus.publish_dashboard_event(TRADE_EVENT, {
+                    "id": trade_log_id,
+                    "timestamp": outcome.started_at.isoformat(),
+                    "symbol": master_position.symbol,
+                    "action": outcome.action,
+                    "side": outcome.side,
+                    "amount": outcome.amount,
+                    "status": "success" if outcome.is_success else "failed",
+                    "is_success": outcome.is_success,
+                    "execution_time_ms": outcome.execution_time_ms
+                }, user_id=outcome.user_id)
+                if outcome.is_success:
+                    self.signal_bus.publish_dashboard_event(POSITION_EVENT, {
+                        "symbol": master_position.symbol,
+                        "position_size": outcome.target_size,
+                        "entry_price": master_position.entry_price
+                    }, user_id=outcome.user_id)
+                    continue
+                settings = settings_by_id[outcome.follow_settings_id]
+                self.signal_bus.publish_dashboard_event(ERROR_EVENT, {
+                    "trade_log_id": trade_log_id,
+                    "error_type": "exchange_error",
+                    "error_message": outcome.error_message,
+                    "symbol": master_position.symbol,
+                    "is_resolved": False
+                }, user_id=outcome.user_id)
+                self.signal_bus.publish_dashboard_event(SETTINGS_EVENT, {
+                    "master_user_id": settings.master_user_id,
+                    "master_credential_id": settings.master_credential_id,
+                    "follow_ratio": settings.follow_ratio,
+                    "is_active": False
+                }, user_id=outcome.user_id)
+
+    def _publish_engine_status(self):
+        """推送引擎狀態給所有已連線的儀表板"""
+        self.signal_bus.publish_dashboard_event(ENGINE_STATUS_EVENT, {
+            "is_running": self.is_running,
+            "status": "Running" if self.is_running else "Stopped",
+            "poll_interval": self.poll_interval,
+            "emergency_stop": self.global_settings.emergency_stop
+        })
+
+    async def _process_due_retries(self):
+        """
+        重送到期的下單腿
         
-        # 計算需要調整的數量（對帳 Reconciliation）
-        size_diff = target_size - current_size
+        沿用原本的客戶端訂單 ID，先前逾時但其實已成交的訂單不會重複成交；
+        已停止跟單或已被移出索引的跟隨者不再重試；緊急全停期間不重試
+        """
+        if self.global_settings.emergency_stop:
+            return
+        due = self.retry_queue.pop_due()
+        if not due:
+            return
         
-        # 如果差異很小（< 0.0001），不需要調整
-        if abs(size_diff) < 0.0001:
-            logger.debug(
-                f"[跟隨者 {settings.user_id}] 倉位已同步，無需調整 - "
-                f"當前: {current_size}, 目標: {target_size}"
+        snapshot = self.subscription_index.snapshot()
+        legs_by_follower: Dict[int, List[Tuple[MasterPosition, FollowerTradeOutcome]]] = {}
+        settings_by_id: Dict[int, FollowerEntry] = {}
+        for item in due:
+            if item.settings not in snapshot.get(item.settings.master_key, ()):
+                continue
+            if not item.held:
+                item.outcome.attempts += 1
+            item.outcome.error_message = None
+            item.outcome.transient = False
+            item.outcome.held_for = None
+            settings_by_id[item.settings.id] = item.settings
+            legs_by_follower.setdefault(item.settings.id, []).append(
+                (item.master_position, item.outcome)
             )
-            return True
         
-        # 判斷操作類型
-        if size_diff > 0:
-            # 需要增加倉位（補單）
-            side = "buy"
-            action = "補單_增加倉位"
-        else:
-            # 需要減少倉位（平倉）
-            side = "sell"
-            action = "平倉_減少倉位"
+        if not legs_by_follower:
+            return
         
-        follower_amount = abs(size_diff)
+        logger.info(f"重試 {sum(len(legs) for legs in legs_by_follower.values())} 筆暫時失敗的下單")
+        await asyncio.gather(*[
+            self._execute_follower_trades(settings_by_id[settings_id], legs)
+            for settings_id, legs in legs_by_follower.items()
+        ])
+        if self.global_settings.emergency_stop:
+            # 期間啟動緊急全停，未送出的下單腿在解除後重新對帳
+            self._defer_until_resume(
+                master_position
+                for legs in legs_by_follower.values()
+                for master_position, outcome in legs
+                if outcome.skipped
+            )
         
-        logger.info(
-            f"[跟隨者 {settings.user_id}] 對帳調整 - "
-            f"交易對: {master_position.symbol}, "
-            f"當前倉位: {current_size}, "
-            f"目標倉位: {target_size}, "
-            f"調整數量: {size_diff}, "
-            f"操作: {action}"
+        # 依倉位分組後寫入（每個倉位一次批量寫入）
+        by_position: Dict[int, Tuple[MasterPosition, List[FollowerTradeOutcome]]] = {}
+        for legs in legs_by_follower.values():
+            for master_position, outcome in legs:
+                by_position.setdefault(id(master_position), (master_position, []))[1].append(outcome)
+        await self._record_outcomes(list(by_position.values()), settings_by_id)
+    
+    async def _plan_follower_trades(
+        self,
+        session: AsyncSession,
+        master_position: MasterPosition,
+        followers: List[FollowerEntry]
+    ) -> List[FollowerTradeOutcome]:
+        """
+        批量讀取跟隨者狀態並計算對帳數量
+        
+        有未解決錯誤或倉位已同步的跟隨者不會產生下單計畫
+        """
+        error_repo = TradeErrorRepository(session)
+        position_repo = FollowerPositionRepository(session)
+        
+        # 檢查是否有未解決的錯誤
+        blocked_users = await error_repo.get_users_with_unresolved_errors(
+            settings.user_id for settings in followers
         )
         
-        # 計算預估滑價
-        estimated_slippage = 0.001 * (1 + follower_amount * 0.1)
-        
-        # 創建 trade_log
-        trade_log = TradeLog(
-            timestamp=start_time,
-            master_user_id=master_position.master_user_id,
-            master_credential_id=master_position.master_credential_id,
-            master_action=f"position_{master_position.position_size}",
-            master_symbol=master_position.symbol,
-            master_position_size=master_position.position_size,
-            master_entry_price=master_position.entry_price,
-            follower_user_id=settings.user_id,
-            follower_credential_id=settings.follower_credential_id,
-            follower_action=action,
-            follower_ratio=settings.follow_ratio,
-            follower_amount=follower_amount,
-            order_type="market",
-            side=side,
-            status="pending",
-            is_success=False
+        # 獲取當前跟隨者倉位
+        positions = await position_repo.get_positions_by_symbol(
+            ((settings.user_id, settings.follower_credential_id) for settings in followers),
+            master_position.symbol
         )
-        self.db.add(trade_log)
-        await self.db.commit()
-        await self.db.refresh(trade_log)
         
+        sid = signal_id(master_position)
+        plans = []
+        for settings in followers:
+            if settings.user_id in blocked_users:
+                logger.warning(
+                    f"[跟隨者 {settings.user_id}] 有未解決的錯誤，跳過本次跟單"
+                )
+                continue
+            
+            current_position = positions.get((settings.user_id, settings.follower_credential_id))
+            current_size = current_position.position_size if current_position else 0.0
+            
+            # 計算目標倉位大小（根據 Master 倉位和跟單比例）
+            target_size = master_position.position_size * settings.follow_ratio
+            
+            # 計算需要調整的數量（對帳 Reconciliation）
+            size_diff = target_size - current_size
+            
+            # 差異只是浮點誤差，不需要調整（低於最小下單量的差異在下單前丟棄）
+            if abs(size_diff) < SIZE_EPSILON:
+                logger.debug(
+                    f"[跟隨者 {settings.user_id}] 倉位已同步，無需調整 - "
+                    f"當前: {current_size}, 目標: {target_size}"
+                )
+                continue
+            
+            # 判斷操作類型：增加倉位（補單）或減少倉位（平倉）
+            if size_diff > 0:
+                side, action = "buy", "補單_增加倉位"
+            else:
+                side, action = "sell", "平倉_減少倉位"
+            
+            logger.info(
+                f"[跟隨者 {settings.user_id}] 對帳調整 - "
+                f"交易對: {master_position.symbol}, "
+                f"當前倉位: {current_size}, "
+                f"目標倉位: {target_size}, "
+                f"調整數量: {size_diff}, "
+                f"操作: {action}"
+            )
+            
+            plans.append(FollowerTradeOutcome(
+                follow_settings_id=settings.id,
+                user_id=settings.user_id,
+                credential_id=settings.follower_credential_id,
+                follow_ratio=settings.follow_ratio,
+                side=side,
+                action=action,
+                amount=abs(size_diff),
+                current_size=current_size,
+                target_size=target_size,
+                started_at=datetime.utcnow(),
+                position_id=current_position.id if current_position else None,
+                client_order_id=client_order_id(
+                    sid, settings.id, master_position.symbol, current_size, target_size
+                )
+            ))
+        
+        return plans
+    
+    async def _execute_follower_trades(
+        self,
+        settings: FollowerEntry,
+        legs: List[Tuple[MasterPosition, FollowerTradeOutcome]]
+    ):
+        """
+        執行跟隨者下單
+        同一跟隨者的所有待下單腿合併為一次批量請求，
+        只與交易所互動，結果記錄在各 outcome 中由批量寫入階段持久化；
+        送出前依交易所市場規格取整數量，低於最小值的下單腿標記為 skipped 不送出
+        """
+        submitted = legs
         try:
             # 獲取跟隨者的解密憑證
             decrypted_cred = await self.credential_service.get_decrypted_credential(
@@ -320,125 +1103,162 @@ class FollowerEngineV2:
             if not decrypted_cred:
                 raise Exception("無法獲取跟隨者憑證")
             
-            # 創建 MockExchange 實例
-            exchange = MockExchange(
-                api_key=decrypted_cred['api_key'],
-                api_secret=decrypted_cred['api_secret'],
-                passphrase=decrypted_cred.get('passphrase')
+            # 獲取共用的 MockExchange 實例
+            exchange = self.client_registry.get_client(
+                'mock',
+                decrypted_cred['api_key'],
+                decrypted_cred['api_secret'],
+                decrypted_cred.get('passphrase'),
+                credential_id=settings.follower_credential_id
             )
             
-            # 執行下單
-            order = exchange.create_order(
-                symbol=master_position.symbol,
-                order_type="market",
-                side=side,
-                amount=follower_amount,
-                price=None
-            )
-            
-            # 計算執行時間
-            end_time = datetime.utcnow()
-            execution_time_ms = int((end_time - start_time).total_seconds() * 1000)
-            
-            # 更新跟隨者倉位
-            await position_repo.update_position(
-                user_id=settings.user_id,
-                credential_id=settings.follower_credential_id,
-                symbol=master_position.symbol,
-                position_size=target_size,
-                entry_price=master_position.entry_price
-            )
-            
-            # 更新 trade_log 為成功
-            trade_log.order_id = order['id']
-            trade_log.status = "success"
-            trade_log.is_success = True
-            trade_log.execution_time_ms = execution_time_ms
+            # 依市場規格取整，丟棄低於最小值的下單腿
+            await self.market_cache.ensure_loaded('mock', exchange)
+            submitted = [
+                (master_position, outcome)
+                for master_position, outcome in legs
+                if self._normalize_leg('mock', settings, master_position, outcome)
+            ]
+            if not submitted:
+                return
             
-            await self.db.commit()
-            
-            logger.info(
-                f"[跟隨者 {settings.user_id}] 對帳成功 - "
-                f"訂單ID: {order['id']}, "
-                f"新倉位: {target_size}, "
-                f"耗時: {execution_time_ms}ms"
-            )
-            
-            # 發送成功通知（異步，不阻塞主流程）
-            asyncio.create_task(
-                self._send_trade_success_notification(
-                    settings=settings,
-                    symbol=master_position.symbol,
-                    side=side,
-                    amount=follower_amount,
-                    price=master_position.entry_price or 0.0,
-                    order_id=order['id']
+            # 送出前最後確認緊急全停（憑證與市場規格的讀取期間可能已啟動）
+            if self.global_settings.emergency_stop:
+                for master_position, outcome in submitted:
+                    outcome.skipped = True
+                logger.warning(
+                    f"[跟隨者 {settings.user_id}] 緊急全停，取消 {len(submitted)} 筆下單"
                 )
-            )
-            
-            return True
+                return
             
+            # 執行批量下單
+            results = await exchange.create_orders([
+                {
+                    'symbol': master_position.symbol,
+                    'type': 'market',
+                    'side': outcome.side,
+                    'amount': outcome.amount,
+                    'price': None,
+                    'params': {'clientOrderId': outcome.client_order_id}
+                }
+                for master_position, outcome in submitted
+            ])
         except Exception as e:
-            # 計算執行時間
-            end_time = datetime.utcnow()
-            execution_time_ms = int((end_time - start_time).total_seconds() * 1000)
-            
-            # 更新 trade_log 為失敗
-            trade_log.status = "failed"
-            trade_log.is_success = False
-            trade_log.error_message = str(e)
-            trade_log.execution_time_ms = execution_time_ms
+            results = [e] * len(submitted)
+        
+        for (master_position, outcome), result in zip(submitted, results):
+            if isinstance(result, BaseException) and is_duplicate_order_error(result):
+                # 同一次對帳的訂單先前已被交易所接受（逾時重試或中斷後重新分發），以原訂單的成交結果記錄
+                result = await self._fetch_duplicate_order(exchange, settings, master_position, outcome)
             
-            # 創建錯誤記錄
-            error_details = {
-                "symbol": master_position.symbol,
-                "side": side,
-                "amount": follower_amount,
-                "current_position": current_size,
-                "target_position": target_size,
-                "master_position": master_position.position_size,
-                "follow_ratio": settings.follow_ratio
-            }
+            if isinstance(result, CircuitOpenError):
+                # 熔斷中，訂單未送出，暫緩而非停止跟單
+                outcome.error_message = str(result)
+                outcome.held_for = result.retry_after
+                
+                logger.warning(
+                    f"[跟隨者 {settings.user_id}] 交易所熔斷中，暫緩下單 - "
+                    f"交易對: {master_position.symbol}, {result}"
+                )
+            elif isinstance(result, BaseException):
+                outcome.error_message = str(result) or type(result).__name__
+                outcome.transient = is_transient_error(result)
+                
+                logger.error(
+                    f"[跟隨者 {settings.user_id}] 對帳失敗"
+                    f"{'，稍後重試' if outcome.transient else '，將自動停止跟單'} - "
+                    f"交易對: {master_position.symbol}, 錯誤: {str(result)}"
+                )
+            else:
+                outcome.order_id = result['id']
+
+                filled = result.get('filled')
+                if filled is not None and filled < outcome.amount - SIZE_EPSILON:
+                    # 部分成交：記錄實際成交後的倉位，差額在下一次對帳補齊
+                    direction = 1 if outcome.side == "buy" else -1
+                    logger.warning(
+                        f"[跟隨者 {settings.user_id}] 訂單部分成交 - "
+                        f"交易對: {master_position.symbol}, 成交 {filled} / {outcome.amount}"
+                    )
+                    outcome.amount = filled
+                    outcome.target_size = outcome.current_size + direction * filled
+
+                logger.info(
+                    f"[跟隨者 {settings.user_id}] 對帳下單成功 - "
+                    f"交易對: {master_position.symbol}, "
+                    f"訂單ID: {result['id']}, "
+                    f"新倉位: {outcome.target_size}"
+                )
             
-            await error_repo.create(
-                user_id=settings.user_id,
-                trade_log_id=trade_log.id,
-                error_type="exchange_error",
-                error_message=str(e),
-                error_details=json.dumps(error_details)
+            # 計算執行時間
+            outcome.execution_time_ms = int(
+                (datetime.utcnow() - outcome.started_at).total_seconds() * 1000
             )
-            
-            # 自動停止該用戶的跟單
-            settings.is_active = False
-            
-            await self.db.commit()
-            
-            logger.error(
-                f"[跟隨者 {settings.user_id}] 對帳失敗，已自動停止跟單 - "
-                f"錯誤: {str(e)}, 耗時: {execution_time_ms}ms"
+    
+    async def _fetch_duplicate_order(
+        self,
+        exchange,
+        settings: FollowerEntry,
+        master_position: MasterPosition,
+        outcome: FollowerTradeOutcome
+    ):
+        """
+        查詢客戶端訂單 ID 重複的原訂單
+        
+        Returns:
+            原訂單回執；查詢失敗或原訂單的方向與數量和本次下單不符時返回例外（不視為已成交）
+        """
+        try:
+            order = await exchange.fetch_order_by_client_id(outcome.client_order_id, master_position.symbol)
+        except Exception as e:
+            return e
+        
+        if order.get('side') != outcome.side or abs((order.get('amount') or 0.0) - outcome.amount) > SIZE_EPSILON:
+            return Exception(
+                f"客戶端訂單ID {outcome.client_order_id} 已用於不同的訂單 - "
+                f"原訂單: {order.get('side')} {order.get('amount')}, 本次: {outcome.side} {outcome.amount}"
             )
-            
-            # 發送錯誤通知（異步，不阻塞主流程）
-            asyncio.create_task(
-                self._send_error_notification(
-                    settings=settings,
-                    error_type=type(e).__name__,
-                    error_message=str(e),
-                    context={
-                        "symbol": master_position.symbol,
-                        "side": side,
-                        "amount": follower_amount,
-                        "current_position": current_size,
-                        "target_position": target_size
-                    }
-                )
+        
+        logger.info(
+            f"[跟隨者 {settings.user_id}] 訂單先前已送達交易所 - "
+            f"交易對: {master_position.symbol}, 客戶端訂單ID: {outcome.client_order_id}, "
+            f"成交: {order.get('filled')}"
+        )
+        return order
+    
+    def _normalize_leg(
+        self,
+        exchange_name: str,
+        settings: FollowerEntry,
+        master_position: MasterPosition,
+        outcome: FollowerTradeOutcome
+    ) -> bool:
+        """
+        依市場規格取整下單數量，目標倉位隨之調整為實際會成交的倉位
+        
+        Returns:
+            False 表示低於最小下單量或最小名目價值，不應送出
+        """
+        amount = self.market_cache.normalize_amount(
+            exchange_name, master_position.symbol, outcome.amount, master_position.entry_price
+        )
+        if amount <= 0:
+            outcome.skipped = True
+            logger.info(
+                f"[跟隨者 {settings.user_id}] 調整數量 {outcome.amount} 低於交易所最小下單量，"
+                f"不送出 - 交易對: {master_position.symbol}"
             )
-            
             return False
+        
+        if amount != outcome.amount:
+            direction = 1 if outcome.side == "buy" else -1
+            outcome.amount = amount
+            outcome.target_size = outcome.current_size + direction * amount
+        return True
     
     async def _send_trade_success_notification(
         self,
-        settings: FollowSettings,
+        settings: FollowerEntry,
         symbol: str,
         side: str,
         amount: float,
@@ -457,11 +1277,12 @@ class FollowerEngineV2:
             order_id: 訂單 ID
         """
         try:
-            # 獲取用戶資訊
-            result = await self.db.execute(
-                select(User).where(User.id == settings.user_id)
-            )
-            user = result.scalar_one_or_none()
+            # 獲取用戶資訊（背景任務使用獨立 session，同樣受 session 上限限制）
+            async with self._session_semaphore, self.session_factory() as session:
+                result = await session.execute(
+                    select(User).where(User.id == settings.user_id)
+                )
+                user = result.scalar_one_or_none()
             
             if user:
                 await self.notifier.notify_trade_success(
@@ -478,7 +1299,7 @@ class FollowerEngineV2:
     
     async def _send_error_notification(
         self,
-        settings: FollowSettings,
+        settings: FollowerEntry,
         error_type: str,
         error_message: str,
         context: Dict[str, Any]
@@ -493,11 +1314,12 @@ class FollowerEngineV2:
             context: 上下文資訊
         """
         try:
-            # 獲取用戶資訊
-            result = await self.db.execute(
-                select(User).where(User.id == settings.user_id)
-            )
-            user = result.scalar_one_or_none()
+            # 獲取用戶資訊（背景任務使用獨立 session，同樣受 session 上限限制）
+            async with self._session_semaphore, self.session_factory() as session:
+                result = await session.execute(
+                    select(User).where(User.id == settings.user_id)
+                )
+                user = result.scalar_one_or_none()
             
             if user:
                 await self.notifier.notify_error(
@@ -546,10 +1368,20 @@ class FollowerEngineV2:
             self.db.add(position)
         
         await self.db.commit()
+        self.dashboard_cache.bump_master(master_user_id, master_credential_id)
+        self.signal_bus.publish_dashboard_event(
+            MASTER_POSITION_EVENT, master_position_event(position),
+            master_key=(master_user_id, master_credential_id)
+        )
         logger.info(
             f"Master 倉位已更新 - 用戶: {master_user_id}, "
             f"交易對: {symbol}, 倉位: {position_size}"
         )
+        
+        # 通知引擎立即處理
+        self.signal_bus.publish_master_position(
+            master_user_id, master_credential_id, symbol, position_size
+        )
 
 
 # 全域引擎實例
@@ -568,8 +1400,15 @@ def get_follower_engine_v2(
         _follower_engine_v2_instance = FollowerEngineV2(
             db=db,
             credential_service=credential_service,
-            poll_interval=3,
+            poll_interval=30,
             telegram_bot_token=telegram_bot_token,
-            telegram_chat_id=telegram_chat_id
+            telegram_chat_id=telegram_chat_id,
+            max_concurrent_masters=app_settings.ENGINE_MAX_CONCURRENT_MASTERS,
+            master_timeout=app_settings.ENGINE_MASTER_TIMEOUT_SECONDS,
+            warm_credential_cache=app_settings.ENGINE_WARM_CREDENTIAL_CACHE,
+            coalesce_window=app_settings.ENGINE_COALESCE_WINDOW_SECONDS,
+            order_retry_attempts=app_settings.ENGINE_ORDER_RETRY_ATTEMPTS,
+            order_retry_base_delay=app_settings.ENGINE_ORDER_RETRY_BASE_DELAY_SECONDS,
+            order_retry_queue_size=app_settings.ENGINE_ORDER_RETRY_QUEUE_SIZE
         )
     return _follower_engine_v2_instance
@@ -0,0 +1,202 @@
+"""
+Global Settings Cache
+全域設定的程序內快取 - 載入 global_settings 一次，之後的讀取是 O(1) 的字典查詢
+
+寫入經 set_bool 提交後立即更新快取，並在信號匯流排發佈 GlobalSettingSignal（CONFIG_TOPIC），
+同一程序內的引擎與 EA 推送通道在毫秒內收到；
+其他程序的寫入由每 refresh_interval 秒一次的重新載入保底，載入到的變更同樣會發佈
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.config import settings as app_settings
+from backend.app.models.global_setting import GlobalSetting
+from backend.app.services.signal_bus import SignalBus, get_signal_bus
+
+logger = logging.getLogger(__name__)
+
+# 設定鍵
+EMERGENCY_STOP_KEY = "emergency_stop_all"
+
+# 設定描述（建立新設定時寫入）
+SETTING_DESCRIPTIONS = {
+    EMERGENCY_STOP_KEY: "緊急全停開關 - 停止所有跟單",
+}
+
+
+@dataclass(frozen=True)
+class SettingValue:
+    """單一設定的值"""
+    value_bool: Optional[bool] = None
+    value_str: Optional[str] = None
+    value_text: Optional[str] = None
+
+    @classmethod
+    def from_model(cls, setting: GlobalSetting) -> "SettingValue":
+        return cls(
+            value_bool=setting.value_bool,
+            value_str=setting.value_str,
+            value_text=setting.value_text
+        )
+
+
+class GlobalSettingsCache:
+    """
+    全域設定快取
+
+    讀取前需先 load / ensure_fresh；每次寫入遞增版本號，
+    寫入期間開始的載入不會以舊值覆蓋
+    """
+
+    def __init__(
+        self,
+        refresh_interval: Optional[float] = None,
+        signal_bus: Optional[SignalBus] = None
+    ):
+        """
+        Args:
+            refresh_interval: 重新載入的間隔（秒，可選，預設使用設定值）
+            signal_bus: 發佈變更的信號匯流排（可選，預設使用全域實例）
+        """
+        self.refresh_interval = (
+            refresh_interval if refresh_interval is not None
+            else app_settings.GLOBAL_SETTINGS_REFRESH_SECONDS
+        )
+        self.signal_bus = signal_bus or get_signal_bus()
+        self._values: Dict[str, SettingValue] = {}
+        self._loaded_at: Optional[float] = None
+        self._version = 0
+        self._lock = asyncio.Lock()
+
+        # 統計
+        self.loads = 0
+        self.changes = 0
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    @property
+    def emergency_stop(self) -> bool:
+        """是否已啟動緊急全停"""
+        return self.get_bool(EMERGENCY_STOP_KEY)
+
+    def get_bool(self, key: str, default: bool = False) -> bool:
+        """讀取布林設定（未設定時返回 default）"""
+        value = self._values.get(key)
+        if value is None or value.value_bool is None:
+            return default
+        return value.value_bool
+
+    def get_str(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """讀取字串設定（未設定時返回 default）"""
+        value = self._values.get(key)
+        if value is None or value.value_str is None:
+            return default
+        return value.value_str
+
+    async def load(self, db: AsyncSession):
+        """
+        從資料庫載入所有設定，與快取不同的設定會發佈變更（第一次載入不發佈）
+
+        Args:
+            db: 資料庫會話
+        """
+        version = self._version
+        result = await db.execute(select(GlobalSetting))
+        values = {setting.key: SettingValue.from_model(setting) for setting in result.scalars()}
+        self.loads += 1
+
+        if self._version != version:
+            # 載入期間有寫入，快取已是最新的值
+            return
+        first_load = self._loaded_at is None
+        previous, self._values = self._values, values
+        self._loaded_at = time.monotonic()
+        if first_load:
+            return
+        for key in set(previous) | set(values):
+            if previous.get(key) != values.get(key):
+                self._publish(key)
+
+    async def ensure_fresh(self, db: AsyncSession):
+        """尚未載入或超過 refresh_interval 時重新載入（並行呼叫只載入一次）"""
+        if not self._is_stale():
+            return
+        async with self._lock:
+            if self._is_stale():
+                await self.load(db)
+
+    def _is_stale(self) -> bool:
+        return (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at >= self.refresh_interval
+        )
+
+    async def set_bool(self, db: AsyncSession, key: str, value: bool) -> GlobalSetting:
+        """
+        寫入布林設定並提交，提交後更新快取並發佈變更
+
+        Args:
+            db: 資料庫會話
+            key: 設定鍵
+            value: 設定值
+
+        Returns:
+            寫入後的 GlobalSetting
+        """
+        result = await db.execute(select(GlobalSetting).where(GlobalSetting.key == key))
+        setting = result.scalar_one_or_none()
+        if setting is None:
+            setting = GlobalSetting(key=key, value_bool=value, description=SETTING_DESCRIPTIONS.get(key))
+            db.add(setting)
+        else:
+            setting.value_bool = value
+
+        await db.commit()
+        await db.refresh(setting)
+        self.apply(setting)
+        return setting
+
+    def apply(self, setting: GlobalSetting):
+        """將已提交的設定寫入快取，值有變更時發佈"""
+        self._version += 1
+        value = SettingValue.from_model(setting)
+        if self._values.get(setting.key) == value:
+            return
+        self._values = {**self._values, setting.key: value}
+        self._publish(setting.key)
+
+    def _publish(self, key: str):
+        self.changes += 1
+        logger.info(f"全域設定已變更: {key}")
+        self.signal_bus.publish_global_setting(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """快取統計"""
+        return {
+            "settings": len(self._values),
+            "loaded": self.is_loaded,
+            "refresh_interval_seconds": self.refresh_interval,
+            "loads": self.loads,
+            "changes": self.changes,
+            "emergency_stop": self.emergency_stop
+        }
+
+
+# 全域設定快取實例
+_global_settings_instance: Optional[GlobalSettingsCache] = None
+
+
+def get_global_settings() -> GlobalSettingsCache:
+    """獲取 Global Settings Cache 單例"""
+    global _global_settings_instance
+    if _global_settings_instance is None:
+        _global_settings_instance = GlobalSettingsCache()
+    return _global_settings_instance
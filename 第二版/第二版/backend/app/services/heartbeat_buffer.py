@@ -0,0 +1,158 @@
+"""
+Heartbeat Buffer
+EA 心跳的寫回緩衝 - last_seen 先記錄在記憶體，定期以一次批量 UPDATE 寫入 users，
+EA 輪詢的頻率不再決定資料庫的寫入量
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from backend.app.config import settings as app_settings
+from backend.app.database import AsyncSessionLocal
+from backend.app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# 以 Core 語句批量更新（已刪除的用戶直接略過，不會讓整批失敗）
+_users = User.__table__
+_UPDATE_LAST_SEEN = (
+    update(_users)
+    .where(_users.c.id == bindparam("b_id"))
+    .values(last_seen=bindparam("b_last_seen"))
+)
+
+
+class HeartbeatBuffer:
+    """
+    心跳寫回緩衝
+
+    每個用戶只保留最新的心跳時間；flush_interval 秒寫入一次，
+    寫入失敗時保留待寫入的心跳，下一輪重試（已有更新的心跳時以較新的為準）
+    """
+
+    def __init__(
+        self,
+        flush_interval: Optional[float] = None,
+        session_factory: Optional[async_sessionmaker] = None
+    ):
+        """
+        Args:
+            flush_interval: 寫入間隔（秒，可選，預設使用設定值）
+            session_factory: 會話工廠（可選，預設使用應用程式的資料庫）
+        """
+        self.flush_interval = (
+            flush_interval if flush_interval is not None
+            else app_settings.EA_HEARTBEAT_FLUSH_SECONDS
+        )
+        self.session_factory = session_factory or AsyncSessionLocal
+        self._pending: Dict[int, datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        # 統計
+        self.heartbeats = 0
+        self.flushes = 0
+        self.rows_written = 0
+        self.failures = 0
+
+    def touch(self, user_id: int, seen_at: Optional[datetime] = None) -> datetime:
+        """
+        記錄心跳（不寫入資料庫），必要時啟動背景寫入任務
+
+        Args:
+            user_id: 用戶 ID
+            seen_at: 心跳時間（可選，預設為現在）
+
+        Returns:
+            記錄的心跳時間
+        """
+        seen_at = seen_at or datetime.utcnow()
+        self._pending[user_id] = seen_at
+        self.heartbeats += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return seen_at
+
+    def pending_last_seen(self, user_id: int) -> Optional[datetime]:
+        """尚未寫入資料庫的心跳時間"""
+        return self._pending.get(user_id)
+
+    async def flush(self) -> int:
+        """
+        以一次批量 UPDATE 寫入所有待寫入的心跳
+
+        Returns:
+            寫入的用戶數
+        """
+        if not self._pending:
+            return 0
+        batch, self._pending = self._pending, {}
+
+        try:
+            async with self.session_factory() as session:
+                await session.execute(
+                    _UPDATE_LAST_SEEN,
+                    [{"b_id": user_id, "b_last_seen": seen_at} for user_id, seen_at in batch.items()]
+                )
+                await session.commit()
+        except asyncio.CancelledError:
+            self._restore(batch)
+            raise
+        except Exception as e:
+            self.failures += 1
+            self._restore(batch)
+            logger.warning(f"寫入 {len(batch)} 筆心跳失敗，下一輪重試: {e}")
+            return 0
+
+        self.flushes += 1
+        self.rows_written += len(batch)
+        logger.debug(f"已寫入 {len(batch)} 筆心跳")
+        return len(batch)
+
+    def _restore(self, batch: Dict[int, datetime]):
+        """放回未寫入的心跳（期間收到的較新心跳優先）"""
+        for user_id, seen_at in batch.items():
+            if self._pending.get(user_id, seen_at) <= seen_at:
+                self._pending[user_id] = seen_at
+
+    async def _run(self):
+        """定期寫入，沒有待寫入的心跳時結束（下一次心跳時重新啟動）"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+            if not self._pending:
+                return
+
+    async def stop(self):
+        """停止背景任務並寫入剩餘的心跳（應用程式關閉時呼叫）"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """緩衝統計"""
+        return {
+            "pending": len(self._pending),
+            "flush_interval_seconds": self.flush_interval,
+            "heartbeats": self.heartbeats,
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+            "failures": self.failures
+        }
+
+
+# 全域心跳緩衝實例
+_heartbeat_buffer_instance: Optional[HeartbeatBuffer] = None
+
+
+def get_heartbeat_buffer() -> HeartbeatBuffer:
+    """獲取 Heartbeat Buffer 單例"""
+    global _heartbeat_buffer_instance
+    if _heartbeat_buffer_instance is None:
+        _heartbeat_buffer_instance = HeartbeatBuffer()
+    return _heartbeat_buffer_instance
@@ -0,0 +1,220 @@
+"""
+Market Data Service
+市場行情服務 - 每個 (交易所, 交易對) 一個輪詢任務，最新行情放在共用的記憶體快取，
+PnL 與儀表板都從快取讀取，交易所請求數與讀取者數量無關
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from backend.app.config import settings as app_settings
+from backend.app.services.exchanges.async_base_exchange import AsyncBaseExchange
+from backend.app.services.exchanges.client_registry import get_exchange_client_registry
+
+logger = logging.getLogger(__name__)
+
+TickerKey = Tuple[str, str]  # (exchange_name, symbol)
+
+# 行情超過幾個輪詢間隔沒有更新視為過期（輪詢失敗或已停止）
+STALE_POLL_INTERVALS = 3
+
+
+def public_market_client(exchange_name: str) -> AsyncBaseExchange:
+    """行情輪詢使用的客戶端（公開端點，不需要帳戶憑證）"""
+    return get_exchange_client_registry().get_client(exchange_name, "market_data", "")
+
+
+@dataclass
+class TickerSnapshot:
+    """最新行情"""
+    symbol: str
+    last: Optional[float]
+    bid: Optional[float]
+    ask: Optional[float]
+    fetched_at: float  # time.monotonic
+
+    @property
+    def price(self) -> Optional[float]:
+        """參考價格：最新成交價，沒有時取買賣中間價"""
+        if self.last:
+            return self.last
+        if self.bid and self.ask:
+            return (self.bid + self.ask) / 2
+        return None
+
+
+@dataclass
+class _Poller:
+    """單一 (交易所, 交易對) 的輪詢任務"""
+    task: Optional[asyncio.Task] = None
+    last_read: float = field(default_factory=time.monotonic)
+    first_tick: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class MarketDataService:
+    """
+    市場行情服務
+
+    第一次讀取某個交易對時啟動輪詢任務，之後所有讀取者共用快取；
+    超過 idle_ttl 沒有人讀取的交易對停止輪詢並移除輪詢任務，下次讀取時重新啟動；
+    超過 max_age 沒有更新的行情視為沒有行情，與新交易對一樣等待第一筆行情
+    """
+
+    def __init__(
+        self,
+        poll_interval: Optional[float] = None,
+        idle_ttl: Optional[float] = None,
+        first_tick_timeout: float = 2.0,
+        max_age: Optional[float] = None,
+        client_factory: Callable[[str], AsyncBaseExchange] = public_market_client
+    ):
+        """
+        Args:
+            poll_interval: 每個交易對的輪詢間隔（秒，可選，預設使用設定值）
+            idle_ttl: 多久沒有讀取後停止輪詢（秒，可選，預設使用設定值）
+            first_tick_timeout: 新交易對等待第一筆行情的時限（秒）
+            max_age: 行情的最長有效時間（秒，可選，預設為 STALE_POLL_INTERVALS 個輪詢間隔）
+            client_factory: 依交易所名稱取得客戶端的函式
+        """
+        self.poll_interval = (
+            poll_interval if poll_interval is not None else app_settings.MARKET_DATA_POLL_SECONDS
+        )
+        self.idle_ttl = idle_ttl if idle_ttl is not None else app_settings.MARKET_DATA_IDLE_SECONDS
+        self.first_tick_timeout = first_tick_timeout
+        self.max_age = max_age if max_age is not None else STALE_POLL_INTERVALS * self.poll_interval
+        self.client_factory = client_factory
+        self._tickers: Dict[TickerKey, TickerSnapshot] = {}
+        self._pollers: Dict[TickerKey, _Poller] = {}
+
+        # 統計
+        self.requests = 0  # 送往交易所的行情請求
+        self.failures = 0
+        self.reads = 0  # 讀取快取的次數
+
+    def watch(self, exchange_name: str, symbol: str) -> _Poller:
+        """標記交易對有人讀取，必要時啟動輪詢任務"""
+        key = (exchange_name, symbol)
+        poller = self._pollers.get(key)
+        if poller is None:
+            poller = _Poller()
+            self._pollers[key] = poller
+        poller.last_read = time.monotonic()
+        if poller.task is None or poller.task.done():
+            poller.task = asyncio.create_task(self._poll(key, poller))
+        return poller
+
+    async def get_prices(self, exchange_name: str, symbols: Iterable[str]) -> Dict[str, float]:
+        """
+        獲取多個交易對的最新價格
+
+        剛開始輪詢或行情已過期的交易對最多等待 first_tick_timeout 秒取得第一筆行情
+
+        Args:
+            exchange_name: 交易所名稱
+            symbols: 交易對
+
+        Returns:
+            {交易對: 價格}；沒有行情或行情過期的交易對不在結果中
+        """
+        symbols = set(symbols)
+        pending = [
+            self.watch(exchange_name, symbol).first_tick.wait()
+            for symbol in symbols
+            if self._fresh_ticker((exchange_name, symbol)) is None
+        ]
+        if pending:
+            try:
+                await asyncio.wait_for(asyncio.gather(*pending), self.first_tick_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"等待 {exchange_name} 行情逾時，部分交易對沒有價格")
+
+        prices = {}
+        for symbol in symbols:
+            price = self.get_price(exchange_name, symbol)
+            if price is not None:
+                prices[symbol] = price
+        return prices
+
+    def get_price(self, exchange_name: str, symbol: str) -> Optional[float]:
+        """從快取讀取價格（不等待），同時讓該交易對保持輪詢"""
+        ticker = self.get_ticker(exchange_name, symbol)
+        return ticker.price if ticker is not None else None
+
+    def get_ticker(self, exchange_name: str, symbol: str) -> Optional[TickerSnapshot]:
+        """從快取讀取行情（不等待，過期的行情返回 None），同時讓該交易對保持輪詢"""
+        self.reads += 1
+        self.watch(exchange_name, symbol)
+        return self._fresh_ticker((exchange_name, symbol))
+
+    def _fresh_ticker(self, key: TickerKey) -> Optional[TickerSnapshot]:
+        """快取中未過期的行情"""
+        ticker = self._tickers.get(key)
+        if ticker is None or time.monotonic() - ticker.fetched_at > self.max_age:
+            return None
+        return ticker
+
+    async def _poll(self, key: TickerKey, poller: _Poller):
+        """輪詢單一交易對，閒置過久後結束並移除輪詢任務"""
+        exchange_name, symbol = key
+        logger.info(f"開始輪詢 {exchange_name} {symbol} 行情")
+        try:
+            while time.monotonic() - poller.last_read <= self.idle_ttl:
+                started = time.monotonic()
+                try:
+                    self.requests += 1
+                    ticker = await self.client_factory(exchange_name).fetch_ticker(symbol)
+                    self._tickers[key] = TickerSnapshot(
+                        symbol=symbol,
+                        last=ticker.get('last'),
+                        bid=ticker.get('bid'),
+                        ask=ticker.get('ask'),
+                        fetched_at=time.monotonic()
+                    )
+                    poller.first_tick.set()
+                except Exception as e:
+                    self.failures += 1
+                    logger.warning(f"獲取 {exchange_name} {symbol} 行情失敗: {e}")
+                await asyncio.sleep(max(0.0, self.poll_interval - (time.monotonic() - started)))
+        finally:
+            if self._pollers.get(key) is poller:
+                del self._pollers[key]
+            logger.info(f"停止輪詢 {exchange_name} {symbol} 行情")
+
+    async def stop(self):
+        """停止所有輪詢任務"""
+        tasks = [p.task for p in self._pollers.values() if p.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._pollers.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """行情統計"""
+        now = time.monotonic()
+        return {
+            "pollers": sum(
+                1 for p in self._pollers.values() if p.task is not None and not p.task.done()
+            ),
+            "poll_interval_seconds": self.poll_interval,
+            "tickers": {
+                f"{exchange_name}:{symbol}": round(now - ticker.fetched_at, 1)
+                for (exchange_name, symbol), ticker in self._tickers.items()
+            },
+            "requests": self.requests,
+            "failures": self.failures,
+            "reads": self.reads
+        }
+
+
+# 全域行情服務實例
+_market_data_service_instance: Optional[MarketDataService] = None
+
+
+def get_market_data_service() -> MarketDataService:
+    """獲取 Market Data Service 單例"""
+    global _market_data_service_instance
+    if _market_data_service_instance is None:
+        _market_data_service_instance = MarketDataService()
+    return _market_data_service_instance
@@ -0,0 +1,86 @@
+"""
+Master Scheduler
+跟單引擎的 Master 並行排程 - 在單輪檢查內以有限並行度處理多個 Master
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TickStats:
+    """單輪檢查的統計計數"""
+    started_at: datetime = field(default_factory=datetime.utcnow)
+    masters_total: int = 0
+    processed: int = 0  # 在時限內完成
+    skipped: int = 0  # 本輪時間預算耗盡，未開始處理
+    timed_out: int = 0  # 超過單一 Master 時限被取消
+    failed: int = 0  # 處理時拋出例外
+    duration_ms: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """轉換為字典"""
+        data = asdict(self)
+        data["started_at"] = self.started_at.isoformat()
+        return data
+
+
+async def run_masters_concurrently(
+    master_groups: Dict[Hashable, Any],
+    worker: Callable[[Hashable, Any], Awaitable[None]],
+    max_concurrency: int,
+    master_timeout: float,
+    tick_budget: Optional[float] = None
+) -> TickStats:
+    """
+    以有限並行度處理所有 Master
+
+    每個 Master 有獨立的時限；若設定了本輪時間預算，
+    預算耗盡後尚未開始的 Master 會被跳過，留待下一輪處理，
+    進行中的 Master 也不會超出預算
+
+    Args:
+        master_groups: Master 鍵 → 跟隨者列表
+        worker: 處理單一 Master 的協程函數
+        max_concurrency: 同時處理的 Master 上限
+        master_timeout: 單一 Master 的處理時限（秒）
+        tick_budget: 本輪時間預算（秒），None 表示不限
+
+    Returns:
+        本輪的 TickStats
+    """
+    stats = TickStats(masters_total=len(master_groups))
+    started = time.monotonic()
+    deadline = started + tick_budget if tick_budget is not None else None
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _run(key: Hashable, followers: Any):
+        async with semaphore:
+            timeout = master_timeout
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    stats.skipped += 1
+                    logger.warning(f"本輪時間預算已耗盡，跳過 Master {key}")
+                    return
+                timeout = min(timeout, remaining)
+
+            try:
+                await asyncio.wait_for(worker(key, followers), timeout)
+                stats.processed += 1
+            except asyncio.TimeoutError:
+                stats.timed_out += 1
+                logger.error(f"處理 Master {key} 超時（{timeout:.2f} 秒），已取消")
+            except Exception as e:
+                stats.failed += 1
+                logger.error(f"處理 Master {key} 的倉位時發生錯誤: {str(e)}", exc_info=True)
+
+    await asyncio.gather(*(_run(key, followers) for key, followers in master_groups.items()))
+
+    stats.duration_ms = int((time.monotonic() - started) * 1000)
+    return stats
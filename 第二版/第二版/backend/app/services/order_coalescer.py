@@ -0,0 +1,139 @@
+"""
+Order Coalescer
+跟單下單合併窗口 - 同一 (Master, 交易對) 在窗口內的多次倉位變動合併為一次對帳
+"""
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PositionKey = Tuple[int, int, str]  # (master_user_id, master_credential_id, symbol)
+
+
+@dataclass
+class _CoalesceWindow:
+    """進行中的合併窗口"""
+    opened_at: float  # 第一次變動的時間（time.monotonic）
+    size: float  # 窗口內最新的 Master 倉位大小
+    changes: int = 1  # 窗口內觀察到的變動次數
+
+
+class OrderCoalescer:
+    """
+    下單合併器
+
+    倉位第一次變動時開啟窗口並延後分發，窗口內的後續變動只更新目標倉位；
+    窗口結束後以最新倉位對帳一次，每個跟隨者只下一筆訂單。
+    window 為 0 時不延後任何變動
+    """
+
+    def __init__(self, window: float = 0.0):
+        """
+        Args:
+            window: 合併窗口長度（秒）
+        """
+        self.window = window
+        self._windows: Dict[PositionKey, _CoalesceWindow] = {}
+
+        # 統計
+        self.windows_closed = 0
+        self.changes_coalesced = 0  # 被合併掉、沒有單獨分發的變動次數
+        self.orders_saved = 0  # 估計省下的跟隨者訂單數
+
+    @property
+    def enabled(self) -> bool:
+        return self.window > 0
+
+    def hold(self, key: PositionKey, size: float, now: Optional[float] = None) -> bool:
+        """
+        記錄一次倉位變動
+
+        Args:
+            key: 倉位鍵
+            size: 最新的 Master 倉位大小
+            now: 當前時間（time.monotonic，可選）
+
+        Returns:
+            True 表示窗口尚未結束，應延後分發
+        """
+        now = time.monotonic() if now is None else now
+        window = self._windows.get(key)
+
+        if window is None:
+            if not self.enabled:
+                return False
+            self._windows[key] = _CoalesceWindow(opened_at=now, size=size)
+            return True
+
+        if size != window.size:
+            window.changes += 1
+            window.size = size
+        return now - window.opened_at < self.window
+
+    def release(self, key: PositionKey, follower_count: int):
+        """
+        窗口內的變動已合併分發，關閉窗口
+
+        Args:
+            key: 倉位鍵
+            follower_count: 收到這次分發的跟隨者數量
+        """
+        window = self._windows.pop(key, None)
+        if window is None:
+            return
+        self._record(key, window.changes - 1, follower_count)
+
+    def discard(self, key: PositionKey, follower_count: int):
+        """
+        倉位在窗口內回到原大小（淨變動為零），關閉窗口且不需分發
+
+        Args:
+            key: 倉位鍵
+            follower_count: 原本會收到分發的跟隨者數量
+        """
+        window = self._windows.pop(key, None)
+        if window is None:
+            return
+        # 回到原大小本身也是一次變動
+        self._record(key, window.changes + 1, follower_count)
+
+    def _record(self, key: PositionKey, coalesced: int, follower_count: int):
+        """累計窗口的合併統計"""
+        self.windows_closed += 1
+        if coalesced <= 0:
+            return
+        self.changes_coalesced += coalesced
+        self.orders_saved += coalesced * follower_count
+        logger.info(
+            f"合併 Master {key[0]} {key[2]} 的 {coalesced} 次倉位變動，"
+            f"省下約 {coalesced * follower_count} 筆跟隨者訂單"
+        )
+
+    def has_pending(self, master_key: Tuple[int, int]) -> bool:
+        """Master 是否有尚未結束的窗口"""
+        return any(key[:2] == master_key for key in self._windows)
+
+    def seconds_until_due(self, now: Optional[float] = None) -> Optional[float]:
+        """
+        距離最早的窗口結束還有多久
+
+        Returns:
+            秒數（已到期為 0）；沒有進行中的窗口時返回 None
+        """
+        if not self._windows:
+            return None
+        now = time.monotonic() if now is None else now
+        earliest = min(window.opened_at for window in self._windows.values())
+        return max(0.0, earliest + self.window - now)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """合併統計"""
+        return {
+            "window_seconds": self.window,
+            "open_windows": len(self._windows),
+            "windows_closed": self.windows_closed,
+            "changes_coalesced": self.changes_coalesced,
+            "orders_saved": self.orders_saved
+        }
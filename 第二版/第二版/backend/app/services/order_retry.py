@@ -0,0 +1,215 @@
+"""
+Order Retry
+跟單下單的冪等與重試 - 確定性的客戶端訂單 ID，以及暫時性失敗的有界重試佇列
+"""
+import hashlib
+import logging
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.app.models.master_position import MasterPosition
+from backend.app.services.subscription_index import FollowerEntry
+from backend.app.services.trade_persistence import FollowerTradeOutcome
+
+logger = logging.getLogger(__name__)
+
+
+def client_order_id(
+    signal_id: str,
+    follow_settings_id: int,
+    symbol: str,
+    current_size: float,
+    target_size: float
+) -> str:
+    """
+    由 (信號, 跟隨者, 交易對, 對帳的起點與目標倉位) 推導客戶端訂單 ID
+
+    同一次對帳重送時（重試、超時後重新分發）ID 不變，交易所會拒絕重複的訂單，避免重複成交；
+    同一信號的另一次對帳（跟單比例變更、緊急全停解除後重新對帳）起點或目標不同，使用新的 ID。
+    32 個英數字元，符合 Binance (36) 與 OKX (32) 的長度限制
+
+    Args:
+        signal_id: 信號 ID（見 signal_id()）
+        follow_settings_id: 跟單設定 ID
+        symbol: 交易對
+        current_size: 對帳前的跟隨者倉位
+        target_size: 對帳的目標倉位
+    """
+    intent = f"{signal_id}|{follow_settings_id}|{symbol}|{current_size:.12g}|{target_size:.12g}"
+    digest = hashlib.sha256(intent.encode()).hexdigest()
+    return f"cf{digest[:30]}"
+
+
+def signal_id(master_position: MasterPosition) -> str:
+    """Master 倉位的一次變動（倉位列 ID 與更新時間）"""
+    updated = master_position.last_updated
+    return f"{master_position.id}@{updated.isoformat() if isinstance(updated, datetime) else updated}"
+
+
+@dataclass
+class RetryItem:
+    """等待重試的下單腿"""
+    master_position: MasterPosition
+    settings: FollowerEntry
+    outcome: FollowerTradeOutcome
+    due_at: float  # time.monotonic
+    held: bool = False  # 因熔斷暫緩（未送出，不計入重試次數）
+
+    @property
+    def key(self) -> Tuple[int, str]:
+        """(跟單設定 ID, 交易對)"""
+        return (self.settings.id, self.master_position.symbol)
+
+
+class OrderRetryQueue:
+    """
+    有界重試佇列
+
+    暫時性失敗的下單腿以指數退避加隨機抖動（full jitter）排程重試，
+    重試沿用原本的客戶端訂單 ID；同一 (跟隨者, 交易對) 只保留最新的一筆，
+    佇列已滿時不再接受，由呼叫端按失敗處理。
+    因熔斷而未送出的下單腿以 hold() 暫緩，不計入重試次數也不受容量限制
+    （每個 (跟隨者, 交易對) 至多一筆，總數不超過啟用中的跟單設定）
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 10.0
+    ):
+        """
+        Args:
+            max_size: 佇列容量
+            max_attempts: 每筆下單腿的最大重試次數
+            base_delay: 第一次重試的退避上限（秒），之後每次加倍
+            max_delay: 退避上限（秒）
+        """
+        self.max_size = max_size
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._items: Dict[Tuple[int, str], RetryItem] = {}
+
+        # 統計
+        self.scheduled = 0
+        self.exhausted = 0  # 重試次數用盡
+        self.rejected = 0  # 佇列已滿
+        self.superseded = 0  # 被新的對帳取代
+        self.held = 0  # 因熔斷暫緩
+        self.cancelled = 0  # 緊急全停時取消
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def backoff(self, attempt: int) -> float:
+        """第 attempt 次重試前的等待秒數"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def can_retry(self, outcome: FollowerTradeOutcome) -> bool:
+        """下單腿是否還有重試次數"""
+        return outcome.attempts < self.max_attempts
+
+    def schedule(
+        self,
+        master_position: MasterPosition,
+        settings: FollowerEntry,
+        outcome: FollowerTradeOutcome
+    ) -> bool:
+        """
+        排程一次重試
+
+        Returns:
+            False 表示重試次數已用盡或佇列已滿
+        """
+        if not self.can_retry(outcome):
+            self.exhausted += 1
+            return False
+
+        key = (settings.id, master_position.symbol)
+        if key not in self._items and len(self._items) >= self.max_size:
+            self.rejected += 1
+            logger.warning(f"重試佇列已滿 ({self.max_size})，跟隨者 {settings.user_id} 不再重試")
+            return False
+
+        delay = self.backoff(outcome.attempts)
+        self._items[key] = RetryItem(
+            master_position=master_position,
+            settings=settings,
+            outcome=outcome,
+            due_at=time.monotonic() + delay
+        )
+        self.scheduled += 1
+        logger.info(
+            f"[跟隨者 {settings.user_id}] {master_position.symbol} 下單暫時失敗，"
+            f"{delay:.2f} 秒後第 {outcome.attempts + 1} 次重試"
+        )
+        return True
+
+    def hold(
+        self,
+        master_position: MasterPosition,
+        settings: FollowerEntry,
+        outcome: FollowerTradeOutcome,
+        delay: float
+    ):
+        """熔斷器開啟中，暫緩到預計恢復時再送出"""
+        key = (settings.id, master_position.symbol)
+        self._items[key] = RetryItem(
+            master_position=master_position,
+            settings=settings,
+            outcome=outcome,
+            due_at=time.monotonic() + delay,
+            held=True
+        )
+        self.held += 1
+
+    def supersede(self, follow_settings_id: int, symbol: str):
+        """新的對帳已涵蓋該 (跟隨者, 交易對)，取消等待中的重試"""
+        if self._items.pop((follow_settings_id, symbol), None) is not None:
+            self.superseded += 1
+
+    def cancel_all(self) -> List[RetryItem]:
+        """取消所有等待中的重試（緊急全停），返回被取消的項目"""
+        cancelled = list(self._items.values())
+        self._items.clear()
+        self.cancelled += len(cancelled)
+        return cancelled
+
+    def pop_due(self, now: Optional[float] = None) -> List[RetryItem]:
+        """取出所有到期的重試"""
+        now = time.monotonic() if now is None else now
+        due = [item for item in self._items.values() if item.due_at <= now]
+        for item in due:
+            del self._items[item.key]
+        return due
+
+    def seconds_until_due(self, now: Optional[float] = None) -> Optional[float]:
+        """
+        距離最早的重試還有多久
+
+        Returns:
+            秒數（已到期為 0）；佇列為空時返回 None
+        """
+        if not self._items:
+            return None
+        now = time.monotonic() if now is None else now
+        return max(0.0, min(item.due_at for item in self._items.values()) - now)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """重試統計"""
+        return {
+            "queued": len(self._items),
+            "max_size": self.max_size,
+            "max_attempts": self.max_attempts,
+            "scheduled": self.scheduled,
+            "exhausted": self.exhausted,
+            "rejected": self.rejected,
+            "superseded": self.superseded,
+            "held": self.held,
+            "cancelled": self.cancelled
+        }
@@ -10,7 +10,7 @@ from sqlalchemy import select, and_, func
 
 from backend.app.models.follower_position import FollowerPosition
 from backend.app.models.trade_log import TradeLog
-from backend.app.services.exchanges.mock_exchange import MockExchange
+from backend.app.services.market_data_service import MarketDataService, get_market_data_service
 
 logger = logging.getLogger(__name__)
 
@@ -18,14 +18,16 @@ logger = logging.getLogger(__name__)
 class PnLService:
     """盈虧計算服務"""
     
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, market_data: Optional[MarketDataService] = None):
         """
         初始化 PnL Service
         
         Args:
             db: 資料庫 session
+            market_data: 市場行情服務（可選，預設使用全域實例）
         """
         self.db = db
+        self.market_data = market_data if market_data is not None else get_market_data_service()
         logger.info("PnLService 初始化完成")
     
     async def calculate_unrealized_pnl(
@@ -84,7 +86,7 @@ class PnLService:
                     "positions": []
                 }
             
-            # 獲取當前市價（從 MockExchange）
+            # 獲取當前市價（從共用的行情快取）
             current_prices = await self._fetch_current_prices(positions)
             
             # 計算每個倉位的盈虧
@@ -274,31 +276,19 @@ class PnLService:
         positions: List[FollowerPosition]
     ) -> Dict[str, float]:
         """
-        獲取當前市價（從 MockExchange）
+        獲取當前市價（從共用的行情快取，不直接請求交易所）
         
         Args:
             positions: 倉位列表
             
         Returns:
-            交易對價格字典 {"BTC/USDT": 50000.0, ...}
+            交易對價格字典 {"BTC/USDT": 50000.0, ...}；
+            沒有行情的交易對不在結果中（以入場價格計算）
         """
         try:
-            # 創建 MockExchange 實例（不需要真實憑證）
-            exchange = MockExchange(
-                api_key="mock_key",
-                api_secret="mock_secret"
+            current_prices = await self.market_data.get_prices(
+                'mock', {pos.symbol for pos in positions if pos.position_size}
             )
-            
-            # 模擬市價（實際應該從交易所獲取）
-            # 這裡使用簡化邏輯：當前價格 = 入場價格 * 1.05（模擬 5% 漲幅）
-            current_prices = {}
-            for pos in positions:
-                if pos.entry_price:
-                    # 模擬價格波動：±5%
-                    current_prices[pos.symbol] = pos.entry_price * 1.05
-                else:
-                    current_prices[pos.symbol] = 0.0
-            
             logger.debug(f"獲取當前市價: {current_prices}")
             return current_prices
             
@@ -0,0 +1,220 @@
+"""
+Signal Bus
+進程內信號匯流排 - Master 倉位變動時即時喚醒跟單引擎，並將引擎的寫入推送給已連線的儀表板
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 主題名稱
+MASTER_POSITION_TOPIC = "master_position"
+CONFIG_TOPIC = "config"  # 用戶配置與全域設定變更
+DASHBOARD_TOPIC = "dashboard"  # 儀表板增量事件
+
+
+@dataclass(frozen=True)
+class MasterPositionSignal:
+    """Master 倉位變動信號"""
+    master_user_id: int
+    master_credential_id: int
+    symbol: str
+    position_size: float
+    published_at: float = field(default_factory=time.monotonic)  # 發佈時間（monotonic 秒）
+
+
+@dataclass(frozen=True)
+class UserConfigSignal:
+    """用戶或跟單關係變更信號（CONFIG_TOPIC）"""
+    user_id: int
+    published_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass(frozen=True)
+class GlobalSettingSignal:
+    """全域設定變更信號（CONFIG_TOPIC），新的值從 GlobalSettingsCache 讀取"""
+    key: str
+    published_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass(frozen=True)
+class DashboardEvent:
+    """
+    儀表板增量事件（DASHBOARD_TOPIC）
+
+    user_id 與 master_key 決定接收者：指定 user_id 的事件只送給該用戶，
+    指定 master_key 的事件送給跟隨該 Master 的用戶，兩者皆無則廣播
+    """
+    event: str  # trade, position, error, master_position, settings, engine_status
+    data: Dict[str, Any]
+    user_id: Optional[int] = None
+    master_key: Optional[Tuple[int, int]] = None  # (master_user_id, master_credential_id)
+    published_at: float = field(default_factory=time.monotonic)
+
+
+class Subscription:
+    """
+    單一訂閱者的信號佇列
+
+    佇列滿時丟棄最舊的信號並標記 overflowed，
+    訂閱者應在 overflowed 時改做一次完整掃描
+    """
+
+    def __init__(self, bus: "SignalBus", topic: str, maxsize: int):
+        self._bus = bus
+        self.topic = topic
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+        self.dropped_count = 0
+
+    def _deliver(self, payload: Any):
+        """投遞信號（由 SignalBus 調用）"""
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.overflowed = True
+            self.dropped_count += 1
+        self._queue.put_nowait(payload)
+
+    async def get_batch(self, timeout: Optional[float] = None) -> List[Any]:
+        """
+        等待至少一個信號，並一次取出佇列中所有已到達的信號
+
+        Args:
+            timeout: 最長等待時間（秒），None 表示無限等待
+
+        Returns:
+            信號列表，逾時則返回空列表
+        """
+        try:
+            first = await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return []
+
+        batch = [first]
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    def consume_overflow(self) -> bool:
+        """讀取並重置溢出標記"""
+        overflowed = self.overflowed
+        self.overflowed = False
+        return overflowed
+
+    def close(self):
+        """取消訂閱"""
+        self._bus.unsubscribe(self)
+
+
+class SignalBus:
+    """
+    進程內信號匯流排
+
+    依主題分發信號給所有訂閱者，發佈端不會被訂閱者阻塞
+    """
+
+    DEFAULT_QUEUE_SIZE = 10000
+
+    def __init__(self):
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+        self.published_count = 0
+
+    def subscribe(self, topic: str, maxsize: Optional[int] = None) -> Subscription:
+        """
+        訂閱主題
+
+        Args:
+            topic: 主題名稱
+            maxsize: 佇列上限，預設 DEFAULT_QUEUE_SIZE
+
+        Returns:
+            Subscription 實例
+        """
+        subscription = Subscription(self, topic, maxsize or self.DEFAULT_QUEUE_SIZE)
+        self._subscriptions.setdefault(topic, set()).add(subscription)
+        logger.debug(f"新增訂閱 - 主題: {topic}")
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """取消訂閱"""
+        subscribers = self._subscriptions.get(subscription.topic)
+        if subscribers:
+            subscribers.discard(subscription)
+
+    def publish(self, topic: str, payload: Any) -> int:
+        """
+        發佈信號
+
+        Args:
+            topic: 主題名稱
+            payload: 信號內容
+
+        Returns:
+            收到信號的訂閱者數量
+        """
+        subscribers = self._subscriptions.get(topic, ())
+        for subscription in subscribers:
+            subscription._deliver(payload)
+        self.published_count += 1
+        return len(subscribers)
+
+    def publish_master_position(
+        self,
+        master_user_id: int,
+        master_credential_id: int,
+        symbol: str,
+        position_size: float
+    ) -> int:
+        """發佈 Master 倉位變動信號"""
+        return self.publish(
+            MASTER_POSITION_TOPIC,
+            MasterPositionSignal(
+                master_user_id=master_user_id,
+                master_credential_id=master_credential_id,
+                symbol=symbol,
+                position_size=position_size
+            )
+        )
+
+    def publish_user_config(self, user_id: int) -> int:
+        """發佈用戶配置變更信號"""
+        return self.publish(CONFIG_TOPIC, UserConfigSignal(user_id=user_id))
+
+    def publish_global_setting(self, key: str) -> int:
+        """發佈全域設定變更信號"""
+        return self.publish(CONFIG_TOPIC, GlobalSettingSignal(key=key))
+
+    def publish_dashboard_event(
+        self,
+        event: str,
+        data: Dict[str, Any],
+        user_id: Optional[int] = None,
+        master_key: Optional[Tuple[int, int]] = None
+    ) -> int:
+        """發佈儀表板增量事件（沒有已連線的儀表板時不建立事件）"""
+        if not self._subscriptions.get(DASHBOARD_TOPIC):
+            return 0
+        return self.publish(
+            DASHBOARD_TOPIC,
+            DashboardEvent(event=event, data=data, user_id=user_id, master_key=master_key)
+        )
+
+
+# 全域實例
+_signal_bus_instance: Optional[SignalBus] = None
+
+
+def get_signal_bus() -> SignalBus:
+    """
+    獲取 SignalBus 單例實例
+
+    Returns:
+        SignalBus 實例
+    """
+    global _signal_bus_instance
+    if _signal_bus_instance is None:
+        _signal_bus_instance = SignalBus()
+    return _signal_bus_instance
@@ -0,0 +1,159 @@
+"""
+Subscription Index
+Master → 跟隨者的記憶體索引 - 啟動時建立一次，之後依設定變更增量更新
+"""
+import logging
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.models.follow_settings import FollowSettings
+
+logger = logging.getLogger(__name__)
+
+MasterKey = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class FollowerEntry:
+    """跟單設定的不可變快照（欄位名稱與 FollowSettings 相同）"""
+    id: int
+    user_id: int
+    master_user_id: int
+    master_credential_id: int
+    follower_credential_id: int
+    follow_ratio: float
+
+    @property
+    def master_key(self) -> MasterKey:
+        """所屬 Master 的 (master_user_id, master_credential_id)"""
+        return (self.master_user_id, self.master_credential_id)
+
+    @classmethod
+    def from_settings(cls, settings: FollowSettings) -> "FollowerEntry":
+        """從 FollowSettings 建立"""
+        return cls(
+            id=settings.id,
+            user_id=settings.user_id,
+            master_user_id=settings.master_user_id,
+            master_credential_id=settings.master_credential_id,
+            follower_credential_id=settings.follower_credential_id,
+            follow_ratio=settings.follow_ratio,
+        )
+
+
+class SubscriptionIndex:
+    """
+    Master → 跟隨者索引
+
+    採用寫時複製：每次變更都建立新的字典並整體替換，
+    讀者取得的快照永遠不會被修改，分發過程不需要任何鎖
+    """
+
+    def __init__(self):
+        self._by_user: Dict[int, FollowerEntry] = {}
+        self._groups: Dict[MasterKey, Tuple[FollowerEntry, ...]] = {}
+        self._loaded = False
+        # 載入期間被增量更新的用戶，載入結果不覆蓋這些用戶
+        self._touched_during_load: Optional[Set[int]] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        """是否已從資料庫建立"""
+        return self._loaded
+
+    def snapshot(self) -> Mapping[MasterKey, Tuple[FollowerEntry, ...]]:
+        """獲取當前快照（唯讀）"""
+        return self._groups
+
+    def follower_count(self) -> int:
+        """啟用中的跟隨者數量"""
+        return len(self._by_user)
+
+    async def load(self, db: AsyncSession):
+        """從資料庫建立完整索引"""
+        self._touched_during_load = set()
+        try:
+            result = await db.execute(
+                select(FollowSettings).where(FollowSettings.is_active == True)
+            )
+            entries = [FollowerEntry.from_settings(s) for s in result.scalars().all()]
+            touched = self._touched_during_load
+        finally:
+            self._touched_during_load = None
+
+        by_user = {e.user_id: e for e in entries if e.user_id not in touched}
+        for user_id in touched:
+            if user_id in self._by_user:
+                by_user[user_id] = self._by_user[user_id]
+
+        groups: Dict[MasterKey, Tuple[FollowerEntry, ...]] = {}
+        for entry in by_user.values():
+            groups[entry.master_key] = groups.get(entry.master_key, ()) + (entry,)
+
+        self._by_user, self._groups = by_user, groups
+        self._loaded = True
+        logger.info(f"跟單索引已建立 - {len(groups)} 個 Master, {len(by_user)} 個跟隨者")
+
+    def upsert(self, settings: FollowSettings):
+        """依最新的跟單設定更新索引；停用的設定會被移除"""
+        if settings.is_active:
+            self._replace(settings.user_id, FollowerEntry.from_settings(settings))
+        else:
+            self._replace(settings.user_id, None)
+
+    def remove_user(self, user_id: int):
+        """移除用戶的跟單設定"""
+        self._replace(user_id, None)
+
+    async def refresh_user(self, db: AsyncSession, user_id: int):
+        """從資料庫重新讀取單一用戶的跟單設定"""
+        result = await db.execute(
+            select(FollowSettings).where(FollowSettings.user_id == user_id)
+        )
+        settings = result.scalar_one_or_none()
+        if settings is None:
+            self.remove_user(user_id)
+        else:
+            self.upsert(settings)
+
+    def _replace(self, user_id: int, entry: Optional[FollowerEntry]):
+        """以寫時複製替換單一用戶的索引項目"""
+        if self._touched_during_load is not None:
+            self._touched_during_load.add(user_id)
+
+        old = self._by_user.get(user_id)
+        if old == entry:
+            return
+
+        by_user = dict(self._by_user)
+        groups = dict(self._groups)
+
+        if old is not None:
+            del by_user[user_id]
+            remaining = tuple(e for e in groups.get(old.master_key, ()) if e.user_id != user_id)
+            if remaining:
+                groups[old.master_key] = remaining
+            else:
+                groups.pop(old.master_key, None)
+
+        if entry is not None:
+            by_user[user_id] = entry
+            groups[entry.master_key] = groups.get(entry.master_key, ()) + (entry,)
+
+        self._by_user, self._groups = by_user, groups
+        logger.debug(f"跟單索引已更新 - 用戶: {user_id}, 啟用: {entry is not None}")
+
+
+# 全域索引實例
+_subscription_index_instance: Optional[SubscriptionIndex] = None
+
+
+def get_subscription_index() -> SubscriptionIndex:
+    """獲取 Subscription Index 單例"""
+    global _subscription_index_instance
+    if _subscription_index_instance is None:
+        _subscription_index_instance = SubscriptionIndex()
+    return _subscription_index_instance
@@ -0,0 +1,187 @@
+"""
+Trade Persistence
+跟單結果的批量寫入 - 將一次分發的所有跟隨者結果在單一交易中寫入
+"""
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.models.follow_settings import FollowSettings
+from backend.app.models.master_position import MasterPosition
+from backend.app.models.trade_log import TradeLog
+from backend.app.repositories.trade_error_repository import TradeErrorRepository
+from backend.app.repositories.follower_position_repository import FollowerPositionRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FollowerTradeOutcome:
+    """單一跟隨者的對帳下單結果"""
+    follow_settings_id: int
+    user_id: int
+    credential_id: int
+    follow_ratio: float
+    side: str
+    action: str
+    amount: float
+    current_size: float
+    target_size: float
+    started_at: datetime
+    position_id: Optional[int] = None  # 現有倉位 ID，None 表示需新建
+    execution_time_ms: int = 0
+    order_id: Optional[str] = None
+    client_order_id: Optional[str] = None  # 確定性的客戶端訂單 ID，重試時沿用
+    error_message: Optional[str] = None
+    transient: bool = False  # 失敗原因為可重試的暫時性錯誤
+    held_for: Optional[float] = None  # 熔斷中未送出，建議等待的秒數
+    attempts: int = 0  # 已重試次數
+    skipped: bool = False  # 取整後低於交易所最小下單量或緊急全停，未送出
+
+    @property
+    def is_success(self) -> bool:
+        """是否下單成功"""
+        return self.error_message is None
+
+
+class TradePersistence:
+    """
+    跟單結果批量寫入
+
+    一次分發的寫入固定為少數幾條語句：
+    TradeLog 多列 INSERT、倉位批量 UPDATE 與 INSERT、
+    TradeError 多列 INSERT，以及停用失敗跟隨者的 UPDATE
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.position_repo = FollowerPositionRepository(db)
+        self.error_repo = TradeErrorRepository(db)
+
+    async def persist(
+        self,
+        master_position: MasterPosition,
+        outcomes: List[FollowerTradeOutcome]
+    ) -> List[int]:
+        """
+        在單一交易中寫入一次分發的所有結果
+
+        Args:
+            master_position: 觸發本次分發的 Master 倉位
+            outcomes: 各跟隨者的下單結果
+
+        Returns:
+            與 outcomes 順序對應的 trade_log ID
+        """
+        if not outcomes:
+            return []
+
+        try:
+            trade_log_ids = await self._insert_trade_logs(master_position, outcomes)
+
+            succeeded = [o for o in outcomes if o.is_success]
+            await self.position_repo.bulk_update_positions([
+                {
+                    "id": o.position_id,
+                    "position_size": o.target_size,
+                    "entry_price": master_position.entry_price
+                }
+                for o in succeeded if o.position_id is not None
+            ])
+            await self.position_repo.bulk_insert_positions([
+                {
+                    "user_id": o.user_id,
+                    "credential_id": o.credential_id,
+                    "symbol": master_position.symbol,
+                    "position_size": o.target_size,
+                    "entry_price": master_position.entry_price
+                }
+                for o in succeeded if o.position_id is None
+            ])
+
+            failed = [(o, log_id) for o, log_id in zip(outcomes, trade_log_ids) if not o.is_success]
+            await self.error_repo.bulk_create([
+                {
+                    "user_id": o.user_id,
+                    "trade_log_id": log_id,
+                    "error_type": "exchange_error",
+                    "error_message": o.error_message,
+                    "error_details": json.dumps({
+                        "symbol": master_position.symbol,
+                        "side": o.side,
+                        "amount": o.amount,
+                        "current_position": o.current_size,
+                        "target_position": o.target_size,
+                        "master_position": master_position.position_size,
+                        "follow_ratio": o.follow_ratio
+                    })
+                }
+                for o, log_id in failed
+            ])
+
+            # 自動停止失敗用戶的跟單
+            if failed:
+                await self.db.execute(
+                    update(FollowSettings)
+                    .where(FollowSettings.id.in_({o.follow_settings_id for o, _ in failed}))
+                    .values(is_active=False)
+                    .execution_options(synchronize_session=False)
+                )
+
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+
+        logger.info(
+            f"批量寫入 {len(outcomes)} 筆跟單結果 - "
+            f"成功: {len(succeeded)}, 失敗: {len(failed)}"
+        )
+        return trade_log_ids
+
+    async def _insert_trade_logs(
+        self,
+        master_position: MasterPosition,
+        outcomes: List[FollowerTradeOutcome]
+    ) -> List[int]:
+        """
+        以多列 INSERT 寫入 TradeLog 並取回 ID
+
+        每個用戶只有一筆跟單設定，以 follower_user_id 對應回 outcomes，
+        避免依賴 RETURNING 的列順序（部分資料庫需逐列執行才能保證）
+        """
+        rows = [
+            {
+                "timestamp": o.started_at,
+                "master_user_id": master_position.master_user_id,
+                "master_credential_id": master_position.master_credential_id,
+                "master_action": f"position_{master_position.position_size}",
+                "master_symbol": master_position.symbol,
+                "master_position_size": master_position.position_size,
+                "master_entry_price": master_position.entry_price,
+                "follower_user_id": o.user_id,
+                "follower_credential_id": o.credential_id,
+                "follower_action": o.action,
+                "follower_ratio": o.follow_ratio,
+                "follower_amount": o.amount,
+                "order_id": o.order_id,
+                "order_type": "market",
+                "side": o.side,
+                "status": "success" if o.is_success else "failed",
+                "is_success": o.is_success,
+                "error_message": o.error_message,
+                "execution_time_ms": o.execution_time_ms
+            }
+            for o in outcomes
+        ]
+        result = await self.db.execute(
+            insert(TradeLog).returning(TradeLog.id, TradeLog.follower_user_id),
+            rows
+        )
+        ids_by_user = {user_id: log_id for log_id, user_id in result.all()}
+        return [ids_by_user[o.user_id] for o in outcomes]
@@ -0,0 +1,125 @@
+"""
+Async Exchange Adapters 單元測試
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock
+
+from backend.app.services.exchanges.async_adapters import (
+    CcxtAsyncExchange,
+    ThreadedExchangeAdapter,
+    as_async_exchange,
+)
+from backend.app.services.exchanges.mock_exchange import MockExchange
+
+
+class SlowExchange(MockExchange):
+    """每次呼叫都阻塞的同步交易所"""
+
+    def fetch_balance(self):
+        time.sleep(0.2)
+        return super().fetch_balance()
+
+
+class TestThreadedExchangeAdapter:
+    """測試同步交易所在執行緒池中執行"""
+
+    async def test_blocking_calls_do_not_stall_event_loop(self):
+        """測試阻塞的交易所呼叫期間事件循環持續運作"""
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            exchange = ThreadedExchangeAdapter(SlowExchange("key", "secret"), executor=executor)
+            ticks = 0
+
+            async def heartbeat():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            beat = asyncio.create_task(heartbeat())
+            started = time.perf_counter()
+            balances = await asyncio.gather(*[exchange.fetch_balance() for _ in range(4)])
+            elapsed = time.perf_counter() - started
+            beat.cancel()
+
+        assert all(b["total"]["USDT"] == 10000.0 for b in balances)
+        assert elapsed < 0.6  # 四個呼叫並行，而非依序 0.8 秒
+        assert ticks >= 10
+
+    async def test_as_async_exchange_wraps_only_sync_clients(self):
+        """測試只有同步客戶端會被包裝"""
+        wrapped = as_async_exchange(MockExchange("key", "secret"))
+
+        assert isinstance(wrapped, ThreadedExchangeAdapter)
+        assert as_async_exchange(wrapped) is wrapped
+        order = await wrapped.create_order("BTC/USDT", "market", "buy", 0.1)
+        assert order["status"] == "closed"
+
+
+class TestCcxtAsyncExchange:
+    """測試 CCXT async_support 轉接器"""
+
+    async def test_delegates_to_native_coroutines(self):
+        """測試直接等待 CCXT 的協程並在關閉時釋放連接"""
+        client = MagicMock(id="binance")
+        client.create_order = AsyncMock(return_value={"id": "1"})
+        client.close = AsyncMock()
+        exchange = CcxtAsyncExchange(client)
+
+        order = await exchange.create_order("BTC/USDT", "market", "sell", 1.0)
+        await exchange.close()
+
+        assert order == {"id": "1"}
+        client.create_order.assert_awaited_once_with("BTC/USDT", "market", "sell", 1.0, None, {})
+        client.close.assert_awaited_once()
+        assert exchange.get_exchange_id() == "binance"
+
+
+ORDERS = [
+    {"symbol": "BTC/USDT", "type": "market", "side": "buy", "amount": 0.1},
+    {"symbol": "ETH/USDT", "type": "market", "side": "sell", "amount": 1.0},
+]
+
+
+class TestCreateOrders:
+    """測試批量下單"""
+
+    async def test_native_batch_is_one_request(self):
+        """測試支援批量下單的交易所只送出一次請求，整批失敗時每筆回報例外"""
+        client = MagicMock(id="okx", has={"createOrders": True})
+        client.create_orders = AsyncMock(return_value=[{"id": "1"}, {"id": "2"}])
+        client.create_order = AsyncMock()
+        exchange = CcxtAsyncExchange(client)
+
+        assert await exchange.create_orders(ORDERS) == [{"id": "1"}, {"id": "2"}]
+        client.create_orders.assert_awaited_once()
+        client.create_order.assert_not_awaited()
+
+        client.create_orders.side_effect = RuntimeError("rejected")
+        results = await exchange.create_orders(ORDERS)
+        assert [str(r) for r in results] == ["rejected", "rejected"]
+
+    async def test_fallback_runs_orders_concurrently_with_per_leg_errors(self):
+        """測試不支援批量下單時並行逐筆下單，單筆失敗不影響其他訂單"""
+        client = MagicMock(id="mexc", has={"createOrders": False})
+
+        async def create_order(symbol, order_type, side, amount, price, params):
+            if symbol == "ETH/USDT":
+                raise RuntimeError("insufficient balance")
+            return {"id": symbol}
+
+        client.create_order = create_order
+        results = await CcxtAsyncExchange(client).create_orders(ORDERS)
+
+        assert results[0] == {"id": "BTC/USDT"}
+        assert isinstance(results[1], RuntimeError)
+
+    async def test_mock_exchange_batches_in_one_thread_call(self):
+        """測試 MockExchange 的批量下單在執行緒池中一次完成"""
+        exchange = as_async_exchange(MockExchange("key", "secret"))
+
+        results = await exchange.create_orders(ORDERS)
+
+        assert exchange.supports_batch_orders is True
+        assert [r["symbol"] for r in results] == ["BTC/USDT", "ETH/USDT"]
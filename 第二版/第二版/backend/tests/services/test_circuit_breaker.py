@@ -0,0 +1,132 @@
+"""
+Circuit Breaker 單元測試
+"""
+import asyncio
+
+import ccxt
+import pytest
+
+from backend.app.services.exchanges.async_adapters import ThreadedExchangeAdapter
+from backend.app.services.exchanges.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerExchange,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+)
+from backend.app.services.exchanges.mock_exchange import MockExchange
+
+ORDERS = [
+    {"symbol": "BTC/USDT", "type": "market", "side": "buy", "amount": 0.1},
+    {"symbol": "ETH/USDT", "type": "market", "side": "sell", "amount": 1.0},
+]
+
+
+class DownExchange(MockExchange):
+    """可切換為無法連線的交易所"""
+
+    down = True
+    calls = 0
+
+    def fetch_balance(self):
+        type(self).calls += 1
+        if self.down:
+            raise ccxt.ExchangeNotAvailable("503 Service Unavailable")
+        return super().fetch_balance()
+
+    def create_order(self, *args, **kwargs):
+        type(self).calls += 1
+        if self.down:
+            raise ccxt.RequestTimeout("timed out")
+        return super().create_order(*args, **kwargs)
+
+
+@pytest.fixture
+def exchange():
+    DownExchange.down = True
+    DownExchange.calls = 0
+    registry = CircuitBreakerRegistry(failure_threshold=3, recovery_timeout=0.05)
+    return CircuitBreakerExchange(
+        ThreadedExchangeAdapter(DownExchange("follower_key", "secret")),
+        registry.breakers_for("mock", "follower_key")
+    )
+
+
+class TestCircuitBreaker:
+    """測試熔斷器狀態轉換"""
+
+    def test_only_transient_errors_count(self):
+        """測試業務錯誤不計為失敗，成功會重置連續失敗次數"""
+        breaker = CircuitBreaker("test", failure_threshold=2)
+
+        for error in (ccxt.RequestTimeout("x"), ccxt.InsufficientFunds("x"), ccxt.RequestTimeout("x")):
+            assert breaker.try_acquire()
+            breaker.release(error)
+        assert breaker.state == "closed"
+
+        assert breaker.try_acquire()
+        breaker.release(ccxt.NetworkError("x"))
+        assert breaker.state == "open"
+        assert not breaker.try_acquire()
+
+
+    def test_exchange_breaker_needs_failures_from_several_keys(self):
+        """測試單一 API Key 的失敗只開啟該 Key 的熔斷器"""
+        registry = CircuitBreakerRegistry(failure_threshold=2, recovery_timeout=30.0)
+        exchange_breaker, key_a = registry.breakers_for("okx", "follower_key_a")
+        _, key_b = registry.breakers_for("okx", "follower_key_b")
+
+        for _ in range(2):
+            for breaker in (exchange_breaker, key_a):
+                breaker.try_acquire()
+                breaker.release(ccxt.RequestTimeout("x"), "follower_key_a")
+        assert (exchange_breaker.state, key_a.state) == ("closed", "open")
+
+        for breaker in (exchange_breaker, key_b):
+            breaker.try_acquire()
+            breaker.release(ccxt.RequestTimeout("x"), "follower_key_b")
+        assert (exchange_breaker.state, key_b.state) == ("open", "closed")
+        assert set(registry.get_stats()["api_keys"]) == {"okx:foll...ey_a", "okx:foll...ey_b"}
+
+
+class TestCircuitBreakerExchange:
+    """測試交易所包裝"""
+
+    async def test_opens_short_circuits_and_recovers_via_probe(self, exchange):
+        """測試開啟後不再呼叫交易所，冷卻後只放行一個探測請求"""
+        for _ in range(3):
+            with pytest.raises(ccxt.ExchangeNotAvailable):
+                await exchange.fetch_balance()
+
+        with pytest.raises(CircuitOpenError) as excinfo:
+            await exchange.fetch_balance()
+        assert DownExchange.calls == 3
+        assert 0 < excinfo.value.retry_after <= 0.05
+
+        # 冷卻後探測仍失敗，重新開啟
+        await asyncio.sleep(0.06)
+        with pytest.raises(ccxt.ExchangeNotAvailable):
+            await exchange.fetch_balance()
+        with pytest.raises(CircuitOpenError):
+            await exchange.fetch_balance()
+
+        # 恢復後探測成功，關閉熔斷器
+        DownExchange.down = False
+        await asyncio.sleep(0.06)
+        balances = await asyncio.gather(
+            exchange.fetch_balance(), exchange.fetch_balance(), return_exceptions=True
+        )
+        assert sum(isinstance(b, CircuitOpenError) for b in balances) == 1  # 半開時只放行一個
+        assert (await exchange.fetch_balance())["total"]["USDT"] == 10000.0
+        assert [b.state for b in exchange.breakers] == ["closed", "closed"]
+
+    async def test_batch_counts_as_one_request(self, exchange):
+        """測試批量下單整批逾時計一次失敗，熔斷時每筆回報 CircuitOpenError"""
+        for _ in range(3):
+            results = await exchange.create_orders(ORDERS)
+            assert all(isinstance(r, ccxt.RequestTimeout) for r in results)
+
+        results = await exchange.create_orders(ORDERS)
+
+        assert all(isinstance(r, CircuitOpenError) for r in results)
+        assert DownExchange.calls == 6
+        assert exchange.breakers[1].get_stats()["opened"] == 1
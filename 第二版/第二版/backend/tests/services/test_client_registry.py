@@ -0,0 +1,83 @@
+"""
+Exchange Client Registry 單元測試
+"""
+from unittest.mock import MagicMock
+
+from backend.app.services.exchanges.client_registry import ExchangeClientRegistry
+from backend.app.services.exchanges.mock_exchange import MockExchange
+
+
+def make_registry(**kwargs):
+    """創建記錄建構次數的註冊表"""
+    builds = []
+
+    def builder(exchange_name, api_key, api_secret, passphrase):
+        client = MockExchange(api_key, api_secret, passphrase)
+        client.session = MagicMock()
+        builds.append(client)
+        return client
+
+    return ExchangeClientRegistry(builder=builder, **kwargs), builds
+
+
+class TestExchangeClientRegistry:
+    """測試客戶端共用、重建與閒置淘汰"""
+
+    def test_same_credential_reuses_client(self):
+        """測試同一憑證重複使用同一個客戶端"""
+        registry, builds = make_registry()
+
+        first = registry.get_client("mock", "key", "secret", credential_id=1)
+        again = registry.get_client("MOCK", "key", "secret", credential_id=1)
+        other = registry.get_client("mock", "key2", "secret", credential_id=2)
+
+        assert first is again
+        assert other is not first
+        assert len(builds) == 2
+
+    def test_changed_credential_rebuilds_client(self):
+        """測試憑證內容變更時重建並關閉舊客戶端"""
+        registry, builds = make_registry()
+        old = registry.get_client("mock", "key", "secret", credential_id=1)
+
+        new = registry.get_client("mock", "key", "rotated", credential_id=1)
+
+        assert new is not old
+        assert new.api_secret == "rotated"
+        old.session.close.assert_called_once()
+        assert len(registry) == 1
+
+    def test_invalidate_drops_credential_clients(self):
+        """測試清除憑證後下次使用重新創建"""
+        registry, builds = make_registry()
+        old = registry.get_client("mock", "key", "secret", credential_id=1)
+        kept = registry.get_client("mock", "key2", "secret", credential_id=2)
+
+        registry.invalidate(1)
+
+        assert registry.get_client("mock", "key", "secret", credential_id=1) is not old
+        assert registry.get_client("mock", "key2", "secret", credential_id=2) is kept
+        old.session.close.assert_called_once()
+
+    def test_idle_clients_are_evicted(self):
+        """測試閒置過久的客戶端被移除"""
+        registry, builds = make_registry(idle_ttl=10)
+        idle = registry.get_client("mock", "key", "secret", credential_id=1)
+        active = registry.get_client("mock", "key2", "secret", credential_id=2)
+        registry._entries[("mock", 1)].last_used -= 20
+
+        assert registry.evict_idle() == 1
+        assert len(registry) == 1
+        idle.session.close.assert_called_once()
+        assert registry.get_client("mock", "key2", "secret", credential_id=2) is active
+
+    def test_anonymous_clients_are_keyed_by_credentials(self):
+        """測試未提供憑證 ID 時以憑證內容區分"""
+        registry, builds = make_registry()
+
+        a = registry.get_client("mock", "key", "secret")
+        b = registry.get_client("mock", "key", "secret")
+        c = registry.get_client("mock", "other", "secret")
+
+        assert a is b
+        assert c is not a
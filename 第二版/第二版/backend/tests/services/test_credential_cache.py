@@ -0,0 +1,199 @@
+"""
+Credential Cache 單元測試
+"""
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+
+from backend.app.database import Base
+from backend.app.models import User
+from backend.app.repositories.credential_repository import CredentialRepository
+from backend.app.services import credential_cache as credential_cache_module
+from backend.app.services.cache_service import CacheService
+from backend.app.services.credential_cache import DecryptedCredentialCache
+from backend.app.services.credential_service import CredentialService
+from backend.app.services.crypto_service import CryptoService
+from backend.app.services.exchange_service import ExchangeService
+
+
+CREDENTIAL = {
+    "exchange_name": "mock",
+    "api_key": "key",
+    "api_secret": "secret",
+    "passphrase": None,
+}
+
+
+class TestDecryptedCredentialCache:
+    """測試快取本身的淘汰與失效"""
+
+    def test_lru_eviction(self):
+        """測試超過容量時淘汰最久未使用的憑證"""
+        cache = DecryptedCredentialCache(max_size=2, ttl=60)
+        cache.put(1, 10, CREDENTIAL)
+        cache.put(2, 20, CREDENTIAL)
+        assert cache.get(1, 10) is not None  # 1 變為最近使用
+
+        cache.put(3, 30, CREDENTIAL)
+
+        assert cache.get(2, 20) is None
+        assert cache.get(1, 10) is not None
+        assert cache.get(3, 30) is not None
+
+    def test_ttl_expiry(self, monkeypatch):
+        """測試過期的憑證不會被返回"""
+        now = [1000.0]
+        monkeypatch.setattr(credential_cache_module.time, "monotonic", lambda: now[0])
+        cache = DecryptedCredentialCache(max_size=10, ttl=5)
+        cache.put(1, 10, CREDENTIAL)
+
+        now[0] += 4
+        assert cache.get(1, 10) is not None
+        now[0] += 2
+        assert cache.get(1, 10) is None
+        assert len(cache) == 0
+
+    def test_owner_mismatch_is_a_miss(self):
+        """測試其他用戶無法取得快取的憑證"""
+        cache = DecryptedCredentialCache()
+        cache.put(1, 10, CREDENTIAL)
+
+        assert cache.get(1, 99) is None
+
+    def test_stale_read_is_not_written_back_after_invalidate(self):
+        """測試讀取期間被清除時，舊的讀取結果不會寫回"""
+        cache = DecryptedCredentialCache()
+        version = cache.version(1)
+        cache.invalidate(1)
+
+        assert cache.put(1, 10, CREDENTIAL, version=version) is False
+        assert cache.get(1, 10) is None
+
+
+@pytest.fixture
+async def db_session(tmp_path):
+    """創建測試資料庫會話"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'credentials.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+
+    await engine.dispose()
+
+
+@pytest.fixture
+async def user(db_session):
+    """創建測試用戶"""
+    user = User(username="cache_user", email="cache@example.com", hashed_password="x")
+    db_session.add(user)
+    await db_session.commit()
+    return user
+
+
+@pytest.fixture
+def crypto_service():
+    """記錄解密次數的加密服務"""
+    service = CryptoService(CryptoService.generate_key())
+    service.decrypt = MagicMock(side_effect=service.decrypt)
+    return service
+
+
+@pytest.fixture
+def credential_service(db_session, crypto_service):
+    """使用獨立快取的 Credential Service"""
+    exchange_service = MagicMock(spec=ExchangeService)
+    cache_service = MagicMock(spec=CacheService)
+    cache_service.invalidate_user_credentials_cache = AsyncMock(return_value=True)
+    cache_service.invalidate_credential_cache = AsyncMock(return_value=True)
+
+    repo = CredentialRepository(db_session)
+    repo.get_credential_by_id = AsyncMock(side_effect=repo.get_credential_by_id)
+    return CredentialService(
+        credential_repo=repo,
+        crypto_service=crypto_service,
+        exchange_service=exchange_service,
+        cache_service=cache_service,
+        credential_cache=DecryptedCredentialCache()
+    )
+
+
+class TestCredentialServiceCache:
+    """測試 Credential Service 使用解密憑證快取"""
+
+    async def test_repeat_lookup_skips_db_and_decrypt(self, credential_service, crypto_service, user):
+        """測試重複查詢不再查詢資料庫與解密"""
+        credential = await credential_service.create_credential(
+            user.id, "mock", "api-key", "api-secret", passphrase="pass", verify=False
+        )
+        crypto_service.decrypt.reset_mock()
+
+        first = await credential_service.get_decrypted_credential(credential.id, user.id)
+        for _ in range(5):
+            again = await credential_service.get_decrypted_credential(credential.id, user.id)
+
+        assert again == first
+        assert first["api_secret"] == "api-secret"
+        assert credential_service.credential_repo.get_credential_by_id.await_count == 1
+        assert crypto_service.decrypt.call_count == 2  # secret + passphrase，僅一次
+
+    async def test_update_and_delete_invalidate(self, credential_service, user):
+        """測試更新與刪除憑證後快取失效"""
+        credential = await credential_service.create_credential(
+            user.id, "mock", "api-key", "old-secret", verify=False
+        )
+        await credential_service.get_decrypted_credential(credential.id, user.id)
+
+        await credential_service.update_credential(
+            credential.id, user.id, api_secret="new-secret", verify=False
+        )
+        updated = await credential_service.get_decrypted_credential(credential.id, user.id)
+        assert updated["api_secret"] == "new-secret"
+
+        await credential_service.delete_credential(credential.id, user.id)
+        assert await credential_service.get_decrypted_credential(credential.id, user.id) is None
+
+    async def test_invalidate_runs_after_commit(self, credential_service, db_session, user, monkeypatch):
+        """測試更新與刪除在提交後才清除快取，並行讀取不會把舊 Secret 重新快取"""
+        credential = await credential_service.create_credential(
+            user.id, "mock", "api-key", "old-secret", verify=False
+        )
+        await db_session.commit()
+        in_transaction = []
+        invalidate = credential_service.credential_cache.invalidate
+
+        def record(credential_id):
+            in_transaction.append(db_session.in_transaction())
+            invalidate(credential_id)
+
+        monkeypatch.setattr(credential_service.credential_cache, "invalidate", record)
+
+        await credential_service.update_credential(
+            credential.id, user.id, api_secret="new-secret", verify=False
+        )
+        await credential_service.delete_credential(credential.id, user.id)
+
+        assert in_transaction == [False, False]
+
+    async def test_warm_up_loads_in_one_query(self, credential_service, crypto_service, user):
+        """測試預載後下單路徑不再查詢資料庫"""
+        credentials = [
+            await credential_service.create_credential(
+                user.id, "mock", f"api-key-{i}", f"secret-{i}", verify=False
+            )
+            for i in range(3)
+        ]
+
+        loaded = await credential_service.warm_credential_cache(
+            [(c.id, user.id) for c in credentials] + [(999, user.id)]
+        )
+        crypto_service.decrypt.reset_mock()
+
+        assert loaded == 3
+        for i, credential in enumerate(credentials):
+            decrypted = await credential_service.get_decrypted_credential(credential.id, user.id)
+            assert decrypted["api_secret"] == f"secret-{i}"
+        assert credential_service.credential_repo.get_credential_by_id.await_count == 0
+        assert crypto_service.decrypt.call_count == 0
@@ -0,0 +1,198 @@
+"""
+Dashboard Service 與 Dashboard Cache 單元測試
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+
+from backend.app.database import Base
+from backend.app.models import FollowSettings, FollowerPosition, MasterPosition, TradeError, TradeLog
+from backend.app.services.dashboard_cache import DashboardCache, DashboardVersion
+from backend.app.services.dashboard_service import DashboardService
+from backend.app.services.market_data_service import MarketDataService
+
+FOLLOWER_ID = 2
+
+
+class FixedTickers:
+    """固定價格的行情來源"""
+
+    def __init__(self, prices):
+        self.prices = prices
+
+    async def fetch_ticker(self, symbol):
+        return {"symbol": symbol, "last": self.prices[symbol], "bid": None, "ask": None}
+
+
+@pytest.fixture
+async def test_engine(tmp_path):
+    """創建測試引擎（檔案資料庫，讓每個 session 取得獨立連接）"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'dashboard.db'}", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield engine
+
+    await engine.dispose()
+
+
+@pytest.fixture
+def statements(test_engine):
+    """記錄執行的 SQL 語句"""
+    executed = []
+
+    @event.listens_for(test_engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    return executed
+
+
+@pytest.fixture
+def session_factory(test_engine):
+    """創建測試會話工廠"""
+    return async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest.fixture
+async def market_data():
+    service = MarketDataService(
+        poll_interval=60, idle_ttl=60,
+        client_factory=lambda exchange_name: FixedTickers({"BTC/USDT": 60000.0})
+    )
+    yield service
+    await service.stop()
+
+
+@pytest.fixture
+async def follower(session_factory, statements):
+    """一位跟隨 Master (1, 1) 的用戶，持有倉位、一筆成功交易與一個未解決錯誤"""
+    async with session_factory() as session:
+        session.add_all([
+            FollowSettings(
+                user_id=FOLLOWER_ID, master_user_id=1, master_credential_id=1,
+                follower_credential_id=2, follow_ratio=0.5, is_active=True
+            ),
+            FollowerPosition(
+                user_id=FOLLOWER_ID, credential_id=2, symbol="BTC/USDT",
+                position_size=0.5, entry_price=50000.0
+            ),
+            MasterPosition(
+                master_user_id=1, master_credential_id=1, symbol="BTC/USDT",
+                position_size=1.0, entry_price=50000.0
+            ),
+            TradeLog(
+                master_user_id=1, master_credential_id=1, master_action="open_long",
+                master_symbol="BTC/USDT", master_position_size=1.0,
+                follower_user_id=FOLLOWER_ID, follower_credential_id=2, follower_action="follow_long",
+                follower_ratio=0.5, follower_amount=0.5, order_type="market", side="buy",
+                status="success", is_success=True
+            ),
+            TradeError(user_id=FOLLOWER_ID, error_type="exchange_error", error_message="down"),
+        ])
+        await session.commit()
+    statements.clear()
+
+
+@pytest.fixture
+def cache():
+    return DashboardCache(ttl=60)
+
+
+@pytest.fixture
+def service(session_factory, cache, market_data):
+    return DashboardService(session_factory=session_factory, cache=cache, market_data=market_data)
+
+
+class TestDashboardService:
+    """測試儀表板摘要組裝與快取"""
+
+    async def test_summary_fields(self, service, follower):
+        summary = await service.get_summary(FOLLOWER_ID, "follower")
+
+        assert (summary["is_active"], summary["follow_ratio"], summary["master_user_id"]) == (True, 0.5, 1)
+        assert summary["total_position_value"] == pytest.approx(30000.0)
+        assert summary["master_positions"][0]["current_value"] == pytest.approx(60000.0)
+        assert summary["master_latest_activity"]["symbol"] == "BTC/USDT"
+        assert [t["symbol"] for t in summary["recent_successful_trades"]] == ["BTC/USDT"]
+        assert (summary["has_unresolved_errors"], summary["unresolved_error_count"]) == (True, 1)
+        assert summary["unrealized_pnl"] == pytest.approx(5000.0)
+
+    async def test_user_without_settings(self, service, follower):
+        summary = await service.get_summary(99, "nobody")
+
+        assert (summary["is_active"], summary["master_positions"], summary["total_pnl"]) == (False, [], 0.0)
+
+    async def test_cached_summary_does_not_query(self, service, cache, follower, statements):
+        first = await service.get_summary(FOLLOWER_ID, "follower")
+        queries = len(statements)
+        second = await service.get_summary(FOLLOWER_ID, "follower")
+
+        assert second is first
+        assert len(statements) == queries
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    async def test_user_write_invalidates(self, service, cache, follower, session_factory):
+        await service.get_summary(FOLLOWER_ID, "follower")
+        async with session_factory() as session:
+            session.add(TradeError(user_id=FOLLOWER_ID, error_type="exchange_error", error_message="again"))
+            await session.commit()
+        assert (await service.get_summary(FOLLOWER_ID, "follower"))["unresolved_error_count"] == 1
+
+        cache.bump_user(FOLLOWER_ID)
+
+        assert (await service.get_summary(FOLLOWER_ID, "follower"))["unresolved_error_count"] == 2
+
+    async def test_master_write_invalidates_followers(self, service, cache, follower, session_factory):
+        await service.get_summary(FOLLOWER_ID, "follower")
+        async with session_factory() as session:
+            position = await session.get(MasterPosition, 1)
+            position.position_size = 2.0
+            await session.commit()
+
+        cache.bump_master(2, 2)
+        assert (await service.get_summary(FOLLOWER_ID, "follower"))["master_positions"][0]["position_size"] == 1.0
+
+        cache.bump_master(1, 1)
+        assert (await service.get_summary(FOLLOWER_ID, "follower"))["master_positions"][0]["position_size"] == 2.0
+
+    async def test_concurrent_misses_build_once(self, service, cache, follower):
+        summaries = await asyncio.gather(*(service.get_summary(FOLLOWER_ID, "follower") for _ in range(5)))
+
+        assert all(summary is summaries[0] for summary in summaries)
+        assert (cache.misses, cache.shared) == (1, 4)
+
+
+class TestDashboardCache:
+    """測試摘要快取的版本與 TTL"""
+
+    async def test_write_during_build_invalidates_result(self):
+        cache = DashboardCache(ttl=60)
+
+        async def build():
+            version = DashboardVersion(user=cache.user_version(1))
+            await asyncio.sleep(0)
+            cache.bump_user(1)  # 組裝期間引擎寫入
+            return {"value": 1}, version
+
+        assert await cache.get_or_build(1, build) == {"value": 1}
+        assert cache.get(1) is None
+
+    async def test_ttl_expiry(self):
+        cache = DashboardCache(ttl=0)
+        cache.put(1, {"value": 1}, DashboardVersion(user=0))
+
+        assert cache.get(1) is None
+
+    async def test_failed_build_not_cached(self):
+        cache = DashboardCache(ttl=60)
+
+        async def broken():
+            raise RuntimeError("database unavailable")
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_build(1, broken)
+        assert cache.get(1) is None
+        assert cache._inflight == {}
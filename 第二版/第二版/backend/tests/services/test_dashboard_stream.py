@@ -0,0 +1,145 @@
+"""
+Dashboard Stream 單元測試 - 直接讀取 SSE 產生器的輸出
+"""
+import asyncio
+import json
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+
+from backend.app.database import Base
+from backend.app.models import FollowSettings
+from backend.app.services.dashboard_stream import (
+    ENGINE_STATUS_EVENT,
+    MASTER_POSITION_EVENT,
+    SETTINGS_EVENT,
+    TRADE_EVENT,
+    DashboardStream,
+    format_sse,
+)
+from backend.app.services.signal_bus import DASHBOARD_TOPIC, SignalBus
+
+FOLLOWER_ID = 2
+MASTER_KEY = (1, 1)
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    """創建測試會話工廠與一位跟隨 Master (1, 1) 的用戶"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'stream.db'}", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with factory() as session:
+        session.add(FollowSettings(
+            user_id=FOLLOWER_ID, master_user_id=1, master_credential_id=1,
+            follower_credential_id=2, follow_ratio=0.5, is_active=True
+        ))
+        await session.commit()
+
+    yield factory
+
+    await engine.dispose()
+
+
+@pytest.fixture
+def signal_bus():
+    return SignalBus()
+
+
+def make_stream(session_factory, signal_bus, **kwargs) -> DashboardStream:
+    snapshots = []
+
+    async def snapshot():
+        snapshots.append(len(snapshots) + 1)
+        return {"user_id": FOLLOWER_ID, "snapshot": len(snapshots)}
+
+    kwargs.setdefault("heartbeat_interval", 60)
+    return DashboardStream(
+        FOLLOWER_ID, snapshot, session_factory=session_factory, signal_bus=signal_bus, **kwargs
+    )
+
+
+def parse(message: str) -> tuple:
+    """解析一則 SSE 訊息，返回 (event, data)；心跳返回 (None, None)"""
+    if message.startswith(":"):
+        return None, None
+    fields = dict(line.split(": ", 1) for line in message.strip().split("\n"))
+    return fields["event"], json.loads(fields["data"])
+
+
+async def next_message(events) -> tuple:
+    return parse(await asyncio.wait_for(events.__anext__(), 1))
+
+
+class TestDashboardStream:
+    """測試儀表板事件串流"""
+
+    async def test_starts_with_summary_and_filters_events(self, session_factory, signal_bus):
+        events = make_stream(session_factory, signal_bus).events()
+        assert await next_message(events) == ("summary", {"user_id": FOLLOWER_ID, "snapshot": 1})
+
+        signal_bus.publish_dashboard_event(TRADE_EVENT, {"id": 1}, user_id=3)
+        signal_bus.publish_dashboard_event(MASTER_POSITION_EVENT, {"symbol": "ETH/USDT"}, master_key=(9, 9))
+        signal_bus.publish_dashboard_event(TRADE_EVENT, {"id": 2}, user_id=FOLLOWER_ID)
+        signal_bus.publish_dashboard_event(MASTER_POSITION_EVENT, {"symbol": "BTC/USDT"}, master_key=MASTER_KEY)
+        signal_bus.publish_dashboard_event(ENGINE_STATUS_EVENT, {"is_running": True})
+
+        assert await next_message(events) == (TRADE_EVENT, {"id": 2})
+        assert await next_message(events) == (MASTER_POSITION_EVENT, {"symbol": "BTC/USDT"})
+        assert await next_message(events) == (ENGINE_STATUS_EVENT, {"is_running": True})
+        await events.aclose()
+
+    async def test_closing_unsubscribes(self, session_factory, signal_bus):
+        events = make_stream(session_factory, signal_bus).events()
+        await next_message(events)
+
+        await events.aclose()
+
+        assert signal_bus.publish_dashboard_event(TRADE_EVENT, {}, user_id=FOLLOWER_ID) == 0
+
+    async def test_idle_connection_sends_heartbeat(self, session_factory, signal_bus):
+        events = make_stream(session_factory, signal_bus, heartbeat_interval=0.01).events()
+        await next_message(events)
+
+        assert await next_message(events) == (None, None)
+        await events.aclose()
+
+    async def test_overflow_resends_summary(self, session_factory, signal_bus):
+        events = make_stream(session_factory, signal_bus, queue_size=2).events()
+        await next_message(events)
+
+        for trade_id in range(5):
+            signal_bus.publish_dashboard_event(TRADE_EVENT, {"id": trade_id}, user_id=FOLLOWER_ID)
+
+        assert await next_message(events) == ("summary", {"user_id": FOLLOWER_ID, "snapshot": 2})
+        await events.aclose()
+
+    async def test_settings_event_switches_master(self, session_factory, signal_bus):
+        stream = make_stream(session_factory, signal_bus)
+        events = stream.events()
+        await next_message(events)
+
+        signal_bus.publish_dashboard_event(
+            SETTINGS_EVENT, {"master_user_id": 5, "master_credential_id": 5}, user_id=FOLLOWER_ID
+        )
+        assert (await next_message(events))[0] == SETTINGS_EVENT
+        signal_bus.publish_dashboard_event(MASTER_POSITION_EVENT, {"symbol": "old"}, master_key=MASTER_KEY)
+        signal_bus.publish_dashboard_event(MASTER_POSITION_EVENT, {"symbol": "new"}, master_key=(5, 5))
+
+        assert await next_message(events) == (MASTER_POSITION_EVENT, {"symbol": "new"})
+        assert stream.master_key == (5, 5)
+        await events.aclose()
+
+    async def test_no_subscribers_publishes_nothing(self, signal_bus):
+        assert signal_bus.publish_dashboard_event(TRADE_EVENT, {"id": 1}, user_id=FOLLOWER_ID) == 0
+        assert signal_bus.published_count == 0
+
+        signal_bus.subscribe(DASHBOARD_TOPIC)
+        assert signal_bus.publish_dashboard_event(TRADE_EVENT, {"id": 1}, user_id=FOLLOWER_ID) == 1
+
+    def test_format_sse(self):
+        assert format_sse("trade", {"symbol": "BTC/USDT"}, 7) == (
+            'id: 7\nevent: trade\ndata: {"symbol": "BTC/USDT"}\n\n'
+        )
@@ -0,0 +1,176 @@
+"""
+EA Config Cache 與 Heartbeat Buffer 單元測試
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+
+from backend.app.database import Base
+from backend.app.models.follower_relation import FollowerRelation
+from backend.app.models.user import User
+from backend.app.services.ea_config_cache import EAConfigCache
+from backend.app.services.heartbeat_buffer import HeartbeatBuffer
+
+
+@pytest.fixture
+async def test_engine(tmp_path):
+    """創建測試引擎（檔案資料庫，讓每個 session 取得獨立連接）"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ea_config.db'}", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield engine
+
+    await engine.dispose()
+
+
+@pytest.fixture
+def statements(test_engine):
+    """記錄執行的 SQL 語句 (statement, executemany)"""
+    executed = []
+
+    @event.listens_for(test_engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append((statement, executemany))
+
+    return executed
+
+
+@pytest.fixture
+def session_factory(test_engine):
+    """創建測試會話工廠"""
+    return async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest.fixture
+async def db_session(session_factory):
+    """創建測試資料庫會話"""
+    async with session_factory() as session:
+        yield session
+
+
+@pytest.fixture
+async def relation(db_session, statements):
+    """創建交易員與一位跟隨者"""
+    master = User(id=1, username="master", email="master@test.com", hashed_password="x", role="master")
+    follower = User(id=2, username="follower", email="follower@test.com", hashed_password="x", role="follower")
+    db_session.add_all([master, follower])
+    await db_session.flush()
+    relation = FollowerRelation(master_id=1, follower_id=2, copy_ratio=0.5, status="active")
+    db_session.add(relation)
+    await db_session.commit()
+    statements.clear()
+    return relation
+
+
+class TestEAConfigCache:
+    """測試 EA 配置快取"""
+
+    async def test_hit_does_not_query_database(self, db_session, statements, relation):
+        cache = EAConfigCache(ttl=60)
+
+        first = await cache.get_user_config(db_session, 2)
+        queries = len(statements)
+        second = await cache.get_user_config(db_session, 2)
+
+        assert first == second
+        assert (first.username, first.copy_ratio, first.relation_active) == ("follower", 0.5, True)
+        assert len(statements) == queries
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    async def test_invalidate_user_reloads_relation(self, db_session, relation):
+        cache = EAConfigCache(ttl=60)
+        await cache.get_user_config(db_session, 2)
+
+        relation.copy_ratio = 0.2
+        relation.status = "blocked"
+        await db_session.commit()
+        assert (await cache.get_user_config(db_session, 2)).copy_ratio == 0.5
+
+        cache.invalidate_user(2)
+        config = await cache.get_user_config(db_session, 2)
+
+        assert (config.copy_ratio, config.relation_active) == (0.2, False)
+
+    async def test_ttl_expiry_reloads(self, db_session, relation):
+        cache = EAConfigCache(ttl=0)
+        await cache.get_user_config(db_session, 2)
+        await cache.get_user_config(db_session, 2)
+
+        assert cache.misses == 2
+
+    async def test_missing_user_not_cached(self, db_session, relation):
+        cache = EAConfigCache(ttl=60)
+
+        assert await cache.get_user_config(db_session, 99) is None
+        db_session.add(User(id=99, username="new", email="new@test.com", hashed_password="x"))
+        await db_session.commit()
+
+        assert (await cache.get_user_config(db_session, 99)).username == "new"
+
+    async def test_lru_eviction(self, db_session, relation):
+        cache = EAConfigCache(ttl=60, max_size=1)
+        await cache.get_user_config(db_session, 1)
+        await cache.get_user_config(db_session, 2)
+
+        assert len(cache) == 1
+        await cache.get_user_config(db_session, 1)
+        assert cache.misses == 3
+
+
+class TestHeartbeatBuffer:
+    """測試心跳寫回緩衝"""
+
+    async def test_flush_writes_single_bulk_update(self, session_factory, statements, relation):
+        buffer = HeartbeatBuffer(flush_interval=60, session_factory=session_factory)
+        seen_at = datetime(2024, 1, 1, 12, 0, 0)
+        buffer.touch(1, seen_at)
+        buffer.touch(2, datetime(2024, 1, 1, 11, 0, 0))
+        buffer.touch(2, seen_at)
+        assert statements == []
+
+        assert await buffer.flush() == 2
+
+        updates = [s for s in statements if s[0].startswith("UPDATE")]
+        assert len(updates) == 1 and updates[0][1] is True
+        async with session_factory() as session:
+            rows = (await session.execute(select(User.id, User.last_seen).order_by(User.id))).all()
+        assert rows == [(1, seen_at), (2, seen_at)]
+        assert buffer.pending_last_seen(2) is None
+        await buffer.stop()
+
+    async def test_failed_flush_keeps_heartbeats(self, session_factory, relation):
+        def broken_factory():
+            raise RuntimeError("database unavailable")
+
+        buffer = HeartbeatBuffer(flush_interval=60, session_factory=broken_factory)
+        seen_at = buffer.touch(2)
+
+        assert await buffer.flush() == 0
+        assert buffer.pending_last_seen(2) == seen_at
+        assert buffer.failures == 1
+
+        buffer.session_factory = session_factory
+        await buffer.stop()
+        assert buffer.pending_last_seen(2) is None
+        assert buffer.rows_written == 1
+
+    async def test_background_task_flushes(self, session_factory, relation):
+        buffer = HeartbeatBuffer(flush_interval=0.01, session_factory=session_factory)
+        buffer.touch(2)
+
+        await buffer._task
+
+        assert buffer.get_stats()["pending"] == 0
+        assert buffer.flushes == 1
+
+    async def test_deleted_user_does_not_block_flush(self, session_factory, relation):
+        buffer = HeartbeatBuffer(flush_interval=60, session_factory=session_factory)
+        buffer.touch(2)
+        buffer.touch(99)
+
+        assert await buffer.flush() == 2
+        assert buffer.failures == 0
+        await buffer.stop()
@@ -0,0 +1,174 @@
+"""
+EA 推送通道測試 - 在測試的事件循環中啟動 WebSocket 端點，以 websockets 客戶端連線
+"""
+import asyncio
+import json
+
+import pytest
+import uvicorn
+import websockets
+from fastapi import FastAPI, WebSocket
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+
+from backend.app.database import Base
+from backend.app.models.follower_relation import FollowerRelation
+from backend.app.models.user import User
+from backend.app.services.auth_service import AuthService
+from backend.app.services.ea_config_cache import EAConfigCache
+from backend.app.services.ea_push import EAPushSession
+from backend.app.services.global_settings import EMERGENCY_STOP_KEY, GlobalSettingsCache
+from backend.app.services.heartbeat_buffer import HeartbeatBuffer
+from backend.app.services.signal_bus import SignalBus
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    """創建測試會話工廠（檔案資料庫）與一位跟隨者"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ea_push.db'}", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with factory() as session:
+        session.add_all([
+            User(id=1, username="master", email="master@test.com", hashed_password="x", role="master"),
+            User(id=2, username="follower", email="follower@test.com", hashed_password="x", role="follower"),
+        ])
+        await session.flush()
+        session.add(FollowerRelation(master_id=1, follower_id=2, copy_ratio=0.5, status="active"))
+        await session.commit()
+
+    yield factory
+
+    await engine.dispose()
+
+
+@pytest.fixture
+async def channel(session_factory):
+    """啟動只含 EA 推送端點的應用程式，返回 (ws 網址, 配置快取, 心跳緩衝, 全域設定)"""
+    signal_bus = SignalBus()
+    cache = EAConfigCache(ttl=60, signal_bus=signal_bus)
+    global_settings = GlobalSettingsCache(refresh_interval=60, signal_bus=signal_bus)
+    heartbeats = HeartbeatBuffer(flush_interval=60, session_factory=session_factory)
+    app = FastAPI()
+
+    @app.websocket("/ws")
+    async def endpoint(websocket: WebSocket):
+        await EAPushSession(
+            websocket,
+            session_factory=session_factory,
+            config_cache=cache,
+            global_settings=global_settings,
+            signal_bus=signal_bus,
+            heartbeat_buffer=heartbeats,
+            auth_timeout=1,
+        ).run()
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+
+    yield f"ws://127.0.0.1:{port}/ws", cache, heartbeats, global_settings
+
+    server.should_exit = True
+    await task
+    await heartbeats.stop()
+
+
+async def receive(ws) -> dict:
+    return json.loads(await asyncio.wait_for(ws.recv(), 2))
+
+
+async def connect(url: str, username: str = "follower"):
+    ws = await websockets.connect(url)
+    token = AuthService.create_access_token({"sub": username})
+    await ws.send(json.dumps({"type": "auth", "token": token}))
+    return ws
+
+
+class TestEAPushChannel:
+    """測試 EA WebSocket 推送通道"""
+
+    async def test_auth_returns_full_config(self, channel):
+        url, _, heartbeats, _ = channel
+
+        async with await connect(url) as ws:
+            message = await receive(ws)
+
+        assert message == {
+            "type": "config",
+            "user_id": 2,
+            "username": "follower",
+            "is_active": True,
+            "copy_ratio": 0.5,
+            "emergency_stop": False,
+            "message": "配置獲取成功",
+        }
+        assert heartbeats.pending_last_seen(2) is not None
+
+    async def test_invalid_token_closes_connection(self, channel):
+        url, _, _, _ = channel
+
+        async with websockets.connect(url) as ws:
+            await ws.send(json.dumps({"type": "auth", "token": "invalid"}))
+            message = await receive(ws)
+            with pytest.raises(websockets.ConnectionClosed) as excinfo:
+                await receive(ws)
+
+        assert message == {"type": "error", "message": "無法驗證憑證"}
+        assert excinfo.value.rcvd.code == 1008
+
+    async def test_relation_change_pushes_diff(self, channel, session_factory):
+        url, cache, _, _ = channel
+
+        async with await connect(url) as ws:
+            await receive(ws)
+            async with session_factory() as session:
+                relation = await session.get(FollowerRelation, 1)
+                relation.copy_ratio = 0.2
+                await session.commit()
+            cache.invalidate_user(2)
+
+            message = await receive(ws)
+
+        assert message == {"type": "config_update", "changes": {"copy_ratio": 0.2}}
+
+    async def test_emergency_stop_pushed(self, channel, session_factory):
+        url, _, _, global_settings = channel
+
+        async with await connect(url) as ws:
+            await receive(ws)
+            async with session_factory() as session:
+                await global_settings.set_bool(session, EMERGENCY_STOP_KEY, True)
+            message = await receive(ws)
+
+        assert message == {
+            "type": "emergency_stop",
+            "changes": {"is_active": False, "emergency_stop": True, "message": "跟單已停用"},
+        }
+
+    async def test_other_users_changes_not_pushed(self, channel, session_factory):
+        url, cache, _, global_settings = channel
+
+        async with await connect(url) as ws:
+            await receive(ws)
+            cache.invalidate_user(1)
+            async with session_factory() as session:
+                await global_settings.set_bool(session, EMERGENCY_STOP_KEY, False)
+            await ws.send(json.dumps({"type": "ping"}))
+
+            assert await receive(ws) == {"type": "pong"}
+
+    async def test_deleted_user_closes_connection(self, channel, session_factory):
+        url, cache, _, _ = channel
+
+        async with await connect(url) as ws:
+            await receive(ws)
+            async with session_factory() as session:
+                await session.delete(await session.get(User, 2))
+                await session.commit()
+            cache.invalidate_user(2)
+
+            assert await receive(ws) == {"type": "error", "message": "用戶已刪除"}
@@ -0,0 +1,59 @@
+"""
+Exchange Factory 測試 - 適配器延後載入
+"""
+import os
+import subprocess
+import sys
+from unittest.mock import Mock, patch
+
+import pytest
+
+from backend.app.services.exchanges.async_adapters import CcxtAsyncExchange, ThreadedExchangeAdapter
+from backend.app.services.exchanges.factory import ExchangeFactory
+from backend.app.services.exchanges.mock_exchange import MockExchange
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+class TestExchangeFactory:
+    """測試適配器註冊表"""
+
+    def test_every_supported_exchange_has_adapter(self):
+        """每個支援的交易所都有對應的適配器"""
+        for name in ExchangeFactory.get_supported_exchanges():
+            assert name in ExchangeFactory.ADAPTERS or name in ExchangeFactory.CCXT_EXCHANGES
+
+    def test_create_mock_exchange(self):
+        """Mock 交易所由登記的模組路徑載入"""
+        exchange = ExchangeFactory.create_exchange("mock", "key", "secret")
+        assert isinstance(exchange, MockExchange)
+
+        client = ExchangeFactory.create_async_client("MOCK", "key", "secret")
+        assert isinstance(client, ThreadedExchangeAdapter)
+
+    def test_create_ccxt_client_resolves_class_on_use(self):
+        """CCXT 交易所類別在創建時才取得，可以被 patch"""
+        with patch("ccxt.async_support.binance") as mock_binance:
+            mock_binance.return_value = Mock()
+            client = ExchangeFactory.create_async_client("binance_testnet", "key", "secret")
+
+        assert isinstance(client, CcxtAsyncExchange)
+        mock_binance.return_value.set_sandbox_mode.assert_called_once_with(True)
+
+    def test_unsupported_exchange(self):
+        with pytest.raises(ValueError, match="不支援的交易所"):
+            ExchangeFactory.create_async_client("unknown", "key", "secret")
+        with pytest.raises(NotImplementedError):
+            ExchangeFactory.create_exchange("okx", "key", "secret")
+
+    def test_app_import_does_not_load_ccxt(self):
+        """匯入應用程式不會載入 ccxt"""
+        result = subprocess.run(
+            [sys.executable, "-c", "import sys, backend.app.main; print('ccxt' in sys.modules)"],
+            cwd=PROJECT_ROOT,
+            env=dict(os.environ),
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        assert result.stdout.strip().splitlines()[-1] == "False"
@@ -6,6 +6,10 @@ from unittest.mock import Mock, patch, AsyncMock
 from ccxt.base.errors import AuthenticationError, NetworkError
 
 from backend.app.services.exchange_service import ExchangeService
+from backend.app.services.exchanges import circuit_breaker, client_registry, rate_limiter
+from backend.app.services.exchanges.circuit_breaker import CircuitBreakerRegistry
+from backend.app.services.exchanges.client_registry import ExchangeClientRegistry
+from backend.app.services.exchanges.rate_limiter import ExchangeRateLimiter
 
 
 @pytest.fixture
@@ -58,7 +62,7 @@ class TestExchangeInstanceCreation:
     
     def test_create_exchange_instance_success(self, exchange_service):
         """測試成功創建交易所實例"""
-        with patch('ccxt.binance') as mock_binance:
+        with patch('ccxt.async_support.binance') as mock_binance:
             mock_binance.return_value = Mock()
             
             exchange = exchange_service._create_exchange_instance(
@@ -72,7 +76,7 @@ class TestExchangeInstanceCreation:
     
     def test_create_exchange_instance_with_passphrase(self, exchange_service):
         """測試創建帶 Passphrase 的交易所實例"""
-        with patch('ccxt.okx') as mock_okx:
+        with patch('ccxt.async_support.okx') as mock_okx:
             mock_okx.return_value = Mock()
             
             exchange = exchange_service._create_exchange_instance(
@@ -327,6 +331,29 @@ class TestTestConnection:
             assert result is False
 
 
+class TestTemporaryExchange:
+    """測試驗證用的一次性交易所實例"""
+    
+    @pytest.mark.asyncio
+    async def test_verification_leaves_no_shared_state(self, exchange_service, monkeypatch):
+        """測試驗證未保存的憑證不留下註冊表客戶端、令牌桶與熔斷器"""
+        registry = ExchangeClientRegistry()
+        limiter = ExchangeRateLimiter()
+        breakers = CircuitBreakerRegistry()
+        monkeypatch.setattr(client_registry, "_client_registry_instance", registry)
+        monkeypatch.setattr(rate_limiter, "_rate_limiter_instance", limiter)
+        monkeypatch.setattr(circuit_breaker, "_circuit_breaker_registry_instance", breakers)
+        
+        for i in range(3):
+            result = await exchange_service.verify_credentials('mock', f'key-{i}', 'secret')
+            assert result['is_valid'] is True
+            await exchange_service.get_account_balance('mock', f'key-{i}', 'secret')
+        
+        assert len(registry) == 0
+        assert limiter.get_stats()['api_keys'] == {}
+        assert breakers.get_stats()['api_keys'] == {}
+
+
 class TestCalculateTotalBalance:
     """測試計算總餘額"""
     
@@ -0,0 +1,137 @@
+"""
+本地模擬交易所端到端測試 - CCXT 客戶端經由 API 位址覆寫連到 scripts/fake_exchange_server.py
+"""
+import asyncio
+import importlib.util
+import json
+import os
+
+import pytest
+import uvicorn
+
+from backend.app.services.exchanges import factory
+from backend.app.services.exchanges.errors import is_duplicate_order_error
+from backend.app.services.exchanges.factory import ExchangeFactory, rebase_urls
+from backend.app.services.exchanges.mock_simulator import MockExchangeSimulator, SimulationProfile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def load_server_module():
+    """以檔案路徑載入 scripts/fake_exchange_server.py（scripts 不是套件）"""
+    path = os.path.join(PROJECT_ROOT, "scripts", "fake_exchange_server.py")
+    spec = importlib.util.spec_from_file_location("fake_exchange_server", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+async def fake_exchange():
+    """在測試的事件循環中啟動模擬交易所，返回 (基礎網址, 應用程式)"""
+    simulator = MockExchangeSimulator(SimulationProfile(seed=1))
+    app = load_server_module().create_app(simulator)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+
+    yield f"http://127.0.0.1:{port}", app
+
+    server.should_exit = True
+    await task
+
+
+@pytest.fixture
+async def binance(fake_exchange):
+    base_url, _ = fake_exchange
+    client = ExchangeFactory.create_async_client("binance", "key_1", "secret", base_url=base_url)
+    yield client
+    await client.close()
+
+
+class TestRebaseUrls:
+    """測試 API 網址覆寫"""
+
+    def test_keeps_path_and_maps_websocket_scheme(self):
+        urls = {
+            "public": "https://api.binance.com/api/v3",
+            "fapiPrivateV2": "https://fapi.binance.com/fapi/v2",
+            "ws": {"spot": "wss://stream.binance.com:9443/ws"},
+            "weight": 1,
+        }
+
+        rebased = rebase_urls(urls, "http://127.0.0.1:8765/")
+
+        assert rebased == {
+            "public": "http://127.0.0.1:8765/api/v3",
+            "fapiPrivateV2": "http://127.0.0.1:8765/fapi/v2",
+            "ws": {"spot": "ws://127.0.0.1:8765/ws"},
+            "weight": 1,
+        }
+
+    def test_base_url_from_settings(self, monkeypatch):
+        monkeypatch.setattr(
+            factory.app_settings, "EXCHANGE_BASE_URLS", {"binance": "http://127.0.0.1:9"}
+        )
+        client = ExchangeFactory.create_async_client("binance", "key", "secret")
+        assert client.client.urls["api"]["public"] == "http://127.0.0.1:9/api/v3"
+
+
+class TestFakeExchangeServer:
+    """測試 CCXT 客戶端對模擬交易所的完整流程"""
+
+    async def test_markets_orders_balance_and_positions(self, binance):
+        markets = await binance.load_markets()
+        assert markets["BTC/USDT"]["precision"]["amount"] == pytest.approx(0.00001)
+        assert markets["BTC/USDT"]["limits"]["cost"]["min"] == 5.0
+
+        ticker = await binance.fetch_ticker("BTC/USDT")
+        assert ticker["last"] == 50000.0
+
+        order = await binance.create_order(
+            "BTC/USDT", "market", "buy", 0.1, None, {"clientOrderId": "signal-1"}
+        )
+        assert order["filled"] == pytest.approx(0.1)
+        assert order["clientOrderId"] == "signal-1"
+
+        balance = await binance.fetch_balance()
+        assert balance["total"]["BTC"] == pytest.approx(0.1)
+        positions = await binance.fetch_positions()
+        assert [(p["side"], p["contracts"]) for p in positions] == [("long", pytest.approx(0.1))]
+
+    async def test_duplicate_client_order_id_detected(self, binance):
+        """幣安以 -2010 回報重複訂單，仍識別為已被接受的訂單"""
+        await binance.create_order("BTC/USDT", "market", "buy", 0.1, None, {"clientOrderId": "signal-1"})
+
+        with pytest.raises(Exception) as excinfo:
+            await binance.create_order(
+                "BTC/USDT", "market", "buy", 0.1, None, {"clientOrderId": "signal-1"}
+            )
+
+        assert is_duplicate_order_error(excinfo.value)
+
+    async def test_spot_batch_falls_back_to_single_orders(self, binance):
+        """幣安批量端點只支援合約，現貨批量下單改為逐筆送出"""
+        results = await binance.create_orders([
+            {"symbol": symbol, "type": "market", "side": "buy", "amount": 0.01}
+            for symbol in ("BTC/USDT", "ETH/USDT")
+        ])
+
+        assert [r["symbol"] for r in results] == ["BTC/USDT", "ETH/USDT"]
+
+    async def test_order_update_stream(self, fake_exchange, binance):
+        import websockets
+
+        base_url, app = fake_exchange
+        listen_key = app.state.fake.listen_key("key_1")
+        async with websockets.connect(base_url.replace("http", "ws") + f"/ws/{listen_key}") as ws:
+            await binance.create_order(
+                "ETH/USDT", "market", "sell", 0.5, None, {"clientOrderId": "signal-2"}
+            )
+            event = json.loads(await asyncio.wait_for(ws.recv(), 2))
+
+        assert event["e"] == "executionReport"
+        assert (event["s"], event["S"], event["c"], event["X"]) == ("ETHUSDT", "SELL", "signal-2", "FILLED")
+        assert float(event["z"]) == pytest.approx(0.5)
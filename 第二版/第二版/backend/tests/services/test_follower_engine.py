@@ -0,0 +1,122 @@
+"""
+Follower Engine 單元測試
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+
+from backend.app.database import Base
+from backend.app.models import FollowRelationship, TradeHistory, TradeLog
+from backend.app.services.follower_engine import FollowerEngine
+
+MASTER_USER_ID = 1
+MASTER_CREDENTIAL_ID = 1
+
+
+class SlowCredentialService:
+    """回傳固定 Mock 憑證；指定的用戶等到 release 後才返回（模擬下單請求超過 Master 時限）"""
+
+    def __init__(self, slow_user_id: int):
+        self.slow_user_id = slow_user_id
+        self.release = asyncio.Event()
+
+    async def get_decrypted_credential(self, credential_id: int, user_id: int):
+        if user_id == self.slow_user_id:
+            await self.release.wait()
+        return {
+            "exchange_name": "mock",
+            "api_key": f"follower_key_{user_id}",
+            "api_secret": "follower_secret",
+            "passphrase": None,
+        }
+
+
+@pytest.fixture
+async def test_engine(tmp_path):
+    """創建測試引擎（檔案資料庫，讓每個 session 取得獨立連接）"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'follower_engine_v1.db'}", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield engine
+
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db_session(test_engine):
+    """創建測試資料庫會話"""
+    factory = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        yield session
+
+
+@pytest.fixture
+async def relationships(db_session):
+    """創建跟隨 Master 的跟隨關係"""
+    rows = [
+        FollowRelationship(
+            follower_user_id=user_id,
+            master_user_id=MASTER_USER_ID,
+            master_credential_id=MASTER_CREDENTIAL_ID,
+            follower_credential_id=100 + user_id,
+            follow_ratio=0.5,
+            is_active=True,
+        )
+        for user_id in (2, 3)
+    ]
+    db_session.add_all(rows)
+    await db_session.commit()
+    return rows
+
+
+async def trade_logs(session, user_id: int) -> list:
+    result = await session.execute(
+        select(TradeLog.status).where(TradeLog.follower_user_id == user_id)
+    )
+    return list(result.scalars().all())
+
+
+class TestMasterTimeout:
+    """測試 Master 處理超時後的重新分發"""
+
+    async def test_timed_out_order_completes_without_resend(self, db_session, relationships):
+        """測試超時不取消已送出的下單，下一輪沿用進行中的下單而不重送"""
+        credential_service = SlowCredentialService(slow_user_id=3)
+        engine = FollowerEngine(
+            db=db_session,
+            credential_service=credential_service,
+            poll_interval=60,
+            master_timeout=0.2,
+        )
+        await engine.update_master_position(
+            MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 2.0, 50000.0
+        )
+
+        stats = await engine._check_and_follow_positions()
+
+        assert stats.timed_out == 1
+        assert engine._last_positions == {}
+        assert await trade_logs(db_session, 2) == ["success"]
+        assert await trade_logs(db_session, 3) == ["pending"]
+
+        stats = await engine._check_and_follow_positions()
+
+        assert stats.timed_out == 1
+        assert await trade_logs(db_session, 3) == ["pending"]
+
+        credential_service.release.set()
+        stats = await engine._check_and_follow_positions()
+
+        assert stats.processed == 1
+        assert engine._last_positions == {(MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT"): 2.0}
+        assert await trade_logs(db_session, 2) == ["success"]
+        assert await trade_logs(db_session, 3) == ["success"]
+        result = await db_session.execute(select(TradeHistory).where(TradeHistory.status == "pending"))
+        assert result.scalars().all() == []
+
+        await engine._check_and_follow_positions()
+
+        assert len(await trade_logs(db_session, 3)) == 1
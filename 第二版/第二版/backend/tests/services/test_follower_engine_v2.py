@@ -0,0 +1,1024 @@
+"""
+Follower Engine V2 單元測試
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import ccxt
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+
+from backend.app.database import Base
+from backend.app.models import (
+    FollowSettings,
+    FollowerPosition,
+    GlobalSetting,
+    MasterPosition,
+    TradeError,
+    TradeLog,
+)
+from backend.app.services.dashboard_cache import DashboardCache
+from backend.app.services.exchanges import circuit_breaker
+from backend.app.services.exchanges.circuit_breaker import CircuitBreakerRegistry
+from backend.app.services.exchanges.client_registry import ExchangeClientRegistry
+from backend.app.services.exchanges.market_cache import MarketMetadataCache
+from backend.app.services.exchanges.mock_exchange import MockExchange
+from backend.app.services.exchanges.mock_simulator import (
+    MockExchangeSimulator,
+    SimulationProfile,
+    configure_mock_simulator,
+)
+from backend.app.services.follower_engine_v2 import FollowerEngineV2
+from backend.app.services.global_settings import EMERGENCY_STOP_KEY, GlobalSettingsCache
+from backend.app.services.signal_bus import DASHBOARD_TOPIC, SignalBus
+from backend.app.services.subscription_index import SubscriptionIndex
+
+
+
+MASTER_USER_ID = 1
+MASTER_CREDENTIAL_ID = 1
+
+
+class StubCredentialService:
+    """回傳固定 Mock 憑證的 Credential Service"""
+
+    async def get_decrypted_credential(self, credential_id: int, user_id: int):
+        return {
+            "exchange_name": "mock",
+            "api_key": f"follower_key_{user_id}",
+            "api_secret": "follower_secret",
+            "passphrase": None,
+        }
+
+
+@pytest.fixture
+async def test_engine(tmp_path):
+    """創建測試引擎（檔案資料庫，讓每個 session 取得獨立連接）"""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'follower_engine.db'}",
+        echo=False,
+    )
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield engine
+
+    await engine.dispose()
+
+
+@pytest.fixture
+def session_factory(test_engine):
+    """創建測試會話工廠"""
+    return async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest.fixture
+async def db_session(session_factory):
+    """創建測試資料庫會話"""
+    async with session_factory() as session:
+        yield session
+
+
+@pytest.fixture
+async def followers(db_session):
+    """創建跟隨 Master 的跟單設定"""
+    settings = [
+        FollowSettings(
+            user_id=user_id,
+            master_user_id=MASTER_USER_ID,
+            master_credential_id=MASTER_CREDENTIAL_ID,
+            follower_credential_id=100 + user_id,
+            follow_ratio=ratio,
+            is_active=True,
+        )
+        for user_id, ratio in ((2, 0.5), (3, 0.1))
+    ]
+    db_session.add_all(settings)
+    await db_session.commit()
+    return settings
+
+
+_created_engines = []
+
+
+def make_engine(db_session, **kwargs) -> FollowerEngineV2:
+    """創建使用獨立信號匯流排、跟單索引、全域設定與儀表板快取的引擎"""
+    kwargs.setdefault("signal_bus", SignalBus())
+    kwargs.setdefault("global_settings", GlobalSettingsCache(signal_bus=kwargs["signal_bus"]))
+    kwargs.setdefault("subscription_index", SubscriptionIndex())
+    kwargs.setdefault("client_registry", ExchangeClientRegistry())
+    kwargs.setdefault("market_cache", MarketMetadataCache())
+    kwargs.setdefault("dashboard_cache", DashboardCache())
+    engine = FollowerEngineV2(
+        db=db_session,
+        credential_service=StubCredentialService(),
+        **kwargs
+    )
+    _created_engines.append(engine)
+    return engine
+
+
+@pytest.fixture(autouse=True)
+async def drain_engines(test_engine):
+    """測試結束前等待引擎的背景通知完成，避免任務跨測試殘留"""
+    yield
+    while _created_engines:
+        await _created_engines.pop().drain_notifications()
+
+
+@pytest.fixture(autouse=True)
+def breakers(monkeypatch):
+    """每個測試使用獨立的熔斷器狀態"""
+    registry = CircuitBreakerRegistry(failure_threshold=5, recovery_timeout=30.0)
+    monkeypatch.setattr(circuit_breaker, "_circuit_breaker_registry_instance", registry)
+    return registry
+
+
+async def wait_for(predicate, timeout: float = 2.0):
+    """輪詢等待條件成立"""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while asyncio.get_running_loop().time() < deadline:
+        if await predicate():
+            return True
+        await asyncio.sleep(0.01)
+    return False
+
+
+async def follower_position_size(session, user_id: int, symbol: str = "BTC/USDT"):
+    """讀取跟隨者倉位大小"""
+    result = await session.execute(
+        select(FollowerPosition.position_size).where(
+            FollowerPosition.user_id == user_id,
+            FollowerPosition.symbol == symbol,
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+class TestEventDrivenDispatch:
+    """測試信號驅動的跟單分發"""
+
+    async def test_signal_wakes_engine_before_safety_sweep(
+        self, db_session, session_factory, followers
+    ):
+        """測試 Master 倉位更新會立即喚醒引擎，不需等待安全掃描"""
+        engine = make_engine(db_session, poll_interval=60)
+        await engine.start()
+        try:
+            await asyncio.sleep(0.05)  # 讓初始安全掃描完成
+
+            await engine.update_master_position(
+                MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 2.0, 50000.0
+            )
+
+            async def synced():
+                async with session_factory() as session:
+                    return await follower_position_size(session, 2) == 1.0
+
+            assert await wait_for(synced)
+        finally:
+            await engine.stop()
+
+    async def test_polling_mode_does_not_subscribe(self, db_session, followers):
+        """測試關閉事件驅動時不訂閱信號匯流排"""
+        bus = SignalBus()
+        engine = make_engine(db_session, poll_interval=60, signal_bus=bus, event_driven=False)
+        await engine.start()
+        try:
+            assert bus.publish_master_position(MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 1.0) == 0
+        finally:
+            await engine.stop()
+
+    async def test_tick_fetches_only_changed_positions(self, db_session, followers):
+        """測試水位線之後只查詢變動的倉位"""
+        engine = make_engine(db_session, poll_interval=60, watermark_lookback=0)
+        for symbol in ("BTC/USDT", "ETH/USDT", "SOL/USDT"):
+            await engine.update_master_position(
+                MASTER_USER_ID, MASTER_CREDENTIAL_ID, symbol, 1.0, 100.0
+            )
+
+        async with engine.session_factory() as session:
+            assert len(await engine._fetch_changed_positions(session)) == 3
+            assert await engine._fetch_changed_positions(session) == []
+
+        await engine.update_master_position(
+            MASTER_USER_ID, MASTER_CREDENTIAL_ID, "ETH/USDT", 2.0, 100.0
+        )
+
+        async with engine.session_factory() as session:
+            changed = await engine._fetch_changed_positions(session)
+        assert [p.symbol for p in changed] == ["ETH/USDT"]
+
+    async def test_unchanged_tick_does_not_dispatch(self, db_session, followers):
+        """測試倉位無變動時不再分發"""
+        engine = make_engine(db_session, poll_interval=60)
+        await engine.update_master_position(
+            MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 1.0, 50000.0
+        )
+
+        first = await engine._check_and_follow_positions()
+        second = await engine._check_and_follow_positions()
+
+        result = await db_session.execute(select(TradeLog))
+        assert len(result.scalars().all()) == len(followers)
+        assert first.masters_total == 1
+        # 回看窗口內的倉位會被重讀，但大小未變不會下單
+        assert second.processed == second.masters_total
+
+    async def test_full_scan_picks_up_row_committed_behind_lookback(self, db_session, followers):
+        """測試提交時間晚於回看窗口的倉位由安全掃描補上"""
+        engine = make_engine(db_session, poll_interval=60)
+        await engine.update_master_position(
+            MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 1.0, 50000.0
+        )
+        await engine._check_and_follow_positions()
+
+        # 時間戳早於水位線減回看窗口的倉位（長交易較晚提交）
+        db_session.add(MasterPosition(
+            master_user_id=MASTER_USER_ID, master_credential_id=MASTER_CREDENTIAL_ID,
+            symbol="ETH/USDT", position_size=2.0, entry_price=3000.0,
+            last_updated=datetime.utcnow() - timedelta(minutes=5),
+        ))
+        await db_session.commit()
+
+        await engine._check_and_follow_positions()
+        assert await follower_position_size(db_session, 2, "ETH/USDT") is None
+
+        await engine._check_and_follow_positions(full_scan=True)
+        assert await follower_position_size(db_session, 2, "ETH/USDT") == 1.0
+        result = await db_session.execute(select(TradeLog).where(TradeLog.follower_user_id == 2))
+        assert len(result.scalars().all()) == 2
+
+
+class TestConcurrentMasters:
+    """測試多個 Master 並行處理"""
+
+    async def test_tick_stats_report_processed_masters(self, db_session, followers):
+        """測試每輪檢查回報已處理的 Master 數量"""
+        engine = make_engine(db_session, poll_interval=60)
+        await engine.update_master_position(
+            MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 1.0, 50000.0
+        )
+
+        stats = await engine._check_and_follow_positions()
+
+        assert stats.masters_total == 1
+        assert stats.processed == 1
+        assert engine.last_tick_stats is stats
+
+    async def test_timed_out_master_is_retried_next_tick(self, db_session, followers, monkeypatch):
+        """測試超時的 Master 在下一輪重新對帳"""
+        engine = make_engine(db_session, poll_interval=60, master_timeout=0.05)
+        await engine.update_master_position(
+            MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 2.0, 50000.0
+        )
+
+        original_dispatch = engine._dispatch_signals_to_followers
+
+        async def stuck_dispatch(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        monkeypatch.setattr(engine, "_dispatch_signals_to_followers", stuck_dispatch)
+        stats = await engine._check_and_follow_positions()
+        assert stats.timed_out == 1
+
+        monkeypatch.setattr(engine, "_dispatch_signals_to_followers", original_dispatch)
+        engine.master_timeout = 5
+        stats = await engine._check_and_follow_positions()
+        assert stats.processed == 1
+        assert await follower_position_size(db_session, 2) == 1.0
+
+    async def test_completed_followers_persisted_before_timeout(
+        self, db_session, followers, monkeypatch
+    ):
+        """測試 Master 超時時已完成的跟隨者已寫入，下一輪只補送未完成的跟隨者"""
+        engine = make_engine(db_session, poll_interval=60, master_timeout=0.3)
+        await engine.update_master_position(
+            MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 2.0, 50000.0
+        )
+
+        original_execute = engine._execute_follower_trades
+
+        async def throttled_execute(settings, legs):
+            if settings.user_id == 3:
+                await asyncio.sleep(10)  # 排在限流佇列中超過 Master 時限
+            await original_execute(settings, legs)
+
+        monkeypatch.setattr(engine, "_execute_follower_trades", throttled_execute)
+        stats = await engine._check_and_follow_positions()
+
+        assert stats.timed_out == 1
+        assert await follower_position_size(db_session, 2) == 1.0
+        assert await follower_position_size(db_session, 3) is None
+
+        monkeypatch.setattr(engine, "_execute_follower_trades", original_execute)
+        await engine._check_and_follow_positions()
+
+        assert await follower_position_size(db_session, 3) == pytest.approx(0.2)
+        result = await db_session.execute(select(TradeLog.follower_user_id))
+        assert sorted(result.scalars().all()) == [2, 3]
+
+
+class TestBatchOrders:
+    """測試多個交易對的變動合併為每個跟隨者一次批量下單"""
+
+    async def test_multi_symbol_signal_uses_one_batch_per_follower(
+        self, db_session, followers, monkeypatch
+    ):
+        """測試同一輪的多個交易對變動，每個跟隨者只送出一次批量請求"""
+        batches = []
+        original_create_orders = MockExchange.create_orders
+
+        def recording_create_orders(self, orders):
+            batches.append((self.api_key, sorted(order["symbol"] for order in orders)))
+            return original_create_orders(self, orders)
+
+        monkeypatch.setattr(MockExchange, "create_orders", recording_create_orders)
+
+        engine = make_engine(db_session, poll_interval=60)
+        for symbol in ("BTC/USDT", "ETH/USDT", "SOL/USDT"):
+            await engine.update_master_position(
+                MASTER_USER_ID, MASTER_CREDENTIAL_ID, symbol, 2.0, 100.0
+            )
+        await engine._check_and_follow_positions()
+
+        assert sorted(batches) == [
+            (f"follower_key_{user_id}", ["BTC/USDT", "ETH/USDT", "SOL/USDT"])
+            for user_id in (2, 3)
+        ]
+        result = await db_session.execute(select(TradeLog))
+        assert len(result.scalars().all()) == 3 * len(followers)
+        assert await follower_position_size(db_session, 3, "SOL/USDT") == pytest.approx(0.2)
+
+
+class TestMarketNormalization:
+    """測試下單前依市場規格取整與丟棄低於最小值的訂單"""
+
+    async def test_amount_rounded_down_to_lot_size(self, db_session, followers):
+        """測試數量向下取整到交易對的最小變動單位"""
+        engine = make_engine(db_session, poll_interval=60)
+        await engine.update_master_position(
+            MASTER_USER_ID, MASTER_CREDENTIAL_ID, "ETH/USDT", 1.23456789, 3000.0
+        )
+        await engine._check_and_follow_positions()
+
+        assert await follower_position_size(db_session, 2, "ETH/USDT") == pytest.approx(0.6172)
+        assert await follower_position_size(db_session, 3, "ETH/USDT") == pytest.approx(0.1234)
+        assert engine.market_cache.amounts_rounded == 2
+
+    async def test_dust_dropped_without_disabling_follower(
+        self, db_session, followers, monkeypatch
+    ):
+        """測試低於最小名目價值的訂單不送出，也不停止跟單"""
+        orders = []
+        original_create_orders = MockExchange.create_orders
+
+        def recording_create_orders(self, batch):
+            orders.extend((self.api_key, order["amount"]) for order in batch)
+            return original_create_orders(self, batch)
+
+        monkeypatch.setattr(MockExchange, "create_orders", recording_create_orders)
+
+        engine = make_engine(db_session, poll_interval=60)
+        # 跟隨者 2: 0.00015 BTC ≈ 7.5 USDT；跟隨者 3: 0.00003 BTC ≈ 1.5 USDT（低於 5 USDT）
+        await engine.update_master_position(
+            MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 0.0003, 50000.0
+        )
+        await engine._check_and_follow_positions()
+
+        assert orders == [("follower_key_2", pytest.approx(0.00015))]
+        assert await follower_position_size(db_session, 3) is None
+        assert (await db_session.execute(select(TradeError))).scalars().all() == []
+        assert engine.subscription_index.follower_count() == 2
+        assert engine.market_cache.orders_dropped == 1
+
+
+class TestOrderCoalescing:
+    """測試合併窗口內的多次倉位變動"""
+
+    async def test_rapid_scale_ins_produce_one_order_per_follower(
+        self, db_session, followers, monkeypatch
+    ):
+        """測試窗口內連續三次加倉，每個跟隨者只下一筆訂單"""
+        orders = []
+        original_create_orders = MockExchange.create_orders
+
+        def recording_create_orders(self, batch):
+            orders.extend((self.api_key, order["amount"]) for order in batch)
+            return original_create_orders(self, batch)
+
+        monkeypatch.setattr(MockExchange, "create_orders", recording_create_orders)
+
+        engine = make_engine(db_session, poll_interval=60, coalesce_window=0.3)
+        await engine.start()
+        try:
+            await asyncio.sleep(0.05)
+            for size in (1.0, 2.0, 3.0):
+                await engine.update_master_position(
+                    MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", size, 50000.0
+                )
+                await asyncio.sleep(0.02)
+            assert orders == []  # 窗口尚未結束
+
+            async def dispatched():
+                return engine.coalescer.get_stats()["windows_closed"] == 1
+
+            assert await wait_for(dispatched)
+        finally:
+            await engine.stop()
+
+        assert sorted(orders) == [
+            ("follower_key_2", pytest.approx(1.5)),
+            ("follower_key_3", pytest.approx(0.3)),
+        ]
+        stats = engine.coalescer.get_stats()
+        assert stats["changes_coalesced"] == 2
+        assert stats["orders_saved"] == 2 * len(followers)
+        assert stats["open_windows"] == 0
+
+    async def test_round_trip_inside_window_is_not_dispatched(self, db_session, followers):
+        """測試窗口內倉位回到原大小時不分發"""
+        engine = make_engine(db_session, poll_interval=60, coalesce_window=0.1)
+        dispatched = record_dispatches(engine)
+
+        await engine.update_master_position(
+            MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 1.0, 50000.0
+        )
+        await engine._check_and_follow_positions()
+        await asyncio.sleep(0.15)
+        await engine._check_and_follow_positions()
+        assert dispatched == ["BTC/USDT"]
+
+        for size in (2.0, 1.0):
+            await engine.update_master_position(
+                MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", size, 50000.0
+            )
+            await engine._check_and_follow_positions()
+        await asyncio.sleep(0.15)
+        await engine._check_and_follow_positions()
+
+        assert dispatched == ["BTC/USDT"]
+        assert engine._retry_masters == set()
+        assert engine.coalescer.get_stats()["orders_saved"] == 2 * len(followers)
+
+
+def flaky_create_orders(monkeypatch, failures: int, filled_on_timeout: bool = False) -> list:
+    """讓 follower_key_3 的前 failures 次批量下單逾時，返回每次送出的客戶端訂單 ID"""
+    submitted = []
+    original_create_orders = MockExchange.create_orders
+
+    def create_orders(self, orders):
+        if self.api_key != "follower_key_3":
+            return original_create_orders(self, orders)
+        submitted.extend(order["params"]["clientOrderId"] for order in orders)
+        if len(submitted) > failures:
+            return original_create_orders(self, orders)
+        if filled_on_timeout:
+            original_create_orders(self, orders)  # 交易所已成交，但回應逾時
+        return [ccxt.RequestTimeout("request timed out")] * len(orders)
+
+    monkeypatch.setattr(MockExchange, "create_orders", create_orders)
+    return submitted
+
+
+async def run_retries(engine, rounds: int):
+    """等待退避時間後處理到期的重試"""
+    for _ in range(rounds):
+        await asyncio.sleep(0.03)
+        await engine._process_due_retries()
+
+
+class TestOrderRetry:
+    """測試暫時性下單失敗的冪等重試"""
+
+    async def test_timeout_is_retried_without_double_fill(
+        self, db_session, followers, monkeypatch
+    ):
+        """測試逾時但已成交的訂單重試時沿用客戶端訂單 ID，不會重複成交也不停止跟單"""
+        submitted = flaky_create_orders(monkeypatch, failures=1, filled_on_timeout=True)
+        engine = make_engine(db_session, poll_interval=60, order_retry_base_delay=0.01)
+        await engine.update_master_position(
+            MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 2.0, 50000.0
+        )
+
+        await engine._check_and_follow_positions()
+        assert len(engine.retry_queue) == 1
+        assert await follower_position_size(db_session, 3) is None
+
+        await run_retries(engine, rounds=1)
+
+        assert len(submitted) == 2 and submitted[0] == submitted[1]
+        assert await follower_position_size(db_session, 3) == pytest.approx(0.2)
+        await db_session.refresh(followers[1])
+        assert followers[1].is_active is True
+        result = await db_session.execute(select(TradeError))
+        assert result.scalars().all() == []
+
+    async def test_follower_disabled_only_after_retries_exhausted(
+        self, db_session, followers, monkeypatch
+    ):
+        """測試重試次數用盡後才停止跟單"""
+        submitted = flaky_create_orders(monkeypatch, failures=100)
+        engine = make_engine(
+            db_session, poll_interval=60, order_retry_attempts=2, order_retry_base_delay=0.01
+        )
+        await engine.update_master_position(
+            MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 2.0, 50000.0
+        )
+
+        await engine._check_and_follow_positions()
+        await run_retries(engine, rounds=1)
+        await db_session.refresh(followers[1])
+        assert followers[1].is_active is True
+
+        await run_retries(engine, rounds=1)
+
+        assert len(submitted) == 3 and len(set(submitted)) == 1
+        await db_session.refresh(followers[1])
+        assert followers[1].is_active is False
+        result = await db_session.execute(select(TradeError))
+        errors = result.scalars().all()
+        assert len(errors) == 1 and "重試 2 次" in errors[0].error_message
+        assert engine.retry_queue.get_stats()["exhausted"] == 1
+
+    async def test_new_signal_supersedes_pending_retry(self, db_session, followers, monkeypatch):
+        """測試新的倉位變動取代等待中的重試，並使用新的客戶端訂單 ID"""
+        submitted = flaky_create_orders(monkeypatch, failures=1)
+        engine = make_engine(db_session, poll_interval=60, order_retry_base_delay=10.0)
+        await engine.update_master_position(
+            MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 2.0, 50000.0
+        )
+        await engine._check_and_follow_positions()
+        assert len(engine.retry_queue) == 1
+
+        await asyncio.sleep(0.01)  # 確保更新時間不同
+        await engine.update_master_position(
+            MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 3.0, 50000.0
+        )
+        await engine._check_and_follow_positions()
+
+        assert len(engine.retry_queue) == 0
+        assert len(submitted) == 2 and submitted[0] != submitted[1]
+        assert await follower_position_size(db_session, 3) == pytest.approx(0.3)
+
+
+class TestSimulatedExchange:
+    """測試引擎在模擬交易所上的行為"""
+
+    @pytest.fixture
+    def simulator(self):
+        """新創建的 MockExchange 使用模擬器，測試後還原"""
+        simulator = MockExchangeSimulator(SimulationProfile(seed=7, partial_fill_rate=1.0))
+        previous = configure_mock_simulator(simulator)
+        yield simulator
+        configure_mock_simulator(previous)
+
+    async def test_partial_fill_records_filled_position(self, db_session, followers, simulator):
+        """測試部分成交時記錄交易所實際的倉位，不記錄目標倉位"""
+        engine = make_engine(db_session, poll_interval=60)
+        await engine.update_master_position(
+            MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 2.0, 50000.0
+        )
+        await engine._check_and_follow_positions()
+
+        for user_id, target in ((2, 1.0), (3, 0.2)):
+            exchange_size = simulator.account(f"follower_key_{user_id}").positions["BTC/USDT"]
+            assert exchange_size < target
+            assert await follower_position_size(db_session, user_id) == pytest.approx(exchange_size)
+        assert simulator.get_stats()["partial_fills"] == len(followers)
+
+    async def test_ratio_change_on_unchanged_master_sends_new_order(self, db_session, followers):
+        """測試 Master 倉位未變時變更跟單比例，使用新的客戶端訂單 ID 並實際調整交易所倉位"""
+        simulator = MockExchangeSimulator(SimulationProfile(seed=7))
+        previous = configure_mock_simulator(simulator)
+        try:
+            engine = make_engine(db_session, poll_interval=60)
+            await engine.update_master_position(
+                MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 2.0, 50000.0
+            )
+            await engine._check_and_follow_positions()
+
+            followers[0].follow_ratio = 0.25
+            await db_session.commit()
+            engine.subscription_index.upsert(followers[0])
+            await engine._check_and_follow_positions()
+        finally:
+            configure_mock_simulator(previous)
+
+        assert simulator.account("follower_key_2").positions["BTC/USDT"] == pytest.approx(0.5)
+        assert await follower_position_size(db_session, 2) == pytest.approx(0.5)
+        assert simulator.get_stats()["duplicates"] == 0
+
+
+class TestCircuitBreaker:
+    """測試交易所熔斷時暫緩跟單"""
+
+    async def test_open_breaker_holds_orders_without_disabling(
+        self, db_session, followers, monkeypatch, breakers
+    ):
+        """測試熔斷後不再送出請求、不寫入錯誤也不停止跟單，新信號同樣暫緩"""
+        breakers.failure_threshold = 2
+        submitted = flaky_create_orders(monkeypatch, failures=100)
+        engine = make_engine(
+            db_session, poll_interval=60, order_retry_attempts=10, order_retry_base_delay=0.01
+        )
+        await engine.update_master_position(
+            MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 2.0, 50000.0
+        )
+
+        await engine._check_and_follow_positions()
+        await run_retries(engine, rounds=3)
+
+        assert len(submitted) == 2  # 第二次失敗後熔斷
+        assert breakers.get_stats()["api_keys"]["mock:foll...ey_3"]["state"] == "open"
+        assert engine.retry_queue.get_stats()["held"] >= 1
+        assert engine.retry_queue.seconds_until_due() > 10
+
+        await asyncio.sleep(0.01)
+        await engine.update_master_position(
+            MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 3.0, 50000.0
+        )
+        await engine._check_and_follow_positions()
+
+        assert len(submitted) == 2
+        assert len(engine.retry_queue) == 1
+        await db_session.refresh(followers[1])
+        assert followers[1].is_active is True
+        result = await db_session.execute(select(TradeError))
+        assert result.scalars().all() == []
+        assert await follower_position_size(db_session, 2) == pytest.approx(1.5)
+
+
+class TestSessionPerFollower:
+    """測試每個跟隨者使用獨立 session 並行跟單"""
+
+    async def test_followers_sync_with_independent_sessions(self, db_session, followers):
+        """測試多個跟隨者並行跟單時各自寫入成功"""
+        engine = make_engine(db_session, poll_interval=60)
+        await engine.update_master_position(
+            MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 2.0, 50000.0
+        )
+
+        await engine._check_and_follow_positions()
+
+        assert await follower_position_size(db_session, 2) == 1.0
+        assert await follower_position_size(db_session, 3) == pytest.approx(0.2)
+        result = await db_session.execute(select(TradeLog).where(TradeLog.is_success == True))
+        assert len(result.scalars().all()) == 2
+
+    async def test_open_sessions_bounded_by_max_db_sessions(self, db_session, session_factory):
+        """測試同時開啟的 session 數量不超過上限"""
+        db_session.add_all([
+            FollowSettings(
+                user_id=user_id,
+                master_user_id=MASTER_USER_ID,
+                master_credential_id=MASTER_CREDENTIAL_ID,
+                follower_credential_id=100 + user_id,
+                follow_ratio=1.0,
+                is_active=True,
+            )
+            for user_id in range(10, 30)
+        ])
+        await db_session.commit()
+
+        open_sessions = 0
+        peak = 0
+
+        class CountingSession:
+            def __init__(self):
+                self._cm = session_factory()
+
+            async def __aenter__(self):
+                nonlocal open_sessions, peak
+                open_sessions += 1
+                peak = max(peak, open_sessions)
+                return await self._cm.__aenter__()
+
+            async def __aexit__(self, *exc):
+                nonlocal open_sessions
+                open_sessions -= 1
+                return await self._cm.__aexit__(*exc)
+
+        engine = make_engine(
+            db_session, poll_interval=60, session_factory=CountingSession, max_db_sessions=3
+        )
+        await engine.update_master_position(
+            MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 1.0, 50000.0
+        )
+
+        await engine._check_and_follow_positions()
+
+        assert peak <= 3
+        result = await db_session.execute(select(TradeLog).where(TradeLog.is_success == True))
+        assert len(result.scalars().all()) == 20
+
+
+class TestSubscriptionIndexIntegration:
+    """測試引擎使用跟單索引"""
+
+    async def test_auto_disabled_follower_removed_from_index(self, db_session, followers):
+        """測試下單失敗自動停止的跟隨者會移出索引"""
+
+        class FailingCredentialService(StubCredentialService):
+            async def get_decrypted_credential(self, credential_id: int, user_id: int):
+                if user_id == 3:
+                    return None
+                return await super().get_decrypted_credential(credential_id, user_id)
+
+        engine = make_engine(db_session, poll_interval=60)
+        engine.credential_service = FailingCredentialService()
+        await engine.update_master_position(
+            MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 2.0, 50000.0
+        )
+
+        await engine._check_and_follow_positions()
+
+        entries = engine.subscription_index.snapshot()[(MASTER_USER_ID, MASTER_CREDENTIAL_ID)]
+        assert [entry.user_id for entry in entries] == [2]
+
+    async def test_tick_does_not_reload_follow_settings(self, db_session, followers):
+        """測試索引建立後，每輪檢查不再重新查詢跟單設定"""
+        engine = make_engine(db_session, poll_interval=60)
+        await engine._check_and_follow_positions()
+
+        # 直接寫入資料庫但未通知索引，引擎不應看到新的跟隨者
+        db_session.add(FollowSettings(
+            user_id=9,
+            master_user_id=MASTER_USER_ID,
+            master_credential_id=MASTER_CREDENTIAL_ID,
+            follower_credential_id=109,
+            follow_ratio=1.0,
+            is_active=True,
+        ))
+        await db_session.commit()
+
+        await engine._check_and_follow_positions()
+
+        assert engine.subscription_index.follower_count() == len(followers)
+
+    async def test_late_subscription_reconciled_after_watermark_moved(self, db_session, followers):
+        """測試水位線已越過 Master 倉位後才訂閱的跟隨者仍會對帳"""
+        engine = make_engine(db_session, poll_interval=60, watermark_lookback=0)
+        await engine.update_master_position(5, 5, "BTC/USDT", 2.0, 50000.0)
+        await engine.update_master_position(
+            MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 1.0, 50000.0
+        )
+        await engine._check_and_follow_positions()
+        await engine._check_and_follow_positions()
+
+        late = [
+            FollowSettings(
+                user_id=user_id, master_user_id=master_key, master_credential_id=master_key,
+                follower_credential_id=100 + user_id, follow_ratio=0.5, is_active=True,
+            )
+            for user_id, master_key in ((8, 5), (9, MASTER_USER_ID))
+        ]
+        db_session.add_all(late)
+        await db_session.commit()
+        for settings in late:
+            engine.subscription_index.upsert(settings)
+        dispatched = record_dispatches(engine)
+
+        await engine._check_and_follow_positions()
+
+        assert await follower_position_size(db_session, 8) == 1.0
+        assert await follower_position_size(db_session, 9) == 0.5
+        # 已同步的跟隨者不會因新跟隨者而重複下單
+        result = await db_session.execute(select(TradeLog).where(TradeLog.follower_user_id == 2))
+        assert len(result.scalars().all()) == 1
+
+        await engine._check_and_follow_positions()
+        assert len(dispatched) == 2
+
+
+def record_dispatches(engine) -> list:
+    """記錄引擎完成分發的交易對"""
+    dispatched = []
+    original_dispatch = engine._dispatch_signals_to_followers
+
+    async def recording_dispatch(master_positions, followers):
+        completed = await original_dispatch(master_positions, followers)
+        dispatched.extend(position.symbol for position in master_positions)
+        return completed
+
+    engine._dispatch_signals_to_followers = recording_dispatch
+    return dispatched
+
+
+class TestCheckpointRestart:
+    """測試引擎重啟後恢復倉位變動偵測狀態"""
+
+    async def test_restart_resumes_without_redundant_dispatch(self, db_session, followers):
+        """測試重啟後只分發真正的變動"""
+        engine = make_engine(db_session, poll_interval=60)
+        dispatched_before = record_dispatches(engine)
+        await engine.start()
+        try:
+            await engine.update_master_position(
+                MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 2.0, 50000.0
+            )
+            await engine.update_master_position(
+                MASTER_USER_ID, MASTER_CREDENTIAL_ID, "ETH/USDT", 4.0, 3000.0
+            )
+
+            async def both_dispatched():
+                return sorted(dispatched_before) == ["BTC/USDT", "ETH/USDT"]
+
+            assert await wait_for(both_dispatched)
+        finally:
+            await engine.stop()
+
+        # 模擬重啟：全新的引擎實例，使用同一個資料庫
+        restarted = make_engine(db_session, poll_interval=60)
+        dispatched_after = record_dispatches(restarted)
+        await restarted.start()
+        try:
+            await asyncio.sleep(0.1)  # 讓啟動後的第一輪檢查完成
+            assert dispatched_after == []
+
+            await restarted.update_master_position(
+                MASTER_USER_ID, MASTER_CREDENTIAL_ID, "ETH/USDT", 6.0, 3000.0
+            )
+
+            async def delta_dispatched():
+                return dispatched_after == ["ETH/USDT"]
+
+            assert await wait_for(delta_dispatched)
+        finally:
+            await restarted.stop()
+
+        assert dispatched_after == ["ETH/USDT"]
+
+    async def test_follower_added_during_downtime_is_reconciled(self, db_session, followers):
+        """測試停機期間新增的跟隨者與變更的跟單比例在重啟後對帳，其餘跟隨者不重複下單"""
+        engine = make_engine(db_session, poll_interval=60)
+        await engine.update_master_position(
+            MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 2.0, 50000.0
+        )
+        await engine._check_and_follow_positions()
+        await engine.save_checkpoint()
+
+        # 停機期間：新增跟隨者、變更跟隨者 3 的比例
+        db_session.add(FollowSettings(
+            user_id=9, master_user_id=MASTER_USER_ID, master_credential_id=MASTER_CREDENTIAL_ID,
+            follower_credential_id=109, follow_ratio=1.0, is_active=True,
+        ))
+        followers[1].follow_ratio = 0.2
+        await db_session.commit()
+
+        restarted = make_engine(db_session, poll_interval=60)
+        assert await restarted.restore_checkpoint() is True
+        await restarted._check_and_follow_positions()
+
+        assert await follower_position_size(db_session, 9) == 2.0
+        assert await follower_position_size(db_session, 3) == pytest.approx(0.4)
+        result = await db_session.execute(select(TradeLog).where(TradeLog.follower_user_id == 2))
+        assert len(result.scalars().all()) == 1
+
+    async def test_without_checkpoint_every_position_is_redispatched(self, db_session, followers):
+        """測試沒有檢查點時，重啟會把所有非零倉位視為首次出現"""
+        engine = make_engine(db_session, poll_interval=60)
+        for symbol in ("BTC/USDT", "ETH/USDT"):
+            await engine.update_master_position(
+                MASTER_USER_ID, MASTER_CREDENTIAL_ID, symbol, 1.0, 100.0
+            )
+        await engine._check_and_follow_positions()
+        await engine.save_checkpoint()
+
+        fresh = make_engine(db_session, poll_interval=60, checkpoint_name="another_engine")
+        dispatched = record_dispatches(fresh)
+        assert await fresh.restore_checkpoint() is False
+        await fresh._check_and_follow_positions()
+
+        assert sorted(dispatched) == ["BTC/USDT", "ETH/USDT"]
+
+
+async def set_emergency_stop(engine, session, stop: bool):
+    """經由引擎的全域設定快取寫入緊急全停（與 /trader/emergency-stop 相同路徑）"""
+    await engine.global_settings.set_bool(session, EMERGENCY_STOP_KEY, stop)
+
+
+class TestEmergencyStop:
+    """測試緊急全停"""
+
+    async def test_stop_skips_dispatch_until_resumed(self, db_session, followers):
+        """測試緊急全停期間不分發，解除後的下一輪補上期間的變動"""
+        engine = make_engine(db_session, poll_interval=60)
+        await set_emergency_stop(engine, db_session, True)
+        await engine.update_master_position(
+            MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 2.0, 50000.0
+        )
+
+        await engine._check_and_follow_positions()
+        result = await db_session.execute(select(TradeLog))
+        assert result.scalars().all() == []
+
+        await set_emergency_stop(engine, db_session, False)
+        await engine._check_and_follow_positions()
+
+        assert await follower_position_size(db_session, 2) == pytest.approx(1.0)
+        assert await follower_position_size(db_session, 3) == pytest.approx(0.2)
+
+    async def test_stop_cancels_queued_orders_immediately(
+        self, db_session, followers, monkeypatch
+    ):
+        """測試緊急全停立即取消重試佇列中的下單，解除後重新對帳"""
+        submitted = flaky_create_orders(monkeypatch, failures=1)
+        engine = make_engine(db_session, poll_interval=60, order_retry_base_delay=10.0)
+        await engine.start()
+        try:
+            await engine.update_master_position(
+                MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 2.0, 50000.0
+            )
+
+            async def queued():
+                return len(engine.retry_queue) == 1
+
+            assert await wait_for(queued)
+
+            await set_emergency_stop(engine, db_session, True)
+            started = asyncio.get_running_loop().time()
+
+            async def cancelled():
+                return len(engine.retry_queue) == 0
+
+            assert await wait_for(cancelled, timeout=0.1)
+            assert asyncio.get_running_loop().time() - started < 0.1
+            assert engine.retry_queue.get_stats()["cancelled"] == 1
+        finally:
+            await engine.stop()
+
+        await set_emergency_stop(engine, db_session, False)
+        await engine._check_and_follow_positions()
+
+        assert len(submitted) == 2
+        assert await follower_position_size(db_session, 3) == pytest.approx(0.2)
+
+    async def test_stop_during_dispatch_cancels_unsent_orders(self, db_session, followers):
+        """測試分發途中啟動緊急全停時，尚未送出的下單被取消，解除後重新對帳"""
+        engine = make_engine(db_session, poll_interval=60)
+        original = engine.credential_service.get_decrypted_credential
+
+        async def stop_then_decrypt(credential_id: int, user_id: int):
+            engine.global_settings.apply(GlobalSetting(key=EMERGENCY_STOP_KEY, value_bool=True))
+            return await original(credential_id, user_id)
+
+        engine.credential_service.get_decrypted_credential = stop_then_decrypt
+        await engine.update_master_position(
+            MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 2.0, 50000.0
+        )
+
+        await engine._check_and_follow_positions()
+        assert await follower_position_size(db_session, 2) is None
+        assert engine._retry_masters == {(MASTER_USER_ID, MASTER_CREDENTIAL_ID)}
+
+        engine.credential_service.get_decrypted_credential = original
+        await set_emergency_stop(engine, db_session, False)
+        await engine._check_and_follow_positions()
+
+        assert await follower_position_size(db_session, 2) == pytest.approx(1.0)
+
+
+class TestDashboardUpdates:
+    """測試引擎寫入後儀表板摘要失效與事件推送"""
+
+    async def test_writes_bump_dashboard_versions(self, db_session, followers):
+        """測試寫入 Master 倉位與跟隨者交易後遞增對應的版本號"""
+        engine = make_engine(db_session, poll_interval=60)
+        cache = engine.dashboard_cache
+
+        await engine.update_master_position(
+            MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 2.0, 50000.0
+        )
+        assert cache.master_version(MASTER_USER_ID, MASTER_CREDENTIAL_ID) == 1
+        assert cache.user_version(2) == 0
+
+        await engine._check_and_follow_positions()
+
+        assert [cache.user_version(user_id) for user_id in (2, 3)] == [1, 1]
+
+    async def test_writes_publish_dashboard_events(self, db_session, followers):
+        """測試 Master 倉位、跟單記錄與跟隨者倉位的寫入推送為儀表板事件"""
+        engine = make_engine(db_session, poll_interval=60)
+        subscription = engine.signal_bus.subscribe(DASHBOARD_TOPIC)
+
+        await engine.update_master_position(
+            MASTER_USER_ID, MASTER_CREDENTIAL_ID, "BTC/USDT", 2.0, 50000.0
+        )
+        await engine._check_and_follow_positions()
+        events = await subscription.get_batch(timeout=1)
+
+        master_event = events[0]
+        assert (master_event.event, master_event.master_key) == (
+            "master_position", (MASTER_USER_ID, MASTER_CREDENTIAL_ID)
+        )
+        assert master_event.data["position_size"] == 2.0
+        by_user = {
+            (event.user_id, event.event): event.data for event in events if event.user_id is not None
+        }
+        assert set(by_user) == {(2, "trade"), (2, "position"), (3, "trade"), (3, "position")}
+        assert by_user[(3, "position")]["position_size"] == pytest.approx(0.2)
+        trade_ids = {log.id for log in (await db_session.execute(select(TradeLog))).scalars()}
+        assert {by_user[(user_id, "trade")]["id"] for user_id in (2, 3)} == trade_ids
@@ -0,0 +1,131 @@
+"""
+Global Settings Cache 單元測試
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+
+from backend.app.database import Base
+from backend.app.models.global_setting import GlobalSetting
+from backend.app.services.global_settings import EMERGENCY_STOP_KEY, GlobalSettingsCache
+from backend.app.services.signal_bus import CONFIG_TOPIC, GlobalSettingSignal, SignalBus
+
+
+@pytest.fixture
+async def test_engine(tmp_path):
+    """創建測試引擎（檔案資料庫，讓每個 session 取得獨立連接）"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'settings.db'}", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield engine
+
+    await engine.dispose()
+
+
+@pytest.fixture
+def session_factory(test_engine):
+    """創建測試會話工廠"""
+    return async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest.fixture
+async def db_session(session_factory):
+    """創建測試資料庫會話"""
+    async with session_factory() as session:
+        yield session
+
+
+@pytest.fixture
+def signal_bus():
+    return SignalBus()
+
+
+@pytest.fixture
+def subscription(signal_bus):
+    """訂閱設定變更"""
+    return signal_bus.subscribe(CONFIG_TOPIC)
+
+
+async def write_setting(session_factory, key: str, value: bool):
+    """繞過快取直接寫入資料庫（模擬其他程序的寫入）"""
+    async with session_factory() as session:
+        setting = await session.get(GlobalSetting, 1)
+        if setting is None:
+            session.add(GlobalSetting(id=1, key=key, value_bool=value))
+        else:
+            setting.value_bool = value
+        await session.commit()
+
+
+class TestGlobalSettingsCache:
+    """測試全域設定快取"""
+
+    async def test_reads_after_load_do_not_query(self, test_engine, db_session, session_factory, signal_bus):
+        await write_setting(session_factory, EMERGENCY_STOP_KEY, True)
+        cache = GlobalSettingsCache(refresh_interval=60, signal_bus=signal_bus)
+        await cache.ensure_fresh(db_session)
+
+        statements = []
+        event.listen(
+            test_engine.sync_engine, "before_cursor_execute",
+            lambda *args: statements.append(args[2])
+        )
+        await cache.ensure_fresh(db_session)
+
+        assert cache.emergency_stop is True
+        assert cache.get_bool("missing", default=True) is True
+        assert cache.get_str("missing") is None
+        assert statements == []
+        assert cache.loads == 1
+
+    async def test_set_bool_upserts_and_publishes(self, db_session, signal_bus, subscription):
+        cache = GlobalSettingsCache(refresh_interval=60, signal_bus=signal_bus)
+        await cache.ensure_fresh(db_session)
+
+        setting = await cache.set_bool(db_session, EMERGENCY_STOP_KEY, True)
+
+        assert setting.value_bool is True
+        assert setting.description is not None
+        assert cache.emergency_stop is True
+        batch = await subscription.get_batch(timeout=1)
+        assert [s.key for s in batch if isinstance(s, GlobalSettingSignal)] == [EMERGENCY_STOP_KEY]
+
+        await cache.set_bool(db_session, EMERGENCY_STOP_KEY, True)
+        assert await subscription.get_batch(timeout=0.05) == []
+
+    async def test_refresh_picks_up_external_write(
+        self, db_session, session_factory, signal_bus, subscription
+    ):
+        cache = GlobalSettingsCache(refresh_interval=0, signal_bus=signal_bus)
+        await cache.ensure_fresh(db_session)
+        assert cache.emergency_stop is False
+
+        await write_setting(session_factory, EMERGENCY_STOP_KEY, True)
+        await cache.ensure_fresh(db_session)
+
+        assert cache.emergency_stop is True
+        batch = await subscription.get_batch(timeout=1)
+        assert [s.key for s in batch] == [EMERGENCY_STOP_KEY]
+
+    async def test_first_load_does_not_publish(self, db_session, session_factory, signal_bus, subscription):
+        await write_setting(session_factory, EMERGENCY_STOP_KEY, True)
+        cache = GlobalSettingsCache(refresh_interval=60, signal_bus=signal_bus)
+
+        await cache.load(db_session)
+
+        assert cache.emergency_stop is True
+        assert await subscription.get_batch(timeout=0.05) == []
+
+    async def test_load_does_not_overwrite_concurrent_write(self, db_session, session_factory, signal_bus):
+        await write_setting(session_factory, EMERGENCY_STOP_KEY, False)
+        cache = GlobalSettingsCache(refresh_interval=60, signal_bus=signal_bus)
+
+        load = asyncio.create_task(cache.load(db_session))
+        await asyncio.sleep(0)  # 讓載入開始並等待查詢
+        cache.apply(GlobalSetting(key=EMERGENCY_STOP_KEY, value_bool=True))
+        await load
+
+        assert cache.emergency_stop is True
@@ -0,0 +1,100 @@
+"""
+Market Metadata Cache 單元測試
+"""
+import asyncio
+
+import pytest
+
+from backend.app.services.exchanges.async_adapters import ThreadedExchangeAdapter
+from backend.app.services.exchanges.market_cache import MarketInfo, MarketMetadataCache
+from backend.app.services.exchanges.mock_exchange import MockExchange
+
+
+class CountingMarkets(ThreadedExchangeAdapter):
+    """記錄 load_markets 次數，可設定為失敗"""
+
+    def __init__(self):
+        super().__init__(MockExchange("key", "secret"))
+        self.calls = 0
+        self.fail = False
+
+    async def load_markets(self):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("down")
+        return await super().load_markets()
+
+
+class TestMarketInfo:
+    """測試取整與最小值檢查"""
+
+    def test_round_amount_floors_to_step(self):
+        market = MarketInfo("BTC/USDT", amount_step=0.001)
+        assert market.round_amount(0.12345) == 0.123
+        # 浮點誤差不會讓剛好整除的數量被捨去一個單位
+        assert market.round_amount(0.1 + 0.2) == pytest.approx(0.3)
+        assert market.round_amount(0.3 - 1e-17) == pytest.approx(0.3)
+
+    def test_round_price_to_tick(self):
+        assert MarketInfo("BTC/USDT", price_tick=0.5).round_price(100.26) == 100.5
+
+    def test_dust(self):
+        market = MarketInfo("BTC/USDT", amount_step=0.001, min_amount=0.002, min_notional=10.0)
+        assert market.is_dust(0.001)
+        assert market.is_dust(0.002, price=1000.0)
+        assert not market.is_dust(0.01, price=1000.0)
+        # 沒有參考價格時不檢查名目價值
+        assert not market.is_dust(0.002)
+
+    def test_unknown_market_uses_default_min_amount(self):
+        market = MarketInfo("XYZ/USDT")
+        assert market.round_amount(0.123456789) == 0.123456789
+        assert market.is_dust(0.00005)
+        assert not market.is_dust(0.001)
+
+
+class TestMarketMetadataCache:
+    """測試載入、背景刷新與失敗降級"""
+
+    async def test_loads_once_per_exchange(self):
+        cache = MarketMetadataCache(refresh_interval=60)
+        client = CountingMarkets()
+
+        await asyncio.gather(*[cache.ensure_loaded("mock", client) for _ in range(5)])
+
+        assert client.calls == 1
+        assert cache.get("mock", "ETH/USDT").amount_step == 0.0001
+        assert cache.normalize_amount("mock", "ETH/USDT", 0.123456, 3000.0) == 0.1234
+        assert cache.normalize_amount("mock", "ETH/USDT", 0.001, 3000.0) == 0.0
+        assert cache.get_stats()["orders_dropped"] == 1
+
+    async def test_stale_markets_refreshed_in_background(self):
+        cache = MarketMetadataCache(refresh_interval=0)
+        client = CountingMarkets()
+
+        await cache.ensure_loaded("mock", client)
+        await cache.ensure_loaded("mock", client)
+        await asyncio.sleep(0.1)
+
+        assert client.calls == 2
+
+    async def test_load_failure_falls_back_to_defaults(self):
+        cache = MarketMetadataCache(refresh_interval=60, retry_interval=0)
+        client = CountingMarkets()
+        client.fail = True
+
+        await cache.ensure_loaded("mock", client)
+        assert cache.get("mock", "BTC/USDT") == MarketInfo("BTC/USDT")
+        assert cache.load_failures == 1
+
+        # retry_interval 到期後在背景重試
+        client.fail = False
+        await cache.ensure_loaded("mock", client)
+        await asyncio.sleep(0.1)
+        assert cache.get("mock", "BTC/USDT").min_notional == 5.0
+
+    async def test_exchange_without_markets(self):
+        """測試交易所不提供市場規格時套用預設的最小下單數量"""
+        cache = MarketMetadataCache()
+        await cache.ensure_loaded("other", ThreadedExchangeAdapter(object()))
+        assert cache.normalize_amount("other", "BTC/USDT", 0.00005) == 0.0
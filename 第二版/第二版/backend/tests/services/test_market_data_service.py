@@ -0,0 +1,132 @@
+"""
+Market Data Service 單元測試
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from backend.app.services.market_data_service import MarketDataService
+from backend.app.services.pnl_service import PnLService
+
+
+class CountingTickers:
+    """記錄 fetch_ticker 次數的行情來源"""
+
+    def __init__(self, prices):
+        self.prices = prices
+        self.calls = []
+        self.fail = False
+
+    async def fetch_ticker(self, symbol):
+        self.calls.append(symbol)
+        if self.fail:
+            raise ConnectionError("down")
+        return {"symbol": symbol, "last": self.prices[symbol], "bid": None, "ask": None}
+
+
+@pytest.fixture
+async def tickers():
+    return CountingTickers({"BTC/USDT": 60000.0, "ETH/USDT": 3500.0})
+
+
+@pytest.fixture
+async def market_data(tickers):
+    service = MarketDataService(
+        poll_interval=0.05, idle_ttl=60, client_factory=lambda exchange_name: tickers
+    )
+    yield service
+    await service.stop()
+
+
+class TestMarketDataService:
+    """測試共用輪詢與快取"""
+
+    async def test_many_readers_share_one_poller(self, market_data, tickers):
+        """測試大量讀取者同時讀取同一交易對，每個間隔只請求一次"""
+        results = await asyncio.gather(*[
+            market_data.get_prices("mock", ["BTC/USDT"]) for _ in range(1000)
+        ])
+
+        assert all(prices == {"BTC/USDT": 60000.0} for prices in results)
+        assert tickers.calls == ["BTC/USDT"]
+        assert market_data.get_stats()["pollers"] == 1
+
+        await asyncio.sleep(0.12)
+        # 輪詢次數取決於時間，與讀取次數無關
+        assert 2 <= len(tickers.calls) <= 5
+
+    async def test_one_poller_per_symbol(self, market_data, tickers):
+        prices = await market_data.get_prices("mock", ["BTC/USDT", "ETH/USDT"])
+
+        assert prices == {"BTC/USDT": 60000.0, "ETH/USDT": 3500.0}
+        assert sorted(tickers.calls) == ["BTC/USDT", "ETH/USDT"]
+
+    async def test_price_updates_reach_readers(self, market_data, tickers):
+        await market_data.get_prices("mock", ["BTC/USDT"])
+        tickers.prices["BTC/USDT"] = 61000.0
+        await asyncio.sleep(0.08)
+
+        assert market_data.get_price("mock", "BTC/USDT") == 61000.0
+
+    async def test_idle_poller_stops(self, tickers):
+        service = MarketDataService(
+            poll_interval=0.02, idle_ttl=0.05, client_factory=lambda exchange_name: tickers
+        )
+        await service.get_prices("mock", ["BTC/USDT"])
+        await asyncio.sleep(0.15)
+
+        calls = len(tickers.calls)
+        assert service.get_stats()["pollers"] == 0
+        assert service._pollers == {}
+        await asyncio.sleep(0.05)
+        assert len(tickers.calls) == calls
+        # 停止輪詢後的行情已過期，再次讀取時重新開始輪詢並等待新行情
+        tickers.prices["BTC/USDT"] = 61000.0
+        assert service.get_price("mock", "BTC/USDT") is None
+        assert await service.get_prices("mock", ["BTC/USDT"]) == {"BTC/USDT": 61000.0}
+        assert len(tickers.calls) == calls + 1
+        await service.stop()
+
+    async def test_stale_price_is_not_returned(self, tickers):
+        """測試輪詢持續失敗時，過期的行情不會被當成最新價格"""
+        service = MarketDataService(
+            poll_interval=0.02, idle_ttl=60, first_tick_timeout=0.1, max_age=0.05,
+            client_factory=lambda exchange_name: tickers
+        )
+        assert await service.get_prices("mock", ["BTC/USDT"]) == {"BTC/USDT": 60000.0}
+
+        tickers.fail = True
+        await asyncio.sleep(0.1)
+
+        assert service.get_price("mock", "BTC/USDT") is None
+        assert await service.get_prices("mock", ["BTC/USDT"]) == {}
+        await service.stop()
+
+    async def test_failing_source_returns_no_price(self, tickers):
+        tickers.fail = True
+        service = MarketDataService(
+            poll_interval=0.02, idle_ttl=60, first_tick_timeout=0.1,
+            client_factory=lambda exchange_name: tickers
+        )
+
+        assert await service.get_prices("mock", ["BTC/USDT"]) == {}
+        assert service.failures >= 1
+        await service.stop()
+
+
+class TestPnLPrices:
+    """測試 PnL 從行情快取取得當前市價"""
+
+    async def test_unrealized_pnl_uses_cached_price(self, market_data, tickers):
+        pnl_service = PnLService(db=None, market_data=market_data)
+        positions = [
+            SimpleNamespace(symbol="BTC/USDT", position_size=0.5, entry_price=50000.0),
+            SimpleNamespace(symbol="ETH/USDT", position_size=0.0, entry_price=3000.0),
+        ]
+
+        prices = await pnl_service._fetch_current_prices(positions)
+
+        # 沒有持倉的交易對不需要輪詢
+        assert prices == {"BTC/USDT": 60000.0}
+        assert tickers.calls == ["BTC/USDT"]
@@ -0,0 +1,77 @@
+"""
+Master Scheduler 單元測試
+"""
+import asyncio
+
+from backend.app.services.master_scheduler import TickStats, run_masters_concurrently
+
+
+class TestRunMastersConcurrently:
+    """測試 Master 並行排程"""
+
+    async def test_masters_run_concurrently_within_limit(self):
+        """測試 Master 並行處理且不超過並行上限"""
+        running = 0
+        peak = 0
+
+        async def worker(key, followers):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+
+        groups = {(i, i): [] for i in range(6)}
+        stats = await run_masters_concurrently(groups, worker, max_concurrency=3, master_timeout=1)
+
+        assert peak == 3
+        assert stats.masters_total == 6
+        assert stats.processed == 6
+        assert stats.timed_out == stats.skipped == stats.failed == 0
+
+    async def test_stuck_master_times_out_without_blocking_others(self):
+        """測試卡住的 Master 超時取消，不影響其他 Master"""
+        done = []
+
+        async def worker(key, followers):
+            if key == "stuck":
+                await asyncio.sleep(10)
+            done.append(key)
+
+        groups = {"stuck": [], "a": [], "b": []}
+        stats = await run_masters_concurrently(groups, worker, max_concurrency=3, master_timeout=0.05)
+
+        assert sorted(done) == ["a", "b"]
+        assert stats.processed == 2
+        assert stats.timed_out == 1
+
+    async def test_tick_budget_skips_pending_masters(self):
+        """測試本輪時間預算耗盡時跳過尚未開始的 Master"""
+        async def worker(key, followers):
+            await asyncio.sleep(10)
+
+        groups = {i: [] for i in range(3)}
+        stats = await run_masters_concurrently(
+            groups, worker, max_concurrency=1, master_timeout=5, tick_budget=0.05
+        )
+
+        assert stats.timed_out == 1
+        assert stats.skipped == 2
+        assert stats.duration_ms < 1000
+
+    async def test_worker_exception_is_counted_as_failed(self):
+        """測試處理例外計入失敗"""
+        async def worker(key, followers):
+            raise RuntimeError("boom")
+
+        stats = await run_masters_concurrently({1: []}, worker, max_concurrency=2, master_timeout=1)
+
+        assert stats.failed == 1
+        assert stats.processed == 0
+
+    def test_tick_stats_to_dict(self):
+        """測試統計可序列化"""
+        data = TickStats(masters_total=2, processed=2).to_dict()
+
+        assert data["masters_total"] == 2
+        assert isinstance(data["started_at"], str)
@@ -0,0 +1,156 @@
+"""
+Mock Exchange Simulator 單元測試
+"""
+import ccxt
+import pytest
+
+from backend.app.services.exchanges.mock_exchange import MockExchange
+from backend.app.services.exchanges.mock_simulator import (
+    MockExchangeSimulator,
+    SimulationProfile,
+    configure_mock_simulator,
+    get_mock_simulator,
+)
+
+
+def market_buy(exchange: MockExchange, amount: float, client_order_id: str = None, symbol: str = "BTC/USDT"):
+    params = {'clientOrderId': client_order_id} if client_order_id else None
+    return exchange.create_order(symbol, 'market', 'buy', amount, params=params)
+
+
+def outcomes(simulator: MockExchangeSimulator, api_key: str, count: int) -> list:
+    """連續下單並記錄每筆的結果類型與成交量"""
+    exchange = MockExchange(api_key, "secret", simulator=simulator)
+    results = []
+    for i in range(count):
+        try:
+            results.append(market_buy(exchange, 1.0, f"order-{i}")['filled'])
+        except ccxt.BaseError as e:
+            results.append(type(e).__name__)
+    return results
+
+
+class TestAccountState:
+    """測試依 API Key 追蹤倉位與餘額"""
+
+    def test_positions_and_balances_per_api_key(self):
+        simulator = MockExchangeSimulator()
+        alice = MockExchange("alice", "secret", simulator=simulator)
+        bob = MockExchange("bob", "secret", simulator=simulator)
+
+        market_buy(alice, 0.5)
+        market_buy(alice, 0.5)
+        alice.create_order("BTC/USDT", 'market', 'sell', 0.25)
+
+        positions = alice.fetch_positions()
+        assert len(positions) == 1
+        assert positions[0]['side'] == 'long'
+        assert positions[0]['contracts'] == pytest.approx(0.75)
+        assert positions[0]['entryPrice'] == pytest.approx(50000.0)
+        assert alice.fetch_balance()['total']['BTC'] == pytest.approx(0.75)
+        assert alice.fetch_balance()['total']['USDT'] < 100000.0 - 0.75 * 50000.0
+
+        assert bob.fetch_positions() == []
+        assert bob.fetch_balance()['total'] == {'USDT': 100000.0}
+
+    def test_state_survives_client_rebuild(self):
+        """帳戶狀態保存在模擬器中，重建客戶端後倉位與訂單 ID 仍在"""
+        simulator = MockExchangeSimulator()
+        market_buy(MockExchange("alice", "secret", simulator=simulator), 0.1, "order-1")
+
+        rebuilt = MockExchange("alice", "secret", simulator=simulator)
+        assert rebuilt.fetch_positions()[0]['contracts'] == pytest.approx(0.1)
+        with pytest.raises(ccxt.DuplicateOrderId):
+            market_buy(rebuilt, 0.1, "order-1")
+
+    def test_default_exchange_keeps_fixed_responses(self):
+        """未啟用模擬器時維持固定回應"""
+        previous = configure_mock_simulator(None)
+        try:
+            exchange = MockExchange("alice", "secret")
+            assert exchange.simulator is None
+            assert market_buy(exchange, 0.1)['filled'] == 0.1
+            assert exchange.fetch_positions()[0]['contracts'] == 0.5
+        finally:
+            configure_mock_simulator(previous)
+
+    def test_configured_simulator_used_by_new_exchanges(self):
+        simulator = MockExchangeSimulator()
+        previous = configure_mock_simulator(simulator)
+        try:
+            assert get_mock_simulator() is simulator
+            assert MockExchange("alice", "secret").simulator is simulator
+        finally:
+            configure_mock_simulator(previous)
+
+
+class TestFaultInjection:
+    """測試錯誤、逾時、部分成交與限流"""
+
+    def test_same_seed_reproduces_scenario(self):
+        profile = dict(seed=42, error_rate=0.2, timeout_rate=0.2, partial_fill_rate=0.3)
+        first = outcomes(MockExchangeSimulator(SimulationProfile(**profile)), "alice", 30)
+        second = outcomes(MockExchangeSimulator(SimulationProfile(**profile)), "alice", 30)
+
+        assert first == second
+        assert "ExchangeNotAvailable" in first
+        assert "RequestTimeout" in first
+        assert any(isinstance(r, float) and r < 1.0 for r in first)
+
+    def test_accepted_timeout_reports_duplicate_on_retry(self):
+        """逾時但已被接受的訂單，以相同客戶端訂單 ID 重試時回報 DuplicateOrderId"""
+        simulator = MockExchangeSimulator(SimulationProfile(seed=1, timeout_rate=1.0, timeout_fill_rate=1.0))
+        exchange = MockExchange("alice", "secret", simulator=simulator)
+
+        with pytest.raises(ccxt.RequestTimeout):
+            market_buy(exchange, 0.2, "order-1")
+        simulator.profile.timeout_rate = 0.0
+        with pytest.raises(ccxt.DuplicateOrderId):
+            market_buy(exchange, 0.2, "order-1")
+
+        assert exchange.fetch_positions()[0]['contracts'] == pytest.approx(0.2)
+        original = exchange.fetch_order_by_client_id("order-1", "BTC/USDT")
+        assert (original['side'], original['amount'], original['filled']) == ('buy', 0.2, 0.2)
+        with pytest.raises(ccxt.OrderNotFound):
+            exchange.fetch_order_by_client_id("order-2", "BTC/USDT")
+
+    def test_partial_fill(self):
+        simulator = MockExchangeSimulator(SimulationProfile(seed=1, partial_fill_rate=1.0, partial_fill_min=0.5))
+        exchange = MockExchange("alice", "secret", simulator=simulator)
+
+        order = market_buy(exchange, 1.0)
+
+        assert 0.5 <= order['filled'] < 1.0
+        assert order['remaining'] == pytest.approx(1.0 - order['filled'])
+        assert order['status'] == 'canceled'
+        assert exchange.fetch_positions()[0]['contracts'] == pytest.approx(order['filled'])
+
+    def test_rate_limit_per_api_key(self):
+        simulator = MockExchangeSimulator(SimulationProfile(rate_limit_per_second=0.001, rate_limit_burst=2))
+        alice = MockExchange("alice", "secret", simulator=simulator)
+
+        alice.fetch_ticker("BTC/USDT")
+        alice.fetch_ticker("BTC/USDT")
+        with pytest.raises(ccxt.RateLimitExceeded):
+            alice.fetch_ticker("BTC/USDT")
+        # 其他 API Key 有獨立的額度
+        MockExchange("bob", "secret", simulator=simulator).fetch_ticker("BTC/USDT")
+        assert simulator.get_stats()['rate_limited'] == 1
+
+    def test_failed_batch_reports_error_for_every_order(self):
+        simulator = MockExchangeSimulator(SimulationProfile(error_rate=1.0))
+        exchange = MockExchange("alice", "secret", simulator=simulator)
+
+        results = exchange.create_orders([
+            {'symbol': symbol, 'type': 'market', 'side': 'buy', 'amount': 1.0}
+            for symbol in ("BTC/USDT", "ETH/USDT")
+        ])
+
+        assert len(results) == 2
+        assert all(isinstance(r, ccxt.ExchangeNotAvailable) for r in results)
+        simulator.profile.error_rate = 0.0
+        assert exchange.fetch_positions() == []
+
+    def test_latency_injected(self):
+        simulator = MockExchangeSimulator(SimulationProfile(seed=1, latency_ms=20))
+        assert simulator._latency(simulator.account("alice").rng) == pytest.approx(0.02)
@@ -0,0 +1,90 @@
+"""
+Rate Limiter 單元測試
+"""
+import asyncio
+import time
+
+import pytest
+
+from backend.app.services.exchanges.async_adapters import ThreadedExchangeAdapter
+from backend.app.services.exchanges.factory import ExchangeFactory
+from backend.app.services.exchanges.mock_exchange import MockExchange
+from backend.app.services.exchanges.rate_limiter import (
+    ExchangeRateLimiter,
+    RateLimit,
+    RateLimitedExchange,
+    TokenBucket,
+)
+
+
+class TestTokenBucket:
+    """測試令牌桶"""
+
+    async def test_burst_then_queue_instead_of_failing(self):
+        """測試超出容量的請求排隊等待，全部成功"""
+        bucket = TokenBucket("test", RateLimit(rate=20, burst=2))
+
+        started = time.perf_counter()
+        waits = await asyncio.gather(*[bucket.acquire() for _ in range(6)])
+        elapsed = time.perf_counter() - started
+
+        assert waits[:2] == [0.0, 0.0]
+        assert waits == sorted(waits)  # 先進先出
+        assert elapsed == pytest.approx(0.2, abs=0.08)
+
+        stats = bucket.get_stats()
+        assert stats["acquired"] == 6
+        assert stats["max_queue_depth"] == 4
+        assert stats["queue_depth"] == 0
+        assert stats["max_wait_ms"] >= 150
+
+    async def test_cancelled_waiter_returns_token(self):
+        """測試取消等待時歸還令牌"""
+        bucket = TokenBucket("test", RateLimit(rate=1, burst=1))
+        await bucket.acquire()
+
+        waiter = asyncio.create_task(bucket.acquire())
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert bucket.queued == 0
+        assert bucket._tokens == pytest.approx(0.0, abs=0.05)
+
+
+class TestRateLimitedExchange:
+    """測試交易所與 API Key 兩層限流"""
+
+    async def test_api_keys_share_exchange_budget(self):
+        """測試不同 API Key 各自限流，但共用交易所整體限額"""
+        limiter = ExchangeRateLimiter()
+        exchange_limit = RateLimit(rate=20, burst=2)
+        key_limit = RateLimit(rate=1000, burst=1000)
+
+        exchanges = [
+            RateLimitedExchange(
+                ThreadedExchangeAdapter(MockExchange(key, "secret")),
+                limiter.buckets_for("mock", key, exchange_limit, key_limit)
+            )
+            for key in ("follower_key_a", "follower_key_b")
+        ]
+
+        orders = await asyncio.gather(*[
+            exchange.create_order("BTC/USDT", "market", "buy", 0.1)
+            for exchange in exchanges
+            for _ in range(2)
+        ])
+
+        assert all(order["status"] == "closed" for order in orders)
+        stats = limiter.get_stats()
+        assert stats["exchanges"]["mock"]["acquired"] == 4
+        assert stats["exchanges"]["mock"]["max_queue_depth"] == 2
+        assert set(stats["api_keys"]) == {"mock:foll...ey_a", "mock:foll...ey_b"}
+
+    def test_factory_declares_limits_for_supported_exchanges(self):
+        """測試每個支援的交易所都有限流設定"""
+        for name in ExchangeFactory.get_supported_exchanges():
+            exchange_limit, key_limit = ExchangeFactory.get_rate_limits(name)
+            assert name in ExchangeFactory.EXCHANGE_RATE_LIMITS
+            assert key_limit.rate <= exchange_limit.rate
@@ -0,0 +1,88 @@
+"""
+Signal Bus 單元測試
+"""
+import asyncio
+import pytest
+
+from backend.app.services.signal_bus import (
+    SignalBus,
+    MasterPositionSignal,
+    MASTER_POSITION_TOPIC,
+)
+
+
+@pytest.fixture
+def signal_bus():
+    """創建獨立的 SignalBus 實例"""
+    return SignalBus()
+
+
+class TestSignalBusPublish:
+    """測試信號發佈與訂閱"""
+
+    async def test_subscriber_receives_published_signal(self, signal_bus):
+        """測試訂閱者可收到已發佈的信號"""
+        subscription = signal_bus.subscribe(MASTER_POSITION_TOPIC)
+
+        delivered = signal_bus.publish_master_position(1, 2, "BTC/USDT", 1.5)
+        batch = await subscription.get_batch(timeout=1)
+
+        assert delivered == 1
+        assert len(batch) == 1
+        assert isinstance(batch[0], MasterPositionSignal)
+        assert batch[0].master_user_id == 1
+        assert batch[0].master_credential_id == 2
+        assert batch[0].position_size == 1.5
+
+    async def test_get_batch_drains_all_pending_signals(self, signal_bus):
+        """測試 get_batch 一次取出所有已到達的信號"""
+        subscription = signal_bus.subscribe(MASTER_POSITION_TOPIC)
+
+        for size in (1.0, 2.0, 3.0):
+            signal_bus.publish_master_position(1, 1, "BTC/USDT", size)
+
+        batch = await subscription.get_batch(timeout=1)
+
+        assert [s.position_size for s in batch] == [1.0, 2.0, 3.0]
+
+    async def test_get_batch_returns_empty_on_timeout(self, signal_bus):
+        """測試無信號時逾時返回空列表"""
+        subscription = signal_bus.subscribe(MASTER_POSITION_TOPIC)
+
+        batch = await subscription.get_batch(timeout=0.01)
+
+        assert batch == []
+
+    async def test_get_batch_wakes_on_publish(self, signal_bus):
+        """測試等待中的訂閱者在發佈時被立即喚醒"""
+        subscription = signal_bus.subscribe(MASTER_POSITION_TOPIC)
+
+        waiter = asyncio.create_task(subscription.get_batch(timeout=5))
+        await asyncio.sleep(0)
+        signal_bus.publish_master_position(1, 1, "ETH/USDT", -1.0)
+
+        batch = await asyncio.wait_for(waiter, timeout=1)
+
+        assert batch[0].symbol == "ETH/USDT"
+
+    async def test_overflow_drops_oldest_and_sets_flag(self, signal_bus):
+        """測試佇列溢出時丟棄最舊信號並標記溢出"""
+        subscription = signal_bus.subscribe(MASTER_POSITION_TOPIC, maxsize=2)
+
+        for size in (1.0, 2.0, 3.0):
+            signal_bus.publish_master_position(1, 1, "BTC/USDT", size)
+
+        batch = await subscription.get_batch(timeout=1)
+
+        assert [s.position_size for s in batch] == [2.0, 3.0]
+        assert subscription.consume_overflow() is True
+        assert subscription.consume_overflow() is False
+
+    async def test_closed_subscription_stops_receiving(self, signal_bus):
+        """測試取消訂閱後不再收到信號"""
+        subscription = signal_bus.subscribe(MASTER_POSITION_TOPIC)
+        subscription.close()
+
+        delivered = signal_bus.publish_master_position(1, 1, "BTC/USDT", 1.0)
+
+        assert delivered == 0
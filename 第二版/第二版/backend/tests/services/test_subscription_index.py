@@ -0,0 +1,114 @@
+"""
+Subscription Index 單元測試
+"""
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+
+from backend.app.database import Base
+from backend.app.models import FollowSettings
+from backend.app.services.subscription_index import SubscriptionIndex
+
+
+@pytest.fixture
+async def db_session(tmp_path):
+    """創建測試資料庫會話"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'index.db'}", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        yield session
+
+    await engine.dispose()
+
+
+def make_settings(user_id: int, master_user_id: int = 1, is_active: bool = True, **kwargs) -> FollowSettings:
+    """創建跟單設定"""
+    values = dict(
+        user_id=user_id,
+        master_user_id=master_user_id,
+        master_credential_id=master_user_id,
+        follower_credential_id=100 + user_id,
+        follow_ratio=0.5,
+        is_active=is_active,
+    )
+    values.update(kwargs)
+    return FollowSettings(**values)
+
+
+@pytest.fixture
+async def seeded(db_session):
+    """創建兩個 Master 的跟單設定（含一筆停用）"""
+    settings = [
+        make_settings(2, master_user_id=1),
+        make_settings(3, master_user_id=1),
+        make_settings(4, master_user_id=5),
+        make_settings(6, master_user_id=5, is_active=False),
+    ]
+    db_session.add_all(settings)
+    await db_session.commit()
+    return settings
+
+
+class TestSubscriptionIndex:
+    """測試 Master → 跟隨者索引"""
+
+    async def test_load_groups_active_settings_by_master(self, db_session, seeded):
+        """測試載入時只包含啟用的設定並按 Master 分組"""
+        index = SubscriptionIndex()
+        await index.load(db_session)
+
+        snapshot = index.snapshot()
+
+        assert index.is_loaded
+        assert sorted(e.user_id for e in snapshot[(1, 1)]) == [2, 3]
+        assert [e.user_id for e in snapshot[(5, 5)]] == [4]
+
+    async def test_upsert_moves_follower_between_masters(self, db_session, seeded):
+        """測試更新設定時跟隨者在 Master 間移動"""
+        index = SubscriptionIndex()
+        await index.load(db_session)
+
+        seeded[0].master_user_id = 5
+        seeded[0].master_credential_id = 5
+        index.upsert(seeded[0])
+
+        snapshot = index.snapshot()
+        assert [e.user_id for e in snapshot[(1, 1)]] == [3]
+        assert sorted(e.user_id for e in snapshot[(5, 5)]) == [2, 4]
+
+    async def test_inactive_upsert_removes_and_empty_master_dropped(self, db_session, seeded):
+        """測試停用設定會移除項目，空的 Master 會被移除"""
+        index = SubscriptionIndex()
+        await index.load(db_session)
+
+        seeded[2].is_active = False
+        index.upsert(seeded[2])
+
+        assert (5, 5) not in index.snapshot()
+        assert index.follower_count() == 2
+
+    async def test_existing_snapshot_is_not_mutated(self, db_session, seeded):
+        """測試讀者持有的快照不受後續更新影響"""
+        index = SubscriptionIndex()
+        await index.load(db_session)
+        reader_snapshot = index.snapshot()
+
+        index.remove_user(2)
+        index.upsert(make_settings(7, master_user_id=1, id=99))
+
+        assert sorted(e.user_id for e in reader_snapshot[(1, 1)]) == [2, 3]
+        assert sorted(e.user_id for e in index.snapshot()[(1, 1)]) == [3, 7]
+
+    async def test_refresh_user_reads_latest_row(self, db_session, seeded):
+        """測試 refresh_user 依資料庫最新狀態更新"""
+        index = SubscriptionIndex()
+        await index.load(db_session)
+
+        seeded[3].is_active = True
+        await db_session.commit()
+        await index.refresh_user(db_session, 6)
+        await index.refresh_user(db_session, 404)
+
+        assert sorted(e.user_id for e in index.snapshot()[(5, 5)]) == [4, 6]
@@ -0,0 +1,174 @@
+"""
+Trade Persistence 單元測試
+"""
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+
+from backend.app.database import Base
+from backend.app.models import FollowSettings, FollowerPosition, MasterPosition, TradeLog, TradeError
+from backend.app.repositories.follower_position_repository import FollowerPositionRepository
+from backend.app.services.trade_persistence import FollowerTradeOutcome, TradePersistence
+
+
+@pytest.fixture
+async def test_engine(tmp_path):
+    """創建測試引擎"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'persistence.db'}", echo=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield engine
+
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db_session(test_engine):
+    """創建測試資料庫會話"""
+    session_factory = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        yield session
+
+
+@pytest.fixture
+def master_position():
+    """Master 倉位"""
+    return MasterPosition(
+        master_user_id=1,
+        master_credential_id=1,
+        symbol="BTC/USDT",
+        position_size=2.0,
+        entry_price=50000.0,
+    )
+
+
+def make_outcome(settings: FollowSettings, **kwargs) -> FollowerTradeOutcome:
+    """創建下單結果"""
+    values = dict(
+        follow_settings_id=settings.id,
+        user_id=settings.user_id,
+        credential_id=settings.follower_credential_id,
+        follow_ratio=settings.follow_ratio,
+        side="buy",
+        action="補單_增加倉位",
+        amount=1.0,
+        current_size=0.0,
+        target_size=1.0,
+        started_at=datetime.utcnow(),
+        order_id="order-1",
+    )
+    values.update(kwargs)
+    return FollowerTradeOutcome(**values)
+
+
+async def create_settings(db_session, user_ids):
+    """創建跟單設定"""
+    settings = [
+        FollowSettings(
+            user_id=user_id,
+            master_user_id=1,
+            master_credential_id=1,
+            follower_credential_id=100 + user_id,
+            follow_ratio=0.5,
+            is_active=True,
+        )
+        for user_id in user_ids
+    ]
+    db_session.add_all(settings)
+    await db_session.commit()
+    return settings
+
+
+class TestTradePersistence:
+    """測試批量寫入"""
+
+    async def test_persist_mixed_outcomes(self, db_session, master_position):
+        """測試成功與失敗結果在同一交易中寫入"""
+        existing, new, failing = await create_settings(db_session, [2, 3, 4])
+        position = FollowerPosition(user_id=2, credential_id=102, symbol="BTC/USDT", position_size=0.2)
+        db_session.add(position)
+        await db_session.commit()
+
+        outcomes = [
+            make_outcome(existing, position_id=position.id, current_size=0.2, amount=0.8),
+            make_outcome(new, order_id="order-2"),
+            make_outcome(failing, order_id=None, error_message="insufficient balance"),
+        ]
+        log_ids = await TradePersistence(db_session).persist(master_position, outcomes)
+
+        logs = {
+            log.id: log for log in (await db_session.execute(select(TradeLog))).scalars().all()
+        }
+        assert [logs[i].follower_user_id for i in log_ids] == [2, 3, 4]
+        assert logs[log_ids[2]].status == "failed"
+
+        positions = {
+            p.user_id: p.position_size
+            for p in (await db_session.execute(select(FollowerPosition))).scalars().all()
+        }
+        assert positions == {2: 1.0, 3: 1.0}
+
+        errors = (await db_session.execute(select(TradeError))).scalars().all()
+        assert [(e.user_id, e.trade_log_id) for e in errors] == [(4, log_ids[2])]
+
+        active = {
+            s.user_id: s.is_active
+            for s in (await db_session.execute(
+                select(FollowSettings).execution_options(populate_existing=True)
+            )).scalars().all()
+        }
+        assert active == {2: True, 3: True, 4: False}
+
+    async def test_statement_count_independent_of_followers(
+        self, db_session, test_engine, master_position
+    ):
+        """測試寫入語句數量不隨跟隨者數量增加"""
+        settings = await create_settings(db_session, range(10, 210))
+        outcomes = [make_outcome(s, order_id=f"order-{s.id}") for s in settings]
+        outcomes[0].error_message = "boom"
+
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(test_engine.sync_engine, "before_cursor_execute", count)
+        try:
+            await TradePersistence(db_session).persist(master_position, outcomes)
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", count)
+
+        assert len(statements) <= 5
+        total = len((await db_session.execute(select(TradeLog))).scalars().all())
+        assert total == 200
+
+
+class TestBulkUpdatePositions:
+    """測試倉位批量更新"""
+
+    async def test_postgresql_uses_update_from_values(self):
+        """測試 PostgreSQL 使用單一 UPDATE ... FROM (VALUES ...)"""
+        executed = []
+
+        class RecordingSession:
+            bind = SimpleNamespace(dialect=postgresql.dialect())
+
+            async def execute(self, statement, *args):
+                executed.append((statement, args))
+
+        await FollowerPositionRepository(RecordingSession()).bulk_update_positions([
+            {"id": 1, "position_size": 1.0, "entry_price": 50000.0},
+            {"id": 2, "position_size": -0.5, "entry_price": None},
+        ])
+
+        assert len(executed) == 1
+        statement, args = executed[0]
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        assert "FROM (VALUES" in sql
+        assert args == ()
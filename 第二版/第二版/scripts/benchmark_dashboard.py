@@ -0,0 +1,187 @@
+"""
+儀表板摘要基準測試
+多個客戶端並行請求 /dashboard/summary 的組裝邏輯，比較無快取與快取的 p50/p99 延遲
+
+使用方式：
+    python scripts/benchmark_dashboard.py --users 50 --clients 20 --requests 50
+    python scripts/benchmark_dashboard.py --query-latency-ms 5 --write-rate 20
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# 添加專案根目錄到 Python 路徑
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 基準測試使用暫存資料庫，不需要真實的設定
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/1")
+os.environ.setdefault("ENCRYPTION_KEY", "benchmark_only_key")
+os.environ.setdefault("DEBUG", "False")
+
+import logging
+logging.disable(logging.CRITICAL)
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+
+from backend.app.database import Base
+from backend.app.models import FollowSettings, FollowerPosition, MasterPosition, TradeLog
+from backend.app.services.dashboard_cache import DashboardCache
+from backend.app.services.dashboard_service import DashboardService
+from backend.app.services.market_data_service import MarketDataService
+
+MASTER_USER_ID = 1
+MASTER_CREDENTIAL_ID = 1
+SYMBOLS = ["BTC/USDT", "ETH/USDT", "SOL/USDT"]
+
+
+class FixedTickers:
+    """固定價格的行情來源（不請求交易所）"""
+
+    async def fetch_ticker(self, symbol):
+        return {"symbol": symbol, "last": 100.0, "bid": None, "ask": None}
+
+
+async def seed(session_factory, users: int, trades_per_user: int):
+    """建立 Master 倉位與每位跟隨者的設定、倉位和交易記錄"""
+    async with session_factory() as session:
+        session.add_all(
+            MasterPosition(
+                master_user_id=MASTER_USER_ID, master_credential_id=MASTER_CREDENTIAL_ID,
+                symbol=symbol, position_size=1.0, entry_price=90.0
+            )
+            for symbol in SYMBOLS
+        )
+        for user_id in range(2, users + 2):
+            session.add(FollowSettings(
+                user_id=user_id, master_user_id=MASTER_USER_ID,
+                master_credential_id=MASTER_CREDENTIAL_ID, follower_credential_id=user_id,
+                follow_ratio=0.5, is_active=True
+            ))
+            session.add_all(
+                FollowerPosition(
+                    user_id=user_id, credential_id=user_id, symbol=symbol,
+                    position_size=0.5, entry_price=90.0
+                )
+                for symbol in SYMBOLS
+            )
+            session.add_all(
+                TradeLog(
+                    master_user_id=MASTER_USER_ID, master_credential_id=MASTER_CREDENTIAL_ID,
+                    master_action="open_long", master_symbol=SYMBOLS[i % len(SYMBOLS)],
+                    master_position_size=1.0, follower_user_id=user_id,
+                    follower_credential_id=user_id, follower_action="follow_long",
+                    follower_ratio=0.5, follower_amount=0.5, order_type="market", side="buy",
+                    status="success", is_success=True
+                )
+                for i in range(trades_per_user)
+            )
+        await session.commit()
+
+
+async def run_scenario(args, cached: bool) -> tuple:
+    """
+    執行單一情境，返回 (每個請求的延遲毫秒, 快取統計)
+
+    Args:
+        args: 命令列參數
+        cached: 是否使用快取（否則每個請求都重新查詢）
+    """
+    # 使用暫存檔案資料庫，讓每個 session 取得獨立連接
+    tmp_dir = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+    db_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_dir.name}/benchmark.db")
+    async with db_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+    await seed(session_factory, args.users, args.trades)
+
+    if args.query_latency_ms > 0:
+        # 每個連接在自己的執行緒執行，以 sleep 模擬資料庫的網路往返
+        @event.listens_for(db_engine.sync_engine, "before_cursor_execute")
+        def delay(conn, cursor, statement, parameters, context, executemany):
+            time.sleep(args.query_latency_ms / 1000)
+
+    market_data = MarketDataService(
+        poll_interval=60, idle_ttl=600, client_factory=lambda exchange_name: FixedTickers()
+    )
+    cache = DashboardCache(ttl=args.ttl if cached else 0)
+    service = DashboardService(session_factory=session_factory, cache=cache, market_data=market_data)
+    user_ids = list(range(2, args.users + 2))
+    latencies = []
+
+    async def client():
+        for _ in range(args.requests):
+            user_id = random.choice(user_ids)
+            started = time.perf_counter()
+            await service.get_summary(user_id, f"user_{user_id}")
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    async def writer():
+        # 模擬引擎寫入跟隨者交易後遞增版本號
+        while True:
+            await asyncio.sleep(1 / args.write_rate)
+            cache.bump_user(random.choice(user_ids))
+
+    writer_task = asyncio.create_task(writer()) if args.write_rate > 0 else None
+    try:
+        await asyncio.gather(*(client() for _ in range(args.clients)))
+    finally:
+        if writer_task:
+            writer_task.cancel()
+        await market_data.stop()
+        await db_engine.dispose()
+        tmp_dir.cleanup()
+    return latencies, cache.get_stats()
+
+
+def summarize(label: str, latencies: list, stats: dict):
+    """輸出延遲統計"""
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{label:<8} n={len(ordered):<5} "
+        f"p50={statistics.median(ordered):8.2f}ms  "
+        f"p99={p99:8.2f}ms  "
+        f"max={ordered[-1]:8.2f}ms  "
+        f"hit_rate={stats['hit_rate']}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="儀表板摘要基準測試")
+    parser.add_argument("--users", type=int, default=50, help="跟隨者數量")
+    parser.add_argument("--trades", type=int, default=20, help="每位跟隨者的交易記錄數量")
+    parser.add_argument("--clients", type=int, default=20, help="並行的客戶端數量")
+    parser.add_argument("--requests", type=int, default=50, help="每個客戶端的請求數量")
+    parser.add_argument("--ttl", type=float, default=2.0, help="快取存活時間（秒）")
+    parser.add_argument(
+        "--query-latency-ms", type=float, default=1.0, help="模擬每個查詢的資料庫往返延遲（毫秒）"
+    )
+    parser.add_argument(
+        "--write-rate", type=float, default=10.0, help="模擬引擎每秒寫入（使摘要失效）的次數，0 表示不寫入"
+    )
+    parser.add_argument("--seed", type=int, default=42, help="隨機種子")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(
+        f"儀表板摘要延遲（{args.users} 位用戶、{args.clients} 個並行客戶端、"
+        f"每查詢 {args.query_latency_ms}ms、每秒 {args.write_rate} 次寫入）"
+    )
+    print("=" * 70)
+
+    random.seed(args.seed)
+    summarize("無快取", *await run_scenario(args, cached=False))
+
+    random.seed(args.seed)
+    summarize("快取", *await run_scenario(args, cached=True))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
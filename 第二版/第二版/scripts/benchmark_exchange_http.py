@@ -0,0 +1,195 @@
+"""
+交易所 HTTP 客戶端端到端基準測試
+在子行程啟動本地模擬交易所（scripts/fake_exchange_server.py），讓 binance 客戶端改連到本地，
+經由與引擎相同的客戶端堆疊（熔斷器 → 令牌桶 → CCXT async_support）下單，
+量測下單延遲、吞吐量、實際建立的 TCP 連接數與 WebSocket 訂單更新延遲
+
+使用方式：
+    python scripts/benchmark_exchange_http.py --accounts 20 --orders 10 --latency-ms 30
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 添加專案根目錄到 Python 路徑
+sys.path.insert(0, PROJECT_ROOT)
+
+# 基準測試不需要真實的設定
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/1")
+os.environ.setdefault("ENCRYPTION_KEY", "benchmark_only_key")
+os.environ.setdefault("DEBUG", "False")
+
+import logging
+logging.disable(logging.CRITICAL)
+
+from backend.app.config import settings as app_settings
+from backend.app.services.exchanges.client_registry import ExchangeClientRegistry
+
+EXCHANGE = "binance"
+SYMBOL = "BTC/USDT"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, args) -> subprocess.Popen:
+    """在子行程啟動模擬交易所並等待就緒"""
+    process = subprocess.Popen(
+        [
+            sys.executable, os.path.join(PROJECT_ROOT, "scripts", "fake_exchange_server.py"),
+            "--port", str(port),
+            "--seed", str(args.seed),
+            "--latency-ms", str(args.latency_ms),
+            "--latency-sigma", str(args.latency_sigma),
+            "--error-rate", str(args.error_rate),
+        ],
+        cwd=PROJECT_ROOT,
+    )
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/api/v3/ping", timeout=1)
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("模擬交易所未能啟動")
+
+
+def server_stats(base_url: str) -> dict:
+    with urllib.request.urlopen(f"{base_url}/stats", timeout=5) as response:
+        return json.loads(response.read())
+
+
+async def watch_order_updates(base_url: str, api_key: str, received: dict, ready: asyncio.Event):
+    """訂閱用戶資料 WebSocket，記錄每個客戶端訂單 ID 收到 executionReport 的時間"""
+    import websockets
+
+    request = urllib.request.Request(
+        f"{base_url}/api/v3/userDataStream", method="POST", headers={"X-MBX-APIKEY": api_key}
+    )
+    listen_key = json.loads(urllib.request.urlopen(request, timeout=5).read())["listenKey"]
+    ws_url = base_url.replace("http://", "ws://") + f"/ws/{listen_key}"
+    async with websockets.connect(ws_url) as websocket:
+        ready.set()
+        async for message in websocket:
+            event = json.loads(message)
+            received[event["c"]] = time.perf_counter()
+
+
+async def run_account(registry, index: int, orders: int, sent: dict, latencies: list, errors: list):
+    """單一帳戶依序下單"""
+    client = registry.get_client(EXCHANGE, f"bench_key_{index}", "bench_secret")
+    for n in range(orders):
+        client_order_id = f"bench-{index}-{n}"
+        started = time.perf_counter()
+        sent[client_order_id] = started
+        try:
+            await client.create_order(
+                SYMBOL, "market", "buy", 0.001, None, {"clientOrderId": client_order_id}
+            )
+            latencies.append((time.perf_counter() - started) * 1000)
+        except Exception as e:
+            errors.append(type(e).__name__)
+
+
+def percentile(ordered: list, fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run(args, base_url: str):
+    registry = ExchangeClientRegistry()
+    sent, received, latencies, errors = {}, {}, [], []
+
+    ready = asyncio.Event()
+    watcher = asyncio.create_task(watch_order_updates(base_url, "bench_key_0", received, ready))
+    await asyncio.wait_for(ready.wait(), 10)
+
+    # 先載入市場資料，量測只包含下單
+    await asyncio.gather(*(
+        registry.get_client(EXCHANGE, f"bench_key_{i}", "bench_secret").load_markets()
+        for i in range(args.accounts)
+    ))
+    before = server_stats(base_url)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        run_account(registry, i, args.orders, sent, latencies, errors)
+        for i in range(args.accounts)
+    ))
+    elapsed = time.perf_counter() - started
+    await asyncio.sleep(0.2)  # 等待最後的 WebSocket 訊息
+
+    watcher.cancel()
+    await asyncio.gather(watcher, return_exceptions=True)
+    registry.clear()
+    await asyncio.sleep(0.1)  # 等待客戶端關閉連接
+    after = server_stats(base_url)
+
+    total = args.accounts * args.orders
+    print(f"帳戶 {args.accounts}，每帳戶 {args.orders} 筆，共 {total} 筆，耗時 {elapsed:.2f}s")
+    print(f"吞吐量       {len(latencies) / elapsed:9.1f} 筆/秒")
+    if latencies:
+        ordered = sorted(latencies)
+        print(
+            f"下單延遲     p50={statistics.median(ordered):7.1f}ms  "
+            f"p95={percentile(ordered, 0.95):7.1f}ms  max={ordered[-1]:7.1f}ms"
+        )
+    if errors:
+        print(f"失敗         {len(errors)} 筆 {sorted(set(errors))}")
+    print(f"HTTP 請求    {after['requests'] - before['requests']}")
+    print(f"TCP 連接     {after['connections']}（含載入市場資料）")
+
+    ws_delays = sorted(
+        (received[c] - sent[c]) * 1000 for c in received if c in sent
+    )
+    if ws_delays:
+        print(
+            f"訂單更新     {len(ws_delays)} 則，下單到收到 executionReport "
+            f"p50={statistics.median(ws_delays):7.1f}ms  max={ws_delays[-1]:7.1f}ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="交易所 HTTP 客戶端端到端基準測試")
+    parser.add_argument("--accounts", type=int, default=10, help="同時下單的帳戶數")
+    parser.add_argument("--orders", type=int, default=10, help="每個帳戶的下單數")
+    parser.add_argument("--seed", type=int, default=42, help="隨機種子")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="模擬交易所的延遲中位數（毫秒）")
+    parser.add_argument("--latency-sigma", type=float, default=0.0, help="延遲的對數常態分佈參數")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 錯誤機率")
+    args = parser.parse_args()
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    app_settings.EXCHANGE_BASE_URLS = {EXCHANGE: base_url}
+
+    process = start_server(port, args)
+    try:
+        print("=" * 70)
+        print(f"交易所 HTTP 客戶端端到端（{EXCHANGE} → {base_url}）")
+        print("=" * 70)
+        asyncio.run(run(args, base_url))
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+冷啟動匯入時間基準測試
+在全新的子行程中匯入 backend.app.main，量測匯入時間、常駐記憶體以及是否載入了 ccxt；
+另外量測第一次創建 CCXT 客戶端（延後載入 ccxt）的成本
+
+使用方式：
+    python scripts/benchmark_import_time.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 在子行程中執行：匯入目標模組並回報結果
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import backend.app.main
+import_ms = (time.perf_counter() - start) * 1000
+result = {"import_ms": import_ms, "ccxt_loaded": "ccxt" in sys.modules}
+if FIRST_CLIENT:
+    from backend.app.services.exchanges.factory import ExchangeFactory
+    start = time.perf_counter()
+    ExchangeFactory.create_async_client("binance", "bench_key", "bench_secret")
+    result["first_client_ms"] = (time.perf_counter() - start) * 1000
+result["max_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps(result))
+"""
+
+
+def probe(first_client: bool) -> dict:
+    """在全新的 Python 行程中執行一次量測"""
+    env = dict(os.environ)
+    # 基準測試不需要真實的設定
+    env.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+    env.setdefault("REDIS_URL", "redis://localhost:6379/1")
+    env.setdefault("ENCRYPTION_KEY", "benchmark_only_key")
+    env.setdefault("DEBUG", "False")
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.replace("FIRST_CLIENT", repr(first_client))],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def summarize(name: str, samples: list, key: str):
+    """輸出單一指標的統計"""
+    values = [s[key] for s in samples if key in s]
+    if not values:
+        return
+    unit = "MB" if key.endswith("_mb") else "ms"
+    print(
+        f"{name:<24} 中位數 {statistics.median(values):8.1f} {unit}   "
+        f"最小 {min(values):8.1f} {unit}   最大 {max(values):8.1f} {unit}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="冷啟動匯入時間基準測試")
+    parser.add_argument("--runs", type=int, default=5, help="每個情境的執行次數")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("冷啟動（全新行程匯入 backend.app.main）")
+    print("=" * 70)
+
+    startup = [probe(first_client=False) for _ in range(args.runs)]
+    summarize("匯入 backend.app.main", startup, "import_ms")
+    summarize("常駐記憶體", startup, "max_rss_mb")
+    print(f"{'啟動時載入 ccxt':<24} {any(s['ccxt_loaded'] for s in startup)}")
+
+    print()
+    print("第一次創建 CCXT 客戶端（延後載入 ccxt）")
+    first_client = [probe(first_client=True) for _ in range(args.runs)]
+    summarize("創建 binance 客戶端", first_client, "first_client_ms")
+    summarize("常駐記憶體", first_client, "max_rss_mb")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+信號到下單延遲基準測試
+比較純輪詢模式與信號匯流排模式下，Master 倉位更新到跟隨者下單的延遲
+
+使用方式：
+    python scripts/benchmark_signal_latency.py --signals 20 --poll-interval 3
+    python scripts/benchmark_signal_latency.py --exchange-latency-ms 80 --exchange-latency-sigma 0.5
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# 添加專案根目錄到 Python 路徑
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 基準測試使用記憶體資料庫，不需要真實的設定
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/1")
+os.environ.setdefault("ENCRYPTION_KEY", "benchmark_only_key")
+os.environ.setdefault("DEBUG", "False")
+
+import logging
+logging.disable(logging.CRITICAL)
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+
+from backend.app.database import Base
+from backend.app.models import FollowSettings
+from backend.app.services.exchanges.mock_exchange import MockExchange
+from backend.app.services.exchanges.mock_simulator import (
+    MockExchangeSimulator,
+    SimulationProfile,
+    configure_mock_simulator,
+)
+from backend.app.services.follower_engine_v2 import FollowerEngineV2
+from backend.app.services.signal_bus import SignalBus
+
+MASTER_USER_ID = 1
+MASTER_CREDENTIAL_ID = 1
+SYMBOL = "BTC/USDT"
+
+
+class BenchmarkCredentialService:
+    """回傳固定 Mock 憑證"""
+
+    async def get_decrypted_credential(self, credential_id: int, user_id: int):
+        return {
+            "exchange_name": "mock",
+            "api_key": f"bench_key_{user_id}",
+            "api_secret": "bench_secret",
+            "passphrase": None,
+        }
+
+
+async def run_scenario(event_driven: bool, poll_interval: float, signals: int) -> list:
+    """
+    執行單一情境並返回每個信號的延遲（毫秒）
+
+    Args:
+        event_driven: 是否使用信號匯流排
+        poll_interval: 輪詢/安全掃描間隔（秒）
+        signals: 信號數量
+    """
+    # 使用暫存檔案資料庫，讓引擎的每個 session 取得獨立連接
+    tmp_dir = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+    db_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_dir.name}/benchmark.db")
+    async with db_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with session_factory() as session:
+        session.add(FollowSettings(
+            user_id=2,
+            master_user_id=MASTER_USER_ID,
+            master_credential_id=MASTER_CREDENTIAL_ID,
+            follower_credential_id=2,
+            follow_ratio=1.0,
+            is_active=True,
+        ))
+        await session.commit()
+
+    order_placed = asyncio.Event()
+    original_create_orders = MockExchange.create_orders
+    loop = asyncio.get_running_loop()
+
+    def timed_create_orders(self, *args, **kwargs):
+        # 同步交易所在執行緒池中執行，需回到事件循環設定 Event
+        orders = original_create_orders(self, *args, **kwargs)
+        loop.call_soon_threadsafe(order_placed.set)
+        return orders
+
+    MockExchange.create_orders = timed_create_orders
+    latencies = []
+
+    async with session_factory() as master_session, session_factory() as engine_session:
+        engine = FollowerEngineV2(
+            db=engine_session,
+            credential_service=BenchmarkCredentialService(),
+            poll_interval=poll_interval,
+            signal_bus=SignalBus(),
+            event_driven=event_driven,
+        )
+        # Master 端使用獨立 session 寫入，並共用引擎的信號匯流排
+        publisher = FollowerEngineV2(
+            db=master_session,
+            credential_service=BenchmarkCredentialService(),
+            signal_bus=engine.signal_bus,
+            event_driven=False,
+        )
+        try:
+            await engine.start()
+            await asyncio.sleep(0.1)
+
+            for i in range(signals):
+                # 隨機錯開相位，模擬 Master 在任意時刻下單
+                await asyncio.sleep(random.uniform(0, poll_interval))
+                order_placed.clear()
+                started = time.perf_counter()
+                await publisher.update_master_position(
+                    MASTER_USER_ID, MASTER_CREDENTIAL_ID, SYMBOL, float(i + 1), 50000.0
+                )
+                await asyncio.wait_for(order_placed.wait(), timeout=poll_interval * 3)
+                latencies.append((time.perf_counter() - started) * 1000)
+        finally:
+            await engine.stop()
+            MockExchange.create_orders = original_create_orders
+
+    await db_engine.dispose()
+    tmp_dir.cleanup()
+    return latencies
+
+
+def summarize(label: str, latencies: list):
+    """輸出延遲統計"""
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(
+        f"{label:<12} n={len(ordered):<4} "
+        f"p50={statistics.median(ordered):9.1f}ms  "
+        f"p95={p95:9.1f}ms  "
+        f"max={ordered[-1]:9.1f}ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="信號到下單延遲基準測試")
+    parser.add_argument("--signals", type=int, default=10, help="每個情境的信號數量")
+    parser.add_argument("--poll-interval", type=float, default=3.0, help="輪詢模式的間隔（秒）")
+    parser.add_argument("--seed", type=int, default=42, help="隨機種子")
+    parser.add_argument(
+        "--exchange-latency-ms", type=float, default=0.0,
+        help="模擬交易所的請求延遲中位數（毫秒），0 表示立即回應"
+    )
+    parser.add_argument(
+        "--exchange-latency-sigma", type=float, default=0.0, help="模擬延遲的對數常態分佈參數"
+    )
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    if args.exchange_latency_ms > 0:
+        configure_mock_simulator(MockExchangeSimulator(SimulationProfile(
+            seed=args.seed,
+            latency_ms=args.exchange_latency_ms,
+            latency_sigma=args.exchange_latency_sigma
+        )))
+
+    print("=" * 70)
+    print("信號到下單延遲（Master 倉位更新 → 跟隨者 create_orders）")
+    print("=" * 70)
+
+    polling = await run_scenario(False, args.poll_interval, args.signals)
+    summarize("輪詢模式", polling)
+
+    event_driven = await run_scenario(True, args.poll_interval, args.signals)
+    summarize("信號驅動", event_driven)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
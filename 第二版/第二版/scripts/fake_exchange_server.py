@@ -0,0 +1,489 @@
+"""
+本地模擬交易所伺服器
+以幣安（Binance）REST 格式提供行情、餘額、下單與持倉端點，並提供用戶資料 WebSocket
+（executionReport 訂單更新），讓 CCXT 客戶端、連接池與限流可以在沒有網路的情況下端到端測試
+
+帳戶狀態、延遲與錯誤注入使用 MockExchangeSimulator（依 API Key 追蹤倉位與餘額）；
+不驗證請求簽名，任何 API Key 都視為有效帳戶
+
+使用方式：
+    python scripts/fake_exchange_server.py --port 8765 --latency-ms 30 --error-rate 0.01
+
+    # 讓應用程式的 binance 客戶端改連到本地伺服器
+    EXCHANGE_BASE_URLS='{"binance": "http://127.0.0.1:8765"}'
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import sys
+import time
+import uuid
+from typing import Any, Dict, Optional, Set
+from urllib.parse import parse_qsl
+
+# 添加專案根目錄到 Python 路徑
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 模擬伺服器不需要真實的設定
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/1")
+os.environ.setdefault("ENCRYPTION_KEY", "fake_exchange_only_key")
+os.environ.setdefault("DEBUG", "False")
+
+from fastapi import FastAPI, Request, WebSocket
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+
+from backend.app.services.exchanges.errors import is_ccxt_error
+from backend.app.services.exchanges.mock_exchange import MockExchange
+from backend.app.services.exchanges.mock_simulator import MockExchangeSimulator, SimulationProfile
+
+# 模擬器錯誤 -> (HTTP 狀態碼, 幣安錯誤碼, 錯誤訊息)
+ERROR_RESPONSES = [
+    ('RateLimitExceeded', 429, -1003, "Too many requests; current limit is exceeded."),
+    ('RequestTimeout', 408, -1007, "Timeout waiting for response from backend server. "
+                                   "Send status unknown; execution status unknown."),
+    ('ExchangeNotAvailable', 503, -1001, "Internal error; unable to process your request."),
+    ('DuplicateOrderId', 400, -2010, "Duplicate order sent."),
+]
+
+
+def _market_id(symbol: str) -> str:
+    return symbol.replace('/', '')
+
+
+def _fmt(value: float) -> str:
+    """幣安以字串表示數字"""
+    return f"{value:.8f}".rstrip('0').rstrip('.') or '0'
+
+
+def _error(status: int, code: int, message: str) -> JSONResponse:
+    return JSONResponse(status_code=status, content={"code": code, "msg": message})
+
+
+class FakeExchange:
+    """模擬交易所的伺服器狀態"""
+
+    def __init__(self, simulator: MockExchangeSimulator):
+        self.simulator = simulator
+        self.reference = MockExchange("fake_exchange", "", simulator=MockExchangeSimulator())
+        self.markets: Dict[str, str] = {
+            _market_id(symbol): symbol for symbol in self.reference._mock_markets
+        }
+        self._exchanges: Dict[str, MockExchange] = {}
+        self._order_ids = itertools.count(1)
+        self._listen_keys: Dict[str, str] = {}  # listenKey -> API Key
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+        # 統計
+        self.requests = 0
+        self.connections: Set[str] = set()  # 不同的客戶端 TCP 連接（用於觀察連接池）
+
+    def exchange(self, api_key: str) -> MockExchange:
+        """API Key 對應的模擬帳戶"""
+        exchange = self._exchanges.get(api_key)
+        if exchange is None:
+            exchange = MockExchange(api_key, "", simulator=self.simulator)
+            self._exchanges[api_key] = exchange
+        return exchange
+
+    def exchange_info(self, contract: bool) -> Dict[str, Any]:
+        """現貨（/api/v3）或 U 本位合約（/fapi/v1）的 exchangeInfo"""
+        symbols = []
+        for market_id, symbol in self.markets.items():
+            amount_step, price_tick, min_notional = self.reference._mock_markets[symbol]
+            base, quote = symbol.split('/')
+            market = {
+                "symbol": market_id,
+                "status": "TRADING",
+                "baseAsset": base,
+                "quoteAsset": quote,
+                "baseAssetPrecision": 8,
+                "quotePrecision": 8,
+                "quoteAssetPrecision": 8,
+                "orderTypes": ["LIMIT", "MARKET"],
+                "filters": [
+                    {"filterType": "PRICE_FILTER", "minPrice": _fmt(price_tick),
+                     "maxPrice": "1000000", "tickSize": _fmt(price_tick)},
+                    {"filterType": "LOT_SIZE", "minQty": _fmt(amount_step),
+                     "maxQty": "9000", "stepSize": _fmt(amount_step)},
+                    # 合約的最小名目價值欄位是 notional，現貨是 minNotional
+                    {"filterType": "MIN_NOTIONAL", "notional": _fmt(min_notional)} if contract
+                    else {"filterType": "NOTIONAL", "minNotional": _fmt(min_notional)},
+                ],
+            }
+            if contract:
+                market.update({
+                    "pair": market_id,
+                    "contractType": "PERPETUAL",
+                    "deliveryDate": 4133404800000,
+                    "onboardDate": 1569398400000,
+                    "marginAsset": quote,
+                    "pricePrecision": 2,
+                    "quantityPrecision": 5,
+                    "underlyingType": "COIN",
+                })
+            else:
+                market.update({
+                    "isSpotTradingAllowed": True,
+                    "isMarginTradingAllowed": False,
+                    "permissions": ["SPOT"],
+                })
+            symbols.append(market)
+        return {
+            "timezone": "UTC",
+            "serverTime": int(time.time() * 1000),
+            "rateLimits": [],
+            "exchangeFilters": [],
+            "symbols": symbols,
+        }
+
+    def listen_key(self, api_key: str) -> str:
+        for key, owner in self._listen_keys.items():
+            if owner == api_key:
+                return key
+        key = uuid.uuid4().hex
+        self._listen_keys[key] = api_key
+        return key
+
+    def subscribe(self, listen_key: str) -> Optional[asyncio.Queue]:
+        api_key = self._listen_keys.get(listen_key)
+        if api_key is None:
+            return None
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(api_key, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, listen_key: str, queue: asyncio.Queue):
+        self._subscribers.get(self._listen_keys.get(listen_key), set()).discard(queue)
+
+    def publish_order(self, api_key: str, order: Dict[str, Any]):
+        """推送 executionReport 給該 API Key 的 WebSocket 訂閱者"""
+        subscribers = self._subscribers.get(api_key)
+        if not subscribers:
+            return
+        now = int(time.time() * 1000)
+        event = {
+            "e": "executionReport",
+            "E": now,
+            "s": order["symbol"],
+            "c": order["clientOrderId"],
+            "S": order["side"],
+            "o": order["type"],
+            "f": "GTC",
+            "q": order["origQty"],
+            "p": order["price"],
+            "x": "TRADE",
+            "X": order["status"],
+            "i": order["orderId"],
+            "l": order["executedQty"],
+            "z": order["executedQty"],
+            "L": order["fills"][0]["price"] if order["fills"] else "0",
+            "n": order["fills"][0]["commission"] if order["fills"] else "0",
+            "N": "USDT",
+            "T": order["transactTime"],
+            "Z": order["cummulativeQuoteQty"],
+        }
+        for queue in subscribers:
+            queue.put_nowait(event)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "connections": len(self.connections),
+            "accounts": len(self._exchanges),
+            "websocket_subscribers": sum(len(s) for s in self._subscribers.values()),
+            "simulator": self.simulator.get_stats(),
+        }
+
+
+async def _params(request: Request) -> Dict[str, str]:
+    """合併查詢字串與表單內容（CCXT 以 urlencoded 送出私有 POST 參數）"""
+    params = dict(request.query_params)
+    body = await request.body()
+    if body:
+        params.update(parse_qsl(body.decode()))
+    return params
+
+
+def create_app(simulator: Optional[MockExchangeSimulator] = None) -> FastAPI:
+    """
+    創建模擬交易所應用程式
+
+    Args:
+        simulator: 模擬器（可選，預設不注入延遲與錯誤）
+    """
+    fake = FakeExchange(simulator or MockExchangeSimulator())
+    app = FastAPI(title="Fake Exchange")
+    app.state.fake = fake
+
+    @app.middleware("http")
+    async def count_requests(request: Request, call_next):
+        fake.requests += 1
+        if request.client is not None:
+            fake.connections.add(f"{request.client.host}:{request.client.port}")
+        return await call_next(request)
+
+    async def call(api_key: Optional[str], method: str, *args):
+        """在執行緒池中呼叫模擬帳戶（模擬器以 time.sleep 注入延遲），錯誤轉為幣安格式"""
+        if not api_key:
+            return _error(401, -2015, "Invalid API-key, IP, or permissions for action.")
+        try:
+            return await run_in_threadpool(getattr(fake.exchange(api_key), method), *args)
+        except Exception as e:
+            for name, status, code, message in ERROR_RESPONSES:
+                if is_ccxt_error(e, name):
+                    return _error(status, code, message)
+            return _error(400, -1000, str(e))
+
+    def api_key_of(request: Request) -> Optional[str]:
+        return request.headers.get("X-MBX-APIKEY")
+
+    def unknown_symbol() -> JSONResponse:
+        return _error(400, -1121, "Invalid symbol.")
+
+    # ==================== 公開端點 ====================
+
+    @app.get("/api/v3/ping")
+    @app.get("/fapi/v1/ping")
+    async def ping():
+        return {}
+
+    @app.get("/api/v3/time")
+    @app.get("/fapi/v1/time")
+    async def server_time():
+        return {"serverTime": int(time.time() * 1000)}
+
+    @app.get("/api/v3/exchangeInfo")
+    async def spot_exchange_info():
+        return fake.exchange_info(contract=False)
+
+    @app.get("/fapi/v1/exchangeInfo")
+    async def futures_exchange_info():
+        return fake.exchange_info(contract=True)
+
+    @app.get("/dapi/v1/exchangeInfo")
+    async def delivery_exchange_info():
+        return {"timezone": "UTC", "serverTime": int(time.time() * 1000), "symbols": []}
+
+    @app.get("/api/v3/ticker/24hr")
+    async def ticker_24hr(symbol: str):
+        if symbol not in fake.markets:
+            return unknown_symbol()
+        # 行情是公開端點，沒有 API Key 時以固定帳戶計算延遲與限流
+        ticker = await call("public", "fetch_ticker", fake.markets[symbol])
+        if isinstance(ticker, JSONResponse):
+            return ticker
+        return {
+            "symbol": symbol,
+            "lastPrice": _fmt(ticker["last"]),
+            "bidPrice": _fmt(ticker["bid"]),
+            "askPrice": _fmt(ticker["ask"]),
+            "highPrice": _fmt(ticker["high"]),
+            "lowPrice": _fmt(ticker["low"]),
+            "openPrice": _fmt(ticker["last"]),
+            "volume": _fmt(ticker["volume"]),
+            "quoteVolume": _fmt(ticker["volume"] * ticker["last"]),
+            "priceChange": "0",
+            "priceChangePercent": "0",
+            "weightedAvgPrice": _fmt(ticker["last"]),
+            "openTime": int(ticker["timestamp"]) - 86400000,
+            "closeTime": int(ticker["timestamp"]),
+            "count": 0,
+        }
+
+    # ==================== 私有端點 ====================
+
+    @app.get("/sapi/v1/capital/config/getall")
+    async def currencies():
+        return []
+
+    @app.get("/api/v3/account")
+    async def account(request: Request):
+        balance = await call(api_key_of(request), "fetch_balance")
+        if isinstance(balance, JSONResponse):
+            return balance
+        return {
+            "makerCommission": 10,
+            "takerCommission": 10,
+            "canTrade": True,
+            "canWithdraw": False,
+            "canDeposit": False,
+            "updateTime": int(time.time() * 1000),
+            "accountType": "SPOT",
+            "balances": [
+                {"asset": asset, "free": _fmt(amount), "locked": "0"}
+                for asset, amount in balance["free"].items()
+            ],
+            "permissions": ["SPOT"],
+        }
+
+    @app.post("/api/v3/order")
+    async def create_order(request: Request):
+        params = await _params(request)
+        symbol = fake.markets.get(params.get("symbol", ""))
+        if symbol is None:
+            return unknown_symbol()
+        client_order_id = params.get("newClientOrderId")
+        api_key = api_key_of(request)
+        order = await call(
+            api_key,
+            "create_order",
+            symbol,
+            params.get("type", "MARKET").lower(),
+            params.get("side", "BUY").lower(),
+            float(params.get("quantity", 0)),
+            float(params["price"]) if params.get("price") else None,
+            {"clientOrderId": client_order_id} if client_order_id else None,
+        )
+        if isinstance(order, JSONResponse):
+            return order
+
+        filled = order["filled"]
+        response = {
+            "symbol": params["symbol"],
+            "orderId": next(fake._order_ids),
+            "orderListId": -1,
+            "clientOrderId": order["clientOrderId"],
+            "transactTime": int(order["timestamp"]),
+            "price": params.get("price", "0"),
+            "origQty": _fmt(order["amount"]),
+            "executedQty": _fmt(filled),
+            "cummulativeQuoteQty": _fmt(order["cost"]),
+            # 市價單未成交的部分由交易所取消（與幣安相同，狀態為 EXPIRED）
+            "status": "FILLED" if filled >= order["amount"] else "EXPIRED",
+            "timeInForce": "GTC",
+            "type": params.get("type", "MARKET"),
+            "side": params.get("side", "BUY"),
+            "fills": [{
+                "price": _fmt(order["price"]),
+                "qty": _fmt(filled),
+                "commission": _fmt(order["fee"]["cost"]),
+                "commissionAsset": "USDT",
+                "tradeId": next(fake._order_ids),
+            }] if filled > 0 else [],
+        }
+        fake.publish_order(api_key, response)
+        return response
+
+    @app.get("/api/v3/openOrders")
+    async def open_orders(request: Request):
+        result = await call(api_key_of(request), "fetch_open_orders")
+        return result if isinstance(result, JSONResponse) else []
+
+    @app.delete("/api/v3/order")
+    async def cancel_order(request: Request):
+        # 市價單立即成交或取消，沒有可取消的掛單
+        return _error(400, -2011, "Unknown order sent.")
+
+    @app.get("/fapi/v2/positionRisk")
+    async def position_risk(request: Request):
+        positions = await call(api_key_of(request), "fetch_positions")
+        if isinstance(positions, JSONResponse):
+            return positions
+        return [
+            {
+                "symbol": _market_id(position["symbol"]),
+                "positionAmt": _fmt(
+                    position["contracts"] if position["side"] == "long" else -position["contracts"]
+                ),
+                "entryPrice": _fmt(position["entryPrice"]),
+                "markPrice": _fmt(position["markPrice"]),
+                "unRealizedProfit": _fmt(position["unrealizedPnl"]),
+                "liquidationPrice": "0",
+                "leverage": "1",
+                "maxNotionalValue": "1000000",
+                "marginType": "cross",
+                "isolatedMargin": "0",
+                "isAutoAddMargin": "false",
+                "positionSide": "BOTH",
+                "notional": _fmt(position["notional"]),
+                "isolatedWallet": "0",
+                "updateTime": int(position["timestamp"]),
+            }
+            for position in positions
+        ]
+
+    @app.get("/fapi/v1/leverageBracket")
+    async def leverage_bracket():
+        return [
+            {"symbol": market_id, "brackets": [{
+                "bracket": 1, "initialLeverage": 20, "notionalCap": 1000000,
+                "notionalFloor": 0, "maintMarginRatio": 0.004, "cum": 0
+            }]}
+            for market_id in fake.markets
+        ]
+
+    # ==================== 用戶資料 WebSocket ====================
+
+    @app.post("/api/v3/userDataStream")
+    async def create_listen_key(request: Request):
+        api_key = api_key_of(request)
+        if not api_key:
+            return _error(401, -2015, "Invalid API-key, IP, or permissions for action.")
+        return {"listenKey": fake.listen_key(api_key)}
+
+    @app.put("/api/v3/userDataStream")
+    async def keepalive_listen_key():
+        return {}
+
+    @app.websocket("/ws/{listen_key}")
+    async def user_data_stream(websocket: WebSocket, listen_key: str):
+        queue = fake.subscribe(listen_key)
+        if queue is None:
+            await websocket.close(code=4001)
+            return
+        await websocket.accept()
+
+        async def forward():
+            while True:
+                await websocket.send_json(await queue.get())
+
+        sender = asyncio.create_task(forward())
+        try:
+            # 等待客戶端斷線（客戶端不會送訊息），斷線後停止推送
+            while (await websocket.receive())["type"] != "websocket.disconnect":
+                pass
+        finally:
+            sender.cancel()
+            fake.unsubscribe(listen_key, queue)
+
+    @app.get("/stats")
+    async def stats():
+        return fake.get_stats()
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地模擬交易所伺服器（幣安 REST 格式）")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=None, help="隨機種子")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="請求延遲中位數（毫秒）")
+    parser.add_argument("--latency-sigma", type=float, default=0.0, help="延遲的對數常態分佈參數")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 錯誤機率")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="下單逾時機率")
+    parser.add_argument("--partial-fill-rate", type=float, default=0.0, help="市價單部分成交機率")
+    parser.add_argument(
+        "--rate-limit", type=float, default=0.0, help="每個 API Key 每秒請求數上限，0 表示不限"
+    )
+    args = parser.parse_args()
+
+    import uvicorn
+
+    simulator = MockExchangeSimulator(SimulationProfile(
+        seed=args.seed,
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate,
+        partial_fill_rate=args.partial_fill_rate,
+        rate_limit_per_second=args.rate_limit,
+    ))
+    uvicorn.run(create_app(simulator), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()